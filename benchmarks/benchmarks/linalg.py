@@ -1,6 +1,7 @@
 from __future__ import division, absolute_import, print_function
 
 import math
+import threading
 
 import numpy.linalg as nl
 
@@ -231,3 +232,79 @@ class SpecialMatrices(Benchmark):
 
     def time_tri(self, size):
         sl.tri(size)
+
+
+class GetFuncs(Benchmark):
+    """
+    Overhead of looking up and calling BLAS/LAPACK wrappers on small
+    matrices, where it dominates the floating point work.
+    """
+
+    param_names = ['dtype']
+    params = [[np.float64, np.complex128]]
+
+    def setup(self, dtype):
+        np.random.seed(1234)
+        self.a = np.asfortranarray(random([4, 4]) + 4*np.eye(4)).astype(dtype)
+        self.b = np.ones((4, 1), dtype=dtype)
+
+    def time_get_blas_funcs(self, dtype):
+        sl.get_blas_funcs('gemm', (self.a,))
+
+    def time_get_blas_funcs_multiple(self, dtype):
+        sl.get_blas_funcs(('gemm', 'gemv', 'axpy'), (self.a, self.b))
+
+    def time_get_lapack_funcs(self, dtype):
+        sl.get_lapack_funcs(('getrf', 'getrs'), (self.a, self.b))
+
+    def time_gemm(self, dtype):
+        gemm = sl.get_blas_funcs('gemm', (self.a,))
+        gemm(1.0, self.a, self.a)
+
+    def time_getrf_getrs(self, dtype):
+        getrf, getrs = sl.get_lapack_funcs(('getrf', 'getrs'),
+                                           (self.a, self.b))
+        lu, piv, info = getrf(self.a)
+        getrs(lu, piv, self.b)
+
+
+class BlasLapackThreads(Benchmark):
+    """
+    BLAS/LAPACK wrappers called from several Python threads, which run
+    concurrently when the wrappers release the GIL.
+    """
+
+    param_names = ['size', 'threads']
+    params = [
+        [100, 500],
+        [1, 4]
+    ]
+
+    def setup(self, size, threads):
+        np.random.seed(1234)
+        self.a = [np.asfortranarray(random([size, size]))
+                  for j in range(8)]
+
+    def _run(self, func, threads):
+        def worker(j):
+            for x in self.a[j::threads]:
+                func(x)
+
+        workers = [threading.Thread(target=worker, args=(j,))
+                   for j in range(threads)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+
+    def time_gemm(self, size, threads):
+        gemm = sl.get_blas_funcs('gemm', self.a[:1])
+        self._run(lambda x: gemm(1.0, x, x), threads)
+
+    def time_getrf(self, size, threads):
+        getrf = sl.get_lapack_funcs('getrf', self.a[:1])
+        self._run(getrf, threads)
+
+    def time_syevd(self, size, threads):
+        syevd = sl.get_lapack_funcs('syevd', self.a[:1])
+        self._run(syevd, threads)
@@ -28,6 +28,8 @@ Basics
    solve_circulant - Solve a circulant system
    solve_triangular - Solve a triangular matrix
    solve_toeplitz - Solve a toeplitz matrix
+   solve_toeplitz_stack - Solve a stack of toeplitz matrices
+   matmul_toeplitz - Fast product with a toeplitz matrix
    det - Find the determinant of a square matrix
    norm - Matrix and vector norm
    lstsq - Solve a linear least-squares problem
@@ -91,6 +93,10 @@ Decompositions
    rsf2csf - Real to complex Schur form
    hessenberg - Hessenberg form of a matrix
    cdf2rdf - Complex diagonal form to real diagonal block form
+   LUFactorization - LU factorization for repeated solves
+   CholeskyFactorization - Cholesky factorization with solves and updates
+   LDLFactorization - LDL.T factorization for repeated solves
+   QRFactorization - Economic QR factorization with solves and updates
 
 .. seealso::
 
@@ -130,6 +136,8 @@ Matrix Equation Solvers
    solve_discrete_are - Solve the discrete-time algebraic Riccati equation
    solve_continuous_lyapunov - Solve the continous-time Lyapunov equation
    solve_discrete_lyapunov - Solve the discrete-time Lyapunov equation
+   solve_continuous_lyapunov_lowrank - Low-rank Lyapunov equation solver
+   solve_continuous_are_lowrank - Low-rank Riccati equation solver
 
 
 Sketches and Random Projections
@@ -139,6 +147,9 @@ Sketches and Random Projections
    :toctree: generated/
 
    clarkson_woodruff_transform - Applies the Clarkson Woodruff Sketch (a.k.a CountMin Sketch)
+   CountSketch - Streaming Clarkson Woodruff sketch
+   GaussianSketch - Streaming Gaussian sketch
+   SRHTSketch - Streaming subsampled randomized Hadamard transform
 
 Special Matrices
 ================
@@ -205,6 +216,7 @@ from .special_matrices import *
 from ._solvers import *
 from ._procrustes import *
 from ._decomp_update import *
+from ._factorizations import *
 from ._sketches import *
 
 __all__ = [s for s in dir() if not s.startswith('_')]
@@ -0,0 +1,612 @@
+"""
+Stacked (batched) versions of the basic linear algebra functions.
+
+The functions of `scipy.linalg` that accept stacks of matrices, i.e. arrays
+of shape ``(..., M, N)``, call the functions in this module for inputs with
+more than two dimensions.  The whole stack is handed to a compiled loop over
+the LAPACK drivers (see ``_batched_lapack.pyx``), which queries the size of
+the workspace once and runs without the GIL, so that the stack can be split
+over several threads.
+"""
+
+from __future__ import division, print_function, absolute_import
+
+import multiprocessing
+import threading
+from warnings import warn
+
+import numpy as np
+from scipy.fftpack import next_fast_len
+
+from .misc import LinAlgError, LinAlgWarning
+from .blas import find_best_blas_type
+from . import _batched_lapack
+from ._solve_toeplitz import levinson_stack
+
+
+def _validate_workers(workers):
+    workers = int(workers)
+    if workers == -1:
+        workers = multiprocessing.cpu_count()
+    elif workers <= 0:
+        raise ValueError("workers must be a positive integer or -1")
+    return workers
+
+
+def _map_stack(func, n, workers, *args):
+    """
+    Call ``func(*args, start, stop)`` for ranges covering the `n` matrices
+    of a stack, distributed over `workers` threads.
+    """
+    workers = min(_validate_workers(workers), n)
+    if workers <= 1:
+        func(*(args + (0, n)))
+        return
+
+    bounds = np.linspace(0, n, workers + 1).astype(np.intp)
+    errors = []
+
+    def worker(i):
+        try:
+            func(*(args + (bounds[i], bounds[i+1])))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,))
+               for i in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise errors[0]
+
+
+def _broadcast_shapes(*shapes):
+    return np.broadcast(*[np.broadcast_to(0, s) for s in shapes]).shape
+
+
+def _lapack_dtype(*arrays):
+    prefix, dtype, prefer_fortran = find_best_blas_type(arrays)
+    return dtype
+
+
+def _to_stack(a, batch_shape, dtype):
+    """
+    Copy of `a` broadcast to `batch_shape`, as a C-contiguous array of
+    shape ``(K, N, M)`` holding the Fortran-ordered matrices.
+    """
+    a = np.broadcast_to(a, batch_shape + a.shape[-2:])
+    m, n = a.shape[-2:]
+    k = int(np.prod(batch_shape, dtype=np.intp))
+    out = np.empty((k, n, m), dtype=dtype)
+    out.reshape(batch_shape + (n, m))[...] = np.swapaxes(a, -1, -2)
+    return out
+
+
+def _from_stack(x, batch_shape):
+    """Inverse of `_to_stack`, without copying."""
+    return np.swapaxes(x, -1, -2).reshape(batch_shape + x.shape[:0:-1])
+
+
+def _real_dtype(dtype):
+    return np.zeros(0, dtype=dtype).real.dtype
+
+
+def _check_square(a):
+    if a.shape[-1] != a.shape[-2]:
+        raise ValueError('expected stack of square matrices, but got '
+                         'shape=%s' % (a.shape,))
+
+
+def _stack_index(i, batch_shape):
+    return tuple(int(j) for j in np.unravel_index(i, batch_shape))
+
+
+def _check_info(info, batch_shape, message):
+    """Raise LinAlgError with `message` for the first failed matrix."""
+    _check_illegal(info)
+    failed = np.flatnonzero(info > 0)
+    if len(failed):
+        index = _stack_index(failed[0], batch_shape)
+        raise LinAlgError(message % {'index': index,
+                                     'info': info[failed[0]]})
+
+
+def _check_illegal(info):
+    if np.any(info < 0):
+        raise ValueError('LAPACK reported an illegal value in %d-th argument'
+                         % -info.min())
+
+
+def solve(a, b, assume_a='gen', lower=False, transposed=False, workers=1):
+    """Stacked version of `scipy.linalg.solve`."""
+    _check_square(a)
+    n = a.shape[-1]
+    b_is_1D = b.ndim == 1 or b.ndim == a.ndim - 1
+    if b_is_1D:
+        b = b[..., np.newaxis]
+    if b.ndim < 2 or b.shape[-2] != n:
+        raise ValueError('Input b has to have same number of rows as '
+                         'input a')
+    if transposed:
+        if np.iscomplexobj(a):
+            raise NotImplementedError('scipy.linalg.solve can currently '
+                                      'not solve a^T x = b or a^H x = b '
+                                      'for complex matrices.')
+        a = np.swapaxes(a, -1, -2)
+        lower = not lower
+
+    batch_shape = _broadcast_shapes(a.shape[:-2], b.shape[:-2])
+    dtype = _lapack_dtype(a, b)
+    a1 = _to_stack(a, batch_shape, dtype)
+    b1 = _to_stack(b, batch_shape, dtype)
+    k = a1.shape[0]
+    info = np.zeros(k, dtype=np.intc)
+
+    if a1.size and b1.size:
+        if assume_a == 'gen':
+            piv = np.empty((k, n), dtype=np.intc)
+            _map_stack(_batched_lapack.gesv, k, workers, a1, b1, piv, info)
+        elif assume_a == 'pos':
+            _map_stack(_batched_lapack.posv, k, workers, a1, b1, lower, info)
+        else:
+            piv = np.empty((k, n), dtype=np.intc)
+            _map_stack(_batched_lapack.sysv, k, workers, a1, b1, piv, lower,
+                       assume_a == 'her', info)
+        _check_info(info, batch_shape, 'Matrix %(index)s is singular.')
+
+    x = _from_stack(b1, batch_shape)
+    if b_is_1D:
+        x = x[..., 0]
+    return x
+
+
+def inv(a, workers=1):
+    """Stacked version of `scipy.linalg.inv`."""
+    _check_square(a)
+    batch_shape = a.shape[:-2]
+    a1 = _to_stack(a, batch_shape, _lapack_dtype(a))
+    k, n = a1.shape[:2]
+    info = np.zeros(k, dtype=np.intc)
+    if a1.size:
+        piv = np.empty((k, n), dtype=np.intc)
+        _map_stack(_batched_lapack.getri, k, workers, a1, piv, info)
+        _check_info(info, batch_shape, 'Matrix %(index)s is singular.')
+    return _from_stack(a1, batch_shape)
+
+
+def lu_factor(a, workers=1):
+    """Stacked version of `scipy.linalg.lu_factor`."""
+    _check_square(a)
+    batch_shape = a.shape[:-2]
+    a1 = _to_stack(a, batch_shape, _lapack_dtype(a))
+    k, n = a1.shape[:2]
+    info = np.zeros(k, dtype=np.intc)
+    piv = np.empty((k, n), dtype=np.intc)
+    if a1.size:
+        _map_stack(_batched_lapack.getrf, k, workers, a1, piv, info)
+        _check_illegal(info)
+        singular = np.flatnonzero(info > 0)
+        if len(singular):
+            warn("Diagonal number %d of matrix %s is exactly zero. "
+                 "Singular matrix." % (info[singular[0]],
+                                       _stack_index(singular[0],
+                                                    batch_shape)),
+                 LinAlgWarning, stacklevel=3)
+    # pivots in Python convention, as returned by the f2py getrf
+    piv -= 1
+    return _from_stack(a1, batch_shape), piv.reshape(batch_shape + (n,))
+
+
+def det(a, workers=1):
+    """Stacked version of `scipy.linalg.det`."""
+    _check_square(a)
+    batch_shape = a.shape[:-2]
+    a1 = _to_stack(a, batch_shape, _lapack_dtype(a))
+    k, n = a1.shape[:2]
+    info = np.zeros(k, dtype=np.intc)
+    piv = np.empty((k, n), dtype=np.intc)
+    if a1.size:
+        # singular matrices (info > 0) simply have a zero on the diagonal
+        _map_stack(_batched_lapack.getrf, k, workers, a1, piv, info)
+    d = np.prod(np.diagonal(a1, axis1=1, axis2=2), axis=-1)
+    swaps = np.count_nonzero(piv != np.arange(1, n + 1), axis=-1)
+    d[swaps % 2 == 1] *= -1
+    return d.reshape(batch_shape)
+
+
+def cholesky(a, lower=False, workers=1):
+    """Stacked version of `scipy.linalg.cholesky`."""
+    _check_square(a)
+    batch_shape = a.shape[:-2]
+    a1 = _to_stack(a, batch_shape, _lapack_dtype(a))
+    k = a1.shape[0]
+    info = np.zeros(k, dtype=np.intc)
+    if a1.size:
+        _map_stack(_batched_lapack.potrf, k, workers, a1, lower, info)
+        _check_info(info, batch_shape,
+                    "%(info)d-th leading minor of the array %(index)s is "
+                    "not positive definite")
+    c = _from_stack(a1, batch_shape)
+    # clean the unused triangle, as potrf(..., clean=True)
+    return np.tril(c) if lower else np.triu(c)
+
+
+def eigh(a, lower=True, eigvals_only=False, workers=1):
+    """Stacked version of `scipy.linalg.eigh` for standard problems."""
+    _check_square(a)
+    batch_shape = a.shape[:-2]
+    dtype = _lapack_dtype(a)
+    a1 = _to_stack(a, batch_shape, dtype)
+    k, n = a1.shape[:2]
+    w = np.empty((k, n), dtype=_real_dtype(dtype))
+    info = np.zeros(k, dtype=np.intc)
+    if a1.size:
+        _map_stack(_batched_lapack.syevd, k, workers, a1, w,
+                   not eigvals_only, lower, info)
+        _check_info(info, batch_shape,
+                    "the eigenvalue computation of matrix %(index)s did not "
+                    "converge")
+    w = w.reshape(batch_shape + (n,))
+    if eigvals_only:
+        return w
+    return w, _from_stack(a1, batch_shape)
+
+
+def svd(a, full_matrices=True, compute_uv=True, workers=1):
+    """Stacked version of `scipy.linalg.svd` with the gesdd driver."""
+    batch_shape = a.shape[:-2]
+    dtype = _lapack_dtype(a)
+    a1 = _to_stack(a, batch_shape, dtype)
+    k, n, m = a1.shape
+    p = min(m, n)
+    s = np.empty((k, p), dtype=_real_dtype(dtype))
+    if not compute_uv:
+        u = vt = np.empty((k, 1, 1), dtype=dtype)
+    elif full_matrices:
+        u = np.empty((k, m, m), dtype=dtype)
+        vt = np.empty((k, n, n), dtype=dtype)
+    else:
+        u = np.empty((k, p, m), dtype=dtype)
+        vt = np.empty((k, n, p), dtype=dtype)
+    info = np.zeros(k, dtype=np.intc)
+
+    if a1.size:
+        _map_stack(_batched_lapack.gesdd, k, workers, a1, s, u, vt,
+                   compute_uv, full_matrices, info)
+        _check_info(info, batch_shape, "SVD of matrix %(index)s did not "
+                                       "converge")
+    elif compute_uv and full_matrices:
+        # singular vectors of empty matrices
+        u[...] = np.eye(m)
+        vt[...] = np.eye(n)
+
+    s = s.reshape(batch_shape + (p,))
+    if not compute_uv:
+        return s
+    return _from_stack(u, batch_shape), s, _from_stack(vt, batch_shape)
+
+
+def lstsq(a, b, cond=None, workers=1):
+    """Stacked version of `scipy.linalg.lstsq` with the gelsd driver."""
+    m, n = a.shape[-2:]
+    b_is_1D = b.ndim == 1 or b.ndim == a.ndim - 1
+    if b_is_1D:
+        b = b[..., np.newaxis]
+    if b.ndim < 2 or b.shape[-2] != m:
+        raise ValueError('incompatible dimensions')
+    nrhs = b.shape[-1]
+
+    batch_shape = _broadcast_shapes(a.shape[:-2], b.shape[:-2])
+    dtype = _lapack_dtype(a, b)
+    a1 = _to_stack(a, batch_shape, dtype)
+    k = a1.shape[0]
+
+    # b holds the solution on exit, and needs max(M, N) rows
+    b1 = np.zeros((k, nrhs, max(m, n, 1)), dtype=dtype)
+    b1.reshape(batch_shape + b1.shape[1:])[..., :m] = np.swapaxes(b, -1, -2)
+
+    s = np.zeros((k, min(m, n)), dtype=_real_dtype(dtype))
+    rank = np.zeros(k, dtype=np.intc)
+    info = np.zeros(k, dtype=np.intc)
+    if cond is None:
+        cond = np.finfo(dtype).eps
+
+    if a1.size and b1.size:
+        _map_stack(_batched_lapack.gelsd, k, workers, a1, b1, s, cond, rank,
+                   info)
+        _check_info(info, batch_shape, "SVD of matrix %(index)s did not "
+                                       "converge in Linear Least Squares")
+
+    x = _from_stack(b1, batch_shape)
+    if m > n:
+        # residues are only defined for full rank matrices
+        resids = np.sum(abs(x[..., n:, :])**2, axis=-2)
+        resids[(rank < n).reshape(batch_shape)] = np.nan
+    else:
+        resids = np.empty(batch_shape + (0,), dtype=_real_dtype(dtype))
+    x = x[..., :n, :]
+    if b_is_1D:
+        x = x[..., 0]
+        if m > n:
+            resids = resids[..., 0]
+    return (x, resids, rank.reshape(batch_shape).astype(int),
+            s.reshape(batch_shape + (min(m, n),)))
+
+
+def solve_sylvester(a, b, q, workers=1):
+    """Stacked version of `scipy.linalg.solve_sylvester`."""
+    _check_square(a)
+    _check_square(b)
+    m, n = a.shape[-1], b.shape[-1]
+    if q.shape[-2:] != (m, n):
+        raise ValueError('Matrix q should have shape (..., %d, %d), but got '
+                         'shape=%s' % (m, n, q.shape))
+    batch_shape = _broadcast_shapes(a.shape[:-2], b.shape[:-2], q.shape[:-2])
+    dtype = _lapack_dtype(a, b, q)
+    a1 = _to_stack(a, batch_shape, dtype)
+    b1 = _to_stack(b, batch_shape, dtype)
+    q1 = _to_stack(q, batch_shape, dtype)
+    _trsyl(a1, b1, q1, False, batch_shape, workers)
+    return _from_stack(q1, batch_shape)
+
+
+def solve_continuous_lyapunov(a, q, workers=1):
+    """Stacked version of `scipy.linalg.solve_continuous_lyapunov`."""
+    _check_square(a)
+    if q.shape[-2:] != a.shape[-2:]:
+        raise ValueError("Matrix a and q should have the same shape.")
+    batch_shape = _broadcast_shapes(a.shape[:-2], q.shape[:-2])
+    dtype = _lapack_dtype(a, q)
+    a1 = _to_stack(a, batch_shape, dtype)
+    q1 = _to_stack(q, batch_shape, dtype)
+    _trsyl(a1, a1, q1, True, batch_shape, workers)
+    return _from_stack(q1, batch_shape)
+
+
+def _trsyl(a, b, q, lyapunov, batch_shape, workers):
+    k = q.shape[0]
+    info = np.zeros(k, dtype=np.intc)
+    if q.size:
+        _map_stack(_batched_lapack.trsyl, k, workers, a, b, q, lyapunov,
+                   info)
+        _check_info(np.where(info == 2, 0, info), batch_shape,
+                    'Schur decomposition of matrix %(index)s did not '
+                    'converge.')
+        close = np.flatnonzero(info == 2)
+        if len(close):
+            warn('The matrices %s have eigenvalues whose sum is very close '
+                 'to or exactly zero. The solution is obtained via '
+                 'perturbing the coefficients.'
+                 % (_stack_index(close[0], batch_shape),), RuntimeWarning,
+                 stacklevel=4)
+
+
+def solve_continuous_are(a, b, q, r, s=None, workers=1):
+    """
+    Stacked version of `scipy.linalg.solve_continuous_are`, with the
+    Newton iteration for the sign function of the Hamiltonian matrices.
+    """
+    _check_square(a)
+    _check_square(q)
+    _check_square(r)
+    n, m = b.shape[-2:]
+    if a.shape[-1] != n or q.shape[-1] != n:
+        raise ValueError("Matrix a, b and q should have the same number of "
+                         "rows.")
+    if r.shape[-1] != m:
+        raise ValueError("Matrix b and r should have the same number of "
+                         "cols.")
+    if s is not None and s.shape[-2:] != b.shape[-2:]:
+        raise ValueError("Matrix b and s should have the same shape.")
+    shapes = [x.shape[:-2] for x in (a, b, q, r)]
+    if s is not None:
+        shapes.append(s.shape[:-2])
+    batch_shape = _broadcast_shapes(*shapes)
+    b = np.broadcast_to(b, batch_shape + (n, m))
+
+    # The Hamiltonian matrix is  [[f, -b r^-1 b^H], [-g, -f^H]]  with
+    # f = a - b r^-1 s^H  and  g = q - s r^-1 s^H
+    bs = b if s is None else np.concatenate(np.broadcast_arrays(b, s), -2)
+    rbs = solve(r, np.swapaxes(bs, -1, -2).conj(), workers=workers)
+    dtype = _lapack_dtype(a, b, q, r, rbs)
+    h = np.empty(batch_shape + (2*n, 2*n), dtype=dtype)
+    h[..., :n, :n] = a
+    h[..., :n, n:] = -np.matmul(b, rbs[..., :n])
+    h[..., n:, :n] = -q
+    if s is not None:
+        h[..., :n, :n] -= np.matmul(b, rbs[..., n:])
+        h[..., n:, :n] += np.matmul(s, rbs[..., n:])
+    h[..., n:, n:] = -np.swapaxes(h[..., :n, :n], -1, -2).conj()
+
+    w = _sign(h, workers)
+
+    # The stable invariant subspace [u1; u2] of h is the null space of w + I,
+    # and x = u2 u1^-1 solves [w12; w22 + I] x = -[w11 + I; w21]
+    eye = np.eye(n)
+    lhs = np.concatenate((w[..., :n, n:], w[..., n:, n:] + eye), -2)
+    rhs = -np.concatenate((w[..., :n, :n] + eye, w[..., n:, :n]), -2)
+    x, _, rank, _ = lstsq(lhs, rhs, workers=workers)
+    if np.any(rank < n):
+        index = _stack_index(np.flatnonzero(rank.ravel() < n)[0],
+                             batch_shape)
+        raise LinAlgError('Failed to find a finite solution for matrix %s.'
+                          % (index,))
+    return (x + np.swapaxes(x, -1, -2).conj()) / 2
+
+
+def _sign(h, workers, maxiter=100):
+    """
+    Sign function of a stack of matrices, by the scaled Newton iteration
+    ``z = (c z + z^-1 / c) / 2``.  The scaling is switched off once the
+    iterates are close, to keep the quadratic convergence, and the iteration
+    stops when the updates stop decreasing.
+    """
+    n = h.shape[-1]
+    tol = 10 * n * np.finfo(h.dtype).eps
+    z = h
+    scale = True
+    delta_old = np.inf
+    for it in range(maxiter):
+        zinv = inv(z, workers=workers)
+        if scale:
+            c = np.sqrt(np.linalg.norm(zinv, axis=(-2, -1)) /
+                        np.linalg.norm(z, axis=(-2, -1)))[..., None, None]
+            z_new = (c * z + zinv / c) / 2
+        else:
+            z_new = (z + zinv) / 2
+        delta = np.max(np.linalg.norm(z_new - z, 1, axis=(-2, -1)) /
+                       np.linalg.norm(z_new, 1, axis=(-2, -1)))
+        z = z_new
+        if delta <= tol or (not scale and delta > delta_old / 2):
+            return z
+        if delta < 1e-2:
+            scale = False
+        delta_old = delta
+    raise LinAlgError('The sign function iteration did not converge; the '
+                      'Hamiltonian matrices may have eigenvalues on or close '
+                      'to the imaginary axis.')
+
+
+def solve_toeplitz(c, r, b, method='levinson', workers=1):
+    """Stacked version of `scipy.linalg.solve_toeplitz`."""
+    n = c.shape[-1]
+    if n == 0 or r.shape[-1] != n:
+        raise ValueError('incompatible dimensions')
+    b_is_1D = b.ndim == max(c.ndim, r.ndim)
+    if b_is_1D:
+        b = b[..., np.newaxis]
+    if b.ndim < 2 or b.shape[-2] != n:
+        raise ValueError('incompatible dimensions')
+
+    batch_shape = _broadcast_shapes(c.shape[:-1], r.shape[:-1], b.shape[:-2])
+    if any(np.iscomplexobj(x) for x in (c, r, b)):
+        dtype = np.complex128
+    else:
+        dtype = np.float64
+    vals = _toeplitz_vals(c, r, batch_shape, dtype)
+    b1 = _to_stack(b, batch_shape, dtype)
+    x1, info = _solve_toeplitz(vals, b1, method, workers)
+    _check_info(info, batch_shape,
+                'Singular principal minor in Toeplitz matrix %(index)s.')
+
+    x = _from_stack(x1, batch_shape)
+    if b_is_1D:
+        x = x[..., 0]
+    return x
+
+
+def _toeplitz_vals(c, r, batch_shape, dtype):
+    """
+    Stack of shape ``(K, 2*N - 1)`` of the reversed ``r[..., 1:]`` followed
+    by `c`, the layout used by `levinson`.
+    """
+    n = c.shape[-1]
+    k = int(np.prod(batch_shape, dtype=np.intp))
+    vals = np.empty((k, 2*n - 1), dtype=dtype)
+    v = vals.reshape(batch_shape + (2*n - 1,))
+    v[..., :n-1] = r[..., :0:-1]
+    v[..., n-1:] = c
+    return vals
+
+
+def _solve_toeplitz(vals, b, method, workers):
+    """
+    Solve the Toeplitz systems given by the rows of `vals` (see
+    `_toeplitz_vals`) for the right-hand sides ``b[i]``, a stack of shape
+    ``(K, NRHS, N)``.  Returns the solution, of the same shape as `b`, and
+    the ``info`` of each system.
+    """
+    k = b.shape[0]
+    x = np.zeros_like(b)
+    info = np.zeros(k, dtype=np.intc)
+    if b.size:
+        if method == 'levinson':
+            _map_stack(levinson_stack, k, workers, vals, b, x, info)
+        else:
+            x = _toeplitz_pcg(vals, b)
+    return x, info
+
+
+def _toeplitz_pcg(vals, b):
+    """
+    Conjugate gradients for a stack of Hermitian positive definite Toeplitz
+    systems, preconditioned with the circulant approximations of T. Chan.
+
+    The products with the Toeplitz matrices embed them into circulant
+    matrices, and both the products and the preconditioners are applied with
+    FFTs, in O(N log N) operations per iteration.  All the systems are
+    iterated together, and those that converged are frozen.
+    """
+    k, nrhs, n = b.shape
+    c = vals[:, n-1:]
+    rrev = vals[:, :n-1]
+    if np.any(c[:, 0].imag != 0) or np.any(rrev != c[:, :0:-1].conj()):
+        raise ValueError("method='cg' requires Hermitian Toeplitz matrices")
+
+    real = not np.iscomplexobj(vals)
+    if real:
+        fft, ifft = np.fft.rfft, np.fft.irfft
+    else:
+        fft, ifft = np.fft.fft, np.fft.ifft
+
+    # T x is the leading part of the product with the circulant matrix whose
+    # first column is [c, 0, ..., 0, r[n-1], ..., r[1]].
+    nfft = next_fast_len(2*n - 1)
+    col = np.zeros((k, nfft), dtype=vals.dtype)
+    col[:, :n] = c
+    col[:, nfft-n+1:] = rrev
+    tf = fft(col)[:, np.newaxis, :]
+
+    # The optimal circulant preconditioner is the circulant matrix with
+    # first column ((n - j) c[j] + j r[n - j]) / n.  It is positive definite
+    # if T is.
+    j = np.arange(1, n)
+    circ = c.copy()
+    circ[:, 1:] = ((n - j)*c[:, 1:] + j*rrev) / n
+    eig = np.fft.fft(circ).real
+    if np.any(eig <= 0):
+        raise LinAlgError('Toeplitz matrix is not positive definite.')
+    if real:
+        eig = eig[:, :n//2 + 1]
+    eig = eig[:, np.newaxis, :]
+
+    def matvec(p):
+        return ifft(tf * fft(p, nfft), nfft)[..., :n]
+
+    def psolve(r):
+        return ifft(fft(r) / eig, n)
+
+    def dot(p, q):
+        return np.sum(p.conj() * q, axis=-1, keepdims=True).real
+
+    tol = 10 * np.sqrt(n) * np.finfo(b.dtype).eps
+    bnorm = np.sqrt(dot(b, b))
+    x = np.zeros_like(b)
+    res = b.copy()
+    z = psolve(res)
+    p = z
+    rz = dot(res, z)
+    active = bnorm > 0
+    for _ in range(2*n):
+        if not active.any():
+            break
+        q = matvec(p)
+        pq = dot(p, q)
+        if np.any(pq[active] <= 0):
+            raise LinAlgError('Toeplitz matrix is not positive definite.')
+        alpha = np.where(active, rz / np.where(active, pq, 1), 0)
+        x += alpha * p
+        res -= alpha * q
+        z = psolve(res)
+        rz_new = dot(res, z)
+        beta = np.where(active, rz_new / np.where(rz > 0, rz, 1), 0)
+        p = z + beta * p
+        rz = rz_new
+        active = np.sqrt(dot(res, res)) > tol * bnorm
+    if active.any():
+        warn('Conjugate gradients for the Toeplitz systems did not converge '
+             'to the working precision.', LinAlgWarning, stacklevel=4)
+    return x
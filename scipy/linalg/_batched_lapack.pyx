@@ -0,0 +1,612 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+LAPACK drivers looping over stacks of matrices.
+
+Each function factors or solves the matrices ``start:stop`` of a stack,
+which is a C-contiguous array of shape ``(K, N, M)`` holding ``K`` matrices
+of shape ``(M, N)`` in Fortran order.  The workspace is queried and
+allocated once for the whole range, and the loop runs without the GIL, so
+that `scipy.linalg._batched` can split a stack over several threads.
+
+The LAPACK ``info`` of each matrix is stored in `info`; the callers turn it
+into exceptions.
+"""
+
+from __future__ import absolute_import
+
+cimport numpy as cnp
+from libc.stdlib cimport malloc, free
+
+from . cimport cython_blas as blas
+from . cimport cython_lapack as lapack
+
+cnp.import_array()
+
+
+ctypedef float complex float_complex
+ctypedef double complex double_complex
+
+ctypedef fused lapack_t:
+    float
+    double
+    float_complex
+    double_complex
+
+
+cdef inline int _lwork(lapack_t query) nogil:
+    # Workspace size returned by a LAPACK query
+    if lapack_t is float or lapack_t is double:
+        return <int>query
+    else:
+        return <int>query.real
+
+
+cdef inline char* _real_data(cnp.ndarray x):
+    return <char*>cnp.PyArray_DATA(x)
+
+
+cdef inline Py_ssize_t _real_stride(cnp.ndarray x):
+    return cnp.PyArray_STRIDES(x)[0]
+
+
+cdef inline void _gesv_one(int n, int nrhs, lapack_t *a, int *piv,
+                           lapack_t *b, int *info) nogil:
+    cdef int ld = max(n, 1)
+    if lapack_t is float:
+        lapack.sgesv(&n, &nrhs, a, &ld, piv, b, &ld, info)
+    elif lapack_t is double:
+        lapack.dgesv(&n, &nrhs, a, &ld, piv, b, &ld, info)
+    elif lapack_t is float_complex:
+        lapack.cgesv(&n, &nrhs, a, &ld, piv, b, &ld, info)
+    else:
+        lapack.zgesv(&n, &nrhs, a, &ld, piv, b, &ld, info)
+
+
+cdef inline void _posv_one(char *uplo, int n, int nrhs, lapack_t *a,
+                           lapack_t *b, int *info) nogil:
+    cdef int ld = max(n, 1)
+    if lapack_t is float:
+        lapack.sposv(uplo, &n, &nrhs, a, &ld, b, &ld, info)
+    elif lapack_t is double:
+        lapack.dposv(uplo, &n, &nrhs, a, &ld, b, &ld, info)
+    elif lapack_t is float_complex:
+        lapack.cposv(uplo, &n, &nrhs, a, &ld, b, &ld, info)
+    else:
+        lapack.zposv(uplo, &n, &nrhs, a, &ld, b, &ld, info)
+
+
+cdef inline void _sysv_one(bint hermitian, char *uplo, int n, int nrhs,
+                           lapack_t *a, int *piv, lapack_t *b,
+                           lapack_t *work, int lwork, int *info) nogil:
+    cdef int ld = max(n, 1)
+    if lapack_t is float:
+        lapack.ssysv(uplo, &n, &nrhs, a, &ld, piv, b, &ld, work, &lwork, info)
+    elif lapack_t is double:
+        lapack.dsysv(uplo, &n, &nrhs, a, &ld, piv, b, &ld, work, &lwork, info)
+    elif lapack_t is float_complex:
+        if hermitian:
+            lapack.chesv(uplo, &n, &nrhs, a, &ld, piv, b, &ld, work, &lwork,
+                         info)
+        else:
+            lapack.csysv(uplo, &n, &nrhs, a, &ld, piv, b, &ld, work, &lwork,
+                         info)
+    else:
+        if hermitian:
+            lapack.zhesv(uplo, &n, &nrhs, a, &ld, piv, b, &ld, work, &lwork,
+                         info)
+        else:
+            lapack.zsysv(uplo, &n, &nrhs, a, &ld, piv, b, &ld, work, &lwork,
+                         info)
+
+
+cdef inline void _getrf_one(int m, int n, lapack_t *a, int *piv,
+                            int *info) nogil:
+    cdef int lda = max(m, 1)
+    if lapack_t is float:
+        lapack.sgetrf(&m, &n, a, &lda, piv, info)
+    elif lapack_t is double:
+        lapack.dgetrf(&m, &n, a, &lda, piv, info)
+    elif lapack_t is float_complex:
+        lapack.cgetrf(&m, &n, a, &lda, piv, info)
+    else:
+        lapack.zgetrf(&m, &n, a, &lda, piv, info)
+
+
+cdef inline void _getri_one(int n, lapack_t *a, int *piv, lapack_t *work,
+                            int lwork, int *info) nogil:
+    cdef int lda = max(n, 1)
+    if lapack_t is float:
+        lapack.sgetri(&n, a, &lda, piv, work, &lwork, info)
+    elif lapack_t is double:
+        lapack.dgetri(&n, a, &lda, piv, work, &lwork, info)
+    elif lapack_t is float_complex:
+        lapack.cgetri(&n, a, &lda, piv, work, &lwork, info)
+    else:
+        lapack.zgetri(&n, a, &lda, piv, work, &lwork, info)
+
+
+cdef inline void _potrf_one(char *uplo, int n, lapack_t *a, int *info) nogil:
+    cdef int lda = max(n, 1)
+    if lapack_t is float:
+        lapack.spotrf(uplo, &n, a, &lda, info)
+    elif lapack_t is double:
+        lapack.dpotrf(uplo, &n, a, &lda, info)
+    elif lapack_t is float_complex:
+        lapack.cpotrf(uplo, &n, a, &lda, info)
+    else:
+        lapack.zpotrf(uplo, &n, a, &lda, info)
+
+
+cdef inline void _syevd_one(char *jobz, char *uplo, int n, lapack_t *a,
+                            char *w, lapack_t *work, int lwork, char *rwork,
+                            int lrwork, int *iwork, int liwork,
+                            int *info) nogil:
+    cdef int lda = max(n, 1)
+    if lapack_t is float:
+        lapack.ssyevd(jobz, uplo, &n, a, &lda, <float*>w, work, &lwork,
+                      iwork, &liwork, info)
+    elif lapack_t is double:
+        lapack.dsyevd(jobz, uplo, &n, a, &lda, <double*>w, work, &lwork,
+                      iwork, &liwork, info)
+    elif lapack_t is float_complex:
+        lapack.cheevd(jobz, uplo, &n, a, &lda, <float*>w, work, &lwork,
+                      <float*>rwork, &lrwork, iwork, &liwork, info)
+    else:
+        lapack.zheevd(jobz, uplo, &n, a, &lda, <double*>w, work, &lwork,
+                      <double*>rwork, &lrwork, iwork, &liwork, info)
+
+
+cdef inline void _gesdd_one(char *jobz, int m, int n, lapack_t *a, char *s,
+                            lapack_t *u, int ldu, lapack_t *vt, int ldvt,
+                            lapack_t *work, int lwork, char *rwork,
+                            int *iwork, int *info) nogil:
+    cdef int lda = max(m, 1)
+    if lapack_t is float:
+        lapack.sgesdd(jobz, &m, &n, a, &lda, <float*>s, u, &ldu, vt, &ldvt,
+                      work, &lwork, iwork, info)
+    elif lapack_t is double:
+        lapack.dgesdd(jobz, &m, &n, a, &lda, <double*>s, u, &ldu, vt, &ldvt,
+                      work, &lwork, iwork, info)
+    elif lapack_t is float_complex:
+        lapack.cgesdd(jobz, &m, &n, a, &lda, <float*>s, u, &ldu, vt, &ldvt,
+                      work, &lwork, <float*>rwork, iwork, info)
+    else:
+        lapack.zgesdd(jobz, &m, &n, a, &lda, <double*>s, u, &ldu, vt, &ldvt,
+                      work, &lwork, <double*>rwork, iwork, info)
+
+
+cdef inline void _gelsd_one(int m, int n, int nrhs, lapack_t *a, lapack_t *b,
+                            int ldb, char *s, double rcond, int *rank,
+                            lapack_t *work, int lwork, char *rwork,
+                            int *iwork, int *info) nogil:
+    cdef int lda = max(m, 1)
+    cdef float rcond_s = <float>rcond
+    if lapack_t is float:
+        lapack.sgelsd(&m, &n, &nrhs, a, &lda, b, &ldb, <float*>s, &rcond_s,
+                      rank, work, &lwork, iwork, info)
+    elif lapack_t is double:
+        lapack.dgelsd(&m, &n, &nrhs, a, &lda, b, &ldb, <double*>s, &rcond,
+                      rank, work, &lwork, iwork, info)
+    elif lapack_t is float_complex:
+        lapack.cgelsd(&m, &n, &nrhs, a, &lda, b, &ldb, <float*>s, &rcond_s,
+                      rank, work, &lwork, <float*>rwork, iwork, info)
+    else:
+        lapack.zgelsd(&m, &n, &nrhs, a, &lda, b, &ldb, <double*>s, &rcond,
+                      rank, work, &lwork, <double*>rwork, iwork, info)
+
+
+cdef inline void _gees_one(int n, lapack_t *a, lapack_t *vs, lapack_t *w,
+                           lapack_t *work, int lwork, char *rwork,
+                           int *info) nogil:
+    # Schur decomposition, real for real `a`; `w` holds 2*n entries
+    cdef int lda = max(n, 1), sdim = 0
+    cdef bint bwork = 0
+    cdef char *jobvs = 'V'
+    cdef char *sort = 'N'
+    if lapack_t is float:
+        lapack.sgees(jobvs, sort, NULL, &n, a, &lda, &sdim, w, w + n, vs,
+                     &lda, work, &lwork, &bwork, info)
+    elif lapack_t is double:
+        lapack.dgees(jobvs, sort, NULL, &n, a, &lda, &sdim, w, w + n, vs,
+                     &lda, work, &lwork, &bwork, info)
+    elif lapack_t is float_complex:
+        lapack.cgees(jobvs, sort, NULL, &n, a, &lda, &sdim, w, vs, &lda,
+                     work, &lwork, <float*>rwork, &bwork, info)
+    else:
+        lapack.zgees(jobvs, sort, NULL, &n, a, &lda, &sdim, w, vs, &lda,
+                     work, &lwork, <double*>rwork, &bwork, info)
+
+
+cdef inline void _gemm_one(char *transa, char *transb, int m, int n, int k,
+                           lapack_t *a, lapack_t *b, lapack_t *c) nogil:
+    # c = op(a) op(b), for matrices stored without padding
+    cdef lapack_t one = 1, zero = 0
+    cdef int lda = max(m if transa[0] == b'N' else k, 1)
+    cdef int ldb = max(k if transb[0] == b'N' else n, 1)
+    cdef int ldc = max(m, 1)
+    if lapack_t is float:
+        blas.sgemm(transa, transb, &m, &n, &k, &one, a, &lda, b, &ldb,
+                   &zero, c, &ldc)
+    elif lapack_t is double:
+        blas.dgemm(transa, transb, &m, &n, &k, &one, a, &lda, b, &ldb,
+                   &zero, c, &ldc)
+    elif lapack_t is float_complex:
+        blas.cgemm(transa, transb, &m, &n, &k, &one, a, &lda, b, &ldb,
+                   &zero, c, &ldc)
+    else:
+        blas.zgemm(transa, transb, &m, &n, &k, &one, a, &lda, b, &ldb,
+                   &zero, c, &ldc)
+
+
+cdef inline void _trsyl_one(char *tranb, int m, int n, lapack_t *a,
+                            lapack_t *b, lapack_t *c, int *info) nogil:
+    # Overwrite c with the solution of  a x + op(b) x = c,  for
+    # quasi-triangular a and b
+    cdef char *trana = 'N'
+    cdef int isgn = 1, lda = max(m, 1), ldb = max(n, 1)
+    cdef float sscale = 1
+    cdef double scale = 1
+    cdef Py_ssize_t j
+    if lapack_t is float:
+        lapack.strsyl(trana, tranb, &isgn, &m, &n, a, &lda, b, &ldb, c, &lda,
+                      &sscale, info)
+        scale = sscale
+    elif lapack_t is double:
+        lapack.dtrsyl(trana, tranb, &isgn, &m, &n, a, &lda, b, &ldb, c, &lda,
+                      &scale, info)
+    elif lapack_t is float_complex:
+        lapack.ctrsyl(trana, tranb, &isgn, &m, &n, a, &lda, b, &ldb, c, &lda,
+                      &sscale, info)
+        scale = sscale
+    else:
+        lapack.ztrsyl(trana, tranb, &isgn, &m, &n, a, &lda, b, &ldb, c, &lda,
+                      &scale, info)
+    if scale != 1:
+        for j in range(<Py_ssize_t>m * n):
+            c[j] = c[j] / scale
+
+
+def gesv(lapack_t[:, :, ::1] a, lapack_t[:, :, ::1] b, int[:, ::1] piv,
+         int[::1] info, Py_ssize_t start, Py_ssize_t stop):
+    """LU solve of ``a[i] x = b[i]``, overwriting `a` and `b`."""
+    cdef int n = a.shape[1], nrhs = b.shape[1]
+    cdef Py_ssize_t i
+    with nogil:
+        for i in range(start, stop):
+            _gesv_one(n, nrhs, &a[i, 0, 0], &piv[i, 0], &b[i, 0, 0],
+                      &info[i])
+
+
+def posv(lapack_t[:, :, ::1] a, lapack_t[:, :, ::1] b, bint lower,
+         int[::1] info, Py_ssize_t start, Py_ssize_t stop):
+    """Cholesky solve of ``a[i] x = b[i]``, overwriting `a` and `b`."""
+    cdef int n = a.shape[1], nrhs = b.shape[1]
+    cdef char *uplo = 'L' if lower else 'U'
+    cdef Py_ssize_t i
+    with nogil:
+        for i in range(start, stop):
+            _posv_one(uplo, n, nrhs, &a[i, 0, 0], &b[i, 0, 0], &info[i])
+
+
+def sysv(lapack_t[:, :, ::1] a, lapack_t[:, :, ::1] b, int[:, ::1] piv,
+         bint lower, bint hermitian, int[::1] info, Py_ssize_t start,
+         Py_ssize_t stop):
+    """
+    Bunch-Kaufman solve of ``a[i] x = b[i]`` for symmetric or hermitian
+    `a`, overwriting `a` and `b`.
+    """
+    cdef int n = a.shape[1], nrhs = b.shape[1]
+    cdef char *uplo = 'L' if lower else 'U'
+    cdef Py_ssize_t i
+    cdef lapack_t query
+    cdef lapack_t *work
+    cdef int lwork, q_info
+
+    if start >= stop:
+        return
+    _sysv_one(hermitian, uplo, n, nrhs, &a[start, 0, 0], &piv[start, 0],
+              &b[start, 0, 0], &query, -1, &q_info)
+    lwork = max(_lwork(query), 1)
+    work = <lapack_t*>malloc(lwork * sizeof(lapack_t))
+    if work == NULL:
+        raise MemoryError()
+    try:
+        with nogil:
+            for i in range(start, stop):
+                _sysv_one(hermitian, uplo, n, nrhs, &a[i, 0, 0], &piv[i, 0],
+                          &b[i, 0, 0], work, lwork, &info[i])
+    finally:
+        free(work)
+
+
+def getrf(lapack_t[:, :, ::1] a, int[:, ::1] piv, int[::1] info,
+          Py_ssize_t start, Py_ssize_t stop):
+    """LU factorization of `a`, in place."""
+    cdef int m = a.shape[2], n = a.shape[1]
+    cdef Py_ssize_t i
+    with nogil:
+        for i in range(start, stop):
+            _getrf_one(m, n, &a[i, 0, 0], &piv[i, 0], &info[i])
+
+
+def getri(lapack_t[:, :, ::1] a, int[:, ::1] piv, int[::1] info,
+          Py_ssize_t start, Py_ssize_t stop):
+    """Inverse of `a` from its LU factorization, in place."""
+    cdef int n = a.shape[1]
+    cdef Py_ssize_t i
+    cdef lapack_t query
+    cdef lapack_t *work
+    cdef int lwork, q_info
+
+    if start >= stop:
+        return
+    _getri_one(n, &a[start, 0, 0], &piv[start, 0], &query, -1, &q_info)
+    lwork = max(_lwork(query), n, 1)
+    work = <lapack_t*>malloc(lwork * sizeof(lapack_t))
+    if work == NULL:
+        raise MemoryError()
+    try:
+        with nogil:
+            for i in range(start, stop):
+                _getrf_one(n, n, &a[i, 0, 0], &piv[i, 0], &info[i])
+                if info[i] == 0:
+                    _getri_one(n, &a[i, 0, 0], &piv[i, 0], work, lwork,
+                               &info[i])
+    finally:
+        free(work)
+
+
+def potrf(lapack_t[:, :, ::1] a, bint lower, int[::1] info,
+          Py_ssize_t start, Py_ssize_t stop):
+    """Cholesky factorization of `a`, in place."""
+    cdef int n = a.shape[1]
+    cdef char *uplo = 'L' if lower else 'U'
+    cdef Py_ssize_t i
+    with nogil:
+        for i in range(start, stop):
+            _potrf_one(uplo, n, &a[i, 0, 0], &info[i])
+
+
+def syevd(lapack_t[:, :, ::1] a, cnp.ndarray w, bint compute_v, bint lower,
+          int[::1] info, Py_ssize_t start, Py_ssize_t stop):
+    """
+    Eigenvalues `w`, and eigenvectors in place of `a` if `compute_v`, of
+    symmetric or hermitian `a`.
+    """
+    cdef int n = a.shape[1]
+    cdef char *jobz = 'V' if compute_v else 'N'
+    cdef char *uplo = 'L' if lower else 'U'
+    cdef char *wp = _real_data(w)
+    cdef Py_ssize_t w_stride = _real_stride(w)
+    cdef Py_ssize_t i
+    cdef lapack_t query
+    cdef float rquery_s = 0
+    cdef double rquery_d = 0
+    cdef int iquery, lwork, lrwork = 1, liwork, q_info
+    cdef lapack_t *work = NULL
+    cdef double *rwork = NULL
+    cdef int *iwork = NULL
+
+    if start >= stop:
+        return
+    if lapack_t is float_complex:
+        _syevd_one(jobz, uplo, n, &a[start, 0, 0], wp, &query, -1,
+                   <char*>&rquery_s, -1, &iquery, -1, &q_info)
+        lrwork = max(<int>rquery_s, 1)
+    else:
+        _syevd_one(jobz, uplo, n, &a[start, 0, 0], wp, &query, -1,
+                   <char*>&rquery_d, -1, &iquery, -1, &q_info)
+        lrwork = max(<int>rquery_d, 1)
+    lwork = max(_lwork(query), 1)
+    liwork = max(iquery, 1)
+
+    try:
+        work = <lapack_t*>malloc(lwork * sizeof(lapack_t))
+        rwork = <double*>malloc(lrwork * sizeof(double))
+        iwork = <int*>malloc(liwork * sizeof(int))
+        if work == NULL or rwork == NULL or iwork == NULL:
+            raise MemoryError()
+        with nogil:
+            for i in range(start, stop):
+                _syevd_one(jobz, uplo, n, &a[i, 0, 0], wp + i*w_stride,
+                           work, lwork, <char*>rwork, lrwork, iwork, liwork,
+                           &info[i])
+    finally:
+        free(work)
+        free(rwork)
+        free(iwork)
+
+
+def gesdd(lapack_t[:, :, ::1] a, cnp.ndarray s, lapack_t[:, :, ::1] u,
+          lapack_t[:, :, ::1] vt, bint compute_uv, bint full_matrices,
+          int[::1] info, Py_ssize_t start, Py_ssize_t stop):
+    """
+    Singular values `s`, and singular vectors `u` and `vt` if
+    `compute_uv`, of `a`, which is overwritten.
+    """
+    cdef int m = a.shape[2], n = a.shape[1]
+    cdef int k = min(m, n), mx = max(m, n)
+    cdef char *jobz
+    cdef int ldu = max(m, 1), ldvt
+    cdef char *sp = _real_data(s)
+    cdef Py_ssize_t s_stride = _real_stride(s)
+    cdef Py_ssize_t i
+    cdef lapack_t query
+    cdef int lwork, lrwork, q_info
+    cdef lapack_t *work = NULL
+    cdef double *rwork = NULL
+    cdef int *iwork = NULL
+
+    if not compute_uv:
+        jobz = 'N'
+        ldvt = 1
+        ldu = 1
+    elif full_matrices:
+        jobz = 'A'
+        ldvt = max(n, 1)
+    else:
+        jobz = 'S'
+        ldvt = max(k, 1)
+
+    if start >= stop:
+        return
+
+    # Size of rwork for the complex drivers, as documented in ?gesdd
+    if not compute_uv:
+        lrwork = 7 * k
+    else:
+        lrwork = max(5*k*k + 5*k, 2*mx*k + 2*k*k + k)
+    lrwork = max(lrwork, 1)
+
+    try:
+        rwork = <double*>malloc(lrwork * sizeof(double))
+        iwork = <int*>malloc(max(8*k, 1) * sizeof(int))
+        if rwork == NULL or iwork == NULL:
+            raise MemoryError()
+        _gesdd_one(jobz, m, n, &a[start, 0, 0], sp, &u[start, 0, 0], ldu,
+                   &vt[start, 0, 0], ldvt, &query, -1, <char*>rwork, iwork,
+                   &q_info)
+        lwork = max(_lwork(query), 1)
+        work = <lapack_t*>malloc(lwork * sizeof(lapack_t))
+        if work == NULL:
+            raise MemoryError()
+        with nogil:
+            for i in range(start, stop):
+                _gesdd_one(jobz, m, n, &a[i, 0, 0], sp + i*s_stride,
+                           &u[i, 0, 0], ldu, &vt[i, 0, 0], ldvt, work, lwork,
+                           <char*>rwork, iwork, &info[i])
+    finally:
+        free(work)
+        free(rwork)
+        free(iwork)
+
+
+def gelsd(lapack_t[:, :, ::1] a, lapack_t[:, :, ::1] b, cnp.ndarray s,
+          double rcond, int[::1] rank, int[::1] info, Py_ssize_t start,
+          Py_ssize_t stop):
+    """
+    Minimum norm least-squares solution of ``a[i] x = b[i]``, returned in
+    `b`, with the singular values `s` and the effective rank of `a`.
+    """
+    cdef int m = a.shape[2], n = a.shape[1]
+    cdef int nrhs = b.shape[1], ldb = b.shape[2]
+    cdef char *sp = _real_data(s)
+    cdef Py_ssize_t s_stride = _real_stride(s)
+    cdef Py_ssize_t i
+    cdef lapack_t query
+    cdef float rquery_s = 0
+    cdef double rquery_d = 0
+    cdef int iquery = 0, lwork, lrwork = 1, liwork, q_info
+    cdef lapack_t *work = NULL
+    cdef double *rwork = NULL
+    cdef int *iwork = NULL
+
+    if start >= stop:
+        return
+    if lapack_t is float_complex:
+        _gelsd_one(m, n, nrhs, &a[start, 0, 0], &b[start, 0, 0], ldb, sp,
+                   rcond, &rank[start], &query, -1, <char*>&rquery_s,
+                   &iquery, &q_info)
+        lrwork = max(<int>rquery_s, 1)
+    else:
+        _gelsd_one(m, n, nrhs, &a[start, 0, 0], &b[start, 0, 0], ldb, sp,
+                   rcond, &rank[start], &query, -1, <char*>&rquery_d,
+                   &iquery, &q_info)
+        lrwork = max(<int>rquery_d, 1)
+    lwork = max(_lwork(query), 1)
+    liwork = max(iquery, 1)
+
+    try:
+        work = <lapack_t*>malloc(lwork * sizeof(lapack_t))
+        rwork = <double*>malloc(lrwork * sizeof(double))
+        iwork = <int*>malloc(liwork * sizeof(int))
+        if work == NULL or rwork == NULL or iwork == NULL:
+            raise MemoryError()
+        with nogil:
+            for i in range(start, stop):
+                _gelsd_one(m, n, nrhs, &a[i, 0, 0], &b[i, 0, 0], ldb,
+                           sp + i*s_stride, rcond, &rank[i], work, lwork,
+                           <char*>rwork, iwork, &info[i])
+    finally:
+        free(work)
+        free(rwork)
+        free(iwork)
+
+
+def trsyl(lapack_t[:, :, ::1] a, lapack_t[:, :, ::1] b,
+          lapack_t[:, :, ::1] q, bint lyapunov, int[::1] info,
+          Py_ssize_t start, Py_ssize_t stop):
+    """
+    Bartels-Stewart solution of ``a[i] x + x b[i] = q[i]``, returned in
+    `q`, overwriting `a` and `b` with their Schur forms.  With `lyapunov`,
+    ``b[i]`` is taken to be ``a[i]^H`` and `b` is not referenced.
+
+    ``info[i]`` is 1 if a Schur decomposition did not converge, and 2 if
+    ``a[i]`` and ``-b[i]`` have close eigenvalues, which ?trsyl perturbs.
+    """
+    cdef int m = a.shape[1], n = q.shape[1], p
+    cdef Py_ssize_t i
+    cdef lapack_t query
+    cdef int lwork, q_info
+    cdef char *tranb = 'C' if lyapunov else 'N'
+    cdef lapack_t *work = NULL
+    cdef lapack_t *u = NULL
+    cdef lapack_t *v = NULL
+    cdef lapack_t *t = NULL
+    cdef lapack_t *w = NULL
+    cdef double *rwork = NULL
+    cdef lapack_t *bi
+    cdef lapack_t *vi
+
+    if start >= stop:
+        return
+    p = max(m, n, 1)
+    _gees_one(p, &a[start, 0, 0], &query, &query, &query, -1, NULL, &q_info)
+    lwork = max(_lwork(query), 3*p, 1)
+
+    try:
+        work = <lapack_t*>malloc(lwork * sizeof(lapack_t))
+        u = <lapack_t*>malloc(max(m*m, 1) * sizeof(lapack_t))
+        v = <lapack_t*>malloc(max(n*n, 1) * sizeof(lapack_t))
+        t = <lapack_t*>malloc(max(m*n, 1) * sizeof(lapack_t))
+        w = <lapack_t*>malloc(2*p * sizeof(lapack_t))
+        rwork = <double*>malloc(p * sizeof(double))
+        if (work == NULL or u == NULL or v == NULL or t == NULL or
+                w == NULL or rwork == NULL):
+            raise MemoryError()
+        with nogil:
+            for i in range(start, stop):
+                _gees_one(m, &a[i, 0, 0], u, w, work, lwork, <char*>rwork,
+                          &info[i])
+                if info[i] != 0:
+                    info[i] = 1
+                    continue
+                if lyapunov:
+                    bi = &a[i, 0, 0]
+                    vi = u
+                else:
+                    _gees_one(n, &b[i, 0, 0], v, w, work, lwork,
+                              <char*>rwork, &info[i])
+                    if info[i] != 0:
+                        info[i] = 1
+                        continue
+                    bi = &b[i, 0, 0]
+                    vi = v
+
+                # With a = u r u^H and b = v s v^H, solve r y + y s = f
+                # for f = u^H q v, and x = u y v^H
+                _gemm_one('C', 'N', m, n, m, u, &q[i, 0, 0], t)
+                _gemm_one('N', 'N', m, n, n, t, vi, &q[i, 0, 0])
+                _trsyl_one(tranb, m, n, &a[i, 0, 0], bi, &q[i, 0, 0],
+                           &info[i])
+                if info[i] == 1:
+                    info[i] = 2
+                _gemm_one('N', 'N', m, n, m, u, &q[i, 0, 0], t)
+                _gemm_one('N', 'C', m, n, n, t, vi, &q[i, 0, 0])
+    finally:
+        free(work)
+        free(u)
+        free(v)
+        free(t)
+        free(w)
+        free(rwork)
@@ -0,0 +1,586 @@
+"""
+Factorization objects for repeated solves with the same matrix.
+"""
+
+from __future__ import division, print_function, absolute_import
+
+from warnings import warn
+
+import numpy as np
+from numpy import asarray, asarray_chkfinite, atleast_2d, iscomplexobj
+
+# Local imports
+from .misc import LinAlgError, LinAlgWarning, _datacopied
+from .lapack import get_lapack_funcs, _compute_lwork
+from .decomp import _asarray_validated
+from .decomp_lu import lu_factor
+from .decomp_cholesky import cho_factor
+from .decomp_qr import qr
+from ._decomp_ldl import (_ldl_sanitize_ipiv, _ldl_get_d_and_l,
+                          _ldl_construct_tri_factor)
+from ._decomp_update import qr_update, _cholesky_update
+
+__all__ = ['LUFactorization', 'CholeskyFactorization', 'LDLFactorization',
+           'QRFactorization']
+
+
+class _Factorization(object):
+    """
+    Common code of the factorization objects.
+
+    Subclasses store their factors in Fortran order and set `shape` and
+    `dtype`.  The LAPACK routines are looked up once, for the type of the
+    factors.
+    """
+
+    def _lapack(self, name, b):
+        # Routine for the dtype of the factors; a complex right-hand side
+        # of a real factorization needs the complex routine.
+        if iscomplexobj(b) and self.dtype.kind != 'c':
+            return get_lapack_funcs(name, (np.empty(0, self.dtype), b))
+        return self._funcs[name]
+
+    def _rhs(self, b, overwrite_b, check_finite):
+        b1 = asarray_chkfinite(b) if check_finite else asarray(b)
+        if b1.ndim not in (1, 2) or b1.shape[0] != self.shape[0]:
+            raise ValueError("incompatible dimensions.")
+        return b1, overwrite_b or _datacopied(b1, b)
+
+    def _update_vectors(self, u):
+        u = asarray(u)
+        if not np.can_cast(u.dtype, self.dtype, casting='same_kind'):
+            raise ValueError('Cannot update a factorization of dtype %s '
+                             'with vectors of dtype %s.'
+                             % (self.dtype, u.dtype))
+        # the updates consume their vectors
+        return np.array(u, dtype=self.dtype, order='F')
+
+    def __repr__(self):
+        return '<%dx%d %s with dtype=%s>' % (self.shape + (
+            self.__class__.__name__, self.dtype))
+
+
+class LUFactorization(_Factorization):
+    """
+    LU factorization of a square matrix, for repeated solves.
+
+    The matrix is validated and factorized once.  The factors are kept in
+    Fortran order, so that `solve` passes them to LAPACK without any copy
+    or check.
+
+    Parameters
+    ----------
+    a : (M, M) array_like
+        Matrix to factorize
+    overwrite_a : bool, optional
+        Whether to overwrite data in `a` (may increase performance)
+    check_finite : bool, optional
+        Whether to check that the input matrix contains only finite numbers.
+        Disabling may give a performance gain, but may result in problems
+        (crashes, non-termination) if the inputs do contain infinities or NaNs.
+
+    Attributes
+    ----------
+    lu : (M, M) ndarray
+        Matrix containing U in its upper triangle, and L in its lower
+        triangle, as returned by `lu_factor`.
+    piv : (M,) ndarray
+        Pivot indices, as returned by `lu_factor`.
+    shape : tuple
+        Shape of the matrix
+    dtype : dtype
+        Data type of the factors
+
+    See Also
+    --------
+    lu_factor, lu_solve
+
+    Notes
+    -----
+    .. versionadded:: 1.2.0
+
+    Examples
+    --------
+    >>> from scipy.linalg import LUFactorization
+    >>> A = np.array([[2, 5, 8, 7], [5, 2, 2, 8], [7, 5, 6, 6], [5, 4, 4, 8]])
+    >>> lu = LUFactorization(A)
+    >>> x = lu.solve(np.ones(4))
+    >>> np.allclose(A.dot(x), np.ones(4))
+    True
+    >>> y = lu.solve(np.ones(4), trans=1)
+    >>> np.allclose(A.T.dot(y), np.ones(4))
+    True
+
+    """
+
+    def __init__(self, a, overwrite_a=False, check_finite=True):
+        self.lu, self.piv = lu_factor(a, overwrite_a=overwrite_a,
+                                      check_finite=check_finite)
+        self.shape = self.lu.shape
+        self.dtype = self.lu.dtype
+        self._funcs = {'getrs': get_lapack_funcs('getrs', (self.lu,))}
+
+    def solve(self, b, trans=0, overwrite_b=False, check_finite=True):
+        """
+        Solve an equation system, a x = b, with the factorized matrix.
+
+        Parameters
+        ----------
+        b : (M,) or (M, K) array_like
+            Right-hand side.  A Fortran ordered array of the type of the
+            factors is solved in place if `overwrite_b` is True.
+        trans : {0, 1, 2}, optional
+            Type of system to solve:
+
+            =====  =========
+            trans  system
+            =====  =========
+            0      a x   = b
+            1      a^T x = b
+            2      a^H x = b
+            =====  =========
+        overwrite_b : bool, optional
+            Whether to overwrite data in `b` (may increase performance)
+        check_finite : bool, optional
+            Whether to check that `b` contains only finite numbers.
+
+        Returns
+        -------
+        x : (M,) or (M, K) ndarray
+            Solution to the system
+        """
+        b1, overwrite_b = self._rhs(b, overwrite_b, check_finite)
+        getrs = self._lapack('getrs', b1)
+        x, info = getrs(self.lu, self.piv, b1, trans=trans,
+                        overwrite_b=overwrite_b)
+        if info != 0:
+            raise ValueError('illegal value in %d-th argument of internal '
+                             'getrs' % -info)
+        return x
+
+
+class CholeskyFactorization(_Factorization):
+    """
+    Cholesky factorization of a hermitian positive definite matrix, for
+    repeated solves and updates.
+
+    The matrix is validated and factorized once.  The factor is kept in
+    Fortran order, so that `solve` and `update` work on it without any copy
+    or check.
+
+    Parameters
+    ----------
+    a : (M, M) array_like
+        Matrix to factorize
+    lower : bool, optional
+        Whether to compute the lower or upper triangular factor.
+        Default is upper-triangular.
+    overwrite_a : bool, optional
+        Whether to overwrite data in `a` (may increase performance)
+    check_finite : bool, optional
+        Whether to check that the input matrix contains only finite numbers.
+        Disabling may give a performance gain, but may result in problems
+        (crashes, non-termination) if the inputs do contain infinities or NaNs.
+
+    Attributes
+    ----------
+    c : (M, M) ndarray
+        Matrix whose upper or lower triangle contains the Cholesky factor
+        of `a`, as returned by `cho_factor`.  The other triangle contains
+        random data.
+    lower : bool
+        Whether the factor is in the lower or upper triangle of `c`.
+    shape : tuple
+        Shape of the matrix
+    dtype : dtype
+        Data type of the factor
+
+    Raises
+    ------
+    LinAlgError
+        If `a` is not positive definite.
+
+    See Also
+    --------
+    cho_factor, cho_solve
+
+    Notes
+    -----
+    .. versionadded:: 1.2.0
+
+    Examples
+    --------
+    >>> from scipy.linalg import CholeskyFactorization
+    >>> A = np.array([[9, 3, 1, 5], [3, 7, 5, 1], [1, 5, 9, 2], [5, 1, 2, 6]])
+    >>> chol = CholeskyFactorization(A)
+    >>> x = chol.solve(np.ones(4))
+    >>> np.allclose(A.dot(x), np.ones(4))
+    True
+
+    Update the factorization to that of ``A + u u^T``:
+
+    >>> u = np.array([1., 0., 2., 1.])
+    >>> chol.update(u)
+    >>> x = chol.solve(np.ones(4))
+    >>> np.allclose((A + np.outer(u, u)).dot(x), np.ones(4))
+    True
+
+    """
+
+    def __init__(self, a, lower=False, overwrite_a=False, check_finite=True):
+        self.c, self.lower = cho_factor(a, lower=lower,
+                                        overwrite_a=overwrite_a,
+                                        check_finite=check_finite)
+        self.c = np.asfortranarray(self.c)
+        self.shape = self.c.shape
+        self.dtype = self.c.dtype
+        self._funcs = {'potrs': get_lapack_funcs('potrs', (self.c,))}
+
+    def solve(self, b, overwrite_b=False, check_finite=True):
+        """
+        Solve an equation system, a x = b, with the factorized matrix.
+
+        Parameters
+        ----------
+        b : (M,) or (M, K) array_like
+            Right-hand side.  A Fortran ordered array of the type of the
+            factor is solved in place if `overwrite_b` is True.
+        overwrite_b : bool, optional
+            Whether to overwrite data in `b` (may increase performance)
+        check_finite : bool, optional
+            Whether to check that `b` contains only finite numbers.
+
+        Returns
+        -------
+        x : (M,) or (M, K) ndarray
+            Solution to the system
+        """
+        b1, overwrite_b = self._rhs(b, overwrite_b, check_finite)
+        if self.shape[0] == 0:
+            return b1.copy()
+        potrs = self._lapack('potrs', b1)
+        x, info = potrs(self.c, b1, lower=self.lower, overwrite_b=overwrite_b)
+        if info != 0:
+            raise ValueError('illegal value in %d-th argument of internal '
+                             'potrs' % -info)
+        return x
+
+    def update(self, u, downdate=False, check_finite=True):
+        """
+        Update the factorization in place to that of ``a + u u^H``.
+
+        Parameters
+        ----------
+        u : (M,) or (M, K) array_like
+            Update vectors
+        downdate : bool, optional
+            If True, factorize ``a - u u^H`` instead.
+        check_finite : bool, optional
+            Whether to check that `u` contains only finite numbers.
+
+        Raises
+        ------
+        LinAlgError
+            If the downdated matrix is not positive definite.  The
+            factorization is then left unchanged.
+
+        Notes
+        -----
+        An update of rank ``K`` costs ``O(K M**2)`` operations, instead of
+        the ``O(M**3)`` of a new factorization.
+        """
+        u1 = self._update_vectors(u)
+        # A failed downdate leaves its input in an unspecified state
+        self.c = _cholesky_update(self.c, u1, lower=self.lower,
+                                  downdate=downdate,
+                                  overwrite_cu=not downdate,
+                                  check_finite=check_finite)
+
+
+class LDLFactorization(_Factorization):
+    """
+    LDLt or Bunch-Kaufman factorization of a symmetric or hermitian matrix,
+    for repeated solves.
+
+    The matrix is validated and factorized once with ``?sytrf`` or
+    ``?hetrf``.  The compact factors are kept in Fortran order, so that
+    `solve` passes them to ``?sytrs`` or ``?hetrs`` without any copy or
+    check.
+
+    Parameters
+    ----------
+    a : (M, M) array_like
+        Matrix to factorize
+    lower : bool, optional
+        Whether to use the lower or upper triangle of `a`.  Default is
+        lower.
+    hermitian : bool, optional
+        For complex arrays, whether `a` is hermitian or complex symmetric.
+        Default is hermitian.
+    overwrite_a : bool, optional
+        Whether to overwrite data in `a` (may increase performance)
+    check_finite : bool, optional
+        Whether to check that the input matrix contains only finite numbers.
+        Disabling may give a performance gain, but may result in problems
+        (crashes, non-termination) if the inputs do contain infinities or NaNs.
+
+    Attributes
+    ----------
+    ldu : (M, M) ndarray
+        Compact factors, as returned by ``?sytrf`` or ``?hetrf``.
+    piv : (M,) ndarray
+        LAPACK pivot array, as returned by ``?sytrf`` or ``?hetrf``.
+    lower, hermitian : bool
+        The corresponding parameters
+    shape : tuple
+        Shape of the matrix
+    dtype : dtype
+        Data type of the factors
+
+    See Also
+    --------
+    ldl
+
+    Notes
+    -----
+    .. versionadded:: 1.2.0
+
+    Examples
+    --------
+    >>> from scipy.linalg import LDLFactorization
+    >>> A = np.array([[2, -1, 3], [-1, 2, 0], [3, 0, 1]])
+    >>> fac = LDLFactorization(A)
+    >>> x = fac.solve(np.ones(3))
+    >>> np.allclose(A.dot(x), np.ones(3))
+    True
+    >>> lu, d, perm = fac.factors()
+    >>> np.allclose(lu.dot(d).dot(lu.T), A)
+    True
+
+    """
+
+    def __init__(self, a, lower=True, hermitian=True, overwrite_a=False,
+                 check_finite=True):
+        a1 = atleast_2d(_asarray_validated(a, check_finite=check_finite))
+        if a1.shape[0] != a1.shape[1]:
+            raise ValueError('The input array "a" should be square.')
+        overwrite_a = overwrite_a or _datacopied(a1, a)
+
+        n = a1.shape[0]
+        self.lower = lower
+        self.hermitian = hermitian
+        if iscomplexobj(a1) and hermitian:
+            s, sl, st = 'hetrf', 'hetrf_lwork', 'hetrs'
+        else:
+            s, sl, st = 'sytrf', 'sytrf_lwork', 'sytrs'
+        self._trs = st
+
+        solver, solver_lwork, trs = get_lapack_funcs((s, sl, st), (a1,))
+        if n == 0:
+            self.ldu = np.empty((0, 0), dtype=solver.dtype)
+            self.piv = np.empty(0, dtype=np.intc)
+        else:
+            lwork = _compute_lwork(solver_lwork, n, lower=lower)
+            self.ldu, self.piv, info = solver(a1, lwork=lwork, lower=lower,
+                                              overwrite_a=overwrite_a)
+            if info < 0:
+                raise ValueError('{} exited with the internal error "illegal '
+                                 'value in argument number {}". See LAPACK '
+                                 'documentation for the error codes.'
+                                 .format(s.upper(), -info))
+            if info > 0:
+                warn("Diagonal number %d is exactly zero. Singular matrix."
+                     % info, LinAlgWarning, stacklevel=2)
+        self.shape = self.ldu.shape
+        self.dtype = self.ldu.dtype
+        self._funcs = {st: trs}
+
+    def solve(self, b, overwrite_b=False, check_finite=True):
+        """
+        Solve an equation system, a x = b, with the factorized matrix.
+
+        Parameters
+        ----------
+        b : (M,) or (M, K) array_like
+            Right-hand side.  A Fortran ordered array of the type of the
+            factors is solved in place if `overwrite_b` is True.
+        overwrite_b : bool, optional
+            Whether to overwrite data in `b` (may increase performance)
+        check_finite : bool, optional
+            Whether to check that `b` contains only finite numbers.
+
+        Returns
+        -------
+        x : (M,) or (M, K) ndarray
+            Solution to the system
+        """
+        b1, overwrite_b = self._rhs(b, overwrite_b, check_finite)
+        if self.shape[0] == 0:
+            return b1.copy()
+        trs = self._lapack(self._trs, b1)
+        x, info = trs(self.ldu, self.piv, b1, lower=self.lower,
+                      overwrite_b=overwrite_b)
+        if info != 0:
+            raise ValueError('illegal value in %d-th argument of internal '
+                             '%s' % (-info, self._trs))
+        return x
+
+    def factors(self):
+        """
+        Return the factors of `ldl`.
+
+        Returns
+        -------
+        lu : (M, M) ndarray
+            The (possibly) permuted upper/lower triangular outer factor.
+        d : (M, M) ndarray
+            The block diagonal multiplier.
+        perm : (M,) ndarray
+            The row-permutation index array that brings `lu` into
+            triangular form.
+        """
+        if self.shape[0] == 0:
+            return (self.ldu.copy(), self.ldu.copy(),
+                    np.array([], dtype=int))
+        swap_arr, pivot_arr = _ldl_sanitize_ipiv(self.piv, lower=self.lower)
+        d, lu = _ldl_get_d_and_l(self.ldu.copy(), pivot_arr, lower=self.lower,
+                                 hermitian=self.hermitian)
+        lu, perm = _ldl_construct_tri_factor(lu, swap_arr, pivot_arr,
+                                             lower=self.lower)
+        return lu, d, perm
+
+
+class QRFactorization(_Factorization):
+    """
+    Economic QR factorization of a matrix, for repeated least-squares
+    solves and updates.
+
+    The matrix is validated and factorized once.  The factors are kept in
+    Fortran order, so that `solve` and `update` work on them without any
+    copy or check.
+
+    Parameters
+    ----------
+    a : (M, N) array_like
+        Matrix to factorize
+    overwrite_a : bool, optional
+        Whether to overwrite data in `a` (may increase performance)
+    check_finite : bool, optional
+        Whether to check that the input matrix contains only finite numbers.
+        Disabling may give a performance gain, but may result in problems
+        (crashes, non-termination) if the inputs do contain infinities or NaNs.
+
+    Attributes
+    ----------
+    q : (M, K) ndarray
+        Matrix with orthonormal columns, ``K = min(M, N)``
+    r : (K, N) ndarray
+        Upper triangular factor
+    shape : tuple
+        Shape of the matrix
+    dtype : dtype
+        Data type of the factors
+
+    See Also
+    --------
+    qr, qr_update
+
+    Notes
+    -----
+    .. versionadded:: 1.2.0
+
+    Examples
+    --------
+    >>> from scipy.linalg import QRFactorization
+    >>> A = np.array([[1., 2.], [3., 4.], [5., 7.]])
+    >>> fac = QRFactorization(A)
+    >>> b = np.array([1., 0., 1.])
+    >>> x = fac.solve(b)
+    >>> np.allclose(x, np.linalg.lstsq(A, b, rcond=None)[0])
+    True
+
+    Update the factorization to that of ``A + u v^T``:
+
+    >>> u, v = np.array([1., 0., 1.]), np.array([0., 1.])
+    >>> fac.update(u, v)
+    >>> np.allclose(fac.q.dot(fac.r), A + np.outer(u, v))
+    True
+
+    """
+
+    def __init__(self, a, overwrite_a=False, check_finite=True):
+        q, r = qr(a, overwrite_a=overwrite_a, mode='economic',
+                  check_finite=check_finite)
+        self.q = np.asfortranarray(q)
+        self.r = np.asfortranarray(r)
+        self.shape = (self.q.shape[0], self.r.shape[1])
+        self.dtype = self.r.dtype
+        self._funcs = {'trtrs': get_lapack_funcs('trtrs', (self.r,))}
+
+    def solve(self, b, overwrite_b=False, check_finite=True):
+        """
+        Solve the least-squares problem ``min |b - a x|`` with the factorized
+        matrix, which must have at least as many rows as columns and full
+        column rank.
+
+        Parameters
+        ----------
+        b : (M,) or (M, K) array_like
+            Right-hand side
+        overwrite_b : bool, optional
+            Whether to overwrite data in `b` (may increase performance)
+        check_finite : bool, optional
+            Whether to check that `b` contains only finite numbers.
+
+        Returns
+        -------
+        x : (N,) or (N, K) ndarray
+            Least-squares solution
+
+        Raises
+        ------
+        LinAlgError
+            If `r` is singular.
+        """
+        m, n = self.shape
+        if m < n:
+            raise ValueError('solve requires a matrix with at least as many '
+                             'rows as columns.')
+        b1, overwrite_b = self._rhs(b, overwrite_b, check_finite)
+        if n == 0:
+            return np.zeros((0,) + b1.shape[1:],
+                            dtype=np.result_type(self.dtype, b1))
+        y = self.q.T.conj().dot(b1)
+        trtrs = self._lapack('trtrs', y)
+        x, info = trtrs(self.r, y, overwrite_b=True)
+        if info > 0:
+            raise LinAlgError("singular matrix: resolution failed at "
+                              "diagonal %d" % (info-1))
+        if info < 0:
+            raise ValueError('illegal value in %d-th argument of internal '
+                             'trtrs' % -info)
+        return x
+
+    def update(self, u, v, check_finite=True):
+        """
+        Update the factorization in place to that of ``a + u v^H``.
+
+        Parameters
+        ----------
+        u : (M,) or (M, K) array_like
+            Left update vectors
+        v : (N,) or (N, K) array_like
+            Right update vectors
+        check_finite : bool, optional
+            Whether to check that `u` and `v` contain only finite numbers.
+
+        Notes
+        -----
+        The update is done by `qr_update`, which reuses the storage of the
+        factors.  An update of rank ``K`` costs ``O(K M N)`` operations.
+        """
+        u1 = self._update_vectors(u)
+        v1 = self._update_vectors(v)
+        self.q, self.r = qr_update(self.q, self.r, u1, v1,
+                                   overwrite_qruv=True,
+                                   check_finite=check_finite)
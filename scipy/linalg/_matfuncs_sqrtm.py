@@ -15,14 +15,35 @@ from scipy._lib._util import _asarray_validated
 
 # Local imports
 from .misc import norm
-from .lapack import ztrsyl, dtrsyl
 from .decomp_schur import schur, rsf2csf
+from ._matfuncs_triu import sqrtm_triu
 
 
 class SqrtmError(np.linalg.LinAlgError):
     pass
 
 
+def _block_bounds(n, blocksize):
+    """
+    Split ``range(n)`` into blocks of about `blocksize` indices.
+
+    Returns the index of the start of each block, followed by `n`.
+    """
+    # Compute the number of blocks to use; use at least one block.
+    nblocks = max(n // blocksize, 1)
+
+    # Compute the smaller of the two sizes of blocks that
+    # we will actually use, and compute the number of large blocks.
+    bsmall, nlarge = divmod(n, nblocks)
+    blarge = bsmall + 1
+    nsmall = nblocks - nlarge
+    if nsmall * bsmall + nlarge * blarge != n:
+        raise Exception('internal inconsistency')
+
+    sizes = [0] + [bsmall] * nsmall + [blarge] * nlarge
+    return np.cumsum(sizes).astype(np.intp)
+
+
 def _sqrtm_triu(T, blocksize=64):
     """
     Matrix square root of an upper triangular matrix.
@@ -55,62 +76,13 @@ def _sqrtm_triu(T, blocksize=64):
         T_diag = T_diag.astype(complex)
     R = np.diag(np.sqrt(T_diag))
 
-    # Compute the number of blocks to use; use at least one block.
-    n, n = T.shape
-    nblocks = max(n // blocksize, 1)
-
-    # Compute the smaller of the two sizes of blocks that
-    # we will actually use, and compute the number of large blocks.
-    bsmall, nlarge = divmod(n, nblocks)
-    blarge = bsmall + 1
-    nsmall = nblocks - nlarge
-    if nsmall * bsmall + nlarge * blarge != n:
-        raise Exception('internal inconsistency')
-
-    # Define the index range covered by each block.
-    start_stop_pairs = []
-    start = 0
-    for count, size in ((nsmall, bsmall), (nlarge, blarge)):
-        for i in range(count):
-            start_stop_pairs.append((start, start + size))
-            start += size
-
-    # Within-block interactions.
-    for start, stop in start_stop_pairs:
-        for j in range(start, stop):
-            for i in range(j-1, start-1, -1):
-                s = 0
-                if j - i > 1:
-                    s = R[i, i+1:j].dot(R[i+1:j, j])
-                denom = R[i, i] + R[j, j]
-                num = T[i, j] - s
-                if denom != 0:
-                    R[i, j] = (T[i, j] - s) / denom
-                elif denom == 0 and num == 0:
-                    R[i, j] = 0
-                else:
-                    raise SqrtmError('failed to find the matrix square root')
-
-    # Between-block interactions.
-    for j in range(nblocks):
-        jstart, jstop = start_stop_pairs[j]
-        for i in range(j-1, -1, -1):
-            istart, istop = start_stop_pairs[i]
-            S = T[istart:istop, jstart:jstop]
-            if j - i > 1:
-                S = S - R[istart:istop, istop:jstart].dot(R[istop:jstart,
-                                                            jstart:jstop])
-
-            # Invoke LAPACK.
-            # For more details, see the solve_sylvester implemention
-            # and the fortran dtrsyl and ztrsyl docs.
-            Rii = R[istart:istop, istart:istop]
-            Rjj = R[jstart:jstop, jstart:jstop]
-            if keep_it_real:
-                x, scale, info = dtrsyl(Rii, Rjj, S)
-            else:
-                x, scale, info = ztrsyl(Rii, Rjj, S)
-            R[istart:istop, jstart:jstop] = x * scale
+    # The recurrences and the Sylvester equations between the blocks
+    # are solved in compiled code, on Fortran ordered arrays.
+    dtype = np.result_type(T, R)
+    R = np.asfortranarray(R, dtype=dtype)
+    T = np.asfortranarray(T, dtype=dtype)
+    if sqrtm_triu(T, R, _block_bounds(T.shape[0], blocksize)):
+        raise SqrtmError('failed to find the matrix square root')
 
     # Return the matrix square root.
     return R
@@ -0,0 +1,219 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Recurrences for functions of upper triangular matrices.
+
+The matrices are split into diagonal blocks, given by `bounds`: the index
+of the first row of each block, followed by the order of the matrix.  The
+diagonal blocks are filled in with the scalar recurrences.  Each
+off-diagonal block solves a triangular Sylvester equation with ?trsyl,
+after the contributions of the blocks computed before are accumulated with
+?gemm.  All matrices are in Fortran order, and the loops run without the
+GIL.
+"""
+
+from __future__ import absolute_import
+
+from libc.math cimport fabs, hypot
+
+from . cimport cython_blas as blas
+from . cimport cython_lapack as lapack
+
+
+ctypedef float complex float_complex
+ctypedef double complex double_complex
+
+ctypedef fused lapack_t:
+    float
+    double
+    float_complex
+    double_complex
+
+
+cdef inline double _abs(lapack_t x) nogil:
+    if lapack_t is float or lapack_t is double:
+        return fabs(x)
+    else:
+        return hypot(x.real, x.imag)
+
+
+cdef inline void _gemm(int m, int n, int k, lapack_t alpha, lapack_t *a,
+                       lapack_t *b, lapack_t beta, lapack_t *c,
+                       int ld) nogil:
+    # c = alpha a b + beta c, for blocks of matrices with leading dimension ld
+    cdef char trans = b'N'
+    if lapack_t is float:
+        blas.sgemm(&trans, &trans, &m, &n, &k, &alpha, a, &ld, b, &ld,
+                   &beta, c, &ld)
+    elif lapack_t is double:
+        blas.dgemm(&trans, &trans, &m, &n, &k, &alpha, a, &ld, b, &ld,
+                   &beta, c, &ld)
+    elif lapack_t is float_complex:
+        blas.cgemm(&trans, &trans, &m, &n, &k, &alpha, a, &ld, b, &ld,
+                   &beta, c, &ld)
+    else:
+        blas.zgemm(&trans, &trans, &m, &n, &k, &alpha, a, &ld, b, &ld,
+                   &beta, c, &ld)
+
+
+cdef inline void _trsyl(int isgn, int m, int n, lapack_t *a, lapack_t *b,
+                        lapack_t *c, int ld) nogil:
+    # Overwrite c with the solution x of  a x + isgn x b = c
+    cdef char trans = b'N'
+    cdef int info = 0
+    cdef int i, j
+    cdef float sscale = 1
+    cdef double scale = 1
+    if lapack_t is float:
+        lapack.strsyl(&trans, &trans, &isgn, &m, &n, a, &ld, b, &ld, c, &ld,
+                      &sscale, &info)
+        scale = sscale
+    elif lapack_t is double:
+        lapack.dtrsyl(&trans, &trans, &isgn, &m, &n, a, &ld, b, &ld, c, &ld,
+                      &scale, &info)
+    elif lapack_t is float_complex:
+        lapack.ctrsyl(&trans, &trans, &isgn, &m, &n, a, &ld, b, &ld, c, &ld,
+                      &sscale, &info)
+        scale = sscale
+    else:
+        lapack.ztrsyl(&trans, &trans, &isgn, &m, &n, a, &ld, b, &ld, c, &ld,
+                      &scale, &info)
+    # ?trsyl solves for scale*c to avoid overflow.  info == 1 means that
+    # a and -isgn*b have close eigenvalues, which the scalar recurrences
+    # do not detect either.
+    if scale != 1:
+        for j in range(n):
+            for i in range(m):
+                c[i + j*ld] = c[i + j*ld] / scale
+
+
+cdef int _sqrtm_triu(lapack_t[::1, :] T, lapack_t[::1, :] R,
+                     Py_ssize_t[::1] bounds) nogil:
+    cdef int ld = max(<int>T.shape[0], 1)
+    cdef Py_ssize_t nblocks = bounds.shape[0] - 1
+    cdef Py_ssize_t bi, bj, i, j, k, i0, i1, j0, j1
+    cdef lapack_t s, denom, num
+    cdef lapack_t one = 1, minus_one = -1
+
+    # Within-block interactions
+    for bj in range(nblocks):
+        j0 = bounds[bj]
+        j1 = bounds[bj + 1]
+        for j in range(j0, j1):
+            for i in range(j - 1, j0 - 1, -1):
+                s = 0
+                for k in range(i + 1, j):
+                    s = s + R[i, k] * R[k, j]
+                denom = R[i, i] + R[j, j]
+                num = T[i, j] - s
+                if denom != 0:
+                    R[i, j] = num / denom
+                elif num == 0:
+                    R[i, j] = 0
+                else:
+                    return 1
+
+    # Between-block interactions:  R_ii R_ij + R_ij R_jj = S  with
+    # S = T_ij - sum_{i<k<j} R_ik R_kj
+    for bj in range(nblocks):
+        j0 = bounds[bj]
+        j1 = bounds[bj + 1]
+        for bi in range(bj - 1, -1, -1):
+            i0 = bounds[bi]
+            i1 = bounds[bi + 1]
+            for j in range(j0, j1):
+                for i in range(i0, i1):
+                    R[i, j] = T[i, j]
+            if j0 > i1:
+                _gemm(<int>(i1 - i0), <int>(j1 - j0), <int>(j0 - i1),
+                      minus_one, &R[i0, i1], &R[i1, j0], one, &R[i0, j0], ld)
+            _trsyl(1, <int>(i1 - i0), <int>(j1 - j0), &R[i0, i0], &R[j0, j0],
+                   &R[i0, j0], ld)
+    return 0
+
+
+def sqrtm_triu(lapack_t[::1, :] T, lapack_t[::1, :] R,
+               Py_ssize_t[::1] bounds):
+    """
+    Fill in the strictly upper triangle of `R`, the square root of the upper
+    triangular `T`.  The diagonal of `R` holds the square roots of the
+    diagonal of `T`.
+
+    Returns 1 if the recurrence breaks down, and 0 otherwise.
+    """
+    cdef int ret
+    with nogil:
+        ret = _sqrtm_triu(T, R, bounds)
+    return ret
+
+
+cdef double _funm_triu(lapack_t[::1, :] T, lapack_t[::1, :] F,
+                       Py_ssize_t[::1] bounds) nogil:
+    cdef int ld = max(<int>T.shape[0], 1)
+    cdef Py_ssize_t n = T.shape[0]
+    cdef Py_ssize_t nblocks = bounds.shape[0] - 1
+    cdef Py_ssize_t bi, bj, i, j, k, i0, i1, j0, j1
+    cdef int m, p, q
+    cdef lapack_t s, den
+    cdef lapack_t zero = 0, one = 1, minus_one = -1
+    cdef double minden
+
+    if n == 0:
+        return 0
+
+    # Smallest distance between two eigenvalues, for the error estimate
+    minden = _abs(T[0, 0])
+    for j in range(n):
+        for i in range(j):
+            minden = min(minden, _abs(T[j, j] - T[i, i]))
+
+    # Within-block interactions, Parlett's recurrence from
+    # F_ij (T_jj - T_ii) = T_ij (F_jj - F_ii) + sum_{i<k<j} T_ik F_kj - F_ik T_kj
+    for bj in range(nblocks):
+        j0 = bounds[bj]
+        j1 = bounds[bj + 1]
+        for j in range(j0, j1):
+            for i in range(j - 1, j0 - 1, -1):
+                s = T[i, j] * (F[j, j] - F[i, i])
+                for k in range(i + 1, j):
+                    s = s + T[i, k] * F[k, j] - F[i, k] * T[k, j]
+                den = T[j, j] - T[i, i]
+                if den != 0:
+                    s = s / den
+                F[i, j] = s
+
+    # Between-block interactions:  T_ii F_ij - F_ij T_jj = C  with
+    # C = F_ii T_ij - T_ij F_jj + sum_{i<k<j} F_ik T_kj - T_ik F_kj
+    for bj in range(nblocks):
+        j0 = bounds[bj]
+        j1 = bounds[bj + 1]
+        q = <int>(j1 - j0)
+        for bi in range(bj - 1, -1, -1):
+            i0 = bounds[bi]
+            i1 = bounds[bi + 1]
+            m = <int>(i1 - i0)
+            _gemm(m, q, m, one, &F[i0, i0], &T[i0, j0], zero, &F[i0, j0], ld)
+            _gemm(m, q, q, minus_one, &T[i0, j0], &F[j0, j0], one,
+                  &F[i0, j0], ld)
+            if j0 > i1:
+                p = <int>(j0 - i1)
+                _gemm(m, q, p, one, &F[i0, i1], &T[i1, j0], one, &F[i0, j0],
+                      ld)
+                _gemm(m, q, p, minus_one, &T[i0, i1], &F[i1, j0], one,
+                      &F[i0, j0], ld)
+            _trsyl(-1, m, q, &T[i0, i0], &T[j0, j0], &F[i0, j0], ld)
+    return minden
+
+
+def funm_triu(lapack_t[::1, :] T, lapack_t[::1, :] F,
+              Py_ssize_t[::1] bounds):
+    """
+    Fill in the strictly upper triangle of `F`, the function of the upper
+    triangular `T` whose diagonal is given on the diagonal of `F`.
+
+    Returns the smallest distance between two diagonal entries of `T`, or
+    ``abs(T[0, 0])`` if smaller.
+    """
+    cdef double minden
+    with nogil:
+        minden = _funm_triu(T, F, bounds)
+    return minden
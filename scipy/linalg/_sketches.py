@@ -5,11 +5,25 @@
 
 from __future__ import division, print_function, absolute_import
 
+import operator
+
 import numpy as np
+from scipy.sparse import issparse, csr_matrix
 
 from scipy._lib._util import check_random_state
 
-__all__ = ['clarkson_woodruff_transform']
+__all__ = ['clarkson_woodruff_transform', 'CountSketch', 'GaussianSketch',
+           'SRHTSketch']
+
+# The random entries of the sketches are drawn for chunks of this many rows,
+# from a generator seeded with the seed of the sketch and the index of the
+# chunk, so that they do not depend on how the rows are split into blocks.
+# A power of two, for the Hadamard transform of `SRHTSketch`.
+_CHUNK = 4096
+
+# `GaussianSketch` draws its entries for subchunks of this many rows instead,
+# as its chunks hold ``_CHUNK * sketch_size`` entries.  Divides `_CHUNK`.
+_GAUSSIAN_SUBCHUNK = 64
 
 
 def cwt_matrix(n_rows, n_columns, seed=None):
@@ -44,8 +58,8 @@ def cwt_matrix(n_rows, n_columns, seed=None):
     Where epsilon is related to the size of S
     """
     S = np.zeros((n_rows, n_columns))
-    nz_positions = np.random.randint(0, n_rows, n_columns)
     rng = check_random_state(seed)
+    nz_positions = rng.randint(0, n_rows, n_columns)
     values = rng.choice([1, -1], n_columns)
     for i in range(n_columns):
         S[nz_positions[i]][i] = values[i]
@@ -86,12 +100,15 @@ def clarkson_woodruff_transform(input_matrix, sketch_size, seed=None):
     A' : array_like
         Sketch of the input matrix ``A``, of size ``(sketch_size, d)``.
 
+    See Also
+    --------
+    CountSketch : Streaming version of this sketch
+
     Notes
     -----
     This is an implementation of the Clarkson-Woodruff Transform (CountSketch).
-    ``A'`` can be computed in principle in ``O(nnz(A))`` (with ``nnz`` meaning
-    the number of nonzero entries), however we don't take advantage of sparse
-    matrices in this implementation.
+    ``A'`` is computed in ``O(nnz(A))`` (with ``nnz`` meaning the number of
+    nonzero entries), and `input_matrix` can be a sparse matrix.
 
     Examples
     --------
@@ -117,5 +134,345 @@ def clarkson_woodruff_transform(input_matrix, sketch_size, seed=None):
            regression in input sparsity time. In STOC, 2013.
 
     """
-    S = cwt_matrix(sketch_size, input_matrix.shape[0], seed)
-    return np.dot(S, input_matrix)
+    return CountSketch(sketch_size, seed=seed).update(input_matrix).sketch
+
+
+class _StreamingSketch(object):
+    """
+    Common code of the streaming sketches.
+
+    The sketch of a matrix ``A`` is ``S A``, for a random matrix ``S`` with
+    `sketch_size` rows and a column per row of ``A``.  The columns of ``S``
+    are drawn chunk by chunk, from the seed of the sketch and the index of
+    the chunk.  Subclasses implement ``_add_chunk(chunk, lo, hi, a)``, which
+    adds to `sketch` the contribution of the rows ``lo:hi`` of the chunk,
+    given by the block `a`.
+    """
+
+    def __init__(self, sketch_size, seed=None):
+        sketch_size = operator.index(sketch_size)
+        if sketch_size < 1:
+            raise ValueError('sketch_size must be a positive integer')
+        if seed is None or isinstance(seed, np.random.RandomState):
+            seed = check_random_state(seed).randint(2**31)
+        seed = operator.index(seed)
+        if not 0 <= seed < 2**32:
+            raise ValueError('seed must be between 0 and 2**32 - 1')
+        self.sketch_size = sketch_size
+        self.seed = seed
+        self.sketch = None
+        self.n_rows = 0
+        self._stop = 0
+
+    def _rng(self, chunk):
+        return np.random.RandomState([self.seed, 0, chunk])
+
+    def _ensure_sketch(self, n_columns, dtype):
+        dtype = np.result_type(dtype, np.float64)
+        if self.sketch is None:
+            self.sketch = np.zeros((self.sketch_size, n_columns), dtype=dtype)
+        elif self.sketch.shape[1] != n_columns:
+            raise ValueError('expected blocks of %d columns, got %d'
+                             % (self.sketch.shape[1], n_columns))
+        elif not np.can_cast(dtype, self.sketch.dtype):
+            self.sketch = self.sketch.astype(dtype)
+
+    def update(self, a, start=None):
+        """
+        Add a block of rows of the sketched matrix.
+
+        Parameters
+        ----------
+        a : (K, N) array_like or sparse matrix
+            The rows ``start:start+K`` of the sketched matrix.
+        start : int, optional
+            Index of the first row of `a` in the sketched matrix.  By
+            default, `a` follows the last block that was added.  The blocks
+            of rows sketched on different processes, and combined with
+            `merge`, need an explicit `start`.
+
+        Returns
+        -------
+        self
+        """
+        if issparse(a):
+            a = csr_matrix(a)
+        else:
+            a = np.asarray(a)
+        if a.ndim != 2:
+            raise ValueError('expected a 2-D block of rows')
+        if start is None:
+            start = self._stop
+        start = operator.index(start)
+        if start < 0:
+            raise ValueError('start must be non-negative')
+        k, n = a.shape
+        self._ensure_sketch(n, a.dtype)
+
+        stop = start + k
+        for chunk in range(start // _CHUNK, (stop - 1) // _CHUNK + 1):
+            offset = chunk * _CHUNK
+            lo = max(start, offset)
+            hi = min(stop, offset + _CHUNK)
+            self._add_chunk(chunk, lo - offset, hi - offset,
+                            a[lo - start:hi - start])
+        self.n_rows += k
+        self._stop = max(self._stop, stop)
+        return self
+
+    def merge(self, other):
+        """
+        Add the rows sketched by another sketch.
+
+        The sketches must be of the same type and size, and have the same
+        seed.  Their rows must be disjoint parts of the same matrix.
+
+        Parameters
+        ----------
+        other : sketch
+            Sketch of other rows of the matrix.
+
+        Returns
+        -------
+        self
+        """
+        if (type(other) is not type(self) or
+                other.sketch_size != self.sketch_size or
+                other.seed != self.seed):
+            raise ValueError('can only merge sketches of the same type and '
+                             'size, with the same seed')
+        if other.sketch is not None:
+            self._ensure_sketch(other.sketch.shape[1], other.sketch.dtype)
+            self.sketch += other.sketch
+        self.n_rows += other.n_rows
+        self._stop = max(self._stop, other._stop)
+        return self
+
+    def __repr__(self):
+        return '<%s of size %d with %d rows>' % (
+            self.__class__.__name__, self.sketch_size, self.n_rows)
+
+
+_sketch_parameters = """
+    Parameters
+    ----------
+    sketch_size : int
+        Number of rows of the sketch.
+    seed : None or int or `numpy.random.RandomState` instance, optional
+        Seed of the random entries of the sketching matrix, an integer
+        between 0 and ``2**32 - 1``.  Sketches with the same seed use the
+        same sketching matrix, and only those can be merged.  If None or a
+        ``RandomState``, a seed is drawn from it (or from the global
+        ``np.random`` state).
+
+    Attributes
+    ----------
+    sketch : (sketch_size, N) ndarray
+        The sketch of the rows added so far, or None before the first
+        update.
+    n_rows : int
+        Number of rows added to the sketch.
+    seed : int
+        Seed of the sketching matrix.
+"""
+
+
+class CountSketch(_StreamingSketch):
+    __doc__ = """
+    Streaming Clarkson-Woodruff sketch (CountSketch) of a tall matrix.
+
+    Each row of the sketched matrix is added, with a random sign, to a
+    random row of the sketch, in ``O(nnz(A))`` operations.  The rows are
+    given in blocks with `update`, and sketches of different blocks,
+    computed for instance on different processes, are combined with
+    `merge`.
+    %s
+    See Also
+    --------
+    clarkson_woodruff_transform, GaussianSketch, SRHTSketch
+
+    Notes
+    -----
+    .. versionadded:: 1.2.0
+
+    References
+    ----------
+    .. [1] Kenneth L. Clarkson and David P. Woodruff. Low rank approximation
+           and regression in input sparsity time. In STOC, 2013.
+
+    Examples
+    --------
+    Solve a least-squares problem in one pass over the rows, by sketching
+    the matrix and the right-hand side together, in blocks of 1000 rows.
+
+    >>> from scipy.linalg import CountSketch, lstsq
+    >>> np.random.seed(1234)
+    >>> x = np.array([1., -2., 3.])
+    >>> sk = CountSketch(500, seed=42)
+    >>> for i in range(10):
+    ...     a = np.random.randn(1000, 3)
+    ...     b = a.dot(x) + 0.01 * np.random.randn(1000)
+    ...     _ = sk.update(np.column_stack((a, b)))
+    >>> sk
+    <CountSketch of size 500 with 10000 rows>
+    >>> y = lstsq(sk.sketch[:, :3], sk.sketch[:, 3])[0]
+    >>> np.allclose(y, x, atol=0.01)
+    True
+
+    The same sketch, computed from two halves of the rows.
+
+    >>> sk1 = CountSketch(500, seed=42)
+    >>> sk2 = CountSketch(500, seed=42)
+    >>> a = np.random.randn(10000, 3)
+    >>> _ = sk1.update(a[:3000])
+    >>> _ = sk2.update(a[3000:], start=3000)
+    >>> np.allclose(sk1.merge(sk2).sketch,
+    ...             CountSketch(500, seed=42).update(a).sketch)
+    True
+
+    """ % _sketch_parameters
+
+    def _add_chunk(self, chunk, lo, hi, a):
+        rng = self._rng(chunk)
+        rows = rng.randint(0, self.sketch_size, _CHUNK)[lo:hi]
+        signs = (2 * rng.randint(0, 2, _CHUNK) - 1.)[lo:hi]
+        s = csr_matrix((signs, (rows, np.arange(hi - lo))),
+                       shape=(self.sketch_size, hi - lo))
+        sa = s.dot(a)
+        self.sketch += sa.toarray() if issparse(sa) else sa
+
+
+class GaussianSketch(_StreamingSketch):
+    __doc__ = """
+    Streaming Gaussian sketch of a tall matrix.
+
+    The sketching matrix has independent normal entries of variance
+    ``1/sketch_size``.  The rows are given in blocks with `update`, and
+    sketches of different blocks, computed for instance on different
+    processes, are combined with `merge`.
+    %s
+    See Also
+    --------
+    CountSketch, SRHTSketch
+
+    Notes
+    -----
+    Gaussian sketches need the fewest rows for a given accuracy, but cost
+    ``O(sketch_size * nnz(A))`` operations.
+
+    .. versionadded:: 1.2.0
+
+    Examples
+    --------
+    >>> from scipy.linalg import GaussianSketch
+    >>> np.random.seed(1234)
+    >>> a = np.random.randn(20000, 5)
+    >>> sk = GaussianSketch(400, seed=1)
+    >>> for i in range(0, 20000, 5000):
+    ...     _ = sk.update(a[i:i+5000])
+    >>> np.allclose(np.linalg.norm(sk.sketch), np.linalg.norm(a), rtol=0.1)
+    True
+
+    """ % _sketch_parameters
+
+    def _add_chunk(self, chunk, lo, hi, a):
+        # Draw the entries of the subchunks holding the rows lo:hi only,
+        # each from its own generator.
+        s = _GAUSSIAN_SUBCHUNK
+        rng = np.random.RandomState()
+        g = np.empty((hi - lo, self.sketch_size))
+        for sub in range(lo // s, (hi - 1) // s + 1):
+            rng.seed([self.seed, 2, chunk, sub])
+            gs = rng.standard_normal((s, self.sketch_size))
+            r0 = max(lo, sub * s)
+            r1 = min(hi, (sub + 1) * s)
+            g[r0 - lo:r1 - lo] = gs[r0 - sub * s:r1 - sub * s]
+        g /= np.sqrt(self.sketch_size)
+        if issparse(a):
+            self.sketch += a.T.dot(g).T
+        else:
+            self.sketch += g.T.dot(a)
+
+
+def _fwht(x):
+    # In-place unnormalized Walsh-Hadamard transform of the rows of x, whose
+    # number is a power of two, in the natural (Sylvester) order.
+    n = x.shape[0]
+    h = 1
+    while h < n:
+        y = x.reshape(n // (2*h), 2, h, -1)
+        s = y[:, 0] + y[:, 1]
+        y[:, 1] = y[:, 0] - y[:, 1]
+        y[:, 0] = s
+        h *= 2
+    return x
+
+
+def _parity(x):
+    # Parity of the number of bits set in non-negative 64-bit integers
+    for shift in (32, 16, 8, 4, 2, 1):
+        x = x ^ (x >> shift)
+    return x & 1
+
+
+class SRHTSketch(_StreamingSketch):
+    __doc__ = """
+    Streaming subsampled randomized Hadamard transform of a tall matrix.
+
+    The sketched matrix is multiplied by random signs and by a Hadamard
+    matrix, and random rows of the product are kept.  The rows are given in
+    blocks with `update`, and sketches of different blocks, computed for
+    instance on different processes, are combined with `merge`.
+    %s
+    See Also
+    --------
+    CountSketch, GaussianSketch
+
+    Notes
+    -----
+    The Hadamard matrix does not need to be of the size of the sketched
+    matrix, so that the number of rows does not need to be known in
+    advance: the rows of the Hadamard matrix are indexed by random 60-bit
+    integers.  The transform is applied to chunks of 4096 rows at a time,
+    with the fast Walsh-Hadamard transform, in ``O(N log 4096)`` operations
+    per row.
+
+    .. versionadded:: 1.2.0
+
+    References
+    ----------
+    .. [1] J. A. Tropp. Improved analysis of the subsampled randomized
+           Hadamard transform. Adv. Adapt. Data Anal., 3(1-2):115-126, 2011.
+
+    Examples
+    --------
+    >>> from scipy.linalg import SRHTSketch
+    >>> np.random.seed(1234)
+    >>> a = np.random.randn(20000, 5)
+    >>> sk = SRHTSketch(400, seed=1).update(a)
+    >>> np.allclose(np.linalg.norm(sk.sketch), np.linalg.norm(a), rtol=0.1)
+    True
+
+    """ % _sketch_parameters
+
+    def __init__(self, sketch_size, seed=None):
+        super(SRHTSketch, self).__init__(sketch_size, seed=seed)
+        # The sampled rows of the Hadamard matrix
+        rng = np.random.RandomState([self.seed, 1])
+        hi = rng.randint(0, 2**30, self.sketch_size).astype(np.int64)
+        lo = rng.randint(0, 2**30, self.sketch_size).astype(np.int64)
+        self._hadamard_rows = (hi << 30) | lo
+
+    def _add_chunk(self, chunk, lo, hi, a):
+        signs = 2 * self._rng(chunk).randint(0, 2, _CHUNK) - 1.
+        x = np.zeros((_CHUNK, a.shape[1]), dtype=self.sketch.dtype)
+        x[lo:hi] = a.toarray() if issparse(a) else a
+        x *= signs[:, np.newaxis]
+        _fwht(x)
+        # The entry (j, offset + i) of the Hadamard matrix is
+        # (-1)**popcount(j & (offset + i)), and the chunk offset is a
+        # multiple of the chunk size.
+        j = self._hadamard_rows
+        sign = 1. - 2 * _parity(j & (chunk * _CHUNK))
+        self.sketch += (sign / np.sqrt(self.sketch_size))[:, np.newaxis] * \
+            x[j & (_CHUNK - 1)]
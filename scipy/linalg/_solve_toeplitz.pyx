@@ -3,6 +3,7 @@
 # cython: boundscheck=False, wraparound=False, cdivision=True
 from __future__ import absolute_import
 
+from libc.stdlib cimport malloc, free
 from numpy import zeros, asarray, complex128, float64
 from numpy.linalg import LinAlgError
 from numpy cimport complex128_t, float64_t
@@ -13,89 +14,63 @@ cdef fused dz:
     complex128_t
 
 
-def levinson(dz[::1] a, dz[::1] b):
-    """Solve a linear Toeplitz system using Levinson recursion.
-
-    Parameters
-    ----------
-    a : array, dtype=double or complex128, shape=(2n-1,)
-        The first column of the matrix in reverse order (without the diagonal)
-        followed by the first (see below)
-    b : array, dtype=double  or complex128, shape=(n,)
-        The right hand side vector. Both a and b must have the same type
-        (double or complex128).
-
-    Notes
-    -----
-    For example, the 5x5 toeplitz matrix below should be represented as
-    the linear array ``a`` on the right ::
-
-        [ a0    a1   a2  a3  a4 ]
-        [ a-1   a0   a1  a2  a3 ]
-        [ a-2  a-1   a0  a1  a2 ] -> [a-4  a-3  a-2  a-1  a0  a1  a2  a3  a4]
-        [ a-3  a-2  a-1  a0  a1 ]
-        [ a-4  a-3  a-2  a-1 a0 ]
+cdef int _levinson(dz *a, dz *b, dz *x, dz *g, dz *h, dz *reflection_coeff,
+                   Py_ssize_t n, Py_ssize_t nrhs) nogil:
+    # Solve the system given by `a` (see `levinson`) for the `nrhs`
+    # right-hand sides stored one after the other in `b`.  The recursion for
+    # the workspace vectors `g` and `h`, of length n, does not depend on the
+    # right-hand side and is shared by all of them.  `reflection_coeff`, if
+    # not NULL, receives the history of the first right-hand side.
+    # Returns 1 if a principal minor is singular, and 0 otherwise.
 
-    Returns
-    -------
-    x : arrray, shape=(n,)
-        The solution vector
-    reflection_coeff : array, shape=(n+1,)
-        Toeplitz reflection coefficients. When a is symmetric Toeplitz and
-        ``b`` is ``a[n:]``, as in the solution of autoregressive systems,
-        then ``reflection_coeff`` also correspond to the partial
-        autocorrelation function.
-    """
     # Adapted from toeplitz.f90 by Alan Miller, accessed at
     # http://jblevins.org/mirror/amiller/toeplitz.f90
     # Released under a Public domain declaration.
-
-    if dz is float64_t:
-        dtype = float64
-    else:
-        dtype = complex128
-
-    cdef ssize_t n, m, j, nmj, k, m2
-    n = b.shape[0]
-    cdef dz x_num, g_num, h_num, x_den, g_den
+    cdef Py_ssize_t m, j, nmj, k, m2, i
+    cdef dz x_num, g_num, h_num, x_den, g_den, xm
     cdef dz gj, gk, hj, hk, c1, c2
-    cdef dz[:] x = zeros(n, dtype=dtype)  # result
-    cdef dz[:] g = zeros(n, dtype=dtype)  # workspace
-    cdef dz[:] h = zeros(n, dtype=dtype)  # workspace
-    cdef dz[:] reflection_coeff = zeros(n+1, dtype=dtype)  # history
-    assert len(a) == (2*n) - 1
+    cdef dz *xi
 
     if a[n-1] == 0:
-        raise LinAlgError('Singular principal minor')
+        return 1
 
-    x[0] = b[0] / a[n-1]
-    reflection_coeff[0] = 1
-    reflection_coeff[1] = x[0]
+    for i in range(nrhs):
+        x[i*n] = b[i*n] / a[n-1]
+    if reflection_coeff != NULL:
+        reflection_coeff[0] = 1
+        reflection_coeff[1] = x[0]
 
-    if (n == 1):
-        return asarray(x), asarray(reflection_coeff)
+    if n == 1:
+        return 0
 
     g[0] = a[n-2] / a[n-1]
     h[0] = a[n] / a[n-1]
 
     for m in range(1, n):
-        # Compute numerator and denominator of x[m]
-        x_num = -b[m]
+        # Compute the denominator of x[m]
         x_den = -a[n-1]
         for j in range(m):
             nmj = n + m - (j+1)
-            x_num = x_num + a[nmj] * x[j]
             x_den = x_den + a[nmj] * g[m-j-1]
         if x_den == 0:
-            raise LinAlgError('Singular principal minor')
-        x[m] = x_num / x_den
-        reflection_coeff[m+1] = x[m]
+            return 1
+
+        # Compute x[m] and update x, for each right-hand side
+        for i in range(nrhs):
+            xi = x + i*n
+            x_num = -b[i*n + m]
+            for j in range(m):
+                nmj = n + m - (j+1)
+                x_num = x_num + a[nmj] * xi[j]
+            xm = x_num / x_den
+            xi[m] = xm
+            for j in range(m):
+                xi[j] = xi[j] - xm * g[m-j-1]
+        if reflection_coeff != NULL:
+            reflection_coeff[m+1] = x[m]
 
-        # Compute x
-        for j in range(m):
-            x[j] = x[j] - x[m] * g[m-j-1]
         if m == n-1:
-            return asarray(x), asarray(reflection_coeff)
+            return 0
 
         # Compute the numerator and denominator of g[m] and h[m]
         g_num = -a[n-m-2]
@@ -106,8 +81,8 @@ def levinson(dz[::1] a, dz[::1] b):
             h_num = h_num + a[n+m-j-1] * h[j]
             g_den = g_den + a[n+j-m-1] * h[m-j-1]
 
-        if g_den == 0.0:
-            raise LinAlgError("Singular principal minor")
+        if g_den == 0:
+            return 1
 
         # Compute g and h
         g[m] = g_num / g_den
@@ -126,3 +101,89 @@ def levinson(dz[::1] a, dz[::1] b):
             h[j] = hj - (c2 * gk)
             h[k] = hk - (c2 * gj)
             k -= 1
+    return 0
+
+
+def levinson(dz[::1] a, dz[::1] b):
+    """Solve a linear Toeplitz system using Levinson recursion.
+
+    Parameters
+    ----------
+    a : array, dtype=double or complex128, shape=(2n-1,)
+        The first column of the matrix in reverse order (without the diagonal)
+        followed by the first (see below)
+    b : array, dtype=double  or complex128, shape=(n,)
+        The right hand side vector. Both a and b must have the same type
+        (double or complex128).
+
+    Notes
+    -----
+    For example, the 5x5 toeplitz matrix below should be represented as
+    the linear array ``a`` on the right ::
+
+        [ a0    a1   a2  a3  a4 ]
+        [ a-1   a0   a1  a2  a3 ]
+        [ a-2  a-1   a0  a1  a2 ] -> [a-4  a-3  a-2  a-1  a0  a1  a2  a3  a4]
+        [ a-3  a-2  a-1  a0  a1 ]
+        [ a-4  a-3  a-2  a-1 a0 ]
+
+    Returns
+    -------
+    x : arrray, shape=(n,)
+        The solution vector
+    reflection_coeff : array, shape=(n+1,)
+        Toeplitz reflection coefficients. When a is symmetric Toeplitz and
+        ``b`` is ``a[n:]``, as in the solution of autoregressive systems,
+        then ``reflection_coeff`` also correspond to the partial
+        autocorrelation function.
+    """
+    if dz is float64_t:
+        dtype = float64
+    else:
+        dtype = complex128
+
+    cdef Py_ssize_t n = b.shape[0]
+    cdef int ret
+    cdef dz[::1] x = zeros(n, dtype=dtype)  # result
+    cdef dz[::1] g = zeros(n, dtype=dtype)  # workspace
+    cdef dz[::1] h = zeros(n, dtype=dtype)  # workspace
+    cdef dz[::1] reflection_coeff = zeros(n+1, dtype=dtype)  # history
+    assert len(a) == (2*n) - 1
+
+    with nogil:
+        ret = _levinson(&a[0], &b[0], &x[0], &g[0], &h[0],
+                        &reflection_coeff[0], n, 1)
+    if ret:
+        raise LinAlgError('Singular principal minor')
+    return asarray(x), asarray(reflection_coeff)
+
+
+def levinson_stack(dz[:, ::1] a, dz[:, :, ::1] b, dz[:, :, ::1] x,
+                   int[::1] info, Py_ssize_t start, Py_ssize_t stop):
+    """
+    Solve the Toeplitz systems ``start:stop`` of a stack with Levinson
+    recursion.
+
+    The i-th system is given by ``a[i]``, in the layout described in
+    `levinson`, and its right-hand sides are the rows of ``b[i]``.  The
+    solutions are stored in the rows of ``x[i]``, and ``info[i]`` is set to
+    1 if the recursion breaks down on a singular principal minor.  The loop
+    runs without the GIL.
+    """
+    cdef Py_ssize_t i, n = b.shape[2], nrhs = b.shape[1]
+    cdef dz *work
+
+    if start >= stop or n == 0 or nrhs == 0:
+        return
+
+    with nogil:
+        work = <dz*>malloc(2*n*sizeof(dz))
+        if work == NULL:
+            with gil:
+                raise MemoryError()
+        try:
+            for i in range(start, stop):
+                info[i] = _levinson(&a[i, 0], &b[i, 0, 0], &x[i, 0, 0],
+                                    work, work + n, NULL, n, nrhs)
+        finally:
+            free(work)
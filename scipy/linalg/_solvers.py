@@ -17,34 +17,45 @@ from numpy.linalg import inv, LinAlgError, norm, cond, svd
 from .basic import solve, solve_triangular, matrix_balance
 from .lapack import get_lapack_funcs
 from .decomp_schur import schur
-from .decomp_lu import lu
+from .decomp_lu import lu, lu_factor, lu_solve
+from .decomp_cholesky import cholesky
+from .decomp_svd import orth
 from .decomp_qr import qr
 from ._decomp_qz import ordqz
-from .decomp import _asarray_validated
+from .decomp import eigvals, _asarray_validated
 from .special_matrices import kron, block_diag
+from .misc import LinAlgWarning
+from . import _batched
 
 __all__ = ['solve_sylvester',
            'solve_continuous_lyapunov', 'solve_discrete_lyapunov',
            'solve_lyapunov',
-           'solve_continuous_are', 'solve_discrete_are']
+           'solve_continuous_are', 'solve_discrete_are',
+           'solve_continuous_lyapunov_lowrank',
+           'solve_continuous_are_lowrank']
 
 
-def solve_sylvester(a, b, q):
+def solve_sylvester(a, b, q, workers=1):
     """
     Computes a solution (X) to the Sylvester equation :math:`AX + XB = Q`.
 
     Parameters
     ----------
-    a : (M, M) array_like
+    a : (..., M, M) array_like
         Leading matrix of the Sylvester equation
-    b : (N, N) array_like
+    b : (..., N, N) array_like
         Trailing matrix of the Sylvester equation
-    q : (M, N) array_like
+    q : (..., M, N) array_like
         Right-hand side
+    workers : int, optional
+        Number of threads over which a stack of equations is split.  ``-1``
+        uses all CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
-    x : (M, N) ndarray
+    x : (..., M, N) ndarray
         The solution to the Sylvester equation.
 
     Raises
@@ -62,8 +73,15 @@ def solve_sylvester(a, b, q):
     triangular form).  The simplified equation is then solved using
     ``*TRSYL`` from LAPACK directly.
 
+    Stacks of equations, with inputs of more than two dimensions, are solved
+    in a single compiled loop over the LAPACK routines.  The batch
+    dimensions of `a`, `b` and `q` are broadcast against each other.
+
     .. versionadded:: 0.11.0
 
+    .. versionadded:: 1.2.0
+       Support for stacks of equations.
+
     Examples
     --------
     Given `a`, `b`, and `q` solve for `x`:
@@ -81,6 +99,10 @@ def solve_sylvester(a, b, q):
     True
 
     """
+    if max(np.ndim(a), np.ndim(b), np.ndim(q)) > 2:
+        a, b, q = [_asarray_validated(x, check_finite=True)
+                   for x in (a, b, q)]
+        return _batched.solve_sylvester(a, b, q, workers=workers)
 
     # Compute the Schur decomp form of a
     r, u = schur(a, output='real')
@@ -107,7 +129,7 @@ def solve_sylvester(a, b, q):
     return np.dot(np.dot(u, y), v.conj().transpose())
 
 
-def solve_continuous_lyapunov(a, q):
+def solve_continuous_lyapunov(a, q, workers=1):
     """
     Solves the continuous Lyapunov equation :math:`AX + XA^H = Q`.
 
@@ -115,15 +137,21 @@ def solve_continuous_lyapunov(a, q):
 
     Parameters
     ----------
-    a : array_like
+    a : (..., M, M) array_like
         A square matrix
 
-    q : array_like
+    q : (..., M, M) array_like
         Right-hand side square matrix
 
+    workers : int, optional
+        Number of threads over which a stack of equations is split.  ``-1``
+        uses all CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
+
     Returns
     -------
-    x : ndarray
+    x : (..., M, M) ndarray
         Solution to the continuous Lyapunov equation
 
     See Also
@@ -131,14 +159,23 @@ def solve_continuous_lyapunov(a, q):
     solve_discrete_lyapunov : computes the solution to the discrete-time
         Lyapunov equation
     solve_sylvester : computes the solution to the Sylvester equation
+    solve_continuous_lyapunov_lowrank : low-rank solutions of large
+        Lyapunov equations
 
     Notes
     -----
     The continuous Lyapunov equation is a special form of the Sylvester
     equation, hence this solver relies on LAPACK routine ?TRSYL.
 
+    Stacks of equations are solved in a single compiled loop over the
+    LAPACK routines, with the batch dimensions of `a` and `q` broadcast
+    against each other.
+
     .. versionadded:: 0.11.0
 
+    .. versionadded:: 1.2.0
+       Support for stacks of equations.
+
     Examples
     --------
     Given `a` and `q` solve for `x`:
@@ -159,6 +196,9 @@ def solve_continuous_lyapunov(a, q):
     a = np.atleast_2d(_asarray_validated(a, check_finite=True))
     q = np.atleast_2d(_asarray_validated(q, check_finite=True))
 
+    if a.ndim > 2 or q.ndim > 2:
+        return _batched.solve_continuous_lyapunov(a, q, workers=workers)
+
     r_or_c = float
 
     for ind, _ in enumerate((a, q)):
@@ -324,7 +364,8 @@ def solve_discrete_lyapunov(a, q, method=None):
     return x
 
 
-def solve_continuous_are(a, b, q, r, e=None, s=None, balanced=True):
+def solve_continuous_are(a, b, q, r, e=None, s=None, balanced=True,
+                         workers=1):
     r"""
     Solves the continuous-time algebraic Riccati equation (CARE).
 
@@ -370,6 +411,11 @@ def solve_continuous_are(a, b, q, r, e=None, s=None, balanced=True):
     balanced : bool, optional
         The boolean that indicates whether a balancing step is performed
         on the data. The default is set to True.
+    workers : int, optional
+        Number of threads over which a stack of equations is split.  ``-1``
+        uses all CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -385,6 +431,8 @@ def solve_continuous_are(a, b, q, r, e=None, s=None, balanced=True):
     See Also
     --------
     solve_discrete_are : Solves the discrete-time algebraic Riccati equation
+    solve_continuous_are_lowrank : low-rank solutions of large Riccati
+        equations
 
     Notes
     -----
@@ -408,8 +456,20 @@ def solve_continuous_are(a, b, q, r, e=None, s=None, balanced=True):
     :math:`H` and :math:`J` entries (after removing the diagonal entries of
     the sum) is balanced following the recipe given in [3]_.
 
+    Stacks of equations, where one of the inputs has more than two
+    dimensions, are instead solved with the Newton
+    iteration for the matrix sign function of the hamiltonian matrices
+    [4]_, which consists of inversions that run in a single compiled loop
+    over the whole stack.  It is meant for many small, well-conditioned
+    equations, such as parameter sweeps in control design; the batch
+    dimensions are broadcast against each other and ``balanced`` is
+    ignored.
+
     .. versionadded:: 0.11.0
 
+    .. versionadded:: 1.2.0
+       Support for stacks of equations.
+
     References
     ----------
     .. [1]  P. van Dooren , "A Generalized Eigenvalue Approach For Solving
@@ -424,6 +484,10 @@ def solve_continuous_are(a, b, q, r, e=None, s=None, balanced=True):
     .. [3] P. Benner, "Symplectic Balancing of Hamiltonian Matrices", 2001,
        SIAM J. Sci. Comput., 2001, Vol.22(5), DOI: 10.1137/S1064827500367993
 
+    .. [4] J.D. Roberts, "Linear model reduction and solution of the
+       algebraic Riccati equation by use of the sign function", Int. J.
+       Control, 1980, Vol.32(4), DOI: 10.1080/00207178008922881
+
     Examples
     --------
     Given `a`, `b`, `q`, and `r` solve for `x`:
@@ -441,6 +505,15 @@ def solve_continuous_are(a, b, q, r, e=None, s=None, balanced=True):
     True
 
     """
+    if max(np.ndim(x) for x in (a, b, q, r, s)) > 2:
+        if e is not None:
+            raise ValueError("Matrix e is not supported for stacks of "
+                             "equations.")
+        a, b, q, r = [np.atleast_2d(_asarray_validated(x, check_finite=True))
+                      for x in (a, b, q, r)]
+        if s is not None:
+            s = np.atleast_2d(_asarray_validated(s, check_finite=True))
+        return _batched.solve_continuous_are(a, b, q, r, s, workers=workers)
 
     # Validate input arguments
     a, b, q, r, e, s, m, n, r_or_c, gen_are = _are_validate_args(
@@ -736,6 +809,401 @@ def solve_discrete_are(a, b, q, r, e=None, s=None, balanced=True):
     return (x + x.conj().T)/2
 
 
+def solve_continuous_lyapunov_lowrank(a, b, tol=1e-10, maxiter=100,
+                                      shifts=None):
+    r"""
+    Low-rank solution of the continuous Lyapunov equation
+    :math:`AX + XA^H + BB^H = 0`.
+
+    For a large and sparse stable matrix :math:`A`, and a right-hand side
+    factor :math:`B` with few columns, the solution is numerically of low
+    rank.  It is computed as a factor :math:`Z` with :math:`X \approx ZZ^H`
+    by the low-rank alternating direction implicit (LR-ADI) iteration,
+    which never forms :math:`X`.
+
+    Parameters
+    ----------
+    a : (M, M) array_like or sparse matrix
+        Stable matrix, i.e. with all eigenvalues in the open left half plane.
+    b : (M, P) array_like
+        Factor of the right-hand side, with ``P`` much smaller than ``M``.
+    tol : float, optional
+        Tolerance on the relative residual,
+        :math:`\|AX + XA^H + BB^H\|_2 / \|BB^H\|_2`.  Default: 1e-10.
+    maxiter : int, optional
+        Maximum number of ADI steps.  Default: 100.
+    shifts : array_like, optional
+        ADI shifts, with negative real parts, used cyclically.  For real
+        `a` and `b`, complex shifts should appear in consecutive complex
+        conjugate pairs.  By default, the shifts are the Ritz values of `a`
+        on the space spanned by the previous ADI steps, reflected into the
+        left half plane [1]_.
+
+    Returns
+    -------
+    z : (M, K) ndarray
+        Factor of the solution, :math:`X \approx ZZ^H`, with orthogonal
+        columns and ``K`` the numerical rank of the solution.  `z` is real
+        if `a` and `b` are real.
+
+    Raises
+    ------
+    LinAlgError
+        If no shifts with negative real parts can be found.
+
+    Warns
+    -----
+    LinAlgWarning
+        If the iteration does not converge in `maxiter` steps.
+
+    See Also
+    --------
+    solve_continuous_lyapunov : dense solver
+    solve_continuous_are_lowrank : low-rank solutions of Riccati equations
+
+    Notes
+    -----
+    Each step solves a shifted system :math:`(A + \sigma I)V = W` with a
+    sparse LU decomposition (or a dense one, if `a` is not sparse), so the
+    cost is that of a few sparse solves with ``P`` right-hand sides instead
+    of the :math:`O(M^3)` of the Bartels-Stewart algorithm.  The residual
+    of the iterate is :math:`WW^H`, which gives a cheap stopping criterion
+    [2]_.  The solution is compressed by a truncated SVD of the factor.
+
+    .. versionadded:: 1.2.0
+
+    References
+    ----------
+    .. [1] P. Benner, P. Kurschner, J. Saak, "Self-generating and efficient
+       shift parameters in ADI methods for large Lyapunov and Sylvester
+       equations", Electron. Trans. Numer. Anal., 2014, Vol.43, pp.142-162
+
+    .. [2] P. Benner, P. Kurschner, J. Saak, "An improved numerical method
+       for balanced truncation for symmetric second-order systems", Math.
+       Comput. Model. Dyn. Syst., 2013, Vol.19(6),
+       DOI: 10.1080/13873954.2013.794363
+
+    Examples
+    --------
+    The controllability Gramian of a heat equation discretized on 2000
+    points, controlled at one end:
+
+    >>> from scipy import sparse
+    >>> from scipy.linalg import solve_continuous_lyapunov_lowrank
+    >>> n = 2000
+    >>> a = -sparse.diags([-1, 2, -1], [-1, 0, 1], shape=(n, n)) * n**2
+    >>> b = np.zeros((n, 1))
+    >>> b[0] = n
+    >>> z = solve_continuous_lyapunov_lowrank(a, b)
+    >>> z.shape[1] < 50
+    True
+    >>> w = a.dot(z).dot(z.T)
+    >>> np.linalg.norm(w + w.T + b.dot(b.T)) < 1e-8 * n**2
+    True
+
+    """
+    a, sparse = _lowrank_validate(a)
+    b = _lowrank_factor(b, a.shape[0], 'b')
+    real = not (np.iscomplexobj(a) or np.iscomplexobj(b))
+    shifts = _ShiftSelector(shifts, b, real)
+
+    bnorm = norm(b, 2)**2
+    w = b
+    blocks = []
+    for it in range(_check_maxiter(maxiter)):
+        if bnorm == 0:
+            break
+        sigma = shifts.next(lambda v: a.dot(v))
+        v = _shifted_solver(a, sigma, sparse, shifts.cache)(w)
+        w = w - 2*sigma.real*v
+        blocks.append(np.sqrt(-2*sigma.real)*v)
+        shifts.add(v)
+        if norm(w, 2)**2 <= tol*bnorm:
+            break
+    else:
+        warnings.warn('LR-ADI did not converge in %d iterations; the '
+                      'relative residual is %g.'
+                      % (maxiter, norm(w, 2)**2/bnorm), LinAlgWarning,
+                      stacklevel=2)
+
+    return _compress_factor(blocks, b, real)
+
+
+def solve_continuous_are_lowrank(a, b, c, tol=1e-10, maxiter=100,
+                                 shifts=None):
+    r"""
+    Low-rank solution of the continuous-time algebraic Riccati equation
+    :math:`A^HX + XA - XBB^HX + C^HC = 0`.
+
+    For a large and sparse :math:`A`, and :math:`B` and :math:`C` with few
+    columns and rows respectively, the stabilizing solution is numerically
+    of low rank.  It is computed as a factor :math:`Z` with
+    :math:`X \approx ZZ^H` by the RADI iteration [1]_, which never forms
+    :math:`X`.
+
+    Parameters
+    ----------
+    a : (M, M) array_like or sparse matrix
+        Square matrix.
+    b : (M, N) array_like
+        Input matrix.  For a weighting :math:`R` of the input, as in
+        `solve_continuous_are`, pass :math:`BR^{-1/2}`.
+    c : (P, M) array_like
+        Output matrix, such that :math:`Q = C^HC`.
+    tol : float, optional
+        Tolerance on the relative residual,
+        :math:`\|A^HX + XA - XBB^HX + C^HC\|_2 / \|C^HC\|_2`.
+        Default: 1e-10.
+    maxiter : int, optional
+        Maximum number of steps.  Default: 100.
+    shifts : array_like, optional
+        Shifts with negative real parts, used cyclically.  For real
+        inputs, complex shifts should appear in consecutive complex
+        conjugate pairs.  By default, the shifts are the Ritz values of the
+        current closed-loop matrix :math:`A^H - KB^H` on the space spanned
+        by the previous steps, reflected into the left half plane.
+
+    Returns
+    -------
+    z : (M, K) ndarray
+        Factor of the solution, :math:`X \approx ZZ^H`, with orthogonal
+        columns and ``K`` the numerical rank of the solution.  `z` is real
+        if `a`, `b` and `c` are real.
+
+    Raises
+    ------
+    LinAlgError
+        If no shifts with negative real parts can be found.
+
+    Warns
+    -----
+    LinAlgWarning
+        If the iteration does not converge in `maxiter` steps.
+
+    See Also
+    --------
+    solve_continuous_are : dense solver
+    solve_continuous_lyapunov_lowrank : low-rank solutions of Lyapunov
+        equations
+
+    Notes
+    -----
+    RADI extends the LR-ADI iteration for Lyapunov equations to Riccati
+    equations.  Each step solves a system with the shifted closed-loop
+    matrix :math:`A^H - KB^H + \sigma I`, where :math:`K = XB` is the
+    feedback of the current iterate, through a sparse LU decomposition of
+    :math:`A^H + \sigma I` and the Sherman-Morrison-Woodbury formula.  The
+    residual of the iterate is :math:`RR^H`, with :math:`R` updated along
+    the iteration, which gives a cheap stopping criterion.
+
+    .. versionadded:: 1.2.0
+
+    References
+    ----------
+    .. [1] P. Benner, Z. Bujanovic, P. Kurschner, J. Saak, "RADI: a
+       low-rank ADI-type algorithm for large scale algebraic Riccati
+       equations", Numer. Math., 2018, Vol.138(2),
+       DOI: 10.1007/s00211-017-0907-5
+
+    Examples
+    --------
+    >>> from scipy import sparse
+    >>> from scipy.linalg import solve_continuous_are_lowrank
+    >>> n = 2000
+    >>> a = -sparse.diags([-1, 2, -1], [-1, 0, 1], shape=(n, n)) * n**2
+    >>> b = np.zeros((n, 1))
+    >>> b[0] = n
+    >>> c = np.ones((1, n)) / n
+    >>> z = solve_continuous_are_lowrank(a, b, c)
+    >>> x_b = z.dot(z.T.dot(b))
+    >>> w = a.T.dot(z).dot(z.T)
+    >>> res = w + w.T - x_b.dot(x_b.T) + c.T.dot(c)
+    >>> np.linalg.norm(res) < 1e-8
+    True
+
+    """
+    a, sparse = _lowrank_validate(a)
+    n = a.shape[0]
+    b = _lowrank_factor(b, n, 'b')
+    c = _lowrank_factor(np.asarray(c).conj().T, n, 'c')
+    real = not any(np.iscomplexobj(x) for x in (a, b, c))
+    shifts = _ShiftSelector(shifts, c, real)
+    ah = a.conj().T
+    if sparse:
+        ah = ah.tocsc()
+
+    cnorm = norm(c, 2)**2
+    r = c
+    k = np.zeros(b.shape, dtype=b.dtype)
+    blocks = []
+    for it in range(_check_maxiter(maxiter)):
+        if cnorm == 0:
+            break
+        sigma = shifts.next(lambda v: ah.dot(v) - k.dot(b.conj().T.dot(v)))
+
+        # Solve (a^H - k b^H + sigma I) v = r by Sherman-Morrison-Woodbury
+        solver = _shifted_solver(ah, sigma, sparse, shifts.cache)
+        vr = solver(r)
+        vk = solver(k)
+        small = np.eye(b.shape[1]) - b.conj().T.dot(vk)
+        v = vr + vk.dot(solve(small, b.conj().T.dot(vr)))
+        shifts.add(v)
+
+        v *= np.sqrt(-2*sigma.real)
+        g = v.conj().T.dot(b)
+        y = np.eye(r.shape[1]) - g.dot(g.conj().T) / (2*sigma.real)
+        yv = solve(y, v.conj().T, assume_a='pos').conj().T
+        r = r + np.sqrt(-2*sigma.real)*yv
+        k = k + yv.dot(g)
+
+        # x = v y^-1 v^H = (v l^-H) (v l^-H)^H  with  y = l l^H
+        low = cholesky(y, lower=True)
+        blocks.append(solve_triangular(low, v.conj().T,
+                                       lower=True).conj().T)
+        if norm(r, 2)**2 <= tol*cnorm:
+            break
+    else:
+        warnings.warn('RADI did not converge in %d iterations; the relative '
+                      'residual is %g.' % (maxiter, norm(r, 2)**2/cnorm),
+                      LinAlgWarning, stacklevel=2)
+
+    return _compress_factor(blocks, c, real)
+
+
+def _lowrank_validate(a):
+    """Square `a`, as a CSC matrix if it is sparse, and whether it is."""
+    from scipy.sparse import isspmatrix
+    if isspmatrix(a):
+        a = a.tocsc()
+        sparse = True
+    else:
+        a = np.atleast_2d(_asarray_validated(a, check_finite=True))
+        sparse = False
+    if a.ndim != 2 or a.shape[0] != a.shape[1]:
+        raise ValueError("Matrix a should be square.")
+    return a, sparse
+
+
+def _lowrank_factor(b, n, name):
+    b = _asarray_validated(b, check_finite=True)
+    if b.ndim == 1:
+        b = b[:, np.newaxis]
+    if b.ndim != 2 or b.shape[0] != n:
+        raise ValueError("Matrix a and %s should have compatible shapes."
+                         % name)
+    return b
+
+
+def _check_maxiter(maxiter):
+    maxiter = int(maxiter)
+    if maxiter < 1:
+        raise ValueError("maxiter must be a positive integer.")
+    return maxiter
+
+
+def _shifted_solver(a, sigma, sparse, cache):
+    """
+    Function solving ``(a + sigma I) x = b``.  The factorizations are kept
+    in `cache`, keyed by the shift.
+    """
+    if sigma not in cache:
+        n = a.shape[0]
+        if sparse:
+            from scipy.sparse import identity
+            from scipy.sparse.linalg import splu
+            shifted = (a + sigma*identity(n, format='csc')).tocsc()
+            try:
+                lu = splu(shifted)
+            except RuntimeError:
+                raise LinAlgError("The matrix shifted by %s is singular."
+                                  % (sigma,))
+            dtype = shifted.dtype
+
+            def solver(b):
+                if np.iscomplexobj(b) and dtype.kind != 'c':
+                    return lu.solve(b.real) + 1j*lu.solve(b.imag)
+                return lu.solve(b.astype(dtype))
+        else:
+            lu_piv = lu_factor(a + sigma*np.eye(n), check_finite=False)
+
+            def solver(b):
+                return lu_solve(lu_piv, b, check_finite=False)
+        cache[sigma] = solver
+    return cache[sigma]
+
+
+class _ShiftSelector(object):
+    """
+    Shifts of the low-rank ADI-type iterations, either given by the user
+    and used cyclically, or computed as projection shifts: the Ritz values
+    of the iteration matrix on the span of the blocks computed with the
+    previous set of shifts, reflected into the left half plane.
+    """
+
+    def __init__(self, shifts, initial, real):
+        self.real = real
+        self.cache = {}
+        self.blocks = [initial]
+        if shifts is None:
+            self.user = None
+        else:
+            self.user = [complex(sigma) for sigma in np.ravel(shifts)]
+            if not self.user or any(sigma.real >= 0 for sigma in self.user):
+                raise ValueError("The shifts should have negative real "
+                                 "parts.")
+        self.queue = []
+
+    def add(self, v):
+        self.blocks.append(v)
+
+    def next(self, matvec):
+        """Next shift; `matvec` is the product with the iteration matrix."""
+        if not self.queue:
+            if self.user is not None:
+                self.queue = list(self.user)
+            else:
+                self.queue = self._projection_shifts(matvec)
+                self.cache.clear()
+            self.blocks = []
+        sigma = self.queue.pop(0)
+        if self.real and sigma.imag == 0:
+            sigma = sigma.real
+        return sigma
+
+    def _projection_shifts(self, matvec):
+        v = np.hstack(self.blocks)
+        if self.real and np.iscomplexobj(v):
+            v = np.hstack((v.real, v.imag))
+        q = orth(v)
+        shifts = []
+        for ritz in eigvals(q.conj().T.dot(matvec(q))):
+            if ritz.real == 0 or (self.real and ritz.imag < 0):
+                continue
+            sigma = complex(-abs(ritz.real), ritz.imag)
+            shifts.append(sigma)
+            if self.real and sigma.imag != 0:
+                # conjugate pairs of shifts, one after the other
+                shifts.append(sigma.conjugate())
+        if not shifts:
+            raise LinAlgError("Could not find shifts with negative real "
+                              "parts.")
+        return shifts
+
+def _compress_factor(blocks, b, real):
+    """Factor ``z`` with orthogonal columns and ``z z^H = x x^H``."""
+    n = b.shape[0]
+    if not blocks:
+        return np.zeros((n, 0), dtype=float if real else complex)
+    x = np.hstack(blocks)
+    if real and np.iscomplexobj(x):
+        # x x^H is real, up to the last incomplete pair of shifts
+        x = np.hstack((x.real, x.imag))
+    q, r = qr(x, mode='economic')
+    u, s, _ = svd(r)
+    rank = np.count_nonzero(s > np.sqrt(np.finfo(s.dtype).eps) * s[0])
+    return q.dot(u[:, :rank] * s[:rank])
+
+
 def _are_validate_args(a, b, q, r, e, s, eq_type='care'):
     """
     A helper function to validate the arguments supplied to the
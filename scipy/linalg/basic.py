@@ -10,14 +10,15 @@ from warnings import warn
 import numpy as np
 from numpy import atleast_1d, atleast_2d
 from .flinalg import get_flinalg_funcs
-from .lapack import get_lapack_funcs, _compute_lwork
+from .lapack import get_lapack_funcs, _compute_lwork, find_best_lapack_type
 from .misc import LinAlgError, _datacopied, LinAlgWarning
 from .decomp import _asarray_validated
-from . import decomp, decomp_svd
-from ._solve_toeplitz import levinson
+from . import decomp, decomp_svd, _batched
+from scipy.fftpack import next_fast_len
 
 __all__ = ['solve', 'solve_triangular', 'solveh_banded', 'solve_banded',
-           'solve_toeplitz', 'solve_circulant', 'inv', 'det', 'lstsq',
+           'solve_toeplitz', 'solve_toeplitz_stack', 'matmul_toeplitz',
+           'solve_circulant', 'inv', 'det', 'lstsq',
            'pinv', 'pinv2', 'pinvh', 'matrix_balance']
 
 
@@ -30,7 +31,7 @@ def _solve_check(n, info, lamch=None, rcond=None):
     elif 0 < info:
         raise LinAlgError('Matrix is singular.')
 
-    if lamch is None:
+    if lamch is None or rcond is None:
         return
     E = lamch('E')
     if rcond < E:
@@ -41,7 +42,7 @@ def _solve_check(n, info, lamch=None, rcond=None):
 
 def solve(a, b, sym_pos=False, lower=False, overwrite_a=False,
           overwrite_b=False, debug=None, check_finite=True, assume_a='gen',
-          transposed=False):
+          transposed=False, workers=1, mixed_precision=False):
     """
     Solves the linear equation set ``a * x = b`` for the unknown ``x``
     for square ``a`` matrix.
@@ -66,10 +67,11 @@ def solve(a, b, sym_pos=False, lower=False, overwrite_a=False,
 
     Parameters
     ----------
-    a : (N, N) array_like
-        Square input data
-    b : (N, NRHS) array_like
-        Input data for the right hand side.
+    a : (..., N, N) array_like
+        Square input data, or a stack of square matrices.
+    b : (..., N, NRHS) array_like
+        Input data for the right hand side.  For a stack `a`, `b` is a
+        stack of vectors if it has one dimension less than `a`.
     sym_pos : bool, optional
         Assume `a` is symmetric and positive definite. This key is deprecated
         and assume_a = 'pos' keyword is recommended instead. The functionality
@@ -92,10 +94,24 @@ def solve(a, b, sym_pos=False, lower=False, overwrite_a=False,
     transposed: bool, optional
         If True, ``a^T x = b`` for real matrices, raises `NotImplementedError`
         for complex matrices (only for True).
+    workers : int, optional
+        Number of threads over which a stack of matrices is split.  ``-1``
+        uses all CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
+    mixed_precision : bool, optional
+        If True, double precision systems with ``'gen'`` or ``'pos'``
+        structure are factorized in single precision, and the solution is
+        brought to double precision accuracy by iterative refinement.  If
+        the refinement does not converge, the system is solved in double
+        precision instead.  Ignored for stacks of matrices, for single
+        precision data and with `transposed`.  Default: False.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
-    x : (N, NRHS) ndarray
+    x : (..., N, NRHS) ndarray
         The solution array.
 
     Raises
@@ -132,12 +148,40 @@ def solve(a, b, sym_pos=False, lower=False, overwrite_a=False,
     The generic, symmetric, hermitian and positive definite solutions are
     obtained via calling ?GESV, ?SYSV, ?HESV, and ?POSV routines of
     LAPACK respectively.
+
+    With `mixed_precision`, the generic and positive definite solutions are
+    obtained with the DSGESV/ZCGESV and DSPOSV/ZCPOSV routines of LAPACK,
+    which factorize a single precision copy of `a`.  For large systems, the
+    factorization dominates and runs about twice as fast on half the
+    memory traffic, while the refinement steps only need products with
+    `a`.  The refinement converges when the condition number of `a` is well
+    below the inverse of the single precision machine epsilon, about
+    ``1e7``; the condition number is only estimated, and a warning issued,
+    when the routines fall back to double precision.
+
+    Stacks of matrices, of shape ``(..., N, N)``, are solved in a single
+    compiled loop over the LAPACK routines.  The batch dimensions of `a` and
+    `b` are broadcast against each other.  The condition number is not
+    checked for stacks, and the input arrays are never overwritten.
+
+    .. versionadded:: 1.2.0
+       Support for stacks of matrices.
     """
     # Flags for 1D or nD right hand side
     b_is_1D = False
 
     a1 = atleast_2d(_asarray_validated(a, check_finite=check_finite))
     b1 = atleast_1d(_asarray_validated(b, check_finite=check_finite))
+
+    if a1.ndim > 2:
+        if sym_pos:
+            assume_a = 'pos'
+        if assume_a not in ('gen', 'sym', 'her', 'pos'):
+            raise ValueError('{} is not a recognized matrix structure'
+                             ''.format(assume_a))
+        return _batched.solve(a1, b1, assume_a=assume_a, lower=lower,
+                              transposed=transposed, workers=workers)
+
     n = a1.shape[0]
 
     overwrite_a = overwrite_a or _datacopied(a1, a)
@@ -208,16 +252,28 @@ def solve(a, b, sym_pos=False, lower=False, overwrite_a=False,
 
     anorm = lange(norm, a1)
 
+    mixed = None
+    if mixed_precision and not transposed:
+        mixed = _mixed_precision_solver(assume_a, a1, b1)
+
     # Generalized case 'gesv'
     if assume_a == 'gen':
         gecon, getrf, getrs = get_lapack_funcs(('gecon', 'getrf', 'getrs'),
                                                (a1, b1))
-        lu, ipvt, info = getrf(a1, overwrite_a=overwrite_a)
-        _solve_check(n, info)
-        x, info = getrs(lu, ipvt, b1,
-                        trans=trans, overwrite_b=overwrite_b)
-        _solve_check(n, info)
-        rcond, info = gecon(lu, anorm, norm=norm)
+        if mixed is not None:
+            lu, ipvt, x, iters, info = mixed(a1, b1, overwrite_a=overwrite_a)
+            _solve_check(n, info)
+            # lu is only the LU decomposition if the refinement failed
+            rcond = None
+            if iters < 0:
+                rcond, info = gecon(lu, anorm, norm=norm)
+        else:
+            lu, ipvt, info = getrf(a1, overwrite_a=overwrite_a)
+            _solve_check(n, info)
+            x, info = getrs(lu, ipvt, b1,
+                            trans=trans, overwrite_b=overwrite_b)
+            _solve_check(n, info)
+            rcond, info = gecon(lu, anorm, norm=norm)
     # Hermitian case 'hesv'
     elif assume_a == 'her':
         hecon, hesv, hesv_lw = get_lapack_funcs(('hecon', 'hesv',
@@ -244,11 +300,19 @@ def solve(a, b, sym_pos=False, lower=False, overwrite_a=False,
     else:
         pocon, posv = get_lapack_funcs(('pocon', 'posv'),
                                        (a1, b1))
-        lu, x, info = posv(a1, b1, lower=lower,
-                           overwrite_a=overwrite_a,
-                           overwrite_b=overwrite_b)
-        _solve_check(n, info)
-        rcond, info = pocon(lu, anorm)
+        if mixed is not None:
+            lu, x, iters, info = mixed(a1, b1, lower=lower,
+                                       overwrite_a=overwrite_a)
+            _solve_check(n, info)
+            rcond = None
+            if iters < 0:
+                rcond, info = pocon(lu, anorm, uplo='L' if lower else 'U')
+        else:
+            lu, x, info = posv(a1, b1, lower=lower,
+                               overwrite_a=overwrite_a,
+                               overwrite_b=overwrite_b)
+            _solve_check(n, info)
+            rcond, info = pocon(lu, anorm)
 
     _solve_check(n, info, lamch, rcond)
 
@@ -258,6 +322,21 @@ def solve(a, b, sym_pos=False, lower=False, overwrite_a=False,
     return x
 
 
+def _mixed_precision_solver(assume_a, a, b):
+    """
+    The LAPACK driver with a single precision factorization and iterative
+    refinement for the structure `assume_a` and the type of `a` and `b`, or
+    None if there is none.
+    """
+    prefix = find_best_lapack_type((a, b))[0]
+    if prefix not in 'dz' or assume_a not in ('gen', 'pos'):
+        return None
+    # dsgesv, zcgesv, dsposv or zcposv
+    name = {'d': 's', 'z': 'c'}[prefix] + {'gen': 'gesv',
+                                            'pos': 'posv'}[assume_a]
+    return get_lapack_funcs(name, (a, b))
+
+
 def solve_triangular(a, b, trans=0, lower=False, unit_diagonal=False,
                      overwrite_b=False, debug=None, check_finite=True):
     """
@@ -591,7 +670,24 @@ def solveh_banded(ab, b, overwrite_ab=False, overwrite_b=False, lower=False,
     return x
 
 
-def solve_toeplitz(c_or_cr, b, check_finite=True):
+def _toeplitz_c_r(c_or_cr, check_finite):
+    if isinstance(c_or_cr, tuple):
+        c, r = c_or_cr
+        c = _asarray_validated(c, check_finite=check_finite).ravel()
+        r = _asarray_validated(r, check_finite=check_finite).ravel()
+    else:
+        c = _asarray_validated(c_or_cr, check_finite=check_finite).ravel()
+        r = c.conjugate()
+    return c, r
+
+
+def _check_toeplitz_method(method):
+    if method not in ('levinson', 'cg'):
+        raise ValueError("method must be 'levinson' or 'cg', got %r"
+                         % (method,))
+
+
+def solve_toeplitz(c_or_cr, b, check_finite=True, method='levinson'):
     """Solve a Toeplitz system using Levinson Recursion
 
     The Toeplitz matrix has constant diagonals, with c as its first column
@@ -613,6 +709,12 @@ def solve_toeplitz(c_or_cr, b, check_finite=True):
         Whether to check that the input matrices contain only finite numbers.
         Disabling may give a performance gain, but may result in problems
         (result entirely NaNs) if the inputs do contain infinities or NaNs.
+    method : {'levinson', 'cg'}, optional
+        ``'levinson'`` (default) uses Levinson-Durbin recursion.  ``'cg'``
+        uses preconditioned conjugate gradients, and requires a Hermitian
+        positive definite Toeplitz matrix.  See Notes.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -620,14 +722,41 @@ def solve_toeplitz(c_or_cr, b, check_finite=True):
         The solution to the system ``T x = b``.  Shape of return matches shape
         of `b`.
 
+    Raises
+    ------
+    LinAlgError
+        If the Levinson recursion meets a singular principal minor, or if
+        the matrix is not positive definite with ``method='cg'``.
+
     See Also
     --------
     toeplitz : Toeplitz matrix
+    solve_toeplitz_stack : Solve a stack of Toeplitz systems
+    matmul_toeplitz : Fast product with a Toeplitz matrix
 
     Notes
     -----
     The solution is computed using Levinson-Durbin recursion, which is faster
     than generic least-squares methods, but can be less numerically stable.
+    It takes O(M**2) operations, and all the columns of `b` are solved in a
+    single recursion.
+
+    With ``method='cg'``, the system is solved with conjugate gradients,
+    preconditioned with the optimal circulant approximation of T. Chan [1]_.
+    The products with the Toeplitz matrix and the preconditioner are computed
+    with FFTs in O(M log M) operations, and for well-conditioned matrices,
+    such as the autocovariance matrices of autoregressive processes, the
+    iteration converges to the working precision in a number of steps that
+    does not grow with M [2]_.  This is much faster than the recursion for
+    large M.  A `LinAlgWarning` is emitted if the iteration did not converge
+    in 2*M steps.
+
+    References
+    ----------
+    .. [1] T. F. Chan, "An optimal circulant preconditioner for Toeplitz
+           systems", SIAM J. Sci. Stat. Comput., 9(4):766-771, 1988.
+    .. [2] R. H. Chan and M. K. Ng, "Conjugate gradient methods for Toeplitz
+           systems", SIAM Review, 38(3):427-482, 1996.
 
     Examples
     --------
@@ -661,13 +790,8 @@ def solve_toeplitz(c_or_cr, b, check_finite=True):
     # If numerical stability of this algorithm is a problem, a future
     # developer might consider implementing other O(N^2) Toeplitz solvers,
     # such as GKO (https://www.jstor.org/stable/2153371) or Bareiss.
-    if isinstance(c_or_cr, tuple):
-        c, r = c_or_cr
-        c = _asarray_validated(c, check_finite=check_finite).ravel()
-        r = _asarray_validated(r, check_finite=check_finite).ravel()
-    else:
-        c = _asarray_validated(c_or_cr, check_finite=check_finite).ravel()
-        r = c.conjugate()
+    _check_toeplitz_method(method)
+    c, r = _toeplitz_c_r(c_or_cr, check_finite)
 
     # Form a 1D array of values to be used in the matrix, containing a reversed
     # copy of r[1:], followed by c.
@@ -685,17 +809,208 @@ def solve_toeplitz(c_or_cr, b, check_finite=True):
         vals = np.asarray(vals, dtype=np.double, order='c')
         b = np.asarray(b, dtype=np.double)
 
-    if b.ndim == 1:
-        x, _ = levinson(vals, np.ascontiguousarray(b))
+    # The right-hand sides are the rows of a stack of a single system
+    b1 = np.ascontiguousarray(b.reshape(b.shape[0], -1).T[np.newaxis])
+    x, info = _batched._solve_toeplitz(vals[np.newaxis], b1, method, 1)
+    if info[0]:
+        raise LinAlgError('Singular principal minor')
+    return x[0].T.reshape(b.shape)
+
+
+def solve_toeplitz_stack(c_or_cr, b, check_finite=True, method='levinson',
+                         workers=1):
+    """
+    Solve a stack of Toeplitz systems.
+
+    The i-th Toeplitz matrix of the stack has constant diagonals, with
+    ``c[i]`` as its first column and ``r[i]`` as its first row.  If `r` is
+    not given, ``r == conjugate(c)`` is assumed.
+
+    .. versionadded:: 1.2.0
+
+    Parameters
+    ----------
+    c_or_cr : array_like or tuple of (array_like, array_like)
+        The first columns ``c``, of shape ``(..., N)``, or a tuple of arrays
+        (``c``, ``r``) where the first rows ``r`` are of shape ``(..., N)``
+        too.  ``r[..., 0]`` is ignored.
+    b : (..., N) or (..., N, K) array_like
+        Right-hand sides in ``T x = b``.  `b` is a stack of vectors if it has
+        as many dimensions as ``c`` and ``r``.
+    check_finite : bool, optional
+        Whether to check that the input matrices contain only finite numbers.
+        Disabling may give a performance gain, but may result in problems
+        (result entirely NaNs) if the inputs do contain infinities or NaNs.
+    method : {'levinson', 'cg'}, optional
+        The solver, as in `solve_toeplitz`.
+    workers : int, optional
+        Number of threads over which the stack is split, with
+        ``method='levinson'``.  ``-1`` uses all CPUs.  Default: 1.
+
+    Returns
+    -------
+    x : (..., N) or (..., N, K) ndarray
+        The solutions of the systems ``T x = b``.
+
+    Raises
+    ------
+    LinAlgError
+        If the Levinson recursion meets a singular principal minor, or if
+        a matrix is not positive definite with ``method='cg'``.
+
+    See Also
+    --------
+    solve_toeplitz : Solve a single Toeplitz system
+
+    Notes
+    -----
+    Unlike in `solve_toeplitz`, ``c`` and ``r`` are not flattened: their
+    last axis holds the entries of the matrices, and their other axes are
+    broadcast against each other and against the stack of right-hand sides.
+
+    With ``method='levinson'``, the systems are solved in a single compiled
+    loop which runs without the GIL, so that they can be split over several
+    threads.  With ``method='cg'``, all the systems are iterated together.
+
+    Examples
+    --------
+    Fit autoregressive models of order 3 to 4 time series with the
+    Yule-Walker equations, whose matrices are the Toeplitz matrices of the
+    sample autocovariances.
+
+    >>> from scipy.linalg import solve_toeplitz_stack, solve_toeplitz
+    >>> np.random.seed(1234)
+    >>> y = np.random.randn(4, 1000)
+    >>> acov = np.array([(y[:, k:] * y[:, :1000-k]).mean(axis=1)
+    ...                  for k in range(4)]).T
+    >>> phi = solve_toeplitz_stack(acov[:, :3], acov[:, 1:])
+    >>> phi.shape
+    (4, 3)
+    >>> np.allclose(phi[2], solve_toeplitz(acov[2, :3], acov[2, 1:]))
+    True
+
+    """
+    _check_toeplitz_method(method)
+    if isinstance(c_or_cr, tuple):
+        c, r = c_or_cr
+        c = atleast_1d(_asarray_validated(c, check_finite=check_finite))
+        r = atleast_1d(_asarray_validated(r, check_finite=check_finite))
     else:
-        b_shape = b.shape
-        b = b.reshape(b.shape[0], -1)
-        x = np.column_stack(
-            (levinson(vals, np.ascontiguousarray(b[:, i]))[0])
-            for i in range(b.shape[1]))
-        x = x.reshape(*b_shape)
+        c = atleast_1d(_asarray_validated(c_or_cr,
+                                          check_finite=check_finite))
+        r = c.conjugate()
+    b = atleast_1d(_asarray_validated(b, check_finite=check_finite))
+    return _batched.solve_toeplitz(c, r, b, method=method, workers=workers)
 
-    return x
+
+def matmul_toeplitz(c_or_cr, x, check_finite=False):
+    """
+    Efficient Toeplitz matrix-matrix multiplication using FFT.
+
+    This function returns the matrix multiplication between a Toeplitz
+    matrix and a dense matrix.
+
+    The Toeplitz matrix has constant diagonals, with c as its first column
+    and r as its first row.  If r is not given, ``r == conjugate(c)`` is
+    assumed.
+
+    .. versionadded:: 1.2.0
+
+    Parameters
+    ----------
+    c_or_cr : array_like or tuple of (array_like, array_like)
+        The vector ``c``, or a tuple of arrays (``c``, ``r``). Whatever the
+        actual shape of ``c``, it will be converted to a 1-D array. If not
+        supplied, ``r = conjugate(c)`` is assumed; in this case, if c[0] is
+        real, the Toeplitz matrix is Hermitian. r[0] is ignored; the first row
+        of the Toeplitz matrix is ``[c[0], r[1:]]``.  Whatever the actual shape
+        of ``r``, it will be converted to a 1-D array.
+    x : (N,) or (N, K) array_like
+        Matrix with which to multiply.  The Toeplitz matrix is of shape
+        ``(M, N)``, where M is the length of ``c`` and N the length of
+        ``r``.
+    check_finite : bool, optional
+        Whether to check that the input matrices contain only finite numbers.
+        Disabling may give a performance gain, but may result in problems
+        (result entirely NaNs) if the inputs do contain infinities or NaNs.
+        Default: False.
+
+    Returns
+    -------
+    T @ x : (M,) or (M, K) ndarray
+        The result of the matrix multiplication ``T @ x``.  Shape of return
+        matches shape of `x`, with the first axis of length M.
+
+    See Also
+    --------
+    toeplitz : Toeplitz matrix
+    solve_toeplitz : Solve a Toeplitz system using Levinson Recursion
+
+    Notes
+    -----
+    The Toeplitz matrix is embedded in a circulant matrix, and the product
+    is computed with FFTs in O((M + N) log(M + N)) operations, instead of
+    the O(M N) of the dense product.
+
+    Examples
+    --------
+    Multiply the Toeplitz matrix T with matrix x::
+
+            [ 1 -1 -2 -3]       [1 10]
+        T = [ 3  1 -1 -2]   x = [2 11]
+            [ 6  3  1 -1]       [2 11]
+            [10  6  3  1]       [5 19]
+
+    To specify the Toeplitz matrix, only the first column and the first
+    row are needed.
+
+    >>> c = np.array([1, 3, 6, 10])    # First column of T
+    >>> r = np.array([1, -1, -2, -3])  # First row of T
+    >>> x = np.array([[1, 10], [2, 11], [2, 11], [5, 19]])
+
+    >>> from scipy.linalg import toeplitz, matmul_toeplitz
+    >>> matmul_toeplitz((c, r), x)
+    array([[ -20.,  -80.],
+           [  -7.,   -8.],
+           [   9.,   85.],
+           [  33.,  218.]])
+
+    Check the result by creating the full Toeplitz matrix and
+    multiplying it by ``x``.
+
+    >>> toeplitz(c, r) @ x
+    array([[-20, -80],
+           [ -7,  -8],
+           [  9,  85],
+           [ 33, 218]])
+
+    """
+    c, r = _toeplitz_c_r(c_or_cr, check_finite)
+    x = _asarray_validated(x, check_finite=check_finite)
+    m, n = c.shape[0], r.shape[0]
+    if x.ndim == 0 or x.shape[0] != n:
+        raise ValueError('incompatible dimensions')
+
+    x_shape = x.shape
+    x = x.reshape(n, -1)
+    if m == 0 or n == 0:
+        dtype = np.result_type(c, r, x, 1.0)
+        return np.zeros((m,) + x_shape[1:], dtype=dtype)
+
+    # The product is the leading part of the product of the circulant matrix
+    # with first column [c, 0, ..., 0, r[n-1], ..., r[1]] with x padded with
+    # zeros.
+    nfft = next_fast_len(m + n - 1)
+    if np.iscomplexobj(c) or np.iscomplexobj(r) or np.iscomplexobj(x):
+        fft, ifft = np.fft.fft, np.fft.ifft
+        col = np.zeros(nfft, dtype=np.complex128)
+    else:
+        fft, ifft = np.fft.rfft, np.fft.irfft
+        col = np.zeros(nfft)
+    col[:m] = c
+    col[nfft-n+1:] = r[:0:-1]
+    y = ifft(fft(col)[:, np.newaxis] * fft(x, nfft, axis=0), nfft, axis=0)
+    return y[:m].reshape((m,) + x_shape[1:])
 
 
 def _get_axis_len(aname, a, axis):
@@ -904,20 +1219,25 @@ def solve_circulant(c, b, singular='raise', tol=None,
 
 
 # matrix inversion
-def inv(a, overwrite_a=False, check_finite=True):
+def inv(a, overwrite_a=False, check_finite=True, workers=1):
     """
     Compute the inverse of a matrix.
 
     Parameters
     ----------
-    a : array_like
-        Square matrix to be inverted.
+    a : (..., M, M) array_like
+        Square matrix to be inverted, or a stack of square matrices.
     overwrite_a : bool, optional
         Discard data in `a` (may improve performance). Default is False.
     check_finite : bool, optional
         Whether to check that the input matrix contains only finite numbers.
         Disabling may give a performance gain, but may result in problems
         (crashes, non-termination) if the inputs do contain infinities or NaNs.
+    workers : int, optional
+        Number of threads over which a stack of matrices is split.  ``-1``
+        uses all CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -929,7 +1249,15 @@ def inv(a, overwrite_a=False, check_finite=True):
     LinAlgError
         If `a` is singular.
     ValueError
-        If `a` is not square, or not 2-dimensional.
+        If `a` is not square, or less than 2-dimensional.
+
+    Notes
+    -----
+    Stacks of matrices are inverted in a single compiled loop over the
+    LAPACK routines.
+
+    .. versionadded:: 1.2.0
+       Support for stacks of matrices.
 
     Examples
     --------
@@ -944,6 +1272,8 @@ def inv(a, overwrite_a=False, check_finite=True):
 
     """
     a1 = _asarray_validated(a, check_finite=check_finite)
+    if a1.ndim > 2:
+        return _batched.inv(a1, workers=workers)
     if len(a1.shape) != 2 or a1.shape[0] != a1.shape[1]:
         raise ValueError('expected square matrix')
     overwrite_a = overwrite_a or _datacopied(a1, a)
@@ -981,7 +1311,7 @@ def inv(a, overwrite_a=False, check_finite=True):
 
 # Determinant
 
-def det(a, overwrite_a=False, check_finite=True):
+def det(a, overwrite_a=False, check_finite=True, workers=1):
     """
     Compute the determinant of a matrix
 
@@ -998,24 +1328,33 @@ def det(a, overwrite_a=False, check_finite=True):
 
     Parameters
     ----------
-    a : (M, M) array_like
-        A square matrix.
+    a : (..., M, M) array_like
+        A square matrix, or a stack of square matrices.
     overwrite_a : bool, optional
         Allow overwriting data in a (may enhance performance).
     check_finite : bool, optional
         Whether to check that the input matrix contains only finite numbers.
         Disabling may give a performance gain, but may result in problems
         (crashes, non-termination) if the inputs do contain infinities or NaNs.
+    workers : int, optional
+        Number of threads over which a stack of matrices is split.  ``-1``
+        uses all CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
-    det : float or complex
-        Determinant of `a`.
+    det : float or complex, or ndarray
+        Determinant of `a`, or an array of shape ``(...)`` with the
+        determinants of a stack.
 
     Notes
     -----
     The determinant is computed via LU factorization, LAPACK routine z/dgetrf.
 
+    .. versionadded:: 1.2.0
+       Support for stacks of matrices.
+
     Examples
     --------
     >>> from scipy import linalg
@@ -1028,6 +1367,8 @@ def det(a, overwrite_a=False, check_finite=True):
 
     """
     a1 = _asarray_validated(a, check_finite=check_finite)
+    if a1.ndim > 2:
+        return _batched.det(a1, workers=workers)
     if len(a1.shape) != 2 or a1.shape[0] != a1.shape[1]:
         raise ValueError('expected square matrix')
     overwrite_a = overwrite_a or _datacopied(a1, a)
@@ -1046,7 +1387,7 @@ class LstsqLapackError(LinAlgError):
 
 
 def lstsq(a, b, cond=None, overwrite_a=False, overwrite_b=False,
-          check_finite=True, lapack_driver=None):
+          check_finite=True, lapack_driver=None, workers=1):
     """
     Compute least-squares solution to equation Ax = b.
 
@@ -1054,10 +1395,12 @@ def lstsq(a, b, cond=None, overwrite_a=False, overwrite_b=False,
 
     Parameters
     ----------
-    a : (M, N) array_like
-        Left hand side matrix (2-D array).
-    b : (M,) or (M, K) array_like
-        Right hand side matrix or vector (1-D or 2-D array).
+    a : (..., M, N) array_like
+        Left hand side matrix (2-D array), or a stack of matrices.
+    b : (..., M) or (..., M, K) array_like
+        Right hand side matrix or vector (1-D or 2-D array).  For a stack
+        `a`, `b` is a stack of vectors if it has one dimension less than
+        `a`.
     cond : float, optional
         Cutoff for 'small' singular values; used to determine effective
         rank of a. Singular values smaller than
@@ -1075,9 +1418,15 @@ def lstsq(a, b, cond=None, overwrite_a=False, overwrite_b=False,
         Options are ``'gelsd'``, ``'gelsy'``, ``'gelss'``. Default
         (``'gelsd'``) is a good choice.  However, ``'gelsy'`` can be slightly
         faster on many problems.  ``'gelss'`` was used historically.  It is
-        generally slow but uses less memory.
+        generally slow but uses less memory.  Stacks of matrices are only
+        supported by ``'gelsd'``.
 
         .. versionadded:: 0.17.0
+    workers : int, optional
+        Number of threads over which a stack of matrices is split.  ``-1``
+        uses all CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -1106,6 +1455,17 @@ def lstsq(a, b, cond=None, overwrite_a=False, overwrite_b=False,
     --------
     optimize.nnls : linear least squares with non-negativity constraint
 
+    Notes
+    -----
+    Stacks of matrices are solved in a single compiled loop over the LAPACK
+    routines, with the batch dimensions of `a` and `b` broadcast against
+    each other.  Then `residues` has shape ``(..., K)`` (or ``(...)`` for
+    stacks of vectors) if ``M > N``, with NaN for the rank deficient
+    matrices, and `rank` is an array of shape ``(...)``.
+
+    .. versionadded:: 1.2.0
+       Support for stacks of matrices.
+
     Examples
     --------
     >>> from scipy.linalg import lstsq
@@ -1153,6 +1513,11 @@ def lstsq(a, b, cond=None, overwrite_a=False, overwrite_b=False,
     """
     a1 = _asarray_validated(a, check_finite=check_finite)
     b1 = _asarray_validated(b, check_finite=check_finite)
+    if a1.ndim > 2:
+        if lapack_driver not in (None, 'gelsd'):
+            raise ValueError('LAPACK driver "%s" does not support stacks of '
+                             'matrices' % lapack_driver)
+        return _batched.lstsq(a1, b1, cond=cond, workers=workers)
     if len(a1.shape) != 2:
         raise ValueError('expected matrix')
     m, n = a1.shape
@@ -209,6 +209,8 @@ from __future__ import division, print_function, absolute_import
 
 __all__ = ['get_blas_funcs', 'find_best_blas_type']
 
+import functools as _functools
+
 import numpy as _np
 
 from scipy.linalg import _fblas
@@ -340,6 +342,47 @@ def _get_funcs(names, arrays, dtype,
         return funcs
 
 
+def _memoize_get_funcs(func):
+    """
+    Memoized fast path for _get_funcs instances.
+
+    The functions found are cached under the names, the dtype and the type
+    and memory order of the arrays, which determine them completely.
+    """
+    memo = {}
+    func.memo = memo
+
+    @_functools.wraps(func)
+    def getter(names, arrays=(), dtype=None):
+        key = (names, dtype)
+        for array in arrays:
+            # cf. find_best_blas_type
+            key += (array.dtype.char, array.flags.fortran)
+
+        try:
+            value = memo.get(key)
+        except TypeError:
+            # unhashable key, e.g. a list of names
+            key = None
+            value = None
+
+        if value is not None:
+            if isinstance(value, tuple):
+                # a fresh list, which the caller may modify
+                return list(value)
+            return value
+
+        value = func(names, arrays, dtype)
+
+        if key is not None:
+            memo[key] = tuple(value) if isinstance(value, list) else value
+
+        return value
+
+    return getter
+
+
+@_memoize_get_funcs
 def get_blas_funcs(names, arrays=(), dtype=None):
     """Return available BLAS function objects from names.
 
@@ -378,6 +421,11 @@ def get_blas_funcs(names, arrays=(), dtype=None):
     The code and the dtype are stored in attributes `typecode` and `dtype`
     of the returned functions.
 
+    The lookup is cached, so that repeated calls with the same names, dtype
+    and types and memory orders of `arrays` only cost a dictionary lookup.
+    The wrappers of the level 2 and level 3 routines release the GIL while
+    the BLAS routine runs.
+
     Examples
     --------
     >>> import scipy.linalg as LA
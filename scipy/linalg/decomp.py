@@ -28,6 +28,8 @@ from scipy._lib._util import _asarray_validated
 from scipy._lib.six import string_types
 from .misc import LinAlgError, _datacopied, norm
 from .lapack import get_lapack_funcs, _compute_lwork
+from .blas import get_blas_funcs
+from . import _batched
 
 
 _I = cast['F'](1j)
@@ -269,7 +271,8 @@ def eig(a, b=None, left=False, right=True, overwrite_a=False,
 
 def eigh(a, b=None, lower=True, eigvals_only=False, overwrite_a=False,
          overwrite_b=False, turbo=True, eigvals=None, type=1,
-         check_finite=True):
+         check_finite=True, workers=1, subset_by_index=None,
+         subset_by_value=None, driver=None):
     """
     Solve an ordinary or generalized eigenvalue problem for a complex
     Hermitian or real symmetric matrix.
@@ -283,9 +286,9 @@ def eigh(a, b=None, lower=True, eigvals_only=False, overwrite_a=False,
 
     Parameters
     ----------
-    a : (M, M) array_like
+    a : (..., M, M) array_like
         A complex Hermitian or real symmetric matrix whose eigenvalues and
-        eigenvectors will be computed.
+        eigenvectors will be computed, or a stack of such matrices.
     b : (M, M) array_like, optional
         A complex Hermitian or real symmetric definite positive matrix in.
         If omitted, identity matrix is assumed.
@@ -297,11 +300,13 @@ def eigh(a, b=None, lower=True, eigvals_only=False, overwrite_a=False,
         (Default: both are calculated)
     turbo : bool, optional
         Use divide and conquer algorithm (faster but expensive in memory,
-        only for generalized eigenvalue problem and if eigvals=None)
+        only for generalized eigenvalue problem and if no subset is
+        requested).  Ignored if `driver` is given.
     eigvals : tuple (lo, hi), optional
         Indexes of the smallest and largest (in ascending order) eigenvalues
         and corresponding eigenvectors to be returned: 0 <= lo <= hi <= M-1.
-        If omitted, all eigenvalues and eigenvectors are returned.
+        If omitted, all eigenvalues and eigenvectors are returned.  Same as
+        `subset_by_index`.
     type : int, optional
         Specifies the problem type to be solved:
 
@@ -318,13 +323,36 @@ def eigh(a, b=None, lower=True, eigvals_only=False, overwrite_a=False,
         Whether to check that the input matrices contain only finite numbers.
         Disabling may give a performance gain, but may result in problems
         (crashes, non-termination) if the inputs do contain infinities or NaNs.
+    workers : int, optional
+        Number of threads over which a stack of matrices is split.  ``-1``
+        uses all CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
+    subset_by_index : tuple (lo, hi), optional
+        Indexes of the smallest and largest (in ascending order) eigenvalues
+        and corresponding eigenvectors to be returned: 0 <= lo <= hi <= M-1.
+
+        .. versionadded:: 1.2.0
+    subset_by_value : tuple (vl, vu), optional
+        Half-open interval ``(vl, vu]`` of the eigenvalues to be returned,
+        ``vl < vu``.  Infinite bounds may be used.
+
+        .. versionadded:: 1.2.0
+    driver : str, optional
+        The LAPACK driver to use.  Valid options are "ev", "evd", "evr" and
+        "evx" for standard problems and "gv", "gvd" and "gvx" for
+        generalized problems (`b` given).  Only "evr", "evx" and "gvx"
+        support subsets, and "evr" only `subset_by_index`.  If omitted, the
+        driver is chosen as described in the Notes.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
-    w : (N,) float ndarray
+    w : (..., N) float ndarray
         The N (1<=N<=M) selected eigenvalues, in ascending order, each
         repeated according to its multiplicity.
-    v : (M, N) complex ndarray
+    v : (..., M, N) complex ndarray
         (if eigvals_only == False)
 
         The normalized selected eigenvector corresponding to the
@@ -362,6 +390,29 @@ def eigh(a, b=None, lower=True, eigvals_only=False, overwrite_a=False,
     in order to allow for representing arrays with only their upper/lower
     triangular parts.
 
+    Stacks of matrices are diagonalized in a single compiled loop over the
+    divide and conquer routines ``?SYEVD`` and ``?HEEVD`` of LAPACK.  This
+    is only supported for standard eigenvalue problems, without `b` and
+    subsets.
+
+    .. versionadded:: 1.2.0
+       Support for stacks of matrices.
+
+    The LAPACK drivers are ``?SYEV``/``?HEEV`` ("ev", QR iteration),
+    ``?SYEVD``/``?HEEVD`` ("evd", divide and conquer), ``?SYEVR``/``?HEEVR``
+    ("evr", relatively robust representations), ``?SYEVX``/``?HEEVX``
+    ("evx", bisection and inverse iteration), and their generalized
+    counterparts ``?SYGV``, ``?SYGVD`` and ``?SYGVX``.  When `driver` is
+    omitted, "evr" is used for standard problems, "evx" for
+    `subset_by_value`, and "gvd" (or "gv" if ``turbo=False``) or "gvx" for
+    generalized problems without or with a subset.  A subset by index that
+    is larger than a third (standard) or half (generalized) of the spectrum
+    is cut from the full decomposition when eigenvectors are requested, as
+    computing them for all eigenvalues is faster in that case.
+
+    .. versionadded:: 1.2.0
+       The `subset_by_index`, `subset_by_value` and `driver` arguments.
+
     Examples
     --------
     >>> from scipy.linalg import eigh
@@ -372,6 +423,19 @@ def eigh(a, b=None, lower=True, eigvals_only=False, overwrite_a=False,
 
     """
     a1 = _asarray_validated(a, check_finite=check_finite)
+    if eigvals is not None:
+        if subset_by_index is not None:
+            raise ValueError('eigvals and subset_by_index cannot both be '
+                             'given')
+        subset_by_index = eigvals
+    if a1.ndim > 2:
+        if (b is not None or subset_by_index is not None or
+                subset_by_value is not None or driver not in (None, 'evd')):
+            raise ValueError('stacks of matrices are only supported for '
+                             'standard eigenvalue problems with the "evd" '
+                             'driver, without b and subsets')
+        return _batched.eigh(a1, lower=lower, eigvals_only=eigvals_only,
+                             workers=workers)
     if len(a1.shape) != 2 or a1.shape[0] != a1.shape[1]:
         raise ValueError('expected square matrix')
     overwrite_a = overwrite_a or (_datacopied(a1, a))
@@ -394,20 +458,61 @@ def eigh(a, b=None, lower=True, eigvals_only=False, overwrite_a=False,
             cplx = cplx or False
     else:
         b1 = None
+    n = a1.shape[0]
+
+    if subset_by_index is not None:
+        if subset_by_value is not None:
+            raise ValueError('subset_by_index and subset_by_value cannot '
+                             'both be given')
+        lo, hi = subset_by_index
+        if lo < 0 or hi >= n or lo > hi:
+            raise ValueError('The eigenvalue range specified is not valid.\n'
+                             'Valid range is [%s,%s]' % (0, n-1))
+    if subset_by_value is not None:
+        vl, vu = subset_by_value
+        if not vl < vu:
+            raise ValueError('The eigenvalue interval (%s, %s] specified '
+                             'is empty.' % (vl, vu))
+    subset = subset_by_index is not None or subset_by_value is not None
+
+    # select the driver
+    if b1 is None:
+        drivers = ('ev', 'evd', 'evr', 'evx')
+    else:
+        drivers = ('gv', 'gvd', 'gvx')
+    compute_all = False
+    if driver is None:
+        if subset_by_value is not None:
+            driver = 'evx' if b1 is None else 'gvx'
+        elif b1 is None:
+            driver = 'evr'
+        elif subset:
+            driver = 'gvx'
+        else:
+            driver = 'gvd' if turbo else 'gv'
+
+        # With eigenvectors, subsets are found by bisection and inverse
+        # iteration, which is slower than computing all eigenpairs once the
+        # subset is a large part of the spectrum.
+        if subset_by_index is not None and not eigvals_only:
+            if (hi - lo + 1) * (3 if b1 is None else 2) > n:
+                driver = 'evr' if b1 is None else 'gvd'
+                compute_all = True
+    elif driver not in drivers:
+        raise ValueError('"%s" is not a valid driver for %s eigenvalue '
+                         'problems, expected one of %s'
+                         % (driver, 'standard' if b1 is None else
+                            'generalized', ', '.join(drivers)))
+    elif subset and driver not in ('evr', 'evx', 'gvx'):
+        raise ValueError('the "%s" driver does not support subsets, use '
+                         'one of "evr", "evx" or "gvx"' % driver)
+    elif subset_by_value is not None and driver == 'evr':
+        raise ValueError('the "evr" driver does not support '
+                         'subset_by_value, use "evx"')
 
     # Set job for fortran routines
     _job = (eigvals_only and 'N') or 'V'
 
-    # port eigenvalue range from python to fortran convention
-    if eigvals is not None:
-        lo, hi = eigvals
-        if lo < 0 or hi >= a1.shape[0]:
-            raise ValueError('The eigenvalue range specified is not valid.\n'
-                             'Valid range is [%s,%s]' % (0, a1.shape[0]-1))
-        lo += 1
-        hi += 1
-        eigvals = (lo, hi)
-
     # set lower
     if lower:
         uplo = 'L'
@@ -420,69 +525,81 @@ def eigh(a, b=None, lower=True, eigvals_only=False, overwrite_a=False,
     else:
         pfx = 'sy'
 
+    ifail = None
     #  Standard Eigenvalue Problem
-    #  Use '*evr' routines
-    # FIXME: implement calculation of optimal lwork
-    #        for all lapack routines
-    if b1 is None:
-        driver = pfx+'evr'
-        (evr,) = get_lapack_funcs((driver,), (a1,))
-        if eigvals is None:
+    if driver == 'evr':
+        (evr,) = get_lapack_funcs((pfx+'evr',), (a1,))
+        if subset_by_index is None or compute_all:
             w, v, info = evr(a1, uplo=uplo, jobz=_job, range="A", il=1,
-                             iu=a1.shape[0], overwrite_a=overwrite_a)
+                             iu=n, overwrite_a=overwrite_a)
         else:
-            (lo, hi) = eigvals
             w_tot, v, info = evr(a1, uplo=uplo, jobz=_job, range="I",
-                                 il=lo, iu=hi, overwrite_a=overwrite_a)
+                                 il=lo+1, iu=hi+1, overwrite_a=overwrite_a)
             w = w_tot[0:hi-lo+1]
+    elif driver == 'evx':
+        evx, evx_lwork = get_lapack_funcs((pfx+'evx', pfx+'evx_lwork'),
+                                          (a1,))
+        lwork = _compute_lwork(evx_lwork, n, lower=lower)
+        if subset_by_index is not None:
+            kwargs = dict(range='I', il=lo+1, iu=hi+1)
+        elif subset_by_value is not None:
+            kwargs = dict(range='V', vl=vl, vu=vu)
+        else:
+            kwargs = dict(range='A')
+        w, v, m, ifail, info = evx(a1, compute_v=not eigvals_only,
+                                   lower=lower, lwork=lwork,
+                                   overwrite_a=overwrite_a, **kwargs)
+        w = w[:m]
+        if not eigvals_only and v.shape[1] != m:
+            v = v[:, :m].copy()
+    elif driver in ('ev', 'evd'):
+        (ev,) = get_lapack_funcs((pfx+driver,), (a1,))
+        w, v, info = ev(a1, compute_v=not eigvals_only, lower=lower,
+                        overwrite_a=overwrite_a)
 
     # Generalized Eigenvalue Problem
-    else:
-        # Use '*gvx' routines if range is specified
-        if eigvals is not None:
-            driver = pfx+'gvx'
-            (gvx,) = get_lapack_funcs((driver,), (a1, b1))
-            (lo, hi) = eigvals
-            w_tot, v, ifail, info = gvx(a1, b1, uplo=uplo, iu=hi,
-                                        itype=type, jobz=_job, il=lo,
+    elif driver == 'gvx':
+        if subset_by_value is not None:
+            w, v, ifail, info = _eigh_gvx_by_value(a1, b1, lower, type,
+                                                   eigvals_only, vl, vu,
+                                                   overwrite_a, overwrite_b)
+        else:
+            if subset_by_index is None:
+                lo, hi = 0, n - 1
+            (gvx,) = get_lapack_funcs((pfx+'gvx',), (a1, b1))
+            w_tot, v, ifail, info = gvx(a1, b1, uplo=uplo, iu=hi+1,
+                                        itype=type, jobz=_job, il=lo+1,
                                         overwrite_a=overwrite_a,
                                         overwrite_b=overwrite_b)
             w = w_tot[0:hi-lo+1]
-        # Use '*gvd' routine if turbo is on and no eigvals are specified
-        elif turbo:
-            driver = pfx+'gvd'
-            (gvd,) = get_lapack_funcs((driver,), (a1, b1))
-            v, w, info = gvd(a1, b1, uplo=uplo, itype=type, jobz=_job,
-                             overwrite_a=overwrite_a,
-                             overwrite_b=overwrite_b)
-        # Use '*gv' routine if turbo is off and no eigvals are specified
-        else:
-            driver = pfx+'gv'
-            (gv,) = get_lapack_funcs((driver,), (a1, b1))
-            v, w, info = gv(a1, b1, uplo=uplo, itype=type, jobz=_job,
-                            overwrite_a=overwrite_a,
-                            overwrite_b=overwrite_b)
+    else:
+        (gv,) = get_lapack_funcs((pfx+driver,), (a1, b1))
+        v, w, info = gv(a1, b1, uplo=uplo, itype=type, jobz=_job,
+                        overwrite_a=overwrite_a,
+                        overwrite_b=overwrite_b)
 
     # Check if we had a  successful exit
     if info == 0:
+        if compute_all:
+            w = w[lo:hi+1]
+            v = v[:, lo:hi+1]
         if eigvals_only:
             return w
         else:
             return w, v
-    _check_info(info, driver, positive=False)  # triage more specifically
-    if info > 0 and b1 is None:
+    _check_info(info, pfx+driver, positive=False)  # triage more specifically
+    if 0 < info <= n and ifail is not None:
+        raise LinAlgError("the eigenvectors %s failed to"
+                          " converge." % (ifail[:info]-1))
+    elif info > 0 and driver == 'evr':
         raise LinAlgError("unrecoverable internal error.")
 
     # The algorithm failed to converge.
-    elif 0 < info <= b1.shape[0]:
-        if eigvals is not None:
-            raise LinAlgError("the eigenvectors %s failed to"
-                              " converge." % nonzero(ifail)-1)
-        else:
-            raise LinAlgError("internal fortran routine failed to converge: "
-                              "%i off-diagonal elements of an "
-                              "intermediate tridiagonal form did not converge"
-                              " to zero." % info)
+    elif 0 < info <= n or b1 is None:
+        raise LinAlgError("internal fortran routine failed to converge: "
+                          "%i off-diagonal elements of an "
+                          "intermediate tridiagonal form did not converge"
+                          " to zero." % info)
 
     # This occurs when b is not positive definite
     else:
@@ -490,7 +607,51 @@ def eigh(a, b=None, lower=True, eigvals_only=False, overwrite_a=False,
                           " of 'b' is not positive definite. The"
                           " factorization of 'b' could not be completed"
                           " and no eigenvalues or eigenvectors were"
-                          " computed." % (info-b1.shape[0]))
+                          " computed." % (info-n))
+
+
+def _eigh_gvx_by_value(a, b, lower, itype, eigvals_only, vl, vu,
+                       overwrite_a, overwrite_b):
+    """
+    Solve a generalized eigenvalue problem for the eigenvalues in the
+    interval (vl, vu], and return w, v, ifail, info as ?SYGVX does.
+
+    The problem is reduced to a standard one with the Cholesky factor of
+    `b`, solved with ?SYEVX/?HEEVX, and the eigenvectors transformed back,
+    which are the steps ?SYGVX takes for a subset by index.
+    """
+    n = a.shape[0]
+    cplx = iscomplexobj(a) or iscomplexobj(b)
+    pfx = 'he' if cplx else 'sy'
+    potrf, gst, evx, evx_lwork, trtrs = get_lapack_funcs(
+        ('potrf', pfx+'gst', pfx+'evx', pfx+'evx_lwork', 'trtrs'), (a, b))
+
+    c, info = potrf(b, lower=lower, clean=0, overwrite_a=overwrite_b)
+    _check_info(info, 'potrf', positive=False)
+    if info > 0:
+        return None, None, None, n + info
+    a, info = gst(a, c, itype=itype, lower=lower, overwrite_a=overwrite_a)
+    _check_info(info, pfx+'gst')
+
+    lwork = _compute_lwork(evx_lwork, n, lower=lower)
+    w, v, m, ifail, info = evx(a, compute_v=not eigvals_only, range='V',
+                               lower=lower, vl=vl, vu=vu, lwork=lwork,
+                               overwrite_a=True)
+    w = w[:m]
+    if eigvals_only or info != 0:
+        return w, None, ifail, info
+
+    # b = L L^H or U^H U; the eigenvectors are inv(L^H) y or inv(U) y for
+    # itype 1 and 2, and L y or U^H y for itype 3
+    if itype == 3:
+        trmm = get_blas_funcs('trmm', (c, v))
+        v = trmm(1., c, v[:, :m], lower=lower, trans_a=0 if lower else 2,
+                 overwrite_b=True)
+    else:
+        v, info = trtrs(c, v[:, :m], lower=lower, trans=2 if lower else 0,
+                        overwrite_b=True)
+        _check_info(info, 'trtrs')
+    return w, v, ifail, 0
 
 
 _conv_dict = {0: 0, 1: 1, 2: 2,
@@ -771,7 +932,8 @@ def eigvals(a, b=None, overwrite_a=False, check_finite=True,
 
 def eigvalsh(a, b=None, lower=True, overwrite_a=False,
              overwrite_b=False, turbo=True, eigvals=None, type=1,
-             check_finite=True):
+             check_finite=True, subset_by_index=None, subset_by_value=None,
+             driver=None):
     """
     Solve an ordinary or generalized eigenvalue problem for a complex
     Hermitian or real symmetric matrix.
@@ -785,9 +947,9 @@ def eigvalsh(a, b=None, lower=True, overwrite_a=False,
 
     Parameters
     ----------
-    a : (M, M) array_like
+    a : (..., M, M) array_like
         A complex Hermitian or real symmetric matrix whose eigenvalues and
-        eigenvectors will be computed.
+        eigenvectors will be computed, or a stack of such matrices.
     b : (M, M) array_like, optional
         A complex Hermitian or real symmetric definite positive matrix in.
         If omitted, identity matrix is assumed.
@@ -817,6 +979,19 @@ def eigvalsh(a, b=None, lower=True, overwrite_a=False,
         Whether to check that the input matrices contain only finite numbers.
         Disabling may give a performance gain, but may result in problems
         (crashes, non-termination) if the inputs do contain infinities or NaNs.
+    subset_by_index : tuple (lo, hi), optional
+        Indexes of the smallest and largest (in ascending order) eigenvalues
+        to be returned: 0 <= lo <= hi <= M-1.
+
+        .. versionadded:: 1.2.0
+    subset_by_value : tuple (vl, vu), optional
+        Half-open interval ``(vl, vu]`` of the eigenvalues to be returned.
+
+        .. versionadded:: 1.2.0
+    driver : str, optional
+        The LAPACK driver to use, see `eigh`.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -858,7 +1033,8 @@ def eigvalsh(a, b=None, lower=True, overwrite_a=False,
     return eigh(a, b=b, lower=lower, eigvals_only=True,
                 overwrite_a=overwrite_a, overwrite_b=overwrite_b,
                 turbo=turbo, eigvals=eigvals, type=type,
-                check_finite=check_finite)
+                check_finite=check_finite, subset_by_index=subset_by_index,
+                subset_by_value=subset_by_value, driver=driver)
 
 
 def eigvals_banded(a_band, lower=False, overwrite_a_band=False,
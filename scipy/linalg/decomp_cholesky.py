@@ -2,11 +2,12 @@
 
 from __future__ import division, print_function, absolute_import
 
-from numpy import asarray_chkfinite, asarray, atleast_2d
+from numpy import asarray_chkfinite, asarray, atleast_2d, ndim
 
 # Local imports
 from .misc import LinAlgError, _datacopied
 from .lapack import get_lapack_funcs
+from . import _batched
 
 __all__ = ['cholesky', 'cho_factor', 'cho_solve', 'cholesky_banded',
            'cho_solve_banded']
@@ -44,7 +45,7 @@ def _cholesky(a, lower=False, overwrite_a=False, clean=True,
     return c, lower
 
 
-def cholesky(a, lower=False, overwrite_a=False, check_finite=True):
+def cholesky(a, lower=False, overwrite_a=False, check_finite=True, workers=1):
     """
     Compute the Cholesky decomposition of a matrix.
 
@@ -53,8 +54,8 @@ def cholesky(a, lower=False, overwrite_a=False, check_finite=True):
 
     Parameters
     ----------
-    a : (M, M) array_like
-        Matrix to be decomposed
+    a : (..., M, M) array_like
+        Matrix to be decomposed, or a stack of matrices
     lower : bool, optional
         Whether to compute the upper or lower triangular Cholesky
         factorization.  Default is upper-triangular.
@@ -64,16 +65,29 @@ def cholesky(a, lower=False, overwrite_a=False, check_finite=True):
         Whether to check that the input matrix contains only finite numbers.
         Disabling may give a performance gain, but may result in problems
         (crashes, non-termination) if the inputs do contain infinities or NaNs.
+    workers : int, optional
+        Number of threads over which a stack of matrices is split.  ``-1``
+        uses all CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
-    c : (M, M) ndarray
+    c : (..., M, M) ndarray
         Upper- or lower-triangular Cholesky factor of `a`.
 
     Raises
     ------
     LinAlgError : if decomposition fails.
 
+    Notes
+    -----
+    Stacks of matrices are factored in a single compiled loop over the
+    LAPACK routines.
+
+    .. versionadded:: 1.2.0
+       Support for stacks of matrices.
+
     Examples
     --------
     >>> from scipy.linalg import cholesky
@@ -87,6 +101,9 @@ def cholesky(a, lower=False, overwrite_a=False, check_finite=True):
            [ 0.+2.j,  5.+0.j]])
 
     """
+    if ndim(a) > 2:
+        a1 = asarray_chkfinite(a) if check_finite else asarray(a)
+        return _batched.cholesky(a1, lower=lower, workers=workers)
     c, lower = _cholesky(a, lower=lower, overwrite_a=overwrite_a, clean=True,
                          check_finite=check_finite)
     return c
@@ -10,11 +10,12 @@ from numpy import asarray, asarray_chkfinite
 from .misc import _datacopied, LinAlgWarning
 from .lapack import get_lapack_funcs
 from .flinalg import get_flinalg_funcs
+from . import _batched
 
 __all__ = ['lu', 'lu_solve', 'lu_factor']
 
 
-def lu_factor(a, overwrite_a=False, check_finite=True):
+def lu_factor(a, overwrite_a=False, check_finite=True, workers=1):
     """
     Compute pivoted LU decomposition of a matrix.
 
@@ -27,21 +28,26 @@ def lu_factor(a, overwrite_a=False, check_finite=True):
 
     Parameters
     ----------
-    a : (M, M) array_like
-        Matrix to decompose
+    a : (..., M, M) array_like
+        Matrix to decompose, or a stack of matrices
     overwrite_a : bool, optional
         Whether to overwrite data in A (may increase performance)
     check_finite : bool, optional
         Whether to check that the input matrix contains only finite numbers.
         Disabling may give a performance gain, but may result in problems
         (crashes, non-termination) if the inputs do contain infinities or NaNs.
+    workers : int, optional
+        Number of threads over which a stack of matrices is split.  ``-1``
+        uses all CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
-    lu : (N, N) ndarray
+    lu : (..., N, N) ndarray
         Matrix containing U in its upper triangle, and L in its lower triangle.
         The unit diagonal elements of L are not stored.
-    piv : (N,) ndarray
+    piv : (..., N) ndarray
         Pivot indices representing the permutation matrix P:
         row i of matrix was interchanged with row piv[i].
 
@@ -51,7 +57,11 @@ def lu_factor(a, overwrite_a=False, check_finite=True):
 
     Notes
     -----
-    This is a wrapper to the ``*GETRF`` routines from LAPACK.
+    This is a wrapper to the ``*GETRF`` routines from LAPACK.  Stacks of
+    matrices are factored in a single compiled loop over these routines.
+
+    .. versionadded:: 1.2.0
+       Support for stacks of matrices.
 
     Examples
     --------
@@ -73,6 +83,8 @@ def lu_factor(a, overwrite_a=False, check_finite=True):
         a1 = asarray_chkfinite(a)
     else:
         a1 = asarray(a)
+    if a1.ndim > 2:
+        return _batched.lu_factor(a1, workers=workers)
     if len(a1.shape) != 2 or (a1.shape[0] != a1.shape[1]):
         raise ValueError('expected square matrix')
     overwrite_a = overwrite_a or (_datacopied(a1, a))
@@ -8,13 +8,14 @@ from numpy import zeros, r_, diag, dot, arccos, arcsin, where, clip
 from .misc import LinAlgError, _datacopied
 from .lapack import get_lapack_funcs, _compute_lwork
 from .decomp import _asarray_validated
+from . import _batched
 from scipy._lib.six import string_types
 
 __all__ = ['svd', 'svdvals', 'diagsvd', 'orth', 'subspace_angles', 'null_space']
 
 
 def svd(a, full_matrices=True, compute_uv=True, overwrite_a=False,
-        check_finite=True, lapack_driver='gesdd'):
+        check_finite=True, lapack_driver='gesdd', workers=1):
     """
     Singular Value Decomposition.
 
@@ -25,8 +26,8 @@ def svd(a, full_matrices=True, compute_uv=True, overwrite_a=False,
 
     Parameters
     ----------
-    a : (M, N) array_like
-        Matrix to decompose.
+    a : (..., M, N) array_like
+        Matrix to decompose, or a stack of matrices.
     full_matrices : bool, optional
         If True (default), `U` and `Vh` are of shape ``(M, M)``, ``(N, N)``.
         If False, the shapes are ``(M, K)`` and ``(K, N)``, where
@@ -45,9 +46,15 @@ def svd(a, full_matrices=True, compute_uv=True, overwrite_a=False,
         Whether to use the more efficient divide-and-conquer approach
         (``'gesdd'``) or general rectangular approach (``'gesvd'``)
         to compute the SVD. MATLAB and Octave use the ``'gesvd'`` approach.
-        Default is ``'gesdd'``.
+        Default is ``'gesdd'``.  Stacks of matrices are only supported by
+        ``'gesdd'``.
 
         .. versionadded:: 0.18
+    workers : int, optional
+        Number of threads over which a stack of matrices is split.  ``-1``
+        uses all CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -61,7 +68,8 @@ def svd(a, full_matrices=True, compute_uv=True, overwrite_a=False,
         Unitary matrix having right singular vectors as rows.
         Of shape ``(N, N)`` or ``(K, N)`` depending on `full_matrices`.
 
-    For ``compute_uv=False``, only ``s`` is returned.
+    For ``compute_uv=False``, only ``s`` is returned.  For a stack of
+    matrices, the shapes are prefixed with the batch dimensions ``(...)``.
 
     Raises
     ------
@@ -73,6 +81,14 @@ def svd(a, full_matrices=True, compute_uv=True, overwrite_a=False,
     svdvals : Compute singular values of a matrix.
     diagsvd : Construct the Sigma matrix, given the vector s.
 
+    Notes
+    -----
+    Stacks of matrices are decomposed in a single compiled loop over the
+    LAPACK routines.
+
+    .. versionadded:: 1.2.0
+       Support for stacks of matrices.
+
     Examples
     --------
     >>> from scipy import linalg
@@ -107,16 +123,24 @@ def svd(a, full_matrices=True, compute_uv=True, overwrite_a=False,
 
     """
     a1 = _asarray_validated(a, check_finite=check_finite)
-    if len(a1.shape) != 2:
+    if len(a1.shape) < 2:
         raise ValueError('expected matrix')
-    m, n = a1.shape
-    overwrite_a = overwrite_a or (_datacopied(a1, a))
 
     if not isinstance(lapack_driver, string_types):
         raise TypeError('lapack_driver must be a string')
     if lapack_driver not in ('gesdd', 'gesvd'):
         raise ValueError('lapack_driver must be "gesdd" or "gesvd", not "%s"'
                          % (lapack_driver,))
+
+    if a1.ndim > 2:
+        if lapack_driver != 'gesdd':
+            raise ValueError('stacks of matrices are only supported by the '
+                             '"gesdd" driver')
+        return _batched.svd(a1, full_matrices=full_matrices,
+                            compute_uv=compute_uv, workers=workers)
+
+    m, n = a1.shape
+    overwrite_a = overwrite_a or (_datacopied(a1, a))
     funcs = (lapack_driver, lapack_driver + '_lwork')
     gesXd, gesXd_lwork = get_lapack_funcs(funcs, (a1,))
 
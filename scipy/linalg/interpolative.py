@@ -318,6 +318,23 @@ To compute an SVD to a fixed rank, use:
 
 >>> U, S, V = sli.svd(L, k)
 
+Blocked computations
+--------------------
+
+The algorithms above apply a :class:`scipy.sparse.linalg.LinearOperator` to
+one vector at a time, and need the entries of a matrix in memory, in Fortran
+order.  With the keyword ``block_size``, :func:`interp_decomp` and
+:func:`svd` instead sketch the matrix with random block products:
+
+>>> k, idx, proj = sli.interp_decomp(A, eps, block_size=1000, workers=4)
+>>> U, S, V = sli.svd(L, k, block_size=64, workers=4)
+
+A matrix given by its entries is read ``block_size`` rows at a time, so that
+it can be a :class:`numpy.memmap` larger than the memory, and a
+:class:`scipy.sparse.linalg.LinearOperator` is applied to ``block_size``
+vectors at a time with `matmat`.  The blocks are split over ``workers``
+threads.
+
 Utility routines
 ----------------
 
@@ -383,6 +400,7 @@ backend routine.
 
 import scipy.linalg._interpolative_backend as backend
 import numpy as np
+from scipy.linalg._batched import _map_stack
 
 _DTYPE_ERROR = ValueError("invalid input dtype (input must be float64 or complex128)")
 _TYPE_ERROR = TypeError("invalid input type (must be array or LinearOperator)")
@@ -460,7 +478,136 @@ def rand(*shape):
     return backend.id_srand(np.prod(shape)).reshape(shape)
 
 
-def interp_decomp(A, eps_or_k, rand=True):
+# Number of extra samples of the randomized blocked algorithms
+_OVERSAMPLING = 10
+
+
+def _sketch(A, l, block_size, workers, key):
+    """
+    Product ``G A`` of `A` with a random ``(l, m)`` matrix ``G``, computed
+    by blocks of `block_size` rows of an array, or of `block_size` columns
+    of ``G^*`` for a LinearOperator.
+
+    The random blocks are drawn from generators seeded with `key` and the
+    index of the block, so that they do not depend on the threads.  The
+    partial products of the threads are summed in a fixed order, but are
+    grouped by thread, so that results with different `workers` only match
+    up to rounding.
+    """
+    m, n = A.shape
+    dtype = np.float64 if _is_real(A) else np.complex128
+
+    if isinstance(A, np.ndarray):
+        nblocks = -(-m // block_size)
+        parts = []
+
+        def work(start, stop):
+            y = np.zeros((l, n), dtype=dtype)
+            for b in range(start, stop):
+                r0 = b * block_size
+                r1 = min(r0 + block_size, m)
+                g = np.random.RandomState(key + (b,)).standard_normal(
+                    (r1 - r0, l))
+                y += g.T.dot(A[r0:r1])
+            parts.append((start, y))
+
+        _map_stack(work, nblocks, workers)
+        # sum the partial products in a fixed order
+        parts.sort(key=lambda part: part[0])
+        y = np.zeros((l, n), dtype=dtype)
+        for part in parts:
+            y += part[1]
+        return y
+    else:
+        AH = A.H
+        yh = np.empty((n, l), dtype=dtype)
+        nblocks = -(-l // block_size)
+
+        def work(start, stop):
+            for b in range(start, stop):
+                c0 = b * block_size
+                c1 = min(c0 + block_size, l)
+                g = np.random.RandomState(key + (b,)).standard_normal(
+                    (m, c1 - c0))
+                yh[:, c0:c1] = AH.matmat(g)
+
+        _map_stack(work, nblocks, workers)
+        return yh.T.conj()
+
+
+def _skeleton(A, cols, block_size, workers):
+    """Columns `cols` of `A`, extracted by blocks."""
+    m, n = A.shape
+    dtype = np.float64 if _is_real(A) else np.complex128
+    k = len(cols)
+    B = np.empty((m, k), dtype=dtype, order='F')
+
+    if isinstance(A, np.ndarray):
+        def work(start, stop):
+            for b in range(start, stop):
+                r0 = b * block_size
+                B[r0:r0 + block_size] = A[r0:r0 + block_size][:, cols]
+        _map_stack(work, -(-m // block_size), workers)
+    else:
+        def work(start, stop):
+            for b in range(start, stop):
+                c0 = b * block_size
+                c1 = min(c0 + block_size, k)
+                e = np.zeros((n, c1 - c0), dtype=dtype)
+                e[cols[c0:c1], np.arange(c1 - c0)] = 1
+                B[:, c0:c1] = A.matmat(e)
+        _map_stack(work, -(-k // block_size), workers)
+    return B
+
+
+def _blocked_id(A, eps_or_k, block_size, workers):
+    """
+    Randomized ID from the sketches of `A` computed by `_sketch`.
+
+    Returns the rank, and the 1-based column indices and interpolation
+    coefficients of the ID.
+    """
+    block_size = int(block_size)
+    if block_size < 1:
+        raise ValueError("block_size must be a positive integer")
+    m, n = A.shape
+    real = _is_real(A)
+    # seed of the random blocks, from the generator of the package
+    base = int(rand(1)[0] * 2**31)
+
+    if eps_or_k >= 1:
+        k = int(eps_or_k)
+        if k > min(A.shape):
+            raise ValueError("Approximation rank %s exceeds min(A.shape) = "
+                             " %s " % (k, min(A.shape)))
+        Y = _sketch(A, k + _OVERSAMPLING, block_size, workers, (base, 0))
+        if real:
+            idx, proj = backend.iddr_id(Y, k)
+        else:
+            idx, proj = backend.idzr_id(Y, k)
+        return k, idx, proj
+
+    # Fixed precision: double the number of samples until the rank of the
+    # sketch is smaller than the number of samples by the oversampling.
+    eps = eps_or_k
+    lmax = min(A.shape)
+    Y = _sketch(A, min(2 * _OVERSAMPLING, lmax), block_size, workers,
+                (base, 0))
+    it = 0
+    while True:
+        if real:
+            k, idx, proj = backend.iddp_id(eps, Y.copy())
+        else:
+            k, idx, proj = backend.idzp_id(eps, Y.copy())
+        l = Y.shape[0]
+        if k + _OVERSAMPLING <= l or l >= lmax:
+            return k, idx, proj
+        it += 1
+        Y = np.vstack((Y, _sketch(A, min(l, lmax - l), block_size, workers,
+                                  (base, it))))
+
+
+def interp_decomp(A, eps_or_k, rand=True, block_size=None, workers=1):
     """
     Compute ID of a matrix.
 
@@ -524,6 +671,21 @@ def interp_decomp(A, eps_or_k, rand=True):
         Whether to use random sampling if `A` is of type :class:`numpy.ndarray`
         (randomized algorithms are always used if `A` is of type
         :class:`scipy.sparse.linalg.LinearOperator`).
+    block_size : int, optional
+        If given, `A` is sketched with random block products: an array is
+        read `block_size` rows at a time, and can be a :class:`numpy.memmap`,
+        and a :class:`scipy.sparse.linalg.LinearOperator` is applied to
+        `block_size` vectors at a time with the `matmat` method of its
+        adjoint.  Requires ``rand=True``.
+
+        .. versionadded:: 1.2.0
+    workers : int, optional
+        Number of threads over which the blocks are split, with
+        `block_size`.  ``-1`` uses all CPUs.  A
+        :class:`scipy.sparse.linalg.LinearOperator` must then be thread-safe.
+        Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -539,6 +701,16 @@ def interp_decomp(A, eps_or_k, rand=True):
 
     real = _is_real(A)
 
+    if block_size is not None:
+        if not rand:
+            raise ValueError("block_size requires rand=True")
+        if not isinstance(A, (np.ndarray, LinearOperator)):
+            raise _TYPE_ERROR
+        k, idx, proj = _blocked_id(A, eps_or_k, block_size, workers)
+        if eps_or_k < 1:
+            return k, idx - 1, proj
+        return idx - 1, proj
+
     if isinstance(A, np.ndarray):
         if eps_or_k < 1:
             eps = eps_or_k
@@ -816,7 +988,7 @@ def estimate_spectral_norm_diff(A, B, its=20):
             m, n, matveca1, matveca2, matvec1, matvec2, its=its)
 
 
-def svd(A, eps_or_k, rand=True):
+def svd(A, eps_or_k, rand=True, block_size=None, workers=1):
     """
     Compute SVD of a matrix via an ID.
 
@@ -853,6 +1025,18 @@ def svd(A, eps_or_k, rand=True):
         Whether to use random sampling if `A` is of type :class:`numpy.ndarray`
         (randomized algorithms are always used if `A` is of type
         :class:`scipy.sparse.linalg.LinearOperator`).
+    block_size : int, optional
+        If given, the ID of `A` is computed from random block products as in
+        :func:`interp_decomp`, and its skeleton columns are extracted by
+        blocks of `block_size` rows of an array, or by products with
+        `block_size` unit vectors at a time.  Requires ``rand=True``.
+
+        .. versionadded:: 1.2.0
+    workers : int, optional
+        Number of threads over which the blocks are split, with
+        `block_size`.  ``-1`` uses all CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -867,6 +1051,15 @@ def svd(A, eps_or_k, rand=True):
 
     real = _is_real(A)
 
+    if block_size is not None:
+        if not rand:
+            raise ValueError("block_size requires rand=True")
+        if not isinstance(A, (np.ndarray, LinearOperator)):
+            raise _TYPE_ERROR
+        k, idx, proj = _blocked_id(A, eps_or_k, block_size, workers)
+        B = _skeleton(A, idx[:k] - 1, int(block_size), workers)
+        return id_to_svd(B, idx - 1, proj)
+
     if isinstance(A, np.ndarray):
         if eps_or_k < 1:
             eps = eps_or_k
@@ -168,6 +168,9 @@ All functions
    cgesv
    zgesv
 
+   dsgesv
+   zcgesv
+
    sgesvx
    dgesvx
    cgesvx
@@ -201,6 +204,22 @@ All functions
    ssygst
    dsygst
 
+   ssytrf
+   dsytrf
+   csytrf
+   zsytrf
+
+   ssytrs
+   dsytrs
+   csytrs
+   zsytrs
+
+   chetrf
+   zhetrf
+
+   chetrs
+   zhetrs
+
    ssytrd
    dsytrd
 
@@ -273,6 +292,12 @@ All functions
    cheevr
    zheevr
 
+   cheevx
+   zheevx
+
+   cheevx_lwork
+   zheevx_lwork
+
    chegv
    zhegv
 
@@ -330,6 +355,9 @@ All functions
    cposv
    zposv
 
+   dsposv
+   zcposv
+
    sposvx
    dposvx
    cposvx
@@ -469,6 +497,12 @@ All functions
    ssyevr
    dsyevr
 
+   ssyevx
+   dsyevx
+
+   ssyevx_lwork
+   dsyevx_lwork
+
    ssygv
    dsygv
 
@@ -552,7 +586,7 @@ __all__ = ['get_lapack_funcs']
 
 import numpy as _np
 
-from .blas import _get_funcs
+from .blas import _get_funcs, _memoize_get_funcs
 
 # Backward compatibility:
 from .blas import find_best_blas_type as find_best_lapack_type
@@ -600,6 +634,7 @@ _lapack_alias = {
 }
 
 
+@_memoize_get_funcs
 def get_lapack_funcs(names, arrays=(), dtype=None):
     """Return available LAPACK function objects from names.
 
@@ -635,6 +670,11 @@ def get_lapack_funcs(names, arrays=(), dtype=None):
     types {float32, float64, complex64, complex128} respectively, and
     are stored in attribute ``typecode`` of the returned functions.
 
+    The lookup is cached, so that repeated calls with the same names, dtype
+    and types and memory orders of `arrays` only cost a dictionary lookup.
+    The wrappers of the factorizations, solvers and eigenvalue drivers most
+    used in loops release the GIL while the LAPACK routine runs.
+
     Examples
     --------
     Suppose we would like to use '?lange' routine which computes the selected
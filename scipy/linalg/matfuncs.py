@@ -19,7 +19,8 @@ from .special_matrices import triu
 from .decomp_svd import svd
 from .decomp_schur import schur, rsf2csf
 from ._expm_frechet import expm_frechet, expm_cond
-from ._matfuncs_sqrtm import sqrtm
+from ._matfuncs_sqrtm import sqrtm, _block_bounds
+from ._matfuncs_triu import funm_triu
 
 eps = np.finfo(float).eps
 feps = np.finfo(single).eps
@@ -528,7 +529,9 @@ def funm(A, func, disp=True):
     Notes
     -----
     This function implements the general algorithm based on Schur decomposition
-    (Algorithm 9.1.1. in [1]_).
+    (Algorithm 9.1.1. in [1]_).  The triangular factor is split into blocks,
+    and the off-diagonal blocks are found by solving Sylvester equations, as
+    in the block form of Parlett's recurrence.
 
     If the input matrix is known to be diagonalizable, then relying on the
     eigendecomposition is likely to be faster. For example, if your matrix is
@@ -554,24 +557,13 @@ def funm(A, func, disp=True):
     T, Z = rsf2csf(T,Z)
     n,n = T.shape
     F = diag(func(diag(T)))  # apply function to diagonal elements
-    F = F.astype(T.dtype.char)  # e.g. when F is real but T is complex
-
-    minden = abs(T[0,0])
-
-    # implement Algorithm 11.1.1 from Golub and Van Loan
-    #                 "matrix Computations."
-    for p in range(1,n):
-        for i in range(1,n-p+1):
-            j = i + p
-            s = T[i-1,j-1] * (F[j-1,j-1] - F[i-1,i-1])
-            ksl = slice(i,j-1)
-            val = dot(T[i-1,ksl],F[ksl,j-1]) - dot(F[i-1,ksl],T[ksl,j-1])
-            s = s + val
-            den = T[j-1,j-1] - T[i-1,i-1]
-            if den != 0.0:
-                s = s / den
-            F[i-1,j-1] = s
-            minden = min(minden,abs(den))
+    # e.g. when F is real but T is complex
+    F = F.astype(T.dtype.char, order='F')
+    T = np.asfortranarray(T)
+
+    # Parlett's recurrence, in compiled code, with the off-diagonal
+    # blocks obtained from Sylvester equations
+    minden = funm_triu(T, F, _block_bounds(n, 64))
 
     F = dot(dot(Z, F), transpose(conjugate(Z)))
     F = _maybe_real(A, F)
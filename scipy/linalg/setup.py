@@ -157,6 +157,13 @@ def configuration(parent_package='', top_path=None):
     config.add_extension('_decomp_update',
                          sources=['_decomp_update.c'])
 
+    config.add_extension('_batched_lapack',
+                         sources=['_batched_lapack.c'],
+                         include_dirs=[get_numpy_include_dirs()])
+
+    config.add_extension('_matfuncs_triu',
+                         sources=['_matfuncs_triu.c'])
+
     # Add any license files
     config.add_data_files('src/id_dist/doc/doc.tex')
     config.add_data_files('src/lapack_deprecations/LICENSE')
@@ -797,6 +797,107 @@ class TestSolve(object):
                                 rtol=tol * size,
                                 err_msg=err_msg)
 
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64,
+                                       np.complex64, np.complex128])
+    @pytest.mark.parametrize('workers', [1, 3])
+    def test_stacked(self, dtype, workers):
+        np.random.seed(1234)
+        a = np.random.rand(4, 3, 5, 5) + 5*np.eye(5)
+        b = np.random.rand(1, 3, 5, 2)
+        if np.issubdtype(dtype, np.complexfloating):
+            a = a + 1j*np.random.rand(4, 3, 5, 5)
+            b = b + 1j*np.random.rand(1, 3, 5, 2)
+        a = a.astype(dtype)
+        b = b.astype(dtype)
+        rtol = 1e-4 if dtype in (np.float32, np.complex64) else 1e-10
+        h = np.matmul(a, np.conj(np.swapaxes(a, -1, -2)))
+        s = a + np.swapaxes(a, -1, -2)
+
+        for assume_a, m in [('gen', a), ('pos', h), ('her', h), ('sym', s)]:
+            for lower in (False, True):
+                x = solve(m, b, assume_a=assume_a, lower=lower,
+                          workers=workers)
+                assert_equal(x.shape, (4, 3, 5, 2))
+                assert_equal(x.dtype, dtype)
+                for i, j in itertools.product(range(4), range(3)):
+                    assert_allclose(x[i, j],
+                                    solve(m[i, j], b[0, j], assume_a=assume_a,
+                                          lower=lower),
+                                    rtol=rtol)
+
+        # stack of vectors, and a single vector for the whole stack
+        bv = np.broadcast_to(b[..., 0], (4, 3, 5))
+        x = solve(a, bv, workers=workers)
+        assert_equal(x.shape, (4, 3, 5))
+        assert_allclose(x, solve(a, b[..., :1])[..., 0], rtol=rtol)
+        x = solve(a, b[0, 0, :, 0], workers=workers)
+        assert_equal(x.shape, (4, 3, 5))
+
+        if not np.issubdtype(dtype, np.complexfloating):
+            x = solve(a, b, transposed=True)
+            assert_allclose(np.matmul(np.swapaxes(a, -1, -2), x),
+                            np.broadcast_to(b, x.shape), rtol=rtol)
+
+    def test_stacked_errors(self):
+        a = np.ones((2, 3, 3))
+        assert_raises(LinAlgError, solve, a, np.ones((2, 3)))
+        assert_raises(ValueError, solve, a, np.ones((2, 4)))
+        assert_raises(ValueError, solve, np.ones((2, 3, 4)), np.ones((2, 3)))
+        assert_raises(ValueError, solve, a, np.ones((2, 3)), assume_a='foo')
+        assert_raises(ValueError, solve, a + np.eye(3), np.ones((2, 3)),
+                      workers=0)
+
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64,
+                                       np.complex64, np.complex128])
+    def test_mixed_precision(self, dtype):
+        np.random.seed(1234)
+        n = 50
+        a = np.random.rand(n, n) + n*np.eye(n)
+        b = np.random.rand(n, 3)
+        if np.issubdtype(dtype, np.complexfloating):
+            a = a + 1j*np.random.rand(n, n)
+            b = b + 1j*np.random.rand(n, 3)
+        a = a.astype(dtype)
+        b = b.astype(dtype)
+        h = a.dot(a.conj().T)
+        rtol = 1e-4 if dtype in (np.float32, np.complex64) else 1e-13
+
+        for assume_a, m in [('gen', a), ('pos', h), ('sym', a + a.T)]:
+            for lower in (False, True):
+                with suppress_warnings() as sup:
+                    sup.filter(LinAlgWarning)
+                    x = solve(m, b, assume_a=assume_a, lower=lower,
+                              mixed_precision=True)
+                    x2 = solve(m, b, assume_a=assume_a, lower=lower)
+                assert_equal(x.dtype, dtype)
+                assert_allclose(x, x2, rtol=rtol)
+
+        x = solve(a, b[:, 0], mixed_precision=True)
+        assert_equal(x.shape, (n,))
+        assert_allclose(a.dot(x), b[:, 0], rtol=rtol)
+
+    def test_mixed_precision_fallback(self):
+        # too ill-conditioned for the single precision factorization
+        n = 8
+        hilbert = 1. / (np.arange(n)[:, None] + np.arange(n) + 1)
+        b = hilbert.sum(axis=1)
+        for assume_a in ('gen', 'pos'):
+            x = solve(hilbert, b, assume_a=assume_a, mixed_precision=True)
+            assert_allclose(x, np.ones(n), rtol=1e-4)
+
+        assert_raises(LinAlgError, solve, np.ones((3, 3)), np.ones(3),
+                      mixed_precision=True)
+        assert_raises(LinAlgError, solve, -np.eye(3), np.ones(3),
+                      assume_a='pos', mixed_precision=True)
+
+    def test_mixed_precision_overwrite(self):
+        np.random.seed(1234)
+        a = np.asfortranarray(np.random.rand(6, 6) + 6*np.eye(6))
+        b = np.random.rand(6)
+        a0 = a.copy()
+        x = solve(a, b, overwrite_a=True, mixed_precision=True)
+        assert_allclose(a0.dot(x), b)
+
 
 class TestSolveTriangular(object):
 
@@ -882,6 +983,18 @@ class TestInv(object):
         a_inv = inv(a, check_finite=False)
         assert_array_almost_equal(dot(a, a_inv), [[1, 0], [0, 1]])
 
+    def test_stacked(self):
+        a = random([3, 2, 4, 4]) + 1j*random([3, 2, 4, 4])
+        for workers in (1, 2):
+            a_inv = inv(a, workers=workers)
+            assert_equal(a_inv.shape, a.shape)
+            for i, j in itertools.product(range(3), range(2)):
+                assert_allclose(a_inv[i, j], inv(a[i, j]), rtol=1e-10)
+
+        a[1, 1] = 0
+        assert_raises(LinAlgError, inv, a)
+        assert_equal(inv(np.ones((2, 0, 0))).shape, (2, 0, 0))
+
 
 class TestDet(object):
     def setup_method(self):
@@ -920,6 +1033,16 @@ class TestDet(object):
         a_det = det(a, check_finite=False)
         assert_almost_equal(a_det, -2.0)
 
+    def test_stacked(self):
+        for a in (random([3, 2, 5, 5]),
+                  random([3, 2, 5, 5]) + 2j*random([3, 2, 5, 5])):
+            a[0, 0] = 0
+            for workers in (1, 2):
+                d = det(a, workers=workers)
+                assert_equal(d.shape, (3, 2))
+                assert_allclose(d, linalg.det(a), rtol=1e-12)
+        assert_equal(det(np.ones((2, 0, 0))), [1, 1])
+
 
 def direct_lstsq(a, b, cmplx=0):
     at = transpose(a)
@@ -1283,6 +1406,28 @@ class TestLstsq(object):
             assert_(rank == 0, 'expected rank 0')
             assert_equal(s, np.empty((0,)))
 
+    @pytest.mark.parametrize('shape', [(6, 4), (4, 6), (5, 5)])
+    def test_stacked(self, shape):
+        np.random.seed(1234)
+        a = np.random.rand(3, 2, *shape)
+        b = np.random.rand(3, 2, shape[0], 2)
+        # a rank deficient matrix in the stack
+        a[1, 1, :, 0] = a[1, 1, :, 1]
+        for workers in (1, 2):
+            x, res, rank, s = lstsq(a, b, workers=workers)
+            assert_equal(x.shape, (3, 2, shape[1], 2))
+            assert_equal(rank.shape, (3, 2))
+            assert_equal(s.shape, (3, 2, min(shape)))
+            for i, j in itertools.product(range(3), range(2)):
+                x1, res1, rank1, s1 = lstsq(a[i, j], b[i, j])
+                assert_allclose(x[i, j], x1, rtol=1e-8, atol=1e-10)
+                assert_allclose(s[i, j], s1, rtol=1e-10, atol=1e-12)
+                assert_equal(rank[i, j], rank1)
+                if rank1 == shape[1] and shape[0] > shape[1]:
+                    assert_allclose(res[i, j], res1, rtol=1e-8)
+
+        assert_raises(ValueError, lstsq, a, b, lapack_driver='gelsy')
+
 
 class TestPinv(object):
 
@@ -12,6 +12,7 @@ Run tests if scipy is installed:
 """
 
 import math
+import threading
 
 import numpy as np
 from numpy.testing import (assert_equal, assert_almost_equal, assert_,
@@ -86,6 +87,55 @@ def test_get_blas_funcs_alias():
     assert f is h
 
 
+def test_get_blas_funcs_memoized():
+    a = np.empty((2, 2), dtype=np.complex64, order='F')
+    b = np.empty((2, 2), dtype=np.float64)
+    f = get_blas_funcs('axpy', (a, b))
+    assert_(get_blas_funcs('axpy', (a, b)) is f)
+    assert_equal(f.typecode, 'z')
+
+    # the memory order of the arrays is part of the key
+    f = get_blas_funcs('axpy', (np.asfortranarray(b),))
+    assert_equal(f.module_name, 'fblas')
+    if cblas is not None:
+        assert_equal(get_blas_funcs('axpy', (b,)).module_name, 'cblas')
+
+    # the list returned for a tuple of names is not shared with the cache
+    funcs = get_blas_funcs(('axpy', 'dot'), (b,))
+    funcs[0] = None
+    funcs = get_blas_funcs(('axpy', 'dot'), (b,))
+    assert_(isinstance(funcs, list))
+    assert_equal([f.typecode for f in funcs], ['d', 'd'])
+    funcs.pop()
+    assert_equal(len(get_blas_funcs(('axpy', 'dot'), (b,))), 2)
+
+    # unhashable names are looked up every time
+    f1, f2 = get_blas_funcs(['gemm', 'gemv'], (a,))
+    assert_equal((f1.typecode, f2.typecode), ('c', 'c'))
+
+
+def test_gemm_threads():
+    # the level 3 wrappers release the GIL, and can run concurrently
+    seed(1234)
+    a = [rand(50, 50) for j in range(8)]
+    gemm = get_blas_funcs('gemm', (a[0],))
+    expected = [np.dot(x, x) for x in a]
+    results = [None] * len(a)
+
+    def worker(j):
+        for k in range(10):
+            results[j] = gemm(1.0, a[j], a[j])
+
+    threads = [threading.Thread(target=worker, args=(j,))
+               for j in range(len(a))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for x, y in zip(results, expected):
+        assert_allclose(x, y)
+
+
 class TestCBLAS1Simple(object):
 
     def test_axpy(self):
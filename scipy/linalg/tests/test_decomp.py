@@ -28,7 +28,7 @@ from scipy.linalg import (eig, eigvals, lu, svd, svdvals, cholesky, qr,
      null_space, cdf2rdf)
 from scipy.linalg.lapack import dgbtrf, dgbtrs, zgbtrf, zgbtrs, \
      dsbev, dsbevd, dsbevx, zhbevd, zhbevx
-from scipy.linalg.misc import norm
+from scipy.linalg.misc import norm, LinAlgError
 from scipy.linalg._decomp_qz import _select_function
 
 from numpy import array, transpose, sometrue, diag, ones, linalg, \
@@ -857,6 +857,179 @@ def test_eigh_integer():
     w,z = eigh(a,b)
 
 
+@pytest.mark.parametrize('dtype', [float32, np.float64, complex64,
+                                   np.complex128])
+def test_eigh_stacked(dtype):
+    seed(1234)
+    a = random((3, 2, 6, 6))
+    if np.issubdtype(dtype, np.complexfloating):
+        a = a + 1j*random((3, 2, 6, 6))
+    a = (a + np.conj(np.swapaxes(a, -1, -2))).astype(dtype)
+    decimal = DIGITS[dtype().dtype.char] - 1
+    for lower in (True, False):
+        for workers in (1, 2):
+            w, v = eigh(a, lower=lower, workers=workers)
+            assert_equal(w.shape, (3, 2, 6))
+            assert_equal(v.shape, a.shape)
+            for i, j in itertools.product(range(3), range(2)):
+                assert_array_almost_equal(w[i, j], eigh(a[i, j])[0],
+                                          decimal=decimal)
+                assert_array_almost_equal(dot(a[i, j], v[i, j]),
+                                          v[i, j] * w[i, j], decimal=decimal)
+            assert_array_almost_equal(eigh(a, lower=lower,
+                                           eigvals_only=True), w,
+                                      decimal=decimal)
+
+    assert_raises(ValueError, eigh, a, a)
+    assert_raises(ValueError, eigh, a, eigvals=(0, 1))
+    assert_raises(ValueError, eigh, a, driver='evr')
+
+
+def _hermitian_pair(n, dtype):
+    a = random((n, n))
+    b = random((n, n))
+    if np.issubdtype(dtype, np.complexfloating):
+        a = a + 1j*random((n, n))
+        b = b + 1j*random((n, n))
+    a = a + a.conj().T
+    b = dot(b, b.conj().T) + n*eye(n)
+    return a.astype(dtype), b.astype(dtype)
+
+
+@pytest.mark.parametrize('dtype', [float32, np.float64, complex64,
+                                   np.complex128])
+@pytest.mark.parametrize('driver', ['ev', 'evd', 'evr', 'evx'])
+def test_eigh_drivers(dtype, driver):
+    seed(1234)
+    a, _ = _hermitian_pair(10, dtype)
+    decimal = DIGITS[dtype().dtype.char] - 1
+    w_ref = linalg.eigvalsh(a.astype(np.complex128))
+    for lower in (True, False):
+        w, v = eigh(a, lower=lower, driver=driver)
+        assert_array_almost_equal(w, w_ref, decimal=decimal)
+        assert_array_almost_equal(dot(a, v), v * w, decimal=decimal)
+        assert_array_almost_equal(eigvalsh(a, lower=lower, driver=driver),
+                                  w_ref, decimal=decimal)
+        if driver in ('evr', 'evx'):
+            w, v = eigh(a, lower=lower, driver=driver,
+                        subset_by_index=(2, 4))
+            assert_equal(v.shape, (10, 3))
+            assert_array_almost_equal(w, w_ref[2:5], decimal=decimal)
+            assert_array_almost_equal(dot(a, v), v * w, decimal=decimal)
+
+
+@pytest.mark.parametrize('dtype', [float32, np.float64, complex64,
+                                   np.complex128])
+def test_eigh_subset_by_value(dtype):
+    seed(1234)
+    a, _ = _hermitian_pair(10, dtype)
+    decimal = DIGITS[dtype().dtype.char] - 1
+    w_ref = linalg.eigvalsh(a.astype(np.complex128))
+    vl, vu = (w_ref[2] + w_ref[3]) / 2, (w_ref[6] + w_ref[7]) / 2
+    for lower in (True, False):
+        w, v = eigh(a, lower=lower, subset_by_value=(vl, vu))
+        assert_equal(v.shape, (10, 4))
+        assert_array_almost_equal(w, w_ref[3:7], decimal=decimal)
+        assert_array_almost_equal(dot(a, v), v * w, decimal=decimal)
+        w = eigvalsh(a, lower=lower, subset_by_value=(-np.inf, vu))
+        assert_array_almost_equal(w, w_ref[:7], decimal=decimal)
+
+    w, v = eigh(a, subset_by_value=(w_ref[-1] + 1, np.inf))
+    assert_equal(w.shape, (0,))
+    assert_equal(v.shape, (10, 0))
+
+
+@pytest.mark.parametrize('dtype', [float32, np.float64, complex64,
+                                   np.complex128])
+@pytest.mark.parametrize('itype', [1, 2, 3])
+def test_eigh_generalized_subsets(dtype, itype):
+    seed(1234)
+    a, b = _hermitian_pair(10, dtype)
+    decimal = DIGITS[dtype().dtype.char] - 1
+    w_ref = eigh(a.astype(np.complex128), b.astype(np.complex128),
+                 type=itype, eigvals_only=True)
+    vl, vu = (w_ref[1] + w_ref[2]) / 2, (w_ref[4] + w_ref[5]) / 2
+    for lower in (True, False):
+        for driver in ('gv', 'gvd', 'gvx'):
+            w = eigh(a, b, lower=lower, type=itype, driver=driver,
+                     eigvals_only=True)
+            assert_array_almost_equal(w, w_ref, decimal=decimal)
+        for kwargs in (dict(subset_by_index=(2, 4)),
+                       dict(subset_by_value=(vl, vu))):
+            w, v = eigh(a, b, lower=lower, type=itype, **kwargs)
+            assert_array_almost_equal(w, w_ref[2:5], decimal=decimal)
+            if itype == 1:
+                assert_array_almost_equal(dot(a, v), dot(b, v) * w,
+                                          decimal=decimal)
+                assert_array_almost_equal(dot(v.conj().T, dot(b, v)),
+                                          eye(3), decimal=decimal)
+            elif itype == 2:
+                assert_array_almost_equal(dot(a, dot(b, v)), v * w,
+                                          decimal=decimal)
+                assert_array_almost_equal(dot(v.conj().T, dot(b, v)),
+                                          eye(3), decimal=decimal)
+            else:
+                assert_array_almost_equal(dot(b, dot(a, v)), v * w,
+                                          decimal=decimal)
+            assert_array_almost_equal(eigvalsh(a, b, lower=lower,
+                                               type=itype, **kwargs),
+                                      w, decimal=decimal)
+
+
+def test_eigh_large_subset():
+    # subsets covering most of the spectrum are cut from the full
+    # decomposition
+    seed(1234)
+    a, b = _hermitian_pair(10, np.float64)
+    w_ref, v_ref = eigh(a)
+    w, v = eigh(a, subset_by_index=(1, 8))
+    assert_array_almost_equal(w, w_ref[1:9])
+    assert_array_almost_equal(dot(a, v), v * w)
+    w_ref = eigh(a, b, eigvals_only=True)
+    w, v = eigh(a, b, subset_by_index=(0, 7))
+    assert_array_almost_equal(w, w_ref[:8])
+    assert_array_almost_equal(dot(a, v), dot(b, v) * w)
+
+
+def test_eigh_invalid_driver_and_subsets():
+    a = eye(4)
+    assert_raises(ValueError, eigh, a, driver='foo')
+    assert_raises(ValueError, eigh, a, driver='gvd')
+    assert_raises(ValueError, eigh, a, a, driver='evr')
+    assert_raises(ValueError, eigh, a, driver='evd', subset_by_index=(0, 1))
+    assert_raises(ValueError, eigh, a, a, driver='gvd',
+                  subset_by_value=(0, 1))
+    assert_raises(ValueError, eigh, a, driver='evr', subset_by_value=(0, 1))
+    assert_raises(ValueError, eigh, a, subset_by_value=(1, 0))
+    assert_raises(ValueError, eigh, a, subset_by_index=(0, 4))
+    assert_raises(ValueError, eigh, a, subset_by_index=(0, 1),
+                  subset_by_value=(0, 1))
+    assert_raises(ValueError, eigh, a, eigvals=(0, 1),
+                  subset_by_index=(0, 1))
+    assert_raises(LinAlgError, eigh, a, -a, subset_by_value=(0, 1))
+
+
+@pytest.mark.parametrize('driver', ['ev', 'evd'])
+def test_eigh_no_convergence(monkeypatch, driver):
+    # ?SYEV and ?SYEVD report a failure to converge with info > 0
+    import scipy.linalg.decomp
+    get_lapack_funcs = scipy.linalg.decomp.get_lapack_funcs
+
+    def failing_get_lapack_funcs(names, arrays=(), dtype=None):
+        # only the ?SYEV/?SYEVD routine of the 'ev'/'evd' path is stubbed
+        if names != ('sy' + driver,):
+            return get_lapack_funcs(names, arrays, dtype)
+
+        def ev(a, **kwargs):
+            return np.zeros(len(a)), a, 2
+        return (ev,)
+
+    monkeypatch.setattr(scipy.linalg.decomp, 'get_lapack_funcs',
+                        failing_get_lapack_funcs)
+    with pytest.raises(LinAlgError, match='failed to converge'):
+        eigh(eye(4), driver=driver)
+
+
 class TestLU(object):
     def setup_method(self):
         self.a = array([[1,2,3],[1,2,3],[2,5,6]])
@@ -930,6 +1103,18 @@ class TestLU(object):
             assert_array_almost_equal(LU, np.array([[2, 1], [0, 1]]))
             assert_array_equal(P, np.array([0, 1]))
 
+    def test_lu_factor_stacked(self):
+        seed(1234)
+        a = random((3, 2, 5, 5))
+        for workers in (1, 2):
+            lu_, piv = lu_factor(a, workers=workers)
+            assert_equal(lu_.shape, a.shape)
+            assert_equal(piv.shape, (3, 2, 5))
+            for i, j in itertools.product(range(3), range(2)):
+                lu1, piv1 = lu_factor(a[i, j])
+                assert_array_almost_equal(lu_[i, j], lu1)
+                assert_array_equal(piv[i, j], piv1)
+
 
 class TestLUSingle(TestLU):
     """LU testers for single precision, real and double"""
@@ -1123,6 +1308,30 @@ class TestSVD_GESVD(TestSVD_GESDD):
         seed(1234)
 
 
+@pytest.mark.parametrize('full_matrices', [True, False])
+@pytest.mark.parametrize('shape', [(5, 3), (3, 5)])
+def test_svd_stacked(shape, full_matrices):
+    seed(1234)
+    a = random((4, 2) + shape) + 1j*random((4, 2) + shape)
+    k = min(shape)
+    for workers in (1, 2):
+        u, s, vh = svd(a, full_matrices=full_matrices, workers=workers)
+        if full_matrices:
+            assert_equal(u.shape, (4, 2, shape[0], shape[0]))
+            assert_equal(vh.shape, (4, 2, shape[1], shape[1]))
+        else:
+            assert_equal(u.shape, (4, 2, shape[0], k))
+            assert_equal(vh.shape, (4, 2, k, shape[1]))
+        assert_equal(s.shape, (4, 2, k))
+        for i, j in itertools.product(range(4), range(2)):
+            assert_array_almost_equal(s[i, j], svdvals(a[i, j]))
+            assert_array_almost_equal(
+                dot(u[i, j][:, :k] * s[i, j], vh[i, j][:k]), a[i, j])
+        assert_array_almost_equal(svd(a, compute_uv=False), s)
+
+    assert_raises(ValueError, svd, a, lapack_driver='gesvd')
+
+
 class TestSVDVals(object):
 
     def test_empty(self):
@@ -1,12 +1,16 @@
 from __future__ import division, print_function, absolute_import
 
-from numpy.testing import assert_array_almost_equal, assert_array_equal
+import itertools
+
+import numpy as np
+from numpy.testing import (assert_array_almost_equal, assert_array_equal,
+                           assert_equal)
 from pytest import raises as assert_raises
 
 from numpy import array, transpose, dot, conjugate, zeros_like, empty
 from numpy.random import random
 from scipy.linalg import cholesky, cholesky_banded, cho_solve_banded, \
-     cho_factor, cho_solve
+     cho_factor, cho_solve, LinAlgError
 
 from scipy.linalg._testutils import assert_no_overwrite
 
@@ -67,6 +71,20 @@ class TestCholesky(object):
             a = dot(c, transpose(conjugate(c)))
             assert_array_almost_equal(cholesky(a, lower=1), c)
 
+    def test_stacked(self):
+        m = random([3, 2, 6, 6]) + 1j*random([3, 2, 6, 6])
+        a = np.matmul(m, np.conj(np.swapaxes(m, -1, -2))) + 6*np.eye(6)
+        for lower in (False, True):
+            for workers in (1, 2):
+                c = cholesky(a, lower=lower, workers=workers)
+                assert_equal(c.shape, a.shape)
+                for i, j in itertools.product(range(3), range(2)):
+                    assert_array_almost_equal(c[i, j],
+                                              cholesky(a[i, j], lower=lower))
+
+        a[1, 0, 0, 0] = -1
+        assert_raises(LinAlgError, cholesky, a)
+
 
 class TestCholeskyBanded(object):
     """Tests for cholesky_banded() and cho_solve_banded."""
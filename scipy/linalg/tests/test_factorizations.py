@@ -0,0 +1,164 @@
+from __future__ import division, print_function, absolute_import
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal, assert_
+import pytest
+from pytest import raises as assert_raises
+
+from scipy.linalg import (LUFactorization, CholeskyFactorization,
+                          LDLFactorization, QRFactorization, LinAlgError,
+                          LinAlgWarning, ldl)
+from scipy._lib._numpy_compat import suppress_warnings
+
+DTYPES = [np.float32, np.float64, np.complex64, np.complex128]
+
+
+def _random(shape, dtype):
+    a = np.random.rand(*shape)
+    if np.issubdtype(dtype, np.complexfloating):
+        a = a + 1j*np.random.rand(*shape)
+    return a.astype(dtype)
+
+
+def _rtol(dtype):
+    return 1e-3 if dtype in (np.float32, np.complex64) else 1e-10
+
+
+def _hpd(n, dtype):
+    m = _random((n, n), dtype)
+    return m.dot(m.T.conj()) + n*np.eye(n, dtype=dtype)
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_lu(dtype):
+    np.random.seed(1234)
+    a = _random((6, 6), dtype) + 3*np.eye(6, dtype=dtype)
+    fac = LUFactorization(a)
+    assert_(fac.lu.flags.f_contiguous)
+    assert_equal(fac.shape, (6, 6))
+    b = _random((6, 3), dtype)
+    rtol = _rtol(dtype)
+    assert_allclose(a.dot(fac.solve(b)), b, rtol=rtol)
+    assert_allclose(a.dot(fac.solve(b[:, 0])), b[:, 0], rtol=rtol)
+    assert_allclose(a.T.dot(fac.solve(b, trans=1)), b, rtol=rtol)
+    assert_allclose(a.T.conj().dot(fac.solve(b, trans=2)), b, rtol=rtol)
+
+    # complex right-hand sides of a real matrix
+    bc = b + 1j
+    assert_allclose(a.dot(fac.solve(bc)), bc, rtol=rtol)
+
+    # in place
+    bf = np.asfortranarray(b)
+    x = fac.solve(bf, overwrite_b=True)
+    assert_(np.shares_memory(x, bf))
+
+    assert_raises(ValueError, fac.solve, np.ones(5))
+    assert_raises(ValueError, fac.solve, [np.nan] * 6)
+
+
+def test_lu_singular():
+    with suppress_warnings() as sup:
+        sup.filter(LinAlgWarning)
+        fac = LUFactorization(np.ones((3, 3)))
+    assert_equal(fac.shape, (3, 3))
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+@pytest.mark.parametrize('lower', [False, True])
+def test_cholesky(dtype, lower):
+    np.random.seed(1234)
+    n = 7
+    a = _hpd(n, dtype)
+    fac = CholeskyFactorization(a, lower=lower)
+    assert_(fac.c.flags.f_contiguous)
+    rtol = _rtol(dtype)
+    b = _random((n, 2), dtype)
+    assert_allclose(a.dot(fac.solve(b)), b, rtol=rtol)
+    assert_allclose(a.dot(fac.solve(b[:, 0])), b[:, 0], rtol=rtol)
+
+    # rank-1 and rank-2 updates and downdates, in place
+    for u in (_random((n,), dtype), _random((n, 2), dtype)):
+        uu = u.reshape(n, -1)
+        c = fac.c
+        fac.update(u)
+        a = a + uu.dot(uu.T.conj())
+        assert_(np.shares_memory(fac.c, c))
+        assert_allclose(a.dot(fac.solve(b)), b, rtol=rtol)
+
+        fac.update(0.5*u, downdate=True)
+        a = a - 0.25*uu.dot(uu.T.conj())
+        assert_allclose(a.dot(fac.solve(b)), b, rtol=rtol)
+
+    fac2 = CholeskyFactorization(a, lower=lower)
+    tri = np.tril if lower else np.triu
+    assert_allclose(tri(fac.c), tri(fac2.c), rtol=10*rtol, atol=10*rtol)
+
+    # a failed downdate leaves the factorization unchanged
+    c = fac.c.copy()
+    assert_raises(LinAlgError, fac.update, 100*np.ones(n), downdate=True)
+    assert_equal(fac.c, c)
+
+    if dtype in (np.float32, np.float64):
+        assert_raises(ValueError, fac.update, np.ones(n) + 1j)
+
+
+def test_cholesky_not_positive_definite():
+    assert_raises(LinAlgError, CholeskyFactorization, [[1, 2], [2, 1]])
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+@pytest.mark.parametrize('lower', [False, True])
+def test_ldl(dtype, lower):
+    np.random.seed(1234)
+    n = 8
+    a = _random((n, n), dtype)
+    for hermitian in (True, False):
+        if hermitian:
+            s = a + a.T.conj()
+        else:
+            s = a + a.T
+        fac = LDLFactorization(s, lower=lower, hermitian=hermitian)
+        rtol = _rtol(dtype)
+        b = _random((n, 3), dtype)
+        assert_allclose(s.dot(fac.solve(b)), b, rtol=rtol)
+        assert_allclose(s.dot(fac.solve(b[:, 0])), b[:, 0], rtol=rtol)
+        for x, y in zip(fac.factors(), ldl(s, lower=lower,
+                                           hermitian=hermitian)):
+            assert_allclose(x, y)
+
+
+def test_ldl_complex_rhs():
+    a = np.array([[2., -1., 3.], [-1., 2., 0.], [3., 0., 1.]])
+    b = np.array([1., 1j, 2.])
+    x = LDLFactorization(a).solve(b)
+    assert_allclose(a.dot(x), b, atol=1e-12)
+
+
+@pytest.mark.parametrize('dtype', DTYPES)
+def test_qr(dtype):
+    np.random.seed(1234)
+    m, n = 9, 5
+    a = _random((m, n), dtype)
+    fac = QRFactorization(a)
+    assert_(fac.q.flags.f_contiguous and fac.r.flags.f_contiguous)
+    assert_equal(fac.shape, (m, n))
+    rtol = 10*_rtol(dtype)
+    b = _random((m, 2), dtype)
+    x = fac.solve(b)
+    assert_equal(x.shape, (n, 2))
+    assert_allclose(x, np.linalg.lstsq(a, b, rcond=None)[0], rtol=rtol)
+
+    for u, v in ((_random((m,), dtype), _random((n,), dtype)),
+                 (_random((m, 2), dtype), _random((n, 2), dtype))):
+        fac.update(u, v)
+        a = a + u.reshape(m, -1).dot(v.reshape(n, -1).T.conj())
+        assert_allclose(fac.q.dot(fac.r), a, rtol=rtol, atol=rtol)
+        assert_allclose(fac.solve(b), np.linalg.lstsq(a, b, rcond=None)[0],
+                        rtol=rtol, atol=rtol)
+
+    assert_raises(ValueError, QRFactorization(a.T).solve, np.ones(n))
+
+
+def test_repr():
+    fac = LUFactorization(np.eye(3))
+    assert_equal(repr(fac), '<3x3 LUFactorization with dtype=float64>')
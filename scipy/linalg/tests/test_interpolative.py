@@ -276,3 +276,63 @@ class TestInterpolativeDecomposition(object):
         B = pymatrixid.reconstruct_skel_matrix(A, k, idx)
         assert_allclose(A, B.dot(P))
 
+    def test_blocked(self):
+        for dtype in [np.float64, np.complex128]:
+            A = hilbert(200).astype(dtype)
+            if np.issubdtype(dtype, np.complexfloating):
+                A = A * (1 + 1j)
+            eps = 1e-12
+            for M in (A, aslinearoperator(A)):
+                for block_size, workers in ((37, 1), (64, 3)):
+                    kw = dict(block_size=block_size, workers=workers)
+                    k, idx, proj = pymatrixid.interp_decomp(M, eps, **kw)
+                    B = pymatrixid.reconstruct_matrix_from_id(A[:, idx[:k]],
+                                                              idx, proj)
+                    assert_(np.allclose(A, B, eps))
+
+                    idx, proj = pymatrixid.interp_decomp(M, k, **kw)
+                    B = pymatrixid.reconstruct_matrix_from_id(A[:, idx[:k]],
+                                                              idx, proj)
+                    assert_(np.allclose(A, B, eps))
+
+                    for eps_or_k in (eps, k):
+                        U, S, V = pymatrixid.svd(M, eps_or_k, **kw)
+                        B = np.dot(U * S, V.conj().T)
+                        assert_(np.allclose(A, B, eps))
+
+    def test_sketch_empty(self):
+        for workers in (1, 3):
+            Y = pymatrixid._sketch(np.zeros((0, 4)), 3, 2, workers, (0, 0))
+            assert_allclose(Y, np.zeros((3, 4)))
+
+    def test_blocked_memmap(self, tmpdir):
+        n = 500
+        x = np.linspace(0, 1, n)
+        A = np.memmap(str(tmpdir.join('A.dat')), dtype=np.float64,
+                      mode='w+', shape=(n, n))
+        A[:] = 1. / (1 + 10*(x[:, None] - x)**2)
+        k, idx, proj = pymatrixid.interp_decomp(A, 1e-10, block_size=64)
+        B = pymatrixid.reconstruct_matrix_from_id(A[:, idx[:k]], idx, proj)
+        assert_(k < 50)
+        assert_allclose(A, B, atol=1e-8)
+
+    def test_blocked_seed(self):
+        # the result depends on the seed, not on the number of threads
+        A = hilbert(100)
+        pymatrixid.seed(1234)
+        idx1, proj1 = pymatrixid.interp_decomp(A, 10, block_size=16)
+        pymatrixid.seed(1234)
+        idx2, proj2 = pymatrixid.interp_decomp(A, 10, block_size=16,
+                                               workers=4)
+        assert_allclose(idx1, idx2)
+        assert_allclose(proj1, proj2)
+
+    def test_blocked_badcall(self):
+        A = hilbert(10)
+        assert_raises(ValueError, pymatrixid.interp_decomp, A, 3,
+                      rand=False, block_size=4)
+        assert_raises(ValueError, pymatrixid.interp_decomp, A, 3,
+                      block_size=0)
+        assert_raises(ValueError, pymatrixid.svd, A, 11, block_size=4)
+        assert_raises(TypeError, pymatrixid.interp_decomp, A.tolist(), 3,
+                      block_size=4)
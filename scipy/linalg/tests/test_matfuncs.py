@@ -417,6 +417,37 @@ class TestSqrtM(object):
         assert_allclose(np.dot(R, R), M, atol=1e-14)
         assert_allclose(sqrtm(M), R, atol=1e-14)
 
+    @pytest.mark.parametrize('dtype', [np.float64, np.complex128])
+    def test_large_blocked(self, dtype):
+        # Several blocks, handled by the Sylvester solver
+        np.random.seed(1234)
+        n = 150
+        A = np.random.randn(n, n) + n*np.eye(n)
+        if dtype is np.complex128:
+            A = A + 1j*np.random.randn(n, n)
+        X = sqrtm(A)
+        assert_allclose(X.dot(X), A, rtol=1e-10, atol=1e-10*n)
+        for blocksize in (1, 16, 100, n):
+            assert_allclose(sqrtm(A, blocksize=blocksize), X,
+                            rtol=1e-10, atol=1e-12)
+
+
+class TestFunM(object):
+    def test_exp(self):
+        np.random.seed(1234)
+        for n in (1, 5, 150):
+            A = np.random.randn(n, n) / n
+            assert_allclose(funm(A, np.exp), expm(A), rtol=1e-10, atol=1e-12)
+            A = A + 1j*np.random.randn(n, n) / n
+            assert_allclose(funm(A, np.exp), expm(A), rtol=1e-10, atol=1e-12)
+
+    def test_single_precision(self):
+        np.random.seed(1234)
+        A = (np.random.randn(100, 100) / 100).astype(np.float32)
+        F = funm(A, np.exp)
+        assert_equal(F.dtype, np.float32)
+        assert_allclose(F, expm(A.astype(float)), rtol=1e-4, atol=1e-5)
+
 
 class TestFractionalMatrixPower(object):
     def test_round_trip_random_complex(self):
@@ -2,9 +2,13 @@
 
 from __future__ import division, print_function, absolute_import
 import numpy as np
-from scipy.linalg import clarkson_woodruff_transform
+from scipy.linalg import (clarkson_woodruff_transform, CountSketch,
+                          GaussianSketch, SRHTSketch)
+from scipy.sparse import csr_matrix, csc_matrix
 
-from numpy.testing import assert_
+from numpy.testing import assert_, assert_allclose, assert_equal
+import pytest
+from pytest import raises as assert_raises
 
 
 def make_random_dense_gaussian_matrix(n_rows, n_columns, mu=0, sigma=0.01):
@@ -59,3 +63,88 @@ class TestClarksonWoodruffTransform(object):
                 n_errors += 1
 
         assert_(n_errors == 0)
+
+    def test_sparse_input(self):
+        sketch = clarkson_woodruff_transform(self.dense_big_matrix,
+                                             self.n_sketch_rows, seed=1234)
+        sparse_sketch = clarkson_woodruff_transform(
+            csc_matrix(self.dense_big_matrix), self.n_sketch_rows, seed=1234)
+        assert_allclose(sketch, sparse_sketch)
+
+
+SKETCHES = [CountSketch, GaussianSketch, SRHTSketch]
+
+
+@pytest.mark.parametrize('cls', SKETCHES)
+class TestStreamingSketch(object):
+
+    def setup_method(self):
+        self.a = np.random.RandomState(1234).randn(10000, 5)
+
+    def test_blocks_and_merge(self, cls):
+        # The sketch does not depend on how the rows are split into blocks,
+        # on the order of the blocks, or on their format.
+        a = self.a
+        desired = cls(200, seed=7).update(a).sketch
+        assert_equal(desired.shape, (200, 5))
+
+        sk = cls(200, seed=7).update(a[:1000]).update(a[1000:4500])
+        sk2 = cls(200, seed=7).update(csr_matrix(a[9000:]), start=9000)
+        sk3 = cls(200, seed=7).update(a[4500:9000], start=4500)
+        sk.merge(sk2).merge(sk3)
+        assert_equal(sk.n_rows, 10000)
+        assert_allclose(sk.sketch, desired, atol=1e-10)
+
+        sk = cls(200, seed=7).update(a[5000:], start=5000)
+        sk.update(a[:5000], start=0)
+        assert_allclose(sk.sketch, desired, atol=1e-10)
+
+        # single rows, within and across chunks
+        for start in (0, 62, 4094):
+            sk = cls(200, seed=7)
+            for i in range(start, start + 4):
+                sk.update(a[i:i+1], start=i)
+            assert_allclose(sk.sketch,
+                            cls(200, seed=7).update(a[start:start+4],
+                                                    start=start).sketch,
+                            atol=1e-12)
+
+        assert_(not np.allclose(cls(200, seed=8).update(a).sketch, desired))
+
+    def test_sketching_matrix(self, cls):
+        # Sketching the identity gives the sketching matrix S, whose columns
+        # have unit norm on average.
+        n = 6000
+        s = cls(100, seed=3).update(np.eye(n)).sketch
+        assert_allclose(np.mean(np.sum(s**2, axis=0)), 1, rtol=0.05)
+        if cls is CountSketch:
+            assert_equal(np.sum(s != 0, axis=0), np.ones(n))
+        elif cls is SRHTSketch:
+            assert_allclose(abs(s), 0.1)
+
+        # linearity, with complex rows
+        sk = cls(100, seed=3).update(1j * np.eye(n)[:, :10])
+        assert_allclose(sk.sketch, 1j * s[:, :10])
+
+    def test_norm(self, cls):
+        sk = cls(400, seed=42).update(self.a)
+        assert_allclose(np.linalg.norm(sk.sketch), np.linalg.norm(self.a),
+                        rtol=0.1)
+
+    def test_errors(self, cls):
+        sk = cls(100, seed=1).update(np.ones((3, 4)))
+        assert_raises(ValueError, sk.update, np.ones((3, 5)))
+        assert_raises(ValueError, sk.update, np.ones(4))
+        assert_raises(ValueError, sk.update, np.ones((3, 4)), start=-1)
+        assert_raises(ValueError, sk.merge, cls(100, seed=2))
+        assert_raises(ValueError, sk.merge, cls(101, seed=1))
+        other = [c for c in SKETCHES if c is not cls][0]
+        assert_raises(ValueError, sk.merge, other(100, seed=1))
+        assert_raises(ValueError, cls, 0)
+        assert_raises(ValueError, cls, 10, seed=-1)
+
+    def test_seed(self, cls):
+        sk = cls(10, seed=np.random.RandomState(1))
+        sk2 = cls(10, seed=sk.seed)
+        assert_allclose(sk.update(self.a).sketch, sk2.update(self.a).sketch)
+        assert_(cls(10).sketch is None)
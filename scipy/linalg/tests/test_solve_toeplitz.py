@@ -4,7 +4,8 @@ from __future__ import division, print_function, absolute_import
 
 import numpy as np
 from scipy.linalg._solve_toeplitz import levinson
-from scipy.linalg import solve, toeplitz, solve_toeplitz
+from scipy.linalg import (solve, toeplitz, solve_toeplitz,
+                          solve_toeplitz_stack, matmul_toeplitz, LinAlgError)
 from numpy.testing import assert_equal, assert_allclose
 
 import pytest
@@ -102,6 +103,110 @@ def test_reflection_coeffs():
     assert_allclose(reflection_coeffs_z, ref_z[:-1])
 
 
+def _autocovariance(n, complex_=False):
+    # a Hermitian positive definite Toeplitz matrix
+    k = np.arange(n)
+    c = 0.9**k * np.cos(k / 3.)
+    c[0] += 0.5
+    if complex_:
+        c = c + 0.1j * np.exp(-k)
+        c[0] = c[0].real
+    return c
+
+
+@pytest.mark.parametrize('complex_', [False, True])
+def test_cg(complex_):
+    random = np.random.RandomState(1234)
+    for n in (1, 2, 10, 300):
+        c = _autocovariance(n, complex_)
+        for yshape in ((n,), (n, 3)):
+            y = random.randn(*yshape)
+            actual = solve_toeplitz(c, y, method='cg')
+            desired = solve(toeplitz(c), y)
+            assert_equal(actual.shape, yshape)
+            assert_allclose(actual, desired, rtol=1e-10, atol=1e-12)
+
+            actual = solve_toeplitz((c, c.conj()), y, method='cg')
+            assert_allclose(actual, desired, rtol=1e-10, atol=1e-12)
+
+
+def test_cg_errors():
+    y = np.ones(3)
+    assert_raises(ValueError, solve_toeplitz, ([1, 2, 3], [1, 3, 2]), y,
+                  method='cg')
+    assert_raises(ValueError, solve_toeplitz, [1j, 0, 0], y, method='cg')
+    assert_raises(LinAlgError, solve_toeplitz, [1, 2, 0], y, method='cg')
+    assert_raises(ValueError, solve_toeplitz, [1, 2, 0], y, method='gko')
+
+
+@pytest.mark.parametrize('method', ['levinson', 'cg'])
+@pytest.mark.parametrize('workers', [1, 3])
+def test_stack(method, workers):
+    random = np.random.RandomState(1234)
+    n = 6
+    c = random.rand(4, 3, n)
+    c[..., 0] += n
+    if method == 'levinson':
+        c = c + 1j * random.randn(4, 3, n)
+        r = random.randn(1, 3, n)
+        cr = (c, r)
+    else:
+        # Hermitian positive definite matrices
+        r = c.conj()
+        cr = c
+    y = random.randn(4, 3, n)
+    ym = random.randn(1, 3, n, 2)
+
+    x = solve_toeplitz_stack(cr, y, method=method, workers=workers)
+    xm = solve_toeplitz_stack(cr, ym, method=method, workers=workers)
+    assert_equal(x.shape, (4, 3, n))
+    assert_equal(xm.shape, (4, 3, n, 2))
+    for i, j in np.ndindex(4, 3):
+        rij = r[i % r.shape[0], j]
+        T = toeplitz(c[i, j], rij)
+        assert_allclose(x[i, j], solve(T, y[i, j]), rtol=1e-10)
+        assert_allclose(xm[i, j], solve(T, ym[0, j]), rtol=1e-10)
+        assert_allclose(solve_toeplitz((c[i, j], rij), y[i, j],
+                                       method=method), x[i, j], rtol=1e-10)
+
+    # a single matrix for a stack of right-hand sides
+    x = solve_toeplitz_stack((c[:1, 0], r[:1, 0]), y[:, 0], method=method)
+    assert_allclose(x[1], solve_toeplitz((c[0, 0], r[0, 0]), y[1, 0],
+                                         method=method))
+
+
+def test_stack_errors():
+    c = np.array([[1., 2, 3], [2, 2, 1]])
+    assert_raises(LinAlgError, solve_toeplitz_stack, c, np.ones((2, 3)))
+    assert_raises(ValueError, solve_toeplitz_stack, c, np.ones((2, 4)))
+    assert_raises(ValueError, solve_toeplitz_stack, (c, c[:, :2]),
+                  np.ones((2, 3)))
+    assert_raises(ValueError, solve_toeplitz_stack, c, np.ones(3),
+                  method='gko')
+
+
+def test_matmul_toeplitz():
+    random = np.random.RandomState(1234)
+    for m, n in ((1, 1), (4, 4), (3, 7), (7, 2)):
+        for offset in (0, 1j):
+            c = random.randn(m) + offset
+            r = random.randn(n)
+            T = toeplitz(c, r)
+            for xshape in ((n,), (n, 3), (n, 3, 2)):
+                x = random.randn(*xshape)
+                actual = matmul_toeplitz((c, r), x)
+                desired = np.tensordot(T, x, axes=1)
+                assert_equal(actual.shape, desired.shape)
+                assert_allclose(actual, desired, atol=1e-12)
+
+    c = random.randn(5) + 1j * random.randn(5)
+    x = random.randn(5, 2)
+    assert_allclose(matmul_toeplitz(c, x), toeplitz(c).dot(x), atol=1e-12)
+
+    assert_raises(ValueError, matmul_toeplitz, [1, 2, 3], np.ones(4))
+    assert_equal(matmul_toeplitz(([], [1, 2]), np.ones(2)).shape, (0,))
+
+
 @pytest.mark.xfail(reason='Instability of Levinson iteration')
 def test_unstable():
     # this is a "Gaussian Toeplitz matrix", as mentioned in Example 2 of
@@ -3,14 +3,18 @@ from __future__ import division, print_function, absolute_import
 import os
 import numpy as np
 
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import (assert_array_almost_equal, assert_allclose,
+                           assert_equal, assert_)
 import pytest
 from pytest import raises as assert_raises
 
 from scipy.linalg import solve_sylvester
 from scipy.linalg import solve_continuous_lyapunov, solve_discrete_lyapunov
 from scipy.linalg import solve_continuous_are, solve_discrete_are
-from scipy.linalg import block_diag, solve, LinAlgError
+from scipy.linalg import (solve_continuous_lyapunov_lowrank,
+                          solve_continuous_are_lowrank)
+from scipy.linalg import block_diag, solve, LinAlgError, LinAlgWarning
+from scipy.sparse import diags, csr_matrix
 
 
 def _load_data(name):
@@ -110,6 +114,24 @@ class TestSolveLyapunov(object):
             self.check_discrete_case(case[0], case[1], method='direct')
             self.check_discrete_case(case[0], case[1], method='bilinear')
 
+    @pytest.mark.parametrize('dtype', [np.float64, np.complex128])
+    def test_continuous_stack(self, dtype):
+        np.random.seed(1234)
+        a = np.random.randn(4, 3, 5, 5).astype(dtype)
+        q = np.random.randn(5, 5).astype(dtype)
+        if dtype == np.complex128:
+            a += 1j*np.random.randn(*a.shape)
+        x = solve_continuous_lyapunov(a, q, workers=2)
+        assert_equal(x.shape, a.shape)
+        assert_equal(x.dtype, dtype)
+        for i in np.ndindex(a.shape[:-2]):
+            assert_allclose(x[i], solve_continuous_lyapunov(a[i], q),
+                            rtol=1e-10, atol=1e-10)
+
+        assert_raises(ValueError, solve_continuous_lyapunov, a,
+                      np.eye(4))
+        assert_raises(ValueError, solve_continuous_lyapunov, a[..., :4], q)
+
 
 def test_solve_continuous_are():
     mat6 = _load_data('carex_6_data.npz')
@@ -765,3 +787,157 @@ class TestSolveSylvester(object):
         c = np.array([2.0, 2.0]).reshape(-1, 1)
         x = solve_sylvester(a, b, c)
         assert_array_almost_equal(x, np.array([1.0, 1.0]).reshape(-1, 1))
+
+    @pytest.mark.parametrize('dtype', [np.float32, np.float64, np.complex64,
+                                       np.complex128])
+    def test_stack(self, dtype):
+        np.random.seed(1234)
+        a = np.random.randn(6, 4, 4) - 3*np.eye(4)
+        b = np.random.randn(6, 3, 3) + 3*np.eye(3)
+        c = np.random.randn(6, 4, 3)
+        if np.issubdtype(dtype, np.complexfloating):
+            a = a + 1j*np.random.randn(*a.shape)
+            c = c + 1j*np.random.randn(*c.shape)
+        a, b, c = a.astype(dtype), b.astype(dtype), c.astype(dtype)
+        x = solve_sylvester(a, b, c, workers=3)
+        assert_equal(x.dtype, dtype)
+        rtol = 1e-4 if dtype in (np.float32, np.complex64) else 1e-12
+        assert_allclose(np.matmul(a, x) + np.matmul(x, b), c, rtol=rtol,
+                        atol=rtol)
+
+    def test_stack_broadcast(self):
+        np.random.seed(1234)
+        a = np.random.randn(4, 4)
+        b = np.random.randn(2, 1, 3, 3)
+        c = np.random.randn(5, 4, 3)
+        x = solve_sylvester(a, b, c)
+        assert_equal(x.shape, (2, 5, 4, 3))
+        for i in np.ndindex(2, 5):
+            assert_allclose(x[i], solve_sylvester(a, b[i[0], 0], c[i[1]]))
+
+        assert_raises(ValueError, solve_sylvester, a, b, c[..., :2])
+        assert_raises(ValueError, solve_sylvester, a[:, :3], b, c)
+        assert_raises(ValueError, solve_sylvester, a, b, c, workers=0)
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.complex128])
+def test_solve_continuous_are_stack(dtype):
+    np.random.seed(1234)
+    a = np.random.randn(5, 6, 6).astype(dtype)
+    if dtype == np.complex128:
+        a += 1j*np.random.randn(*a.shape)
+    b = np.random.randn(5, 6, 2)
+    q = np.eye(6)
+    r = np.array([[2., 0.5], [0.5, 1.]])
+    s = 0.1*np.random.randn(6, 2)
+    for s_ in (None, s):
+        x = solve_continuous_are(a, b, q, r, s=s_, workers=2)
+        assert_equal(x.shape, a.shape)
+        for i in range(5):
+            assert_allclose(x[i], solve_continuous_are(a[i], b[i], q, r,
+                                                       s=s_),
+                            rtol=1e-9, atol=1e-9)
+
+    # scalar r, broadcast against the stack
+    x = solve_continuous_are(a, b[0, :, :1], q, 1)
+    assert_allclose(x[2], solve_continuous_are(a[2], b[0, :, :1], q, 1),
+                    rtol=1e-9, atol=1e-9)
+
+    assert_raises(ValueError, solve_continuous_are, a, b, q, r, e=np.eye(6))
+    assert_raises(ValueError, solve_continuous_are, a, b[..., :5, :], q, r)
+    assert_raises(ValueError, solve_continuous_are, a, b, q, np.eye(3))
+
+    # no stabilizing solution: eigenvalues of the Hamiltonian on the axis
+    assert_raises(LinAlgError, solve_continuous_are, np.zeros((2, 1, 1)),
+                  np.zeros((1, 1)), np.zeros((1, 1)), 1)
+
+
+def _heat(n):
+    """Heat equation on n points, controlled at the left end."""
+    a = -diags([-1, 2, -1], [-1, 0, 1], shape=(n, n), format='csc') * n**2
+    b = np.zeros((n, 1))
+    b[0] = n
+    return a, b
+
+
+class TestLowRank(object):
+
+    def check_lyapunov(self, a, b, z, rtol):
+        ad = a.toarray() if hasattr(a, 'toarray') else a
+        x = solve_continuous_lyapunov(ad, -b.dot(b.conj().T))
+        assert_allclose(z.dot(z.conj().T), x, rtol=0, atol=rtol*abs(x).max())
+
+    def test_lyapunov_sparse(self):
+        a, b = _heat(200)
+        z = solve_continuous_lyapunov_lowrank(a, b)
+        assert_(z.dtype == np.float64 and z.shape[1] < 40)
+        self.check_lyapunov(a, b, z, 1e-8)
+
+        # orthogonal columns
+        zz = z.T.dot(z)
+        assert_allclose(zz, np.diag(np.diag(zz)), atol=1e-8*zz.max())
+
+    def test_lyapunov_nonsymmetric(self):
+        np.random.seed(1234)
+        a = np.random.randn(60, 60) - 10*np.eye(60)
+        b = np.random.randn(60, 2)
+        for a_ in (a, csr_matrix(a)):
+            z = solve_continuous_lyapunov_lowrank(a_, b)
+            assert_equal(z.dtype, np.float64)
+            self.check_lyapunov(a, b, z, 1e-8)
+
+        ac = a + 0.5j*np.random.randn(60, 60)
+        bc = b[:, 0] + 1j
+        z = solve_continuous_lyapunov_lowrank(ac, bc)
+        assert_equal(z.dtype, np.complex128)
+        self.check_lyapunov(ac, bc[:, None], z, 1e-8)
+
+    def test_lyapunov_shifts(self):
+        np.random.seed(1234)
+        a = np.random.randn(40, 40) - 8*np.eye(40)
+        b = np.random.randn(40, 1)
+        ev = np.linalg.eigvals(a)
+        shifts = np.sort_complex(-abs(ev.real) + 1j*ev.imag)
+        z = solve_continuous_lyapunov_lowrank(a, b, shifts=shifts[::2],
+                                              maxiter=400)
+        self.check_lyapunov(a, b, z, 1e-8)
+
+        with pytest.warns(LinAlgWarning):
+            solve_continuous_lyapunov_lowrank(a, b, shifts=[-1000.],
+                                              maxiter=5)
+
+    def test_riccati(self):
+        np.random.seed(1234)
+        a, b = _heat(200)
+        c = np.ones((1, 200)) / 200
+        for a_ in (a, a.toarray()):
+            z = solve_continuous_are_lowrank(a_, b, c)
+            x = solve_continuous_are(a.toarray(), b, c.T.dot(c), 1)
+            assert_allclose(z.dot(z.T), x, atol=1e-8*abs(x).max())
+
+        # unstable and complex
+        a = np.random.randn(50, 50) - 6*np.eye(50)
+        a[0, 0] = 5
+        a = a + 1j*np.random.randn(50, 50)
+        b = np.random.randn(50, 2)
+        c = np.random.randn(2, 50)
+        z = solve_continuous_are_lowrank(a, b, c, maxiter=300)
+        x = solve_continuous_are(a, b, c.T.dot(c), np.eye(2))
+        assert_allclose(z.dot(z.conj().T), x, atol=1e-8*abs(x).max())
+
+    def test_zero_rhs(self):
+        a, b = _heat(10)
+        assert_equal(solve_continuous_lyapunov_lowrank(a, 0*b).shape,
+                     (10, 0))
+        assert_equal(solve_continuous_are_lowrank(a, b, np.zeros((1, 10)))
+                     .shape, (10, 0))
+
+    def test_badcall(self):
+        a, b = _heat(10)
+        f = solve_continuous_lyapunov_lowrank
+        assert_raises(ValueError, f, a[:, :9], b)
+        assert_raises(ValueError, f, a, b[:9])
+        assert_raises(ValueError, f, a, b, shifts=[-1, 1])
+        assert_raises(ValueError, f, a, b, maxiter=0)
+        assert_raises(ValueError, solve_continuous_are_lowrank, a, b,
+                      np.ones((1, 9)))
@@ -1,10 +1,15 @@
 from __future__ import division, print_function, absolute_import
 
+import os
 import sys
+import struct
+import zipfile
+
 import numpy as np
 import scipy.sparse
 
 from scipy._lib._version import NumpyVersion
+from scipy._lib.six import string_types
 
 __all__ = ['save_npz', 'load_npz']
 
@@ -80,7 +85,7 @@ def save_npz(file, matrix, compressed=True):
         np.savez(file, **arrays_dict)
 
 
-def load_npz(file):
+def load_npz(file, mmap_mode=None):
     """ Load a sparse matrix from a file using ``.npz`` format.
 
     Parameters
@@ -88,6 +93,16 @@ def load_npz(file):
     file : str or file-like object
         Either the file name (string) or an open file (file-like object)
         where the data will be loaded.
+    mmap_mode : {None, 'r+', 'r', 'c'}, optional
+        If not None, memory-map the index and data arrays of the matrix
+        instead of reading them into memory, using the given mode (see
+        `numpy.memmap` for a description of the modes).  `file` must then
+        be the name of an uncompressed ``.npz`` file (as written by
+        ``save_npz(..., compressed=False)``) or of a directory holding one
+        ``.npy`` file per array of the archive (``format.npy``,
+        ``shape.npy``, ``data.npy``, ``indices.npy``, ...).
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -104,6 +119,17 @@ def load_npz(file):
     scipy.sparse.save_npz: Save a sparse matrix to a file using ``.npz`` format.
     numpy.load: Load several arrays from a ``.npz`` archive.
 
+    Notes
+    -----
+    A memory-mapped CSR, CSC or BSR matrix is not validated beyond O(1)
+    checks, and its index arrays keep the integer type they were saved with
+    (the other formats convert their index arrays on construction, which
+    may copy them into memory).  Products with
+    dense vectors and matrices, sums and row (column, for CSC) slicing run
+    the compiled kernels in a single pass over the major axis, so only the
+    parts of the file currently in use need to be resident in memory.  This
+    allows working with matrices that are larger than the available RAM.
+
     Examples
     --------
     Store sparse matrix to disk, and load it again:
@@ -126,25 +152,23 @@ def load_npz(file):
     >>> sparse_matrix.todense()
     matrix([[0, 0, 3],
             [4, 0, 0]], dtype=int64)
-    """
-
-    with np.load(file, **PICKLE_KWARGS) as loaded:
-        try:
-            matrix_format = loaded['format']
-        except KeyError:
-            raise ValueError('The file {} does not contain a sparse matrix.'.format(file))
 
-        matrix_format = matrix_format.item()
+    An uncompressed file can be memory-mapped, so that products are
+    computed without reading the whole matrix into memory:
 
-        if sys.version_info[0] >= 3 and not isinstance(matrix_format, str):
-            # Play safe with Python 2 vs 3 backward compatibility;
-            # files saved with Scipy < 1.0.0 may contain unicode or bytes.
-            matrix_format = matrix_format.decode('ascii')
+    >>> scipy.sparse.save_npz('/tmp/sparse_matrix.npz', sparse_matrix,
+    ...                       compressed=False)
+    >>> sparse_matrix = scipy.sparse.load_npz('/tmp/sparse_matrix.npz',
+    ...                                       mmap_mode='r')
+    >>> sparse_matrix.dot(np.array([1, 2, 3]))
+    array([9, 4])
+    """
+    if mmap_mode is not None:
+        return _load_npz_mmap(file, mmap_mode)
 
-        try:
-            cls = getattr(scipy.sparse, '{}_matrix'.format(matrix_format))
-        except AttributeError:
-            raise ValueError('Unknown matrix format "{}"'.format(matrix_format))
+    with np.load(file, **PICKLE_KWARGS) as loaded:
+        matrix_format = _get_format(loaded, file)
+        cls = _get_class(matrix_format)
 
         if matrix_format in ('csc', 'csr', 'bsr'):
             return cls((loaded['data'], loaded['indices'], loaded['indptr']), shape=loaded['shape'])
@@ -155,3 +179,136 @@ def load_npz(file):
         else:
             raise NotImplementedError('Load is not implemented for '
                                       'sparse matrix of format {}.'.format(matrix_format))
+
+
+def _get_format(loaded, file):
+    try:
+        matrix_format = loaded['format']
+    except KeyError:
+        raise ValueError('The file {} does not contain a sparse matrix.'.format(file))
+
+    matrix_format = matrix_format.item()
+
+    if sys.version_info[0] >= 3 and not isinstance(matrix_format, str):
+        # Play safe with Python 2 vs 3 backward compatibility;
+        # files saved with Scipy < 1.0.0 may contain unicode or bytes.
+        matrix_format = matrix_format.decode('ascii')
+
+    return matrix_format
+
+
+def _get_class(matrix_format):
+    try:
+        return getattr(scipy.sparse, '{}_matrix'.format(matrix_format))
+    except AttributeError:
+        raise ValueError('Unknown matrix format "{}"'.format(matrix_format))
+
+
+def _memmap_npy(fp, filename, offset, mmap_mode):
+    """Memory-map the ``.npy`` array stored in `filename` at `offset`.
+
+    `fp` is an open file object of `filename`.
+    """
+    fp.seek(offset)
+    version = np.lib.format.read_magic(fp)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fp)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fp)
+    if dtype.hasobject:
+        raise ValueError('Arrays of dtype {} cannot be memory-mapped.'.format(dtype))
+    if int(np.prod(shape)) == 0:
+        # mmap cannot map zero bytes
+        return np.zeros(shape, dtype=dtype)
+    order = 'F' if fortran_order else 'C'
+    return np.memmap(filename, dtype=dtype, mode=mmap_mode, offset=fp.tell(),
+                     shape=shape, order=order)
+
+
+class _MemmapNpzArrays(object):
+    """Read-only mapping from the array names of an uncompressed ``.npz``
+    file or of a directory of ``.npy`` files to memory-mapped arrays.
+    """
+
+    def __init__(self, file, mmap_mode):
+        if not isinstance(file, string_types):
+            raise ValueError('Memory-mapping requires a file or '
+                             'directory name, not {!r}.'.format(file))
+        self.file = file
+        self.mmap_mode = mmap_mode
+        self._offsets = None
+        if not os.path.isdir(file):
+            self._offsets = {}
+            with zipfile.ZipFile(file) as archive, open(file, 'rb') as fp:
+                for info in archive.infolist():
+                    if not info.filename.endswith('.npy'):
+                        continue
+                    if info.compress_type != zipfile.ZIP_STORED:
+                        raise ValueError('The file {} is compressed and cannot '
+                                         'be memory-mapped; save it with '
+                                         'compressed=False.'.format(file))
+                    # The member data follows its local file header, whose
+                    # variable-length name and extra fields are only known
+                    # from the header itself.
+                    fp.seek(info.header_offset + 26)
+                    name_len, extra_len = struct.unpack('<HH', fp.read(4))
+                    self._offsets[info.filename[:-4]] = (info.header_offset +
+                                                         30 + name_len +
+                                                         extra_len)
+
+    def _path(self, key):
+        if self._offsets is None:
+            filename = os.path.join(self.file, key + '.npy')
+            if not os.path.exists(filename):
+                raise KeyError('{} is not a file in the directory'.format(key))
+            return filename, 0
+        try:
+            return self.file, self._offsets[key]
+        except KeyError:
+            raise KeyError('{} is not a file in the archive'.format(key))
+
+    def load(self, key):
+        """Read a (small) array into memory."""
+        filename, offset = self._path(key)
+        with open(filename, 'rb') as fp:
+            fp.seek(offset)
+            return np.lib.format.read_array(fp, **PICKLE_KWARGS)
+
+    def __getitem__(self, key):
+        filename, offset = self._path(key)
+        with open(filename, 'rb') as fp:
+            return _memmap_npy(fp, filename, offset, self.mmap_mode)
+
+
+def _load_npz_mmap(file, mmap_mode):
+    arrays = _MemmapNpzArrays(file, mmap_mode)
+
+    try:
+        loaded_format = arrays.load('format')
+    except (KeyError, ValueError):
+        raise ValueError('The file {} does not contain a sparse matrix.'.format(file))
+    matrix_format = _get_format({'format': loaded_format}, file)
+    cls = _get_class(matrix_format)
+    shape = tuple(arrays.load('shape'))
+
+    if matrix_format in ('csc', 'csr', 'bsr'):
+        data = arrays['data']
+        kwargs = {}
+        if matrix_format == 'bsr':
+            kwargs['blocksize'] = data.shape[1:]
+        # Assign the arrays to an empty matrix rather than passing them
+        # to the constructor, which inspects their contents and may
+        # downcast (i.e. copy into memory) the index arrays.
+        matrix = cls(shape, dtype=data.dtype, **kwargs)
+        matrix.data = data
+        matrix.indices = arrays['indices']
+        matrix.indptr = arrays['indptr']
+        matrix.check_format(full_check=False)
+        return matrix
+    elif matrix_format == 'dia':
+        return cls((arrays['data'], arrays['offsets']), shape=shape)
+    elif matrix_format == 'coo':
+        return cls((arrays['data'], (arrays['row'], arrays['col'])), shape=shape)
+    else:
+        raise NotImplementedError('Load is not implemented for '
+                                  'sparse matrix of format {}.'.format(matrix_format))
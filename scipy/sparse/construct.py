@@ -5,14 +5,15 @@ from __future__ import division, print_function, absolute_import
 __docformat__ = "restructuredtext en"
 
 __all__ = ['spdiags', 'eye', 'identity', 'kron', 'kronsum',
-           'hstack', 'vstack', 'bmat', 'rand', 'random', 'diags', 'block_diag']
+           'hstack', 'vstack', 'bmat', 'rand', 'random', 'diags', 'block_diag',
+           'from_coo_chunks']
 
 
 import numpy as np
 
 from scipy._lib.six import xrange
 
-from .sputils import upcast, get_index_dtype, isscalarlike
+from .sputils import upcast, get_index_dtype, isscalarlike, check_shape
 
 from .csr import csr_matrix
 from .csc import csc_matrix
@@ -676,6 +677,78 @@ def block_diag(mats, format=None, dtype=None):
     return bmat(rows, format=format, dtype=dtype)
 
 
+def from_coo_chunks(chunks, shape, format='csr', dtype=None):
+    """
+    Build a sparse matrix from chunks of COO triplets.
+
+    Parameters
+    ----------
+    chunks : iterable of (data, (row, col))
+        The entries of the matrix, in any number of chunks of the form
+        accepted by `coo_matrix`.  Entries may be repeated, within and
+        across chunks, and are summed.  Each chunk is read only once, so
+        `chunks` may be a generator that reads an edge list piece by piece.
+    shape : tuple of int
+        The shape of the matrix.
+    format : {'csr', 'csc'}, optional
+        The sparse format of the result.  Default: 'csr'.
+    dtype : dtype specifier, optional
+        The data-type of the output matrix.  If not given, the dtype is
+        determined from that of the chunks.
+
+    Returns
+    -------
+    res : csr_matrix or csc_matrix
+        The matrix in canonical format, i.e. with sorted indices, no
+        duplicate entries and no explicitly stored zeros.
+
+    Notes
+    -----
+    Each chunk is converted to the compressed format on its own and the
+    results are added.  Partial sums over equal numbers of chunks are
+    merged, as in a binary counter, so that every entry takes part in
+    ``O(log(number of chunks))`` linear merges.  Only the current chunk and
+    the partial sums are held in memory, not the full list of triplets.
+
+    .. versionadded:: 1.2.0
+
+    See Also
+    --------
+    coo_matrix
+
+    Examples
+    --------
+    >>> from scipy.sparse import from_coo_chunks
+    >>> chunks = [([1, 2], ([0, 1], [1, 0])), ([3, 4], ([0, 1], [1, 1]))]
+    >>> from_coo_chunks(chunks, shape=(2, 2)).toarray()
+    array([[0, 4],
+           [2, 4]])
+
+    """
+    if format not in ('csr', 'csc'):
+        raise ValueError("format must be 'csr' or 'csc', got %r" % (format,))
+    shape = check_shape(shape)
+
+    # Partial sums with the number of chunks in each of them
+    partial = []
+    for chunk in chunks:
+        x = coo_matrix(chunk, shape=shape, dtype=dtype).asformat(format)
+        count = 1
+        while partial and partial[-1][1] == count:
+            x = partial.pop()[0] + x
+            count *= 2
+        partial.append((x, count))
+
+    if not partial:
+        return coo_matrix(shape, dtype=dtype).asformat(format)
+    x = partial.pop()[0]
+    while partial:
+        x = partial.pop()[0] + x
+    x.eliminate_zeros()
+    x.sum_duplicates()
+    return x
+
+
 def random(m, n, density=0.01, format='coo', dtype=None,
            random_state=None, data_rvs=None):
     """Generate a sparse matrix of the given shape and density with randomly
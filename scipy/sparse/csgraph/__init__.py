@@ -20,6 +20,7 @@ Contents
    floyd_warshall -- use the Floyd-Warshall algorithm for shortest path
    bellman_ford -- use the Bellman-Ford algorithm for shortest path
    johnson -- use Johnson's algorithm for shortest path
+   shortest_path_pairs -- compute the shortest paths between pairs of points
    breadth_first_order -- compute a breadth-first order of nodes
    depth_first_order -- compute a depth-first order of nodes
    breadth_first_tree -- construct the breadth-first tree from a given node
@@ -161,6 +162,7 @@ __all__ = ['connected_components',
            'dijkstra',
            'bellman_ford',
            'johnson',
+           'shortest_path_pairs',
            'breadth_first_order',
            'depth_first_order',
            'breadth_first_tree',
@@ -180,7 +182,7 @@ __all__ = ['connected_components',
 
 from ._laplacian import laplacian
 from ._shortest_path import shortest_path, floyd_warshall, dijkstra,\
-    bellman_ford, johnson, NegativeCycleError
+    bellman_ford, johnson, shortest_path_pairs, NegativeCycleError
 from ._traversal import breadth_first_order, depth_first_order, \
     breadth_first_tree, depth_first_tree, connected_components
 from ._min_spanning_tree import minimum_spanning_tree
@@ -10,12 +10,15 @@ Laplacian of a compressed-sparse graph
 from __future__ import division, print_function, absolute_import
 
 import numpy as np
-from scipy.sparse import isspmatrix
+from scipy.sparse import isspmatrix, dia_matrix
+from scipy.sparse import _sparsetools
+from scipy.sparse.linalg import LinearOperator
 
 
 ###############################################################################
 # Graph laplacian
-def laplacian(csgraph, normed=False, return_diag=False, use_out_degree=False):
+def laplacian(csgraph, normed=False, return_diag=False, use_out_degree=False,
+              copy=True, form='array', dtype=None):
     """
     Return the Laplacian matrix of a directed graph.
 
@@ -31,12 +34,40 @@ def laplacian(csgraph, normed=False, return_diag=False, use_out_degree=False):
         If True, then use out-degree instead of in-degree.
         This distinction matters only if the graph is asymmetric.
         Default: False.
+    copy : bool, optional
+        If False, then change `csgraph` in place if possible, avoiding
+        doubling the memory use.  For CSR and CSC matrices, the Laplacian
+        shares the index arrays of `csgraph`, unless diagonal entries have
+        to be inserted.  Default: True.
+
+        .. versionadded:: 1.2.0
+    form : {'array', 'function', 'lo'}, optional
+        Format of the output Laplacian:
+
+        * 'array' is a numpy array or a sparse matrix, as the input;
+        * 'function' is a function applying the Laplacian to a vector or
+          to the columns of a 2-D array;
+        * 'lo' is a `LinearOperator` applying the Laplacian.
+
+        The last two forms do not compute the Laplacian matrix, and leave
+        `csgraph` unchanged.  Only the degrees are stored, so that they can
+        be used with ``eigsh`` or ``lobpcg`` on graphs too large to hold a
+        second copy.  Default: 'array'.
+
+        .. versionadded:: 1.2.0
+    dtype : dtype, optional
+        The data type of the output, e.g. ``np.float32`` to halve the memory
+        use on large graphs.  Default: the data type of `csgraph`, or float
+        for the normalized Laplacian of an integer graph.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
-    lap : ndarray or sparse matrix
+    lap : ndarray, sparse matrix, function or LinearOperator
         The N x N laplacian matrix of csgraph. It will be a numpy array (dense)
-        if the input was dense, or a sparse matrix otherwise.
+        if the input was dense, or a sparse matrix otherwise, unless `form`
+        selects one of the matrix-free formats.
     diag : ndarray, optional
         The length-N diagonal of the Laplacian matrix.
         For the normalized Laplacian, this is the array of square roots
@@ -65,17 +96,42 @@ def laplacian(csgraph, normed=False, return_diag=False, use_out_degree=False):
            [  0,  -2,  16,  -6,  -8],
            [  0,  -3,  -6,  21, -12],
            [  0,  -4,  -8, -12,  24]])
+
+    The matrix-free form gives the same products:
+
+    >>> L = csgraph.laplacian(G, form='lo')
+    >>> np.allclose(L.matvec(np.ones(5)), 0)
+    True
     """
     if csgraph.ndim != 2 or csgraph.shape[0] != csgraph.shape[1]:
         raise ValueError('csgraph must be a square matrix or array')
+    if form not in ('array', 'function', 'lo'):
+        raise ValueError("form must be 'array', 'function' or 'lo', "
+                         "got %r" % (form,))
 
-    if normed and (np.issubdtype(csgraph.dtype, np.signedinteger)
-                   or np.issubdtype(csgraph.dtype, np.uint)):
-        csgraph = csgraph.astype(float)
+    if dtype is not None:
+        dtype = np.dtype(dtype)
+    elif normed and (np.issubdtype(csgraph.dtype, np.signedinteger)
+                     or np.issubdtype(csgraph.dtype, np.uint)):
+        dtype = np.dtype(float)
 
-    create_lap = _laplacian_sparse if isspmatrix(csgraph) else _laplacian_dense
     degree_axis = 1 if use_out_degree else 0
-    lap, d = create_lap(csgraph, normed=normed, axis=degree_axis)
+    if form != 'array':
+        if dtype is None:
+            dtype = csgraph.dtype
+        lap, d = _laplacian_operator(csgraph, normed=normed, axis=degree_axis,
+                                     dtype=dtype)
+        if form == 'lo':
+            lap = LinearOperator(csgraph.shape, matvec=lap, matmat=lap,
+                                 rmatvec=lap.rmatvec,
+                                 dtype=dtype)
+    else:
+        if isspmatrix(csgraph):
+            create_lap = _laplacian_sparse
+        else:
+            create_lap = _laplacian_dense
+        lap, d = create_lap(csgraph, normed=normed, axis=degree_axis,
+                            copy=copy, dtype=dtype)
     if return_diag:
         return lap, d
     return lap
@@ -85,13 +141,74 @@ def _setdiag_dense(A, d):
     A.flat[::len(d)+1] = d
 
 
-def _laplacian_sparse(graph, normed=False, axis=0):
+def _degrees(graph, axis):
+    """Degrees of the nodes of `graph`, ignoring the self loops."""
+    diag = graph.diagonal()
+    w = np.asarray(graph.sum(axis=axis)).ravel() - diag
+    return w, diag
+
+
+def _laplacian_operator(graph, normed=False, axis=0, dtype=None):
+    if not isspmatrix(graph):
+        graph = np.asarray(graph)
+    w, diag = _degrees(graph, axis)
+    if dtype is not None:
+        w = w.astype(dtype)
+        diag = diag.astype(dtype)
+
+    if normed:
+        isolated_node_mask = (w == 0)
+        w = np.where(isolated_node_mask, 1, np.sqrt(w))
+        # L = I - S^{-1} (A - diag(A)) S^{-1}, with zeros for isolated nodes
+        scale = 1 / w
+        d_lap = 1 - isolated_node_mask
+        d_adj = diag * scale**2
+    else:
+        scale = None
+        d_lap = w
+        d_adj = diag
+
+    def apply(x, dot):
+        x = np.asarray(x)
+        if x.ndim == 2:
+            column = (slice(None), np.newaxis)
+        else:
+            column = slice(None)
+        if scale is None:
+            y = dot(x)
+        else:
+            y = dot(x * scale[column]) * scale[column]
+        # the self loops are not part of the Laplacian
+        y = (d_lap + d_adj)[column] * x - y
+        if dtype is not None:
+            y = y.astype(np.result_type(dtype, x.dtype), copy=False)
+        return y
+
+    def lap(x):
+        return apply(x, graph.dot)
+
+    def rmatvec(x):
+        # the adjoint L^H x is conj(L^T conj(x)), with L^T applying graph.T
+        if np.issubdtype(graph.dtype, np.complexfloating):
+            return np.conj(apply(np.conj(x), graph.T.dot))
+        return apply(x, graph.T.dot)
+
+    lap.rmatvec = rmatvec
+    return lap, w
+
+
+def _laplacian_sparse(graph, normed=False, axis=0, copy=True, dtype=None):
+    if graph.format in ('csr', 'csc'):
+        return _laplacian_compressed(graph, normed=normed, axis=axis,
+                                     copy=copy, dtype=dtype)
+    if dtype is not None and graph.dtype != dtype:
+        graph = graph.astype(dtype)
     if graph.format in ('lil', 'dok'):
         m = graph.tocoo()
         needs_copy = False
     else:
         m = graph
-        needs_copy = True
+        needs_copy = copy
     w = m.sum(axis=axis).getA1() - m.diagonal()
     if normed:
         m = m.tocoo(copy=needs_copy)
@@ -103,7 +220,8 @@ def _laplacian_sparse(graph, normed=False, axis=0):
         m.setdiag(1 - isolated_node_mask)
     else:
         if m.format == 'dia':
-            m = m.copy()
+            if needs_copy:
+                m = m.copy()
         else:
             m = m.tocoo(copy=needs_copy)
         m.data *= -1
@@ -111,8 +229,54 @@ def _laplacian_sparse(graph, normed=False, axis=0):
     return m, w
 
 
-def _laplacian_dense(graph, normed=False, axis=0):
-    m = np.array(graph)
+def _laplacian_compressed(graph, normed=False, axis=0, copy=True, dtype=None):
+    # Work on the data array of the CSR or CSC matrix, keeping its index
+    # arrays (and thus their dtype) instead of going through COO.
+    if dtype is not None and graph.dtype != dtype:
+        m = graph.astype(dtype)
+    elif copy:
+        m = graph.copy()
+    else:
+        m = graph
+    m.sum_duplicates()
+
+    w, _ = _degrees(m, axis)
+    if normed:
+        isolated_node_mask = (w == 0)
+        w = np.where(isolated_node_mask, 1, np.sqrt(w)).astype(m.dtype,
+                                                              copy=False)
+        # scale along the minor axis, then along the major axis
+        m.data /= w[m.indices]
+        m.data /= np.repeat(w, np.diff(m.indptr))
+        m.data *= -1
+        diag = 1 - isolated_node_mask
+    else:
+        m.data *= -1
+        diag = w
+
+    diag = np.asarray(diag, dtype=m.dtype)
+    N = m.shape[0]
+    idx = np.arange(N, dtype=m.indices.dtype)
+    offsets = np.empty(N, dtype=m.indices.dtype)
+    _sparsetools.csr_sample_offsets(N, N, m.indptr, m.indices, N, idx, idx,
+                                    offsets)
+    if not (offsets < 0).any():
+        m.data[offsets] = diag
+    else:
+        # Inserting the missing entries into the arrays of `m` is much
+        # slower than a single pass adding the diagonal.
+        m = m + dia_matrix((diag - m.diagonal(), 0), shape=m.shape)
+    # copies and sums may downcast the index arrays
+    m.indices = m.indices.astype(graph.indices.dtype, copy=False)
+    m.indptr = m.indptr.astype(graph.indptr.dtype, copy=False)
+    return m, w
+
+
+def _laplacian_dense(graph, normed=False, axis=0, copy=True, dtype=None):
+    if copy:
+        m = np.array(graph, dtype=dtype)
+    else:
+        m = np.asarray(graph, dtype=dtype)
     np.fill_diagonal(m, 0)
     w = m.sum(axis=axis)
     if normed:
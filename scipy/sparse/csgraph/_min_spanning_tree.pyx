@@ -6,21 +6,25 @@ from __future__ import absolute_import
 import numpy as np
 cimport numpy as np
 cimport cython
+from numpy.math cimport INFINITY
 
 from scipy.sparse import csr_matrix, isspmatrix_csc, isspmatrix
-from scipy.sparse.csgraph._validation import validate_graph
+from scipy.sparse.csgraph._validation import (validate_graph,
+                                              _validate_workers, _map_sources)
 
 include 'parameters.pxi'
 
-def minimum_spanning_tree(csgraph, overwrite=False):
+def minimum_spanning_tree(csgraph, overwrite=False, method='kruskal',
+                          workers=1):
     r"""
-    minimum_spanning_tree(csgraph, overwrite=False)
+    minimum_spanning_tree(csgraph, overwrite=False, method='kruskal', workers=1)
 
     Return a minimum spanning tree of an undirected graph
 
     A minimum spanning tree is a graph consisting of the subset of edges
     which together connect all connected nodes, while minimizing the total
-    sum of weights on the edges.  This is computed using the Kruskal algorithm.
+    sum of weights on the edges.  This is computed using the Kruskal algorithm,
+    or optionally Boruvka's algorithm.
 
     .. versionadded:: 0.11.0
 
@@ -31,7 +35,19 @@ def minimum_spanning_tree(csgraph, overwrite=False):
         (see notes below).
     overwrite : bool, optional
         if true, then parts of the input graph will be overwritten for
-        efficiency.
+        efficiency.  Only referenced with ``method='kruskal'``.
+    method : {'kruskal', 'boruvka'}, optional
+        Algorithm to use.  Kruskal's algorithm (default) sorts all the
+        edges.  Boruvka's algorithm repeatedly joins every tree of the
+        spanning forest to its nearest neighbour, and can use several
+        threads.
+
+        .. versionadded:: 1.2.0
+    workers : int, optional
+        Number of threads used to search the edges with
+        ``method='boruvka'``.  If -1, use all the CPUs.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -46,6 +62,24 @@ def minimum_spanning_tree(csgraph, overwrite=False):
     have an edge connecting them.  If either is nonzero, then the two are
     connected by the minimum nonzero value of the two.
 
+    If the graph is not connected, the result is a minimum spanning forest,
+    with one tree for each connected component.  Graphs in CSR format with
+    64-bit indices are supported by both methods.
+
+    With ``method='boruvka'``, each of the O(log N) rounds searches the
+    edges for the lightest edge leaving each tree, which is the part
+    distributed over the threads, and then joins the trees along these
+    edges [1]_.  Edges within a tree are dropped from the search as the
+    trees grow.  Ties between edges of equal weight are broken by their
+    position in the graph.  The input graph is not modified, but the
+    search holds a copy of each edge for both of its ends.  On a single
+    thread, Kruskal's algorithm is usually faster.
+
+    References
+    ----------
+    .. [1] O. Boruvka, "O jistem problemu minimalnim", Prace Moravske
+           Prirodovedecke Spolecnosti 3, 37 (1926).
+
     Examples
     --------
     The following example shows the computation of a minimum spanning tree
@@ -81,20 +115,29 @@ def minimum_spanning_tree(csgraph, overwrite=False):
            [0, 0, 0, 0]])
     """
     global NULL_IDX
-    
+
+    if method not in ('kruskal', 'boruvka'):
+        raise ValueError("method must be 'kruskal' or 'boruvka'")
+    workers = _validate_workers(workers)
+
+    if method == 'boruvka':
+        csgraph = validate_graph(csgraph, True, DTYPE, dense_output=False)
+        return _boruvka_spanning_tree(csgraph, workers)
+
     csgraph = validate_graph(csgraph, True, DTYPE, dense_output=False,
                              copy_if_sparse=not overwrite)
-    cdef int N = csgraph.shape[0]
+    N = csgraph.shape[0]
 
     data = csgraph.data
     indices = csgraph.indices
     indptr = csgraph.indptr
+    idx_dtype = indices.dtype
 
-    rank = np.zeros(N, dtype=ITYPE)
-    predecessors = np.arange(N, dtype=ITYPE)
+    rank = np.zeros(N, dtype=idx_dtype)
+    predecessors = np.arange(N, dtype=idx_dtype)
 
-    i_sort = np.argsort(data).astype(ITYPE)
-    row_indices = np.zeros(len(data), dtype=ITYPE)
+    i_sort = np.argsort(data).astype(idx_dtype)
+    row_indices = np.zeros(len(data), dtype=idx_dtype)
 
     _min_spanning_tree(data, indices, indptr, i_sort,
                        row_indices, predecessors, rank)
@@ -107,72 +150,281 @@ def minimum_spanning_tree(csgraph, overwrite=False):
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef void _min_spanning_tree(DTYPE_t[::1] data,
-                             ITYPE_t[::1] col_indices,
-                             ITYPE_t[::1] indptr,
-                             ITYPE_t[::1] i_sort,
-                             ITYPE_t[::1] row_indices,
-                             ITYPE_t[::1] predecessors,
-                             ITYPE_t[::1] rank) nogil:
+def _min_spanning_tree(DTYPE_t[::1] data,
+                       int32_or_int64[::1] col_indices,
+                       int32_or_int64[::1] indptr,
+                       int32_or_int64[::1] i_sort,
+                       int32_or_int64[::1] row_indices,
+                       int32_or_int64[::1] predecessors,
+                       int32_or_int64[::1] rank):
     # Work-horse routine for computing minimum spanning tree using
     #  Kruskal's algorithm.  By separating this code here, we get more
     #  efficient indexing.
-    cdef unsigned int i, j, V1, V2, R1, R2, n_edges_in_mst, n_verts, n_data
+    cdef np.npy_intp i, j, V1, V2, R1, R2, n_edges_in_mst, n_verts, n_data
     n_verts = predecessors.shape[0]
     n_data = i_sort.shape[0]
-    
-    # Arrange `row_indices` to contain the row index of each value in `data`.
-    # Note that the array `col_indices` already contains the column index.
-    for i in range(n_verts):
-        for j in range(indptr[i], indptr[i + 1]):
-            row_indices[j] = i
-    
-    # step through the edges from smallest to largest.
-    #  V1 and V2 are connected vertices.
-    n_edges_in_mst = 0
-    i = 0
-    while i < n_data and n_edges_in_mst < n_verts - 1:
-        j = i_sort[i]
-        V1 = row_indices[j]
-        V2 = col_indices[j]
-
-        # progress upward to the head node of each subtree
-        R1 = V1
-        while predecessors[R1] != R1:
-            R1 = predecessors[R1]
-        R2 = V2
-        while predecessors[R2] != R2:
-            R2 = predecessors[R2]
-
-        # Compress both paths.
-        while predecessors[V1] != R1:
-            predecessors[V1] = R1
-        while predecessors[V2] != R2:
-            predecessors[V2] = R2
-            
-        # if the subtrees are different, then we connect them and keep the
-        # edge.  Otherwise, we remove the edge: it duplicates one already
-        # in the spanning tree.
-        if R1 != R2:
-            n_edges_in_mst += 1
-            
-            # Use approximate (because of path-compression) rank to try
-            # to keep balanced trees.
-            if rank[R1] > rank[R2]:
-                predecessors[R2] = R1
-            elif rank[R1] < rank[R2]:
-                predecessors[R1] = R2
+
+    with nogil:
+        # Arrange `row_indices` to contain the row index of each value in
+        # `data`.  Note that the array `col_indices` already contains the
+        # column index.
+        for i in range(n_verts):
+            for j in range(indptr[i], indptr[i + 1]):
+                row_indices[j] = i
+
+        # step through the edges from smallest to largest.
+        #  V1 and V2 are connected vertices.
+        n_edges_in_mst = 0
+        i = 0
+        while i < n_data and n_edges_in_mst < n_verts - 1:
+            j = i_sort[i]
+            V1 = row_indices[j]
+            V2 = col_indices[j]
+
+            # progress upward to the head node of each subtree
+            R1 = V1
+            while predecessors[R1] != R1:
+                R1 = predecessors[R1]
+            R2 = V2
+            while predecessors[R2] != R2:
+                R2 = predecessors[R2]
+
+            # Compress both paths.
+            while predecessors[V1] != R1:
+                predecessors[V1] = R1
+            while predecessors[V2] != R2:
+                predecessors[V2] = R2
+
+            # if the subtrees are different, then we connect them and keep
+            # the edge.  Otherwise, we remove the edge: it duplicates one
+            # already in the spanning tree.
+            if R1 != R2:
+                n_edges_in_mst += 1
+
+                # Use approximate (because of path-compression) rank to try
+                # to keep balanced trees.
+                if rank[R1] > rank[R2]:
+                    predecessors[R2] = R1
+                elif rank[R1] < rank[R2]:
+                    predecessors[R1] = R2
+                else:
+                    predecessors[R2] = R1
+                    rank[R1] += 1
             else:
-                predecessors[R2] = R1
-                rank[R1] += 1
-        else:
+                data[j] = 0
+
+            i += 1
+
+        # We may have stopped early if we found a full-sized MST so zero out
+        # the rest
+        while i < n_data:
+            j = i_sort[i]
             data[j] = 0
-        
-        i += 1
-        
-    # We may have stopped early if we found a full-sized MST so zero out the rest
-    while i < n_data:
-        j = i_sort[i]
-        data[j] = 0
-        i += 1
-    
+            i += 1
+
+
+def _boruvka_spanning_tree(csgraph, workers):
+    N = csgraph.shape[0]
+    data = csgraph.data
+    indices = csgraph.indices
+    indptr = csgraph.indptr
+    idx_dtype = indices.dtype
+
+    # Both ends of every edge, with its weight and position in data.  The
+    # edges joining nodes of the same component are dropped as the trees
+    # grow, and the lists then end at adj_end.
+    adj_ptr = np.zeros(N + 1, dtype=idx_dtype)
+    adj_node = np.empty(2 * len(data), dtype=idx_dtype)
+    adj_edge = np.empty(2 * len(data), dtype=idx_dtype)
+    adj_weight = np.empty(2 * len(data), dtype=DTYPE)
+    _symmetric_adjacency(data, indices, indptr,
+                         adj_ptr, adj_node, adj_edge, adj_weight)
+    adj_end = adj_ptr[1:].copy()
+
+    # component of each node, as its lowest numbered node
+    components = np.arange(N, dtype=idx_dtype)
+    # lightest edge to another component and its other end, for each node
+    best_edge = np.empty(N, dtype=idx_dtype)
+    best_other = np.empty(N, dtype=idx_dtype)
+    keep = np.zeros(len(data), dtype=np.uint8)
+
+    def func(start, stop):
+        _boruvka_scan(adj_ptr, adj_end, adj_node, adj_edge, adj_weight,
+                      components, best_edge, best_other, start, stop)
+
+    while True:
+        _map_sources(func, N, workers, max_block=65536)
+        if _boruvka_join(data, components, best_edge, best_other, keep) == 0:
+            break
+
+    keep = keep.view(bool)
+    kept = np.concatenate(([0], np.cumsum(keep, dtype=idx_dtype)))
+    sp_tree = csr_matrix((data[keep], indices[keep], kept[indptr]), (N, N))
+    sp_tree.eliminate_zeros()
+
+    return sp_tree
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _symmetric_adjacency(np.ndarray[DTYPE_t, ndim=1, mode='c'] data,
+                         np.ndarray[int32_or_int64, ndim=1, mode='c'] indices,
+                         np.ndarray[int32_or_int64, ndim=1, mode='c'] indptr,
+                         np.ndarray[int32_or_int64, ndim=1, mode='c'] adj_ptr,
+                         np.ndarray[int32_or_int64, ndim=1, mode='c'] adj_node,
+                         np.ndarray[int32_or_int64, ndim=1, mode='c'] adj_edge,
+                         np.ndarray[DTYPE_t, ndim=1, mode='c'] adj_weight):
+    # Lists of neighbours of each node in both directions.  adj_ptr must be
+    # zero on input.
+    cdef DTYPE_t* w = <DTYPE_t*> data.data
+    cdef int32_or_int64* ind = <int32_or_int64*> indices.data
+    cdef int32_or_int64* ptr = <int32_or_int64*> indptr.data
+    cdef int32_or_int64* aptr = <int32_or_int64*> adj_ptr.data
+    cdef int32_or_int64* anode = <int32_or_int64*> adj_node.data
+    cdef int32_or_int64* aedge = <int32_or_int64*> adj_edge.data
+    cdef DTYPE_t* aw = <DTYPE_t*> adj_weight.data
+    cdef np.npy_intp N = indptr.shape[0] - 1
+    cdef np.npy_intp u, v, j, k
+
+    with nogil:
+        # degrees, shifted by two so that aptr[u + 1] is the fill position
+        # of node u below
+        for u in range(N):
+            for j in range(ptr[u], ptr[u + 1]):
+                v = ind[j]
+                if u + 2 <= N:
+                    aptr[u + 2] += 1
+                if v + 2 <= N:
+                    aptr[v + 2] += 1
+        for u in range(2, N + 1):
+            aptr[u] += aptr[u - 1]
+
+        for u in range(N):
+            for j in range(ptr[u], ptr[u + 1]):
+                v = ind[j]
+                k = aptr[u + 1]
+                anode[k] = v
+                aedge[k] = j
+                aw[k] = w[j]
+                aptr[u + 1] = k + 1
+                k = aptr[v + 1]
+                anode[k] = u
+                aedge[k] = j
+                aw[k] = w[j]
+                aptr[v + 1] = k + 1
+
+
+cdef inline bint _lighter(DTYPE_t w1, np.npy_intp e1,
+                          DTYPE_t w2, np.npy_intp e2) nogil:
+    # total order on the edges: by weight, then by position
+    return e2 < 0 or w1 < w2 or (w1 == w2 and e1 < e2)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _boruvka_scan(np.ndarray[int32_or_int64, ndim=1, mode='c'] adj_ptr,
+                  np.ndarray[int32_or_int64, ndim=1, mode='c'] adj_end,
+                  np.ndarray[int32_or_int64, ndim=1, mode='c'] adj_node,
+                  np.ndarray[int32_or_int64, ndim=1, mode='c'] adj_edge,
+                  np.ndarray[DTYPE_t, ndim=1, mode='c'] adj_weight,
+                  np.ndarray[int32_or_int64, ndim=1, mode='c'] components,
+                  np.ndarray[int32_or_int64, ndim=1, mode='c'] best_edge,
+                  np.ndarray[int32_or_int64, ndim=1, mode='c'] best_other,
+                  np.npy_intp start, np.npy_intp stop):
+    # Find the lightest edge from each of the nodes start:stop to another
+    # component, and drop the edges within the component from their lists.
+    # Only the data of these nodes is written.
+    cdef int32_or_int64* aptr = <int32_or_int64*> adj_ptr.data
+    cdef int32_or_int64* aend = <int32_or_int64*> adj_end.data
+    cdef int32_or_int64* anode = <int32_or_int64*> adj_node.data
+    cdef int32_or_int64* aedge = <int32_or_int64*> adj_edge.data
+    cdef DTYPE_t* aw = <DTYPE_t*> adj_weight.data
+    cdef int32_or_int64* comp = <int32_or_int64*> components.data
+    cdef int32_or_int64* best = <int32_or_int64*> best_edge.data
+    cdef int32_or_int64* other = <int32_or_int64*> best_other.data
+    cdef np.npy_intp u, v, j, k, e, c, be, bv
+    cdef DTYPE_t bw
+
+    with nogil:
+        for u in range(start, stop):
+            c = comp[u]
+            be = -1
+            bv = -1
+            bw = 0
+            k = aptr[u]
+            for j in range(aptr[u], aend[u]):
+                v = anode[j]
+                if comp[v] != c:
+                    e = aedge[j]
+                    anode[k] = v
+                    aedge[k] = e
+                    aw[k] = aw[j]
+                    k += 1
+                    if _lighter(aw[j], e, bw, be):
+                        be = e
+                        bv = v
+                        bw = aw[j]
+            aend[u] = k
+            best[u] = be
+            other[u] = bv
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _boruvka_join(np.ndarray[DTYPE_t, ndim=1, mode='c'] data,
+                  np.ndarray[int32_or_int64, ndim=1, mode='c'] components,
+                  np.ndarray[int32_or_int64, ndim=1, mode='c'] best_edge,
+                  np.ndarray[int32_or_int64, ndim=1, mode='c'] best_other,
+                  np.ndarray[np.uint8_t, ndim=1, mode='c'] keep):
+    # Join each component to its nearest neighbour, along the lightest of
+    # the edges found for its nodes.  Returns the number of joins.
+    cdef DTYPE_t* w = <DTYPE_t*> data.data
+    cdef int32_or_int64* comp = <int32_or_int64*> components.data
+    cdef int32_or_int64* best = <int32_or_int64*> best_edge.data
+    cdef int32_or_int64* other = <int32_or_int64*> best_other.data
+    cdef np.npy_intp N = components.shape[0]
+    cdef np.npy_intp u, c, r1, r2, n_joins = 0
+    # node holding the lightest edge of each component, stored at the
+    # component root
+    cdef np.ndarray[int32_or_int64, ndim=1, mode='c'] chosen = \
+        np.empty(N, dtype=components.dtype)
+    cdef int32_or_int64* ch = <int32_or_int64*> chosen.data
+
+    with nogil:
+        for u in range(N):
+            ch[u] = -1
+        for u in range(N):
+            if best[u] >= 0:
+                c = comp[u]
+                if ch[c] < 0 or _lighter(w[best[u]], best[u],
+                                         w[best[ch[c]]], best[ch[c]]):
+                    ch[c] = u
+
+        # Since the edges are totally ordered, the chosen edges form a
+        # forest, up to edges chosen by both of their components.
+        for c in range(N):
+            u = ch[c]
+            if u < 0:
+                continue
+            r1 = _find_root(comp, u)
+            r2 = _find_root(comp, other[u])
+            if r1 != r2:
+                if r1 < r2:
+                    comp[r2] = r1
+                else:
+                    comp[r1] = r2
+                keep[best[u]] = 1
+                n_joins += 1
+
+        # Every node is linked to a lower numbered one, so that one pass
+        # in increasing order flattens the trees.
+        for u in range(N):
+            comp[u] = comp[comp[u]]
+    return n_joins
+
+
+cdef inline np.npy_intp _find_root(int32_or_int64* parent,
+                                   np.npy_intp v) nogil:
+    while parent[v] != v:
+        v = parent[v]
+    return v
@@ -12,16 +12,19 @@ the Bellman-Ford algorithm, or Johnson's Algorithm.
 from __future__ import absolute_import
 
 import warnings
+import threading
 
 import numpy as np
 cimport numpy as np
 
 from scipy.sparse import csr_matrix, isspmatrix, isspmatrix_csr, isspmatrix_csc
-from scipy.sparse.csgraph._validation import validate_graph
+from scipy.sparse.csgraph._validation import (validate_graph,
+                                              _validate_workers, _map_sources)
 
 cimport cython
 
-from libc.stdlib cimport malloc, free
+from libc.stdlib cimport malloc, realloc, free
+from libc.math cimport fabs, sqrt
 from numpy.math cimport INFINITY
 
 include 'parameters.pxi'
@@ -37,10 +40,11 @@ def shortest_path(csgraph, method='auto',
                   return_predecessors=False,
                   unweighted=False,
                   overwrite=False,
-                  indices=None):
+                  indices=None,
+                  workers=1):
     """
     shortest_path(csgraph, method='auto', directed=True, return_predecessors=False,
-                  unweighted=False, overwrite=False, indices=None)
+                  unweighted=False, overwrite=False, indices=None, workers=1)
 
     Perform a shortest-path graph search on a positive directed or
     undirected graph.
@@ -98,6 +102,12 @@ def shortest_path(csgraph, method='auto',
     indices : array_like or int, optional
         If specified, only compute the paths for the points at the given
         indices. Incompatible with method == 'FW'.
+    workers : int, optional
+        Number of threads among which the source points are distributed,
+        for methods 'D', 'BF' and 'J'.  If -1 is given, all processors are
+        used.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -190,17 +200,20 @@ def shortest_path(csgraph, method='auto',
     elif method == 'D':
         return dijkstra(csgraph, directed,
                         return_predecessors=return_predecessors,
-                        unweighted=unweighted, indices=indices)
+                        unweighted=unweighted, indices=indices,
+                        workers=workers)
 
     elif method == 'BF':
         return bellman_ford(csgraph, directed,
                             return_predecessors=return_predecessors,
-                            unweighted=unweighted, indices=indices)
+                            unweighted=unweighted, indices=indices,
+                            workers=workers)
 
     elif method == 'J':
         return johnson(csgraph, directed,
                        return_predecessors=return_predecessors,
-                       unweighted=unweighted, indices=indices)
+                       unweighted=unweighted, indices=indices,
+                       workers=workers)
 
     else:
         raise ValueError("unrecognized method '%s'" % method)
@@ -394,10 +407,12 @@ cdef void _floyd_warshall(
 
 def dijkstra(csgraph, directed=True, indices=None,
              return_predecessors=False,
-             unweighted=False, limit=np.inf):
+             unweighted=False, limit=np.inf,
+             workers=1, output='dense', min_only=False):
     """
     dijkstra(csgraph, directed=True, indices=None, return_predecessors=False,
-             unweighted=False, limit=np.inf)
+             unweighted=False, limit=np.inf, workers=1, output='dense',
+             min_only=False)
 
     Dijkstra algorithm using Fibonacci Heaps
 
@@ -430,21 +445,63 @@ def dijkstra(csgraph, directed=True, indices=None,
         will be equal to np.inf (i.e., not connected).
 
         .. versionadded:: 0.14.0
+    workers : int, optional
+        Number of threads among which the source points are distributed.
+        If -1 is given, all processors are used.  Default: 1.
+
+        .. versionadded:: 1.2.0
+    output : {'dense', 'sparse'}, optional
+        If 'sparse', return the distances and predecessors as sparse
+        matrices of shape (len(indices), N), which only store the nodes
+        within distance `limit` of each source point, including the source
+        point itself at distance zero.  The memory needed is then
+        proportional to the number of such pairs rather than to
+        ``len(indices) * N``.  Default: 'dense'.
+
+        The predecessor matrix stores the same entries as the distance
+        matrix, with -9999 stored for the source points themselves.  A
+        predecessor 0 is stored as an explicit zero, which ``toarray()``
+        cannot tell apart from a node that was not reached.  The dense
+        convention, with -9999 for the nodes that were not reached, is
+        obtained with::
+
+            P = np.full(predecessors.shape, -9999, dtype=predecessors.dtype)
+            coo = predecessors.tocoo()
+            P[coo.row, coo.col] = coo.data
+
+        .. versionadded:: 1.2.0
+    min_only : bool, optional
+        If True, then for every node in the graph, find the shortest path
+        from any of the nodes in `indices`, in a single search started from
+        all of them at once.  The results then have shape (N,), and the
+        nodes of origin of the paths are returned as well.  `workers` and
+        `output` do not apply.  Default: False.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
-    dist_matrix : ndarray
+    dist_matrix : ndarray or csr_matrix
         The matrix of distances between graph nodes. dist_matrix[i,j]
         gives the shortest distance from point i to point j along the graph.
+        If min_only=True, dist_matrix[j] gives the shortest distance from
+        any of the points in `indices` to point j.
 
-    predecessors : ndarray
+    predecessors : ndarray or csr_matrix
         Returned only if return_predecessors == True.
         The matrix of predecessors, which can be used to reconstruct
         the shortest paths.  Row i of the predecessor matrix contains
         information on the shortest paths from point i: each entry
         predecessors[i, j] gives the index of the previous node in the
         path from point i to point j.  If no path exists between point
-        i and j, then predecessors[i, j] = -9999
+        i and j, then predecessors[i, j] = -9999.
+        If min_only=True, predecessors[j] is the previous node on the
+        shortest path to point j from any of the points in `indices`.
+
+    sources : ndarray
+        Returned only if min_only=True and return_predecessors=True.
+        sources[j] is the point of `indices` from which the shortest path
+        to point j starts, or -9999 if no such path exists.
 
     Notes
     -----
@@ -459,6 +516,15 @@ def dijkstra(csgraph, directed=True, indices=None,
     be handled by specialized algorithms such as Bellman-Ford's algorithm
     or Johnson's algorithm.
 
+    The searches from the different source points are independent.  With
+    ``workers != 1``, they are run in parallel threads, each with its own
+    heap, which release the GIL.  With ``min_only=True``, all the source
+    points are inserted into the heap at once, so that the cost is that of
+    a single search, and the memory is proportional to N, whatever the
+    number of source points.  A search only resets the nodes it has
+    reached, so that its cost is proportional to the size of the part of
+    the graph within distance `limit` of the source point.
+
     Examples
     --------
     >>> from scipy.sparse import csr_matrix
@@ -513,19 +579,12 @@ def dijkstra(csgraph, directed=True, indices=None,
     if limitf < 0:
         raise ValueError('limit must be >= 0')
 
-    #------------------------------
-    # initialize dist_matrix for output
-    dist_matrix = np.zeros((len(indices), N), dtype=DTYPE)
-    dist_matrix.fill(np.inf)
-    dist_matrix[np.arange(len(indices)), indices] = 0
+    if output not in ('dense', 'sparse'):
+        raise ValueError("output must be 'dense' or 'sparse'")
+    if min_only and output != 'dense':
+        raise ValueError("output='sparse' is not supported with min_only")
 
-    #------------------------------
-    # initialize predecessors for output
-    if return_predecessors:
-        predecessor_matrix = np.empty((len(indices), N), dtype=ITYPE)
-        predecessor_matrix.fill(NULL_IDX)
-    else:
-        predecessor_matrix = np.empty((0, N), dtype=ITYPE)
+    workers = _validate_workers(workers)
 
     if unweighted:
         csr_data = np.ones(csgraph.data.shape)
@@ -533,19 +592,55 @@ def dijkstra(csgraph, directed=True, indices=None,
         csr_data = csgraph.data
 
     if directed:
-        _dijkstra_directed(indices,
-                           csr_data, csgraph.indices, csgraph.indptr,
-                           dist_matrix, predecessor_matrix, limitf)
+        csgraphT = None
+        csrT_data = None
     else:
         csgraphT = csgraph.T.tocsr()
         if unweighted:
             csrT_data = csr_data
         else:
             csrT_data = csgraphT.data
-        _dijkstra_undirected(indices,
-                             csr_data, csgraph.indices, csgraph.indptr,
-                             csrT_data, csgraphT.indices, csgraphT.indptr,
-                             dist_matrix, predecessor_matrix, limitf)
+
+    if min_only:
+        dist_matrix = np.empty(N, dtype=DTYPE)
+        dist_matrix.fill(np.inf)
+        predecessor_matrix = np.empty(N, dtype=ITYPE)
+        predecessor_matrix.fill(NULL_IDX)
+        source_matrix = np.empty(N, dtype=ITYPE)
+        source_matrix.fill(NULL_IDX)
+        if csgraphT is None:
+            csgraphT = csgraph
+            csrT_data = csr_data
+        _dijkstra_min_only(indices,
+                           csr_data, csgraph.indices, csgraph.indptr,
+                           csrT_data, csgraphT.indices, csgraphT.indptr,
+                           directed, dist_matrix, predecessor_matrix,
+                           source_matrix, limitf)
+        if return_predecessors:
+            return dist_matrix, predecessor_matrix, source_matrix
+        return dist_matrix
+
+    if output == 'sparse':
+        return _dijkstra_sparse(indices, csr_data, csgraph,
+                                csrT_data, csgraphT,
+                                return_predecessors, limitf, workers)
+
+    #------------------------------
+    # initialize dist_matrix for output
+    dist_matrix = np.zeros((len(indices), N), dtype=DTYPE)
+    dist_matrix.fill(np.inf)
+    dist_matrix[np.arange(len(indices)), indices] = 0
+
+    #------------------------------
+    # initialize predecessors for output
+    if return_predecessors:
+        predecessor_matrix = np.empty((len(indices), N), dtype=ITYPE)
+        predecessor_matrix.fill(NULL_IDX)
+    else:
+        predecessor_matrix = np.empty((0, N), dtype=ITYPE)
+
+    _dijkstra_dense(indices, csr_data, csgraph, csrT_data, csgraphT,
+                    dist_matrix, predecessor_matrix, limitf, workers)
 
     if return_predecessors:
         return (dist_matrix.reshape(return_shape),
@@ -554,154 +649,876 @@ def dijkstra(csgraph, directed=True, indices=None,
         return dist_matrix.reshape(return_shape)
 
 
-cdef _dijkstra_directed(
+def _dijkstra_dense(indices, csr_data, csgraph, csrT_data, csgraphT,
+                    dist_matrix, predecessor_matrix, limit, workers):
+    # rows of dist_matrix and predecessor_matrix are filled in-place
+    if csgraphT is None:
+        csgraphT = csgraph
+        csrT_data = csr_data
+        directed = True
+    else:
+        directed = False
+
+    def func(start, stop):
+        _dijkstra_rows(indices, start, stop,
+                       csr_data, csgraph.indices, csgraph.indptr,
+                       csrT_data, csgraphT.indices, csgraphT.indptr,
+                       directed, dist_matrix, predecessor_matrix, limit,
+                       None)
+
+    _map_sources(func, len(indices), workers)
+
+
+def _dijkstra_sparse(indices, csr_data, csgraph, csrT_data, csgraphT,
+                     return_predecessors, limit, workers):
+    cdef ITYPE_t N = csgraph.shape[0]
+    if csgraphT is None:
+        csgraphT = csgraph
+        csrT_data = csr_data
+        directed = True
+    else:
+        directed = False
+
+    dummy_dist = np.empty((0, N), dtype=DTYPE)
+    dummy_pred = np.empty((0, N), dtype=ITYPE)
+
+    def func(start, stop):
+        out = _SparseRows(stop - start, return_predecessors)
+        _dijkstra_rows(indices, start, stop,
+                       csr_data, csgraph.indices, csgraph.indptr,
+                       csrT_data, csgraphT.indices, csgraphT.indptr,
+                       directed, dummy_dist, dummy_pred, limit, out)
+        return out.to_arrays()
+
+    results = _map_sources(func, len(indices), workers)
+
+    counts = np.concatenate([r[0] for r in results])
+    indptr = np.zeros(len(indices) + 1, dtype=ITYPE)
+    np.cumsum(counts, out=indptr[1:])
+    col = np.concatenate([r[1] for r in results])
+    shape = (len(indices), N)
+
+    # sort_indices works in-place, so that the matrices must not share
+    # their index arrays
+    dist_matrix = csr_matrix((np.concatenate([r[2] for r in results]),
+                              col.copy(), indptr.copy()), shape=shape)
+    dist_matrix.sort_indices()
+    if return_predecessors:
+        predecessor_matrix = csr_matrix(
+            (np.concatenate([r[3] for r in results]), col, indptr),
+            shape=shape)
+        predecessor_matrix.sort_indices()
+        return dist_matrix, predecessor_matrix
+    return dist_matrix
+
+
+cdef class _SparseRows:
+    # Growable buffers, which store the nodes reached from a block of
+    # source points in CSR order.
+    cdef ITYPE_t* counts
+    cdef ITYPE_t* col
+    cdef DTYPE_t* dist
+    cdef ITYPE_t* pred
+    cdef ITYPE_t n_rows
+    cdef size_t size, capacity
+    cdef int store_pred
+
+    def __cinit__(self, ITYPE_t n_rows, int store_pred):
+        self.n_rows = n_rows
+        self.store_pred = store_pred
+        self.size = 0
+        self.capacity = 0
+        self.counts = <ITYPE_t*> malloc((n_rows + 1) * sizeof(ITYPE_t))
+        self.col = NULL
+        self.dist = NULL
+        self.pred = NULL
+        if self.counts == NULL:
+            raise MemoryError()
+
+    def __dealloc__(self):
+        free(self.counts)
+        free(self.col)
+        free(self.dist)
+        free(self.pred)
+
+    cdef int reserve(self, size_t extra) nogil:
+        # make room for `extra` more entries, returns -1 if out of memory
+        cdef size_t capacity = self.capacity
+        cdef void* tmp
+        if self.size + extra <= capacity:
+            return 0
+        while capacity < self.size + extra:
+            capacity = 2 * capacity + 64
+
+        tmp = realloc(self.col, capacity * sizeof(ITYPE_t))
+        if tmp == NULL:
+            return -1
+        self.col = <ITYPE_t*> tmp
+        tmp = realloc(self.dist, capacity * sizeof(DTYPE_t))
+        if tmp == NULL:
+            return -1
+        self.dist = <DTYPE_t*> tmp
+        if self.store_pred:
+            tmp = realloc(self.pred, capacity * sizeof(ITYPE_t))
+            if tmp == NULL:
+                return -1
+            self.pred = <ITYPE_t*> tmp
+        self.capacity = capacity
+        return 0
+
+    def to_arrays(self):
+        cdef size_t k
+        counts = np.empty(self.n_rows, dtype=ITYPE)
+        col = np.empty(self.size, dtype=ITYPE)
+        dist = np.empty(self.size, dtype=DTYPE)
+        cdef ITYPE_t[:] counts_view = counts
+        cdef ITYPE_t[:] col_view = col
+        cdef DTYPE_t[:] dist_view = dist
+        cdef ITYPE_t[:] pred_view
+        for k in range(self.n_rows):
+            counts_view[k] = self.counts[k]
+        for k in range(self.size):
+            col_view[k] = self.col[k]
+            dist_view[k] = self.dist[k]
+        if self.store_pred:
+            pred = np.empty(self.size, dtype=ITYPE)
+            pred_view = pred
+            for k in range(self.size):
+                pred_view[k] = self.pred[k]
+        else:
+            pred = None
+        return counts, col, dist, pred
+
+
+@cython.boundscheck(False)
+cdef _dijkstra_rows(
             np.ndarray[ITYPE_t, ndim=1, mode='c'] source_indices,
+            ITYPE_t start, ITYPE_t stop,
             np.ndarray[DTYPE_t, ndim=1, mode='c'] csr_weights,
             np.ndarray[ITYPE_t, ndim=1, mode='c'] csr_indices,
             np.ndarray[ITYPE_t, ndim=1, mode='c'] csr_indptr,
+            np.ndarray[DTYPE_t, ndim=1, mode='c'] csrT_weights,
+            np.ndarray[ITYPE_t, ndim=1, mode='c'] csrT_indices,
+            np.ndarray[ITYPE_t, ndim=1, mode='c'] csrT_indptr,
+            int directed,
             np.ndarray[DTYPE_t, ndim=2, mode='c'] dist_matrix,
-            np.ndarray[ITYPE_t, ndim=2, mode='c'] pred,
-            DTYPE_t limit):
-    cdef unsigned int Nind = dist_matrix.shape[0]
-    cdef unsigned int N = dist_matrix.shape[1]
-    cdef unsigned int i, k, j_source, j_current
-    cdef ITYPE_t j
+            np.ndarray[ITYPE_t, ndim=2, mode='c'] pred_matrix,
+            DTYPE_t limit,
+            _SparseRows out):
+    # Run Dijkstra from source_indices[start:stop].  The results are
+    # written to the rows start:stop of dist_matrix and pred_matrix, or
+    # appended to `out` if it is given.  For undirected graphs, the
+    # edges of the transposed graph csrT are followed as well.
+    cdef ITYPE_t N = csr_indptr.shape[0] - 1
+    cdef ITYPE_t i, j, k, count
+    cdef int return_pred = (pred_matrix.size > 0 or
+                            (out is not None and out.store_pred))
+    cdef int failed = 0
+
+    cdef ITYPE_t* sources = <ITYPE_t*> source_indices.data
+    cdef DTYPE_t* weights = <DTYPE_t*> csr_weights.data
+    cdef ITYPE_t* indices = <ITYPE_t*> csr_indices.data
+    cdef ITYPE_t* indptr = <ITYPE_t*> csr_indptr.data
+    cdef DTYPE_t* weightsT = NULL
+    cdef ITYPE_t* indicesT = NULL
+    cdef ITYPE_t* indptrT = NULL
+    if not directed:
+        weightsT = <DTYPE_t*> csrT_weights.data
+        indicesT = <ITYPE_t*> csrT_indices.data
+        indptrT = <ITYPE_t*> csrT_indptr.data
+
+    cdef char* dist_data = dist_matrix.data
+    cdef char* pred_data = pred_matrix.data
+    cdef DTYPE_t* dist_row
+    cdef ITYPE_t* pred_row
+
+    cdef FibonacciNode* nodes = <FibonacciNode*> malloc(
+        N * sizeof(FibonacciNode))
+    cdef ITYPE_t* order = <ITYPE_t*> malloc(N * sizeof(ITYPE_t))
+    cdef ITYPE_t* pred = NULL
+    if return_pred:
+        pred = <ITYPE_t*> malloc(N * sizeof(ITYPE_t))
+
+    try:
+        if nodes == NULL or order == NULL or (return_pred and pred == NULL):
+            raise MemoryError()
+
+        with nogil:
+            for k in range(N):
+                initialize_node(&nodes[k], k)
+
+            for i in range(start, stop):
+                count = _dijkstra_scan(&sources[i], 1, nodes, order,
+                                       pred, NULL,
+                                       weights, indices, indptr,
+                                       weightsT, indicesT, indptrT, limit)
+
+                if out is None:
+                    # the row offset i * N overflows ITYPE_t for outputs
+                    # with more than 2**31 entries, so compute it in npy_intp
+                    dist_row = <DTYPE_t*> dist_data + <np.npy_intp> i * N
+                    for k in range(count):
+                        j = order[k]
+                        dist_row[j] = nodes[j].val
+                    if return_pred:
+                        pred_row = <ITYPE_t*> pred_data + <np.npy_intp> i * N
+                        for k in range(count):
+                            j = order[k]
+                            pred_row[j] = pred[j]
+                else:
+                    if out.reserve(count) < 0:
+                        failed = 1
+                        break
+                    for k in range(count):
+                        j = order[k]
+                        out.col[out.size + k] = j
+                        out.dist[out.size + k] = nodes[j].val
+                        if return_pred:
+                            out.pred[out.size + k] = pred[j]
+                    out.counts[i - start] = count
+                    out.size += count
 
-    cdef DTYPE_t next_val
+                # reset the reached nodes for the next search
+                for k in range(count):
+                    j = order[k]
+                    initialize_node(&nodes[j], j)
 
-    cdef int return_pred = (pred.size > 0)
+        if failed:
+            raise MemoryError()
+    finally:
+        free(nodes)
+        free(order)
+        free(pred)
 
+
+@cython.boundscheck(False)
+cdef _dijkstra_min_only(
+            np.ndarray[ITYPE_t, ndim=1, mode='c'] source_indices,
+            np.ndarray[DTYPE_t, ndim=1, mode='c'] csr_weights,
+            np.ndarray[ITYPE_t, ndim=1, mode='c'] csr_indices,
+            np.ndarray[ITYPE_t, ndim=1, mode='c'] csr_indptr,
+            np.ndarray[DTYPE_t, ndim=1, mode='c'] csrT_weights,
+            np.ndarray[ITYPE_t, ndim=1, mode='c'] csrT_indices,
+            np.ndarray[ITYPE_t, ndim=1, mode='c'] csrT_indptr,
+            int directed,
+            np.ndarray[DTYPE_t, ndim=1, mode='c'] dist_matrix,
+            np.ndarray[ITYPE_t, ndim=1, mode='c'] pred,
+            np.ndarray[ITYPE_t, ndim=1, mode='c'] sources,
+            DTYPE_t limit):
+    # Single search from all of source_indices.  pred and sources are
+    # written directly, the distances of the reached nodes are copied to
+    # dist_matrix afterwards.
+    cdef ITYPE_t N = dist_matrix.shape[0]
+    cdef ITYPE_t j, k, count
+
+    cdef DTYPE_t* weightsT = NULL
+    cdef ITYPE_t* indicesT = NULL
+    cdef ITYPE_t* indptrT = NULL
+    if not directed:
+        weightsT = <DTYPE_t*> csrT_weights.data
+        indicesT = <ITYPE_t*> csrT_indices.data
+        indptrT = <ITYPE_t*> csrT_indptr.data
+
+    cdef FibonacciNode* nodes = <FibonacciNode*> malloc(
+        N * sizeof(FibonacciNode))
+    cdef ITYPE_t* order = <ITYPE_t*> malloc(N * sizeof(ITYPE_t))
+
+    try:
+        if nodes == NULL or order == NULL:
+            raise MemoryError()
+
+        with nogil:
+            for k in range(N):
+                initialize_node(&nodes[k], k)
+
+            count = _dijkstra_scan(<ITYPE_t*> source_indices.data,
+                                   source_indices.shape[0],
+                                   nodes, order,
+                                   <ITYPE_t*> pred.data,
+                                   <ITYPE_t*> sources.data,
+                                   <DTYPE_t*> csr_weights.data,
+                                   <ITYPE_t*> csr_indices.data,
+                                   <ITYPE_t*> csr_indptr.data,
+                                   weightsT, indicesT, indptrT, limit)
+
+            for k in range(count):
+                j = order[k]
+                dist_matrix[j] = nodes[j].val
+    finally:
+        free(nodes)
+        free(order)
+
+
+cdef ITYPE_t _dijkstra_scan(ITYPE_t* sources,
+                            ITYPE_t n_sources,
+                            FibonacciNode* nodes,
+                            ITYPE_t* order,
+                            ITYPE_t* pred,
+                            ITYPE_t* origin,
+                            DTYPE_t* weights,
+                            ITYPE_t* indices,
+                            ITYPE_t* indptr,
+                            DTYPE_t* weightsT,
+                            ITYPE_t* indicesT,
+                            ITYPE_t* indptrT,
+                            DTYPE_t limit) nogil:
+    # Dijkstra on initialized nodes, from all of sources[:n_sources] at
+    # once.  On return, order[:count] holds the nodes within distance
+    # `limit` of the sources, in the order in which they were scanned, with
+    # their distances in nodes[j].val and, if not NULL, their predecessors
+    # in pred[j] and the source their path starts from in origin[j].  The
+    # transposed graph (weightsT, indicesT, indptrT) is only followed if
+    # not NULL.
     cdef FibonacciHeap heap
     cdef FibonacciNode *v
+    cdef ITYPE_t i, source
+    cdef ITYPE_t count = 0
+
+    heap.min_node = NULL
+    for i in range(n_sources):
+        source = sources[i]
+        if nodes[source].state != NOT_IN_HEAP:
+            # repeated source
+            continue
+        nodes[source].state = IN_HEAP
+        nodes[source].val = 0
+        insert_node(&heap, &nodes[source])
+        if pred != NULL:
+            pred[source] = NULL_IDX
+        if origin != NULL:
+            origin[source] = source
+
+    while heap.min_node:
+        v = remove_min(&heap)
+        v.state = SCANNED
+        order[count] = v.index
+        count += 1
+
+        _dijkstra_relax(&heap, v, nodes, pred, origin,
+                        weights, indices, indptr, limit)
+        if indptrT != NULL:
+            _dijkstra_relax(&heap, v, nodes, pred, origin,
+                            weightsT, indicesT, indptrT, limit)
+
+    return count
+
+
+cdef inline void _dijkstra_relax(FibonacciHeap* heap,
+                                 FibonacciNode* v,
+                                 FibonacciNode* nodes,
+                                 ITYPE_t* pred,
+                                 ITYPE_t* origin,
+                                 DTYPE_t* weights,
+                                 ITYPE_t* indices,
+                                 ITYPE_t* indptr,
+                                 DTYPE_t limit) nogil:
+    # relax the edges leaving the scanned node v
+    cdef ITYPE_t j, j_current
+    cdef DTYPE_t next_val
     cdef FibonacciNode *current_node
-    cdef FibonacciNode* nodes = <FibonacciNode*> malloc(N *
-                                                        sizeof(FibonacciNode))
 
-    for i in range(Nind):
-        j_source = source_indices[i]
+    for j in range(indptr[v.index], indptr[v.index + 1]):
+        j_current = indices[j]
+        current_node = &nodes[j_current]
+        if current_node.state != SCANNED:
+            next_val = v.val + weights[j]
+            if next_val <= limit:
+                if current_node.state == NOT_IN_HEAP:
+                    current_node.state = IN_HEAP
+                    current_node.val = next_val
+                    insert_node(heap, current_node)
+                elif current_node.val > next_val:
+                    decrease_val(heap, current_node, next_val)
+                else:
+                    continue
+                if pred != NULL:
+                    pred[j_current] = v.index
+                if origin != NULL:
+                    origin[j_current] = origin[v.index]
 
-        for k in range(N):
-            initialize_node(&nodes[k], k)
 
-        dist_matrix[i, j_source] = 0
-        heap.min_node = NULL
-        insert_node(&heap, &nodes[j_source])
+def shortest_path_pairs(csgraph, sources, targets, directed=True,
+                        method='bidirectional', coordinates=None,
+                        unweighted=False, return_paths=False, workers=1):
+    """
+    shortest_path_pairs(csgraph, sources, targets, directed=True,
+                        method='bidirectional', coordinates=None,
+                        unweighted=False, return_paths=False, workers=1)
 
-        while heap.min_node:
-            v = remove_min(&heap)
-            v.state = SCANNED
+    Compute the shortest paths between pairs of points.
 
-            for j in range(csr_indptr[v.index], csr_indptr[v.index + 1]):
-                j_current = csr_indices[j]
-                current_node = &nodes[j_current]
-                if current_node.state != SCANNED:
-                    next_val = v.val + csr_weights[j]
-                    if next_val <= limit:
-                        if current_node.state == NOT_IN_HEAP:
-                            current_node.state = IN_HEAP
-                            current_node.val = next_val
-                            insert_node(&heap, current_node)
-                            if return_pred:
-                                pred[i, j_current] = v.index
-                        elif current_node.val > next_val:
-                            decrease_val(&heap, current_node,
-                                         next_val)
-                            if return_pred:
-                                pred[i, j_current] = v.index
+    Unlike `dijkstra`, each search stops as soon as the path between its
+    pair of points is known, so that it usually only visits a small part
+    of the graph.
+
+    .. versionadded:: 1.2.0
+
+    Parameters
+    ----------
+    csgraph : array, matrix, or sparse matrix, 2 dimensions
+        The N x N array of non-negative distances representing the input
+        graph.
+    sources, targets : array_like of int
+        The start and end points of the paths.  They are broadcast against
+        each other.
+    directed : bool, optional
+        If True (default), then find the shortest path on a directed graph:
+        only move from point i to point j along paths csgraph[i, j].
+        If False, then find the shortest path on an undirected graph: the
+        algorithm can progress from point i to j along csgraph[i, j] or
+        csgraph[j, i].
+    method : {'bidirectional', 'astar'}, optional
+        Algorithm to use:
+
+           'bidirectional' -- (default) Dijkstra's algorithm, run from the
+                              source point and, backwards, from the target
+                              point until the two searches meet.
+
+           'astar'         -- the A* algorithm, i.e. Dijkstra's algorithm
+                              directed towards the target point by the
+                              Euclidean distance from `coordinates`.
+
+    coordinates : array_like, shape (N, d), optional
+        Coordinates of the nodes, required for method 'astar'.  The weight
+        of each edge must be at least the Euclidean distance between its
+        end points, otherwise the paths found may not be the shortest ones.
+    unweighted : bool, optional
+        If True, then find unweighted distances.  That is, rather than finding
+        the path between each point such that the sum of weights is minimized,
+        find the path such that the number of edges is minimized.
+    return_paths : bool, optional
+        If True, return the paths as well.
+    workers : int, optional
+        Number of threads among which the pairs are distributed.
+        If -1 is given, all processors are used.  Default: 1.
 
-            #v has now been scanned: add the distance to the results
-            dist_matrix[i, v.index] = v.val
+    Returns
+    -------
+    lengths : ndarray
+        The lengths of the shortest paths, with the broadcast shape of
+        `sources` and `targets`.  np.inf if there is no path.
+    paths : list of ndarray
+        Returned only if return_paths == True.  The nodes along each path,
+        from the source to the target point, in the order of the flattened
+        `lengths`.  Empty if there is no path.
+
+    See Also
+    --------
+    dijkstra
 
-    free(nodes)
+    Notes
+    -----
+    Like `dijkstra`, this routine does not work for graphs with negative
+    distances, nor for graphs with direction-dependent distances when
+    directed == False.
 
+    Examples
+    --------
+    >>> from scipy.sparse import csr_matrix
+    >>> from scipy.sparse.csgraph import shortest_path_pairs
 
-cdef _dijkstra_undirected(
-            np.ndarray[ITYPE_t, ndim=1, mode='c'] source_indices,
-            np.ndarray[DTYPE_t, ndim=1, mode='c'] csr_weights,
-            np.ndarray[ITYPE_t, ndim=1, mode='c'] csr_indices,
-            np.ndarray[ITYPE_t, ndim=1, mode='c'] csr_indptr,
-            np.ndarray[DTYPE_t, ndim=1, mode='c'] csrT_weights,
-            np.ndarray[ITYPE_t, ndim=1, mode='c'] csrT_indices,
-            np.ndarray[ITYPE_t, ndim=1, mode='c'] csrT_indptr,
-            np.ndarray[DTYPE_t, ndim=2, mode='c'] dist_matrix,
-            np.ndarray[ITYPE_t, ndim=2, mode='c'] pred,
-            DTYPE_t limit):
-    cdef unsigned int Nind = dist_matrix.shape[0]
-    cdef unsigned int N = dist_matrix.shape[1]
-    cdef unsigned int i, k, j_source, j_current
-    cdef ITYPE_t j
+    >>> graph = [
+    ... [0, 1 , 2, 0],
+    ... [0, 0, 0, 1],
+    ... [0, 0, 0, 3],
+    ... [0, 0, 0, 0]
+    ... ]
+    >>> graph = csr_matrix(graph)
 
-    cdef DTYPE_t next_val
+    >>> lengths, paths = shortest_path_pairs(graph, [0, 2], 3,
+    ...                                      return_paths=True)
+    >>> lengths
+    array([ 2.,  3.])
+    >>> paths
+    [array([0, 1, 3], dtype=int32), array([2, 3], dtype=int32)]
 
-    cdef int return_pred = (pred.size > 0)
+    """
+    csgraph = validate_graph(csgraph, directed, DTYPE,
+                             dense_output=False)
+    if np.any(csgraph.data < 0):
+        raise ValueError("shortest_path_pairs does not support negative "
+                         "weights")
 
-    cdef FibonacciHeap heap
-    cdef FibonacciNode *v
-    cdef FibonacciNode *current_node
-    cdef FibonacciNode* nodes = <FibonacciNode*> malloc(N *
-                                                        sizeof(FibonacciNode))
+    N = csgraph.shape[0]
 
-    for i in range(Nind):
-        j_source = source_indices[i]
+    sources, targets = np.broadcast_arrays(np.asarray(sources),
+                                           np.asarray(targets))
+    return_shape = sources.shape
+    sources = np.array(sources, order='C', dtype=ITYPE).reshape(-1)
+    targets = np.array(targets, order='C', dtype=ITYPE).reshape(-1)
+    for points in (sources, targets):
+        points[points < 0] += N
+        if np.any(points < 0) or np.any(points >= N):
+            raise ValueError("indices out of range 0...N")
 
-        for k in range(N):
-            initialize_node(&nodes[k], k)
+    if method == 'astar':
+        if coordinates is None:
+            raise ValueError("method 'astar' requires coordinates")
+        coordinates = np.array(coordinates, order='C', dtype=DTYPE)
+        if coordinates.ndim != 2 or coordinates.shape[0] != N:
+            raise ValueError("coordinates must have shape (N, d)")
+    elif method == 'bidirectional':
+        coordinates = np.empty((0, 0), dtype=DTYPE)
+    else:
+        raise ValueError("unrecognized method '%s'" % method)
+
+    workers = _validate_workers(workers)
+
+    if unweighted:
+        csr_data = np.ones(csgraph.data.shape)
+    else:
+        csr_data = csgraph.data
+    csgraphT = csr_matrix((csr_data, csgraph.indices, csgraph.indptr),
+                          csgraph.shape).T.tocsr()
+
+    lengths = np.empty(len(sources), dtype=DTYPE)
+    local = threading.local()
+
+    def func(start, stop):
+        # one workspace per thread, reused for all its blocks
+        search = getattr(local, 'search', None)
+        if search is None:
+            search = local.search = _PairSearch(
+                csr_data, csgraph.indices, csgraph.indptr,
+                csgraphT.data, csgraphT.indices, csgraphT.indptr,
+                directed, coordinates)
+        return search.run(sources, targets, start, stop, lengths,
+                          return_paths)
+
+    results = _map_sources(func, len(sources), workers)
+
+    lengths = lengths.reshape(return_shape)
+    if return_paths:
+        paths = []
+        for r in results:
+            paths.extend(r)
+        return lengths, paths
+    return lengths
+
+
+cdef class _PairSearch:
+    # Workspace for the point-to-point searches, of size O(N).  Between
+    # two searches, all nodes are in the NOT_IN_HEAP state; a search
+    # records the nodes it touches, and only resets those.
+    cdef np.ndarray csr_weights, csr_indices, csr_indptr
+    cdef np.ndarray csrT_weights, csrT_indices, csrT_indptr
+    cdef np.ndarray coordinates
+    cdef int directed
+    cdef ITYPE_t N
+    cdef ITYPE_t dim
+    cdef FibonacciNode* nodes_f
+    cdef FibonacciNode* nodes_b
+    cdef ITYPE_t* pred_f
+    cdef ITYPE_t* pred_b
+    cdef ITYPE_t* touched_f
+    cdef ITYPE_t* touched_b
+    cdef DTYPE_t* g
+    cdef ITYPE_t n_touched_f, n_touched_b
+
+    def __cinit__(self, csr_weights, csr_indices, csr_indptr,
+                  csrT_weights, csrT_indices, csrT_indptr,
+                  int directed, np.ndarray coordinates):
+        cdef ITYPE_t k
+        # keep references to the arrays accessed through pointers
+        self.csr_weights = csr_weights
+        self.csr_indices = csr_indices
+        self.csr_indptr = csr_indptr
+        self.csrT_weights = csrT_weights
+        self.csrT_indices = csrT_indices
+        self.csrT_indptr = csrT_indptr
+        self.coordinates = coordinates
+        self.directed = directed
+        self.N = csr_indptr.shape[0] - 1
+        self.dim = coordinates.shape[1]
+
+        self.nodes_f = <FibonacciNode*> malloc(self.N * sizeof(FibonacciNode))
+        self.nodes_b = <FibonacciNode*> malloc(self.N * sizeof(FibonacciNode))
+        self.pred_f = <ITYPE_t*> malloc(self.N * sizeof(ITYPE_t))
+        self.pred_b = <ITYPE_t*> malloc(self.N * sizeof(ITYPE_t))
+        self.touched_f = <ITYPE_t*> malloc(self.N * sizeof(ITYPE_t))
+        self.touched_b = <ITYPE_t*> malloc(self.N * sizeof(ITYPE_t))
+        self.g = <DTYPE_t*> malloc(self.N * sizeof(DTYPE_t))
+        if (self.nodes_f == NULL or self.nodes_b == NULL or
+                self.pred_f == NULL or self.pred_b == NULL or
+                self.touched_f == NULL or self.touched_b == NULL or
+                self.g == NULL):
+            raise MemoryError()
+
+        for k in range(self.N):
+            initialize_node(&self.nodes_f[k], k)
+            initialize_node(&self.nodes_b[k], k)
+        self.n_touched_f = 0
+        self.n_touched_b = 0
+
+    def __dealloc__(self):
+        free(self.nodes_f)
+        free(self.nodes_b)
+        free(self.pred_f)
+        free(self.pred_b)
+        free(self.touched_f)
+        free(self.touched_b)
+        free(self.g)
+
+    @cython.boundscheck(False)
+    def run(self, np.ndarray[ITYPE_t, ndim=1, mode='c'] sources,
+            np.ndarray[ITYPE_t, ndim=1, mode='c'] targets,
+            ITYPE_t start, ITYPE_t stop,
+            np.ndarray[DTYPE_t, ndim=1, mode='c'] lengths,
+            int return_paths):
+        # Solve the queries start:stop, and return their paths if
+        # requested.
+        cdef ITYPE_t i, meet = NULL_IDX
+        cdef int astar = self.dim > 0
+        paths = []
+        for i in range(start, stop):
+            with nogil:
+                if astar:
+                    lengths[i] = self.astar(sources[i], targets[i])
+                    meet = targets[i]
+                else:
+                    lengths[i] = self.bidirectional(sources[i], targets[i],
+                                                    &meet)
+            if return_paths:
+                paths.append(self.path(sources[i], targets[i], meet,
+                                       lengths[i] != INFINITY))
+            with nogil:
+                self.reset()
+        return paths
+
+    cdef void reset(self) nogil:
+        cdef ITYPE_t k, j
+        for k in range(self.n_touched_f):
+            j = self.touched_f[k]
+            initialize_node(&self.nodes_f[j], j)
+        for k in range(self.n_touched_b):
+            j = self.touched_b[k]
+            initialize_node(&self.nodes_b[j], j)
+        self.n_touched_f = 0
+        self.n_touched_b = 0
+
+    cdef path(self, ITYPE_t source, ITYPE_t target, ITYPE_t meet,
+              int found):
+        # Path from source to target through meet, from the predecessors
+        # of the forward and the backward search.
+        cdef ITYPE_t j
+        if not found:
+            return np.empty(0, dtype=ITYPE)
+        head = []
+        j = meet
+        while j != source:
+            head.append(j)
+            j = self.pred_f[j]
+        head.append(source)
+        head.reverse()
+        j = meet
+        while j != target:
+            j = self.pred_b[j]
+            head.append(j)
+        return np.array(head, dtype=ITYPE)
+
+    cdef DTYPE_t bidirectional(self, ITYPE_t source, ITYPE_t target,
+                               ITYPE_t* meet) nogil:
+        # Bidirectional Dijkstra: the forward search follows the edges of
+        # csgraph from the source point, the backward search follows them
+        # in reverse from the target point.  mu is the length of the
+        # shortest path found through a node touched by both searches; it
+        # is optimal once the sum of the minima of the two heaps exceeds it.
+        cdef FibonacciHeap heap_f, heap_b
+        cdef FibonacciNode *v
+        cdef DTYPE_t mu = INFINITY
+        cdef DTYPE_t* weights = <DTYPE_t*> self.csr_weights.data
+        cdef ITYPE_t* indices = <ITYPE_t*> self.csr_indices.data
+        cdef ITYPE_t* indptr = <ITYPE_t*> self.csr_indptr.data
+        cdef DTYPE_t* weightsT = <DTYPE_t*> self.csrT_weights.data
+        cdef ITYPE_t* indicesT = <ITYPE_t*> self.csrT_indices.data
+        cdef ITYPE_t* indptrT = <ITYPE_t*> self.csrT_indptr.data
+
+        meet[0] = source
+        if source == target:
+            return 0
+
+        heap_f.min_node = NULL
+        heap_b.min_node = NULL
+        self.touched_f[0] = source
+        self.n_touched_f = 1
+        self.nodes_f[source].state = IN_HEAP
+        self.nodes_f[source].val = 0
+        insert_node(&heap_f, &self.nodes_f[source])
+        self.touched_b[0] = target
+        self.n_touched_b = 1
+        self.nodes_b[target].state = IN_HEAP
+        self.nodes_b[target].val = 0
+        insert_node(&heap_b, &self.nodes_b[target])
+
+        while heap_f.min_node and heap_b.min_node:
+            if heap_f.min_node.val + heap_b.min_node.val >= mu:
+                break
+            if heap_f.min_node.val <= heap_b.min_node.val:
+                v = remove_min(&heap_f)
+                v.state = SCANNED
+                _bidirectional_relax(&heap_f, v, self.nodes_f, self.pred_f,
+                                     self.touched_f, &self.n_touched_f,
+                                     self.nodes_b, weights, indices, indptr,
+                                     &mu, meet)
+                if not self.directed:
+                    _bidirectional_relax(&heap_f, v, self.nodes_f,
+                                         self.pred_f, self.touched_f,
+                                         &self.n_touched_f, self.nodes_b,
+                                         weightsT, indicesT, indptrT,
+                                         &mu, meet)
+            else:
+                v = remove_min(&heap_b)
+                v.state = SCANNED
+                _bidirectional_relax(&heap_b, v, self.nodes_b, self.pred_b,
+                                     self.touched_b, &self.n_touched_b,
+                                     self.nodes_f, weightsT, indicesT,
+                                     indptrT, &mu, meet)
+                if not self.directed:
+                    _bidirectional_relax(&heap_b, v, self.nodes_b,
+                                         self.pred_b, self.touched_b,
+                                         &self.n_touched_b, self.nodes_f,
+                                         weights, indices, indptr,
+                                         &mu, meet)
+        return mu
+
+    cdef DTYPE_t astar(self, ITYPE_t source, ITYPE_t target) nogil:
+        # A* search: the nodes are scanned in the order of their distance
+        # from the source plus the Euclidean distance to the target.  The
+        # distances from the source are kept in self.g.
+        cdef FibonacciHeap heap
+        cdef FibonacciNode *v
+        cdef DTYPE_t* weights = <DTYPE_t*> self.csr_weights.data
+        cdef ITYPE_t* indices = <ITYPE_t*> self.csr_indices.data
+        cdef ITYPE_t* indptr = <ITYPE_t*> self.csr_indptr.data
+        cdef DTYPE_t* weightsT = <DTYPE_t*> self.csrT_weights.data
+        cdef ITYPE_t* indicesT = <ITYPE_t*> self.csrT_indices.data
+        cdef ITYPE_t* indptrT = <ITYPE_t*> self.csrT_indptr.data
+        cdef DTYPE_t* coords = <DTYPE_t*> self.coordinates.data
+        cdef DTYPE_t* target_coords = coords + target * self.dim
 
-        dist_matrix[i, j_source] = 0
         heap.min_node = NULL
-        insert_node(&heap, &nodes[j_source])
+        self.touched_f[0] = source
+        self.n_touched_f = 1
+        self.g[source] = 0
+        self.nodes_f[source].state = IN_HEAP
+        self.nodes_f[source].val = _euclidean(coords + source * self.dim,
+                                              target_coords, self.dim)
+        insert_node(&heap, &self.nodes_f[source])
 
         while heap.min_node:
             v = remove_min(&heap)
             v.state = SCANNED
+            if v.index == target:
+                return self.g[target]
+            _astar_relax(&heap, v, self.nodes_f, self.pred_f, self.g,
+                         self.touched_f, &self.n_touched_f,
+                         weights, indices, indptr,
+                         coords, target_coords, self.dim)
+            if not self.directed:
+                _astar_relax(&heap, v, self.nodes_f, self.pred_f, self.g,
+                             self.touched_f, &self.n_touched_f,
+                             weightsT, indicesT, indptrT,
+                             coords, target_coords, self.dim)
+        return INFINITY
+
+
+cdef inline void _bidirectional_relax(FibonacciHeap* heap,
+                                      FibonacciNode* v,
+                                      FibonacciNode* nodes,
+                                      ITYPE_t* pred,
+                                      ITYPE_t* touched,
+                                      ITYPE_t* n_touched,
+                                      FibonacciNode* other_nodes,
+                                      DTYPE_t* weights,
+                                      ITYPE_t* indices,
+                                      ITYPE_t* indptr,
+                                      DTYPE_t* mu,
+                                      ITYPE_t* meet) nogil:
+    # relax the edges leaving v in one of the two searches, and update the
+    # best path through the nodes also touched by the other search
+    cdef ITYPE_t j, j_current
+    cdef DTYPE_t next_val
+    cdef FibonacciNode *current_node
 
-            for j in range(csr_indptr[v.index], csr_indptr[v.index + 1]):
-                j_current = csr_indices[j]
-                current_node = &nodes[j_current]
-                if current_node.state != SCANNED:
-                    next_val = v.val + csr_weights[j]
-                    if next_val <= limit:
-                        if current_node.state == NOT_IN_HEAP:
-                            current_node.state = IN_HEAP
-                            current_node.val = next_val
-                            insert_node(&heap, current_node)
-                            if return_pred:
-                                pred[i, j_current] = v.index
-                        elif current_node.val > next_val:
-                            decrease_val(&heap, current_node,
-                                         next_val)
-                            if return_pred:
-                                pred[i, j_current] = v.index
-
-            for j in range(csrT_indptr[v.index], csrT_indptr[v.index + 1]):
-                j_current = csrT_indices[j]
-                current_node = &nodes[j_current]
-                if current_node.state != SCANNED:
-                    next_val = v.val + csrT_weights[j]
-                    if next_val <= limit:
-                        if current_node.state == NOT_IN_HEAP:
-                            current_node.state = IN_HEAP
-                            current_node.val = next_val
-                            insert_node(&heap, current_node)
-                            if return_pred:
-                                pred[i, j_current] = v.index
-                        elif current_node.val > next_val:
-                            decrease_val(&heap, current_node, next_val)
-                            if return_pred:
-                                pred[i, j_current] = v.index
+    for j in range(indptr[v.index], indptr[v.index + 1]):
+        j_current = indices[j]
+        current_node = &nodes[j_current]
+        if current_node.state == SCANNED:
+            continue
+        next_val = v.val + weights[j]
+        if current_node.state == NOT_IN_HEAP:
+            current_node.state = IN_HEAP
+            current_node.val = next_val
+            insert_node(heap, current_node)
+            touched[n_touched[0]] = j_current
+            n_touched[0] += 1
+        elif current_node.val > next_val:
+            decrease_val(heap, current_node, next_val)
+        else:
+            continue
+        pred[j_current] = v.index
+
+        if (other_nodes[j_current].state != NOT_IN_HEAP and
+                next_val + other_nodes[j_current].val < mu[0]):
+            mu[0] = next_val + other_nodes[j_current].val
+            meet[0] = j_current
+
+
+cdef inline void _astar_relax(FibonacciHeap* heap,
+                              FibonacciNode* v,
+                              FibonacciNode* nodes,
+                              ITYPE_t* pred,
+                              DTYPE_t* g,
+                              ITYPE_t* touched,
+                              ITYPE_t* n_touched,
+                              DTYPE_t* weights,
+                              ITYPE_t* indices,
+                              ITYPE_t* indptr,
+                              DTYPE_t* coords,
+                              DTYPE_t* target_coords,
+                              ITYPE_t dim) nogil:
+    # relax the edges leaving v; the heap is keyed by g + heuristic
+    cdef ITYPE_t j, j_current
+    cdef DTYPE_t next_g
+    cdef FibonacciNode *current_node
+
+    for j in range(indptr[v.index], indptr[v.index + 1]):
+        j_current = indices[j]
+        current_node = &nodes[j_current]
+        if current_node.state == SCANNED:
+            continue
+        next_g = g[v.index] + weights[j]
+        if current_node.state == NOT_IN_HEAP:
+            current_node.state = IN_HEAP
+            current_node.val = next_g + _euclidean(
+                coords + j_current * dim, target_coords, dim)
+            insert_node(heap, current_node)
+            touched[n_touched[0]] = j_current
+            n_touched[0] += 1
+        elif g[j_current] > next_g:
+            decrease_val(heap, current_node,
+                         current_node.val - (g[j_current] - next_g))
+        else:
+            continue
+        g[j_current] = next_g
+        pred[j_current] = v.index
 
-            #v has now been scanned: add the distance to the results
-            dist_matrix[i, v.index] = v.val
 
-    free(nodes)
+cdef inline DTYPE_t _euclidean(DTYPE_t* x, DTYPE_t* y, ITYPE_t dim) nogil:
+    cdef ITYPE_t k
+    cdef DTYPE_t d, s = 0
+    for k in range(dim):
+        d = x[k] - y[k]
+        s += d * d
+    return sqrt(s)
 
 
 def bellman_ford(csgraph, directed=True, indices=None,
                  return_predecessors=False,
-                 unweighted=False):
+                 unweighted=False, workers=1):
     """
     bellman_ford(csgraph, directed=True, indices=None, return_predecessors=False,
-                 unweighted=False)
+                 unweighted=False, workers=1)
 
     Compute the shortest path lengths using the Bellman-Ford algorithm.
 
@@ -730,6 +1547,11 @@ def bellman_ford(csgraph, directed=True, indices=None,
         If True, then find unweighted distances.  That is, rather than finding
         the path between each point such that the sum of weights is minimized,
         find the path such that the number of edges is minimized.
+    workers : int, optional
+        Number of threads among which the source points are distributed.
+        If -1 is given, all processors are used.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -820,19 +1642,31 @@ def bellman_ford(csgraph, directed=True, indices=None,
     else:
         csr_data = csgraph.data
 
-    if directed:
-        ret = _bellman_ford_directed(indices,
-                                     csr_data, csgraph.indices,
-                                     csgraph.indptr,
-                                     dist_matrix, predecessor_matrix)
-    else:
-        ret = _bellman_ford_undirected(indices,
-                                       csr_data, csgraph.indices,
-                                       csgraph.indptr,
-                                       dist_matrix, predecessor_matrix)
+    workers = _validate_workers(workers)
 
-    if ret >= 0:
-        raise NegativeCycleError("Negative cycle detected on node %i" % ret)
+    # position in `indices` of the first source found on a negative cycle,
+    # the blocks stop at the sources after it
+    first_cycle = np.array([len(indices)], dtype=ITYPE)
+
+    def func(start, stop):
+        if directed:
+            return _bellman_ford_directed(indices, start, stop,
+                                          csr_data, csgraph.indices,
+                                          csgraph.indptr,
+                                          dist_matrix, predecessor_matrix,
+                                          first_cycle)
+        else:
+            return _bellman_ford_undirected(indices, start, stop,
+                                            csr_data, csgraph.indices,
+                                            csgraph.indptr,
+                                            dist_matrix, predecessor_matrix,
+                                            first_cycle)
+
+    # report the first source in order, as when run serially
+    for ret in _map_sources(func, len(indices), workers):
+        if ret >= 0:
+            raise NegativeCycleError("Negative cycle detected on node %i"
+                                     % ret)
 
     if return_predecessors:
         return (dist_matrix.reshape(return_shape),
@@ -841,101 +1675,129 @@ def bellman_ford(csgraph, directed=True, indices=None,
         return dist_matrix.reshape(return_shape)
 
 
+@cython.boundscheck(False)
 cdef int _bellman_ford_directed(
             np.ndarray[ITYPE_t, ndim=1, mode='c'] source_indices,
+            ITYPE_t start, ITYPE_t stop,
             np.ndarray[DTYPE_t, ndim=1, mode='c'] csr_weights,
             np.ndarray[ITYPE_t, ndim=1, mode='c'] csr_indices,
             np.ndarray[ITYPE_t, ndim=1, mode='c'] csr_indptr,
             np.ndarray[DTYPE_t, ndim=2, mode='c'] dist_matrix,
-            np.ndarray[ITYPE_t, ndim=2, mode='c'] pred):
-    cdef unsigned int Nind = dist_matrix.shape[0]
+            np.ndarray[ITYPE_t, ndim=2, mode='c'] pred,
+            np.ndarray[ITYPE_t, ndim=1, mode='c'] first_cycle):
     cdef unsigned int N = dist_matrix.shape[1]
     cdef unsigned int i, j, k, j_source, count
+    cdef int stop_here
 
     cdef DTYPE_t d1, d2, w12
 
     cdef int return_pred = (pred.size > 0)
 
-    for i in range(Nind):
-        j_source = source_indices[i]
+    # process the sources start:stop, other blocks may run in other threads
+    with nogil:
+        for i in range(start, stop):
+            # stop if another block has found a negative cycle from an
+            # earlier source, whose error is reported instead
+            with gil:
+                stop_here = <ITYPE_t> i > first_cycle[0]
+            if stop_here:
+                break
+            j_source = source_indices[i]
+
+            # relax all edges N-1 times
+            for count in range(N - 1):
+                for j in range(N):
+                    d1 = dist_matrix[i, j]
+                    for k in range(csr_indptr[j], csr_indptr[j + 1]):
+                        w12 = csr_weights[k]
+                        d2 = dist_matrix[i, csr_indices[k]]
+                        if d1 + w12 < d2:
+                            dist_matrix[i, csr_indices[k]] = d1 + w12
+                            if return_pred:
+                                pred[i, csr_indices[k]] = j
 
-        # relax all edges N-1 times
-        for count in range(N - 1):
+            # check for negative-weight cycles
             for j in range(N):
                 d1 = dist_matrix[i, j]
                 for k in range(csr_indptr[j], csr_indptr[j + 1]):
                     w12 = csr_weights[k]
                     d2 = dist_matrix[i, csr_indices[k]]
-                    if d1 + w12 < d2:
-                        dist_matrix[i, csr_indices[k]] = d1 + w12
-                        if return_pred:
-                            pred[i, csr_indices[k]] = j
-
-        # check for negative-weight cycles
-        for j in range(N):
-            d1 = dist_matrix[i, j]
-            for k in range(csr_indptr[j], csr_indptr[j + 1]):
-                w12 = csr_weights[k]
-                d2 = dist_matrix[i, csr_indices[k]]
-                if d1 + w12 + DTYPE_EPS < d2:
-                    return j_source
+                    if d1 + w12 + DTYPE_EPS < d2:
+                        with gil:
+                            if <ITYPE_t> i < first_cycle[0]:
+                                first_cycle[0] = i
+                        return j_source
 
     return -1
 
 
+@cython.boundscheck(False)
 cdef int _bellman_ford_undirected(
             np.ndarray[ITYPE_t, ndim=1, mode='c'] source_indices,
+            ITYPE_t start, ITYPE_t stop,
             np.ndarray[DTYPE_t, ndim=1, mode='c'] csr_weights,
             np.ndarray[ITYPE_t, ndim=1, mode='c'] csr_indices,
             np.ndarray[ITYPE_t, ndim=1, mode='c'] csr_indptr,
             np.ndarray[DTYPE_t, ndim=2, mode='c'] dist_matrix,
-            np.ndarray[ITYPE_t, ndim=2, mode='c'] pred):
-    cdef unsigned int Nind = dist_matrix.shape[0]
+            np.ndarray[ITYPE_t, ndim=2, mode='c'] pred,
+            np.ndarray[ITYPE_t, ndim=1, mode='c'] first_cycle):
     cdef unsigned int N = dist_matrix.shape[1]
     cdef unsigned int i, j, k, j_source, ind_k, count
+    cdef int stop_here
 
     cdef DTYPE_t d1, d2, w12
 
     cdef int return_pred = (pred.size > 0)
 
-    for i in range(Nind):
-        j_source = source_indices[i]
+    # process the sources start:stop, other blocks may run in other threads
+    with nogil:
+        for i in range(start, stop):
+            # stop if another block has found a negative cycle from an
+            # earlier source, whose error is reported instead
+            with gil:
+                stop_here = <ITYPE_t> i > first_cycle[0]
+            if stop_here:
+                break
+            j_source = source_indices[i]
+
+            # relax all edges N-1 times
+            for count in range(N - 1):
+                for j in range(N):
+                    d1 = dist_matrix[i, j]
+                    for k in range(csr_indptr[j], csr_indptr[j + 1]):
+                        w12 = csr_weights[k]
+                        ind_k = csr_indices[k]
+                        d2 = dist_matrix[i, ind_k]
+                        if d1 + w12 < d2:
+                            dist_matrix[i, ind_k] = d2 = d1 + w12
+                            if return_pred:
+                                pred[i, ind_k] = j
+                        if d2 + w12 < d1:
+                            dist_matrix[i, j] = d1 = d2 + w12
+                            if return_pred:
+                                pred[i, j] = ind_k
 
-        # relax all edges N-1 times
-        for count in range(N - 1):
+            # check for negative-weight cycles
             for j in range(N):
                 d1 = dist_matrix[i, j]
                 for k in range(csr_indptr[j], csr_indptr[j + 1]):
                     w12 = csr_weights[k]
-                    ind_k = csr_indices[k]
-                    d2 = dist_matrix[i, ind_k]
-                    if d1 + w12 < d2:
-                        dist_matrix[i, ind_k] = d2 = d1 + w12
-                        if return_pred:
-                            pred[i, ind_k] = j
-                    if d2 + w12 < d1:
-                        dist_matrix[i, j] = d1 = d2 + w12
-                        if return_pred:
-                            pred[i, j] = ind_k
-
-        # check for negative-weight cycles
-        for j in range(N):
-            d1 = dist_matrix[i, j]
-            for k in range(csr_indptr[j], csr_indptr[j + 1]):
-                w12 = csr_weights[k]
-                d2 = dist_matrix[i, csr_indices[k]]
-                if abs(d2 - d1) > w12 + DTYPE_EPS:
-                    return j_source
+                    d2 = dist_matrix[i, csr_indices[k]]
+                    if fabs(d2 - d1) > w12 + DTYPE_EPS:
+                        with gil:
+                            if <ITYPE_t> i < first_cycle[0]:
+                                first_cycle[0] = i
+                        return j_source
 
     return -1
 
 
 def johnson(csgraph, directed=True, indices=None,
             return_predecessors=False,
-            unweighted=False):
+            unweighted=False, workers=1):
     """
     johnson(csgraph, directed=True, indices=None, return_predecessors=False,
-            unweighted=False)
+            unweighted=False, workers=1)
 
     Compute the shortest path lengths using Johnson's algorithm.
 
@@ -966,6 +1828,11 @@ def johnson(csgraph, directed=True, indices=None,
         If True, then find unweighted distances.  That is, rather than finding
         the path between each point such that the sum of weights is minimized,
         find the path such that the number of edges is minimized.
+    workers : int, optional
+        Number of threads among which the source points are distributed.
+        If -1 is given, all processors are used.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -1023,7 +1890,7 @@ def johnson(csgraph, directed=True, indices=None,
     # if unweighted, there are no negative weights: we just use dijkstra
     if unweighted:
         return dijkstra(csgraph, directed, indices,
-                        return_predecessors, unweighted)
+                        return_predecessors, unweighted, workers=workers)
 
     #------------------------------
     # validate csgraph and convert to csr matrix
@@ -1058,6 +1925,8 @@ def johnson(csgraph, directed=True, indices=None,
     else:
         predecessor_matrix = np.empty((0, N), dtype=ITYPE)
 
+    workers = _validate_workers(workers)
+
     #------------------------------
     # initialize distance array
     dist_array = np.zeros(N, dtype=DTYPE)
@@ -1083,18 +1952,16 @@ def johnson(csgraph, directed=True, indices=None,
                          csgraph.indptr, dist_array)
 
     if directed:
-        _dijkstra_directed(indices,
-                           csr_data, csgraph.indices, csgraph.indptr,
-                           dist_matrix, predecessor_matrix, np.inf)
+        _dijkstra_dense(indices, csr_data, csgraph, None, None,
+                        dist_matrix, predecessor_matrix, np.inf, workers)
     else:
         csgraphT = csr_matrix((csr_data, csgraph.indices, csgraph.indptr),
                           csgraph.shape).T.tocsr()
         _johnson_add_weights(csgraphT.data, csgraphT.indices,
                              csgraphT.indptr, dist_array)
-        _dijkstra_undirected(indices,
-                             csr_data, csgraph.indices, csgraph.indptr,
-                             csgraphT.data, csgraphT.indices, csgraphT.indptr,
-                             dist_matrix, predecessor_matrix, np.inf)
+        _dijkstra_dense(indices, csr_data, csgraph,
+                        csgraphT.data, csgraphT,
+                        dist_matrix, predecessor_matrix, np.inf, workers)
 
     #------------------------------
     # correct the distance matrix for the bellman-ford weights
@@ -1221,7 +2088,7 @@ cdef struct FibonacciNode:
 
 cdef void initialize_node(FibonacciNode* node,
                           unsigned int index,
-                          DTYPE_t val=0):
+                          DTYPE_t val=0) nogil:
     # Assumptions: - node is a valid pointer
     #              - node is not currently part of a heap
     node.index = index
@@ -1235,7 +2102,7 @@ cdef void initialize_node(FibonacciNode* node,
     node.children = NULL
 
 
-cdef FibonacciNode* rightmost_sibling(FibonacciNode* node):
+cdef FibonacciNode* rightmost_sibling(FibonacciNode* node) nogil:
     # Assumptions: - node is a valid pointer
     cdef FibonacciNode* temp = node
     while(temp.right_sibling):
@@ -1243,7 +2110,7 @@ cdef FibonacciNode* rightmost_sibling(FibonacciNode* node):
     return temp
 
 
-cdef FibonacciNode* leftmost_sibling(FibonacciNode* node):
+cdef FibonacciNode* leftmost_sibling(FibonacciNode* node) nogil:
     # Assumptions: - node is a valid pointer
     cdef FibonacciNode* temp = node
     while(temp.left_sibling):
@@ -1251,7 +2118,7 @@ cdef FibonacciNode* leftmost_sibling(FibonacciNode* node):
     return temp
 
 
-cdef void add_child(FibonacciNode* node, FibonacciNode* new_child):
+cdef void add_child(FibonacciNode* node, FibonacciNode* new_child) nogil:
     # Assumptions: - node is a valid pointer
     #              - new_child is a valid pointer
     #              - new_child is not the sibling or child of another node
@@ -1266,7 +2133,7 @@ cdef void add_child(FibonacciNode* node, FibonacciNode* new_child):
         node.rank = 1
 
 
-cdef void add_sibling(FibonacciNode* node, FibonacciNode* new_sibling):
+cdef void add_sibling(FibonacciNode* node, FibonacciNode* new_sibling) nogil:
     # Assumptions: - node is a valid pointer
     #              - new_sibling is a valid pointer
     #              - new_sibling is not the child or sibling of another node
@@ -1279,7 +2146,7 @@ cdef void add_sibling(FibonacciNode* node, FibonacciNode* new_sibling):
         new_sibling.parent.rank += 1
 
 
-cdef void remove(FibonacciNode* node):
+cdef void remove(FibonacciNode* node) nogil:
     # Assumptions: - node is a valid pointer
     if node.parent:
         node.parent.rank -= 1
@@ -1314,7 +2181,7 @@ cdef struct FibonacciHeap:
 
 
 cdef void insert_node(FibonacciHeap* heap,
-                      FibonacciNode* node):
+                      FibonacciNode* node) nogil:
     # Assumptions: - heap is a valid pointer
     #              - node is a valid pointer
     #              - node is not the child or sibling of another node
@@ -1328,7 +2195,7 @@ cdef void insert_node(FibonacciHeap* heap,
 
 cdef void decrease_val(FibonacciHeap* heap,
                        FibonacciNode* node,
-                       DTYPE_t newval):
+                       DTYPE_t newval) nogil:
     # Assumptions: - heap is a valid pointer
     #              - newval <= node.val
     #              - node is a valid pointer
@@ -1342,7 +2209,7 @@ cdef void decrease_val(FibonacciHeap* heap,
         heap.min_node = node
 
 
-cdef void link(FibonacciHeap* heap, FibonacciNode* node):
+cdef void link(FibonacciHeap* heap, FibonacciNode* node) nogil:
     # Assumptions: - heap is a valid pointer
     #              - node is a valid pointer
     #              - node is already within heap
@@ -1367,7 +2234,7 @@ cdef void link(FibonacciHeap* heap, FibonacciNode* node):
             link(heap, linknode)
 
 
-cdef FibonacciNode* remove_min(FibonacciHeap* heap):
+cdef FibonacciNode* remove_min(FibonacciHeap* heap) nogil:
     # Assumptions: - heap is a valid pointer
     #              - heap.min_node is a valid pointer
     cdef FibonacciNode *temp
@@ -11,7 +11,8 @@ import numpy as np
 cimport numpy as np
 
 from scipy.sparse import csr_matrix, isspmatrix, isspmatrix_csr, isspmatrix_csc
-from scipy.sparse.csgraph._validation import validate_graph
+from scipy.sparse.csgraph._validation import (validate_graph,
+                                              _validate_workers, _map_sources)
 from scipy.sparse.csgraph._tools import reconstruct_path
 
 cimport cython
@@ -20,10 +21,10 @@ from libc cimport stdlib
 include 'parameters.pxi'
 
 def connected_components(csgraph, directed=True, connection='weak',
-                         return_labels=True):
+                         return_labels=True, workers=1):
     """
     connected_components(csgraph, directed=True, connection='weak',
-                         return_labels=True)
+                         return_labels=True, workers=1)
 
     Analyze the connected components of a sparse graph
 
@@ -49,18 +50,39 @@ def connected_components(csgraph, directed=True, connection='weak',
     return_labels : bool, optional
         If True (default), then return the labels for each of the connected
         components.
+    workers : int, optional
+        Number of threads used to find weakly connected components.
+        If -1, use all the CPUs.  Strongly connected components are always
+        found by a single thread.  Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
     n_components: int
         The number of connected components.
     labels: ndarray
-        The length-N array of labels of the connected components.
+        The length-N array of labels of the connected components.  It has
+        the index dtype of the compressed sparse graph.
+
+    Notes
+    -----
+    Weakly connected components are found with a union-find structure over
+    the edges of the graph [2]_, which does not need the transposed graph.
+    With ``workers > 1``, the rows are processed by several threads which
+    link the trees concurrently, followed by sweeps over the edges until
+    no edge joins two trees.  Strongly connected components are found with
+    Pearce's variant of Tarjan's algorithm [1]_.
+
+    Graphs in CSR format are used without copying, including graphs with
+    64-bit indices, e.g. those with more than 2**31 edges.
 
     References
     ----------
     .. [1] D. J. Pearce, "An Improved Algorithm for Finding the Strongly
            Connected Components of a Directed Graph", Technical Report, 2005
+    .. [2] R. E. Tarjan, "Efficiency of a Good But Not Linear Set Union
+           Algorithm", J. ACM 22, 215 (1975).
 
     Examples
     --------
@@ -95,24 +117,32 @@ def connected_components(csgraph, directed=True, connection='weak',
     if connection.lower() == 'weak':
         directed = False
 
-    csgraph = validate_graph(csgraph, directed,
-                             dtype=csgraph.dtype,
-                             dense_output=False)
+    workers = _validate_workers(workers)
 
-    labels = np.empty(csgraph.shape[0], dtype=ITYPE)
-    labels.fill(NULL_IDX)
+    csgraph = validate_graph(csgraph, directed, dtype=None,
+                             dense_output=False)
+    N = csgraph.shape[0]
 
     if directed:
+        labels = np.empty(N, dtype=csgraph.indices.dtype)
         n_components = _connected_components_directed(csgraph.indices,
                                                       csgraph.indptr,
                                                       labels)
     else:
-        csgraph_T = csgraph.T.tocsr()
-        n_components = _connected_components_undirected(csgraph.indices,
-                                                        csgraph.indptr,
-                                                        csgraph_T.indices,
-                                                        csgraph_T.indptr,
-                                                        labels)
+        # labels holds the union-find forest until it is relabeled
+        labels = np.arange(N, dtype=csgraph.indices.dtype)
+
+        def func(start, stop):
+            return _union_rows(csgraph.indices, csgraph.indptr, labels,
+                               start, stop)
+
+        changed = _map_sources(func, N, workers, max_block=65536)
+        # Concurrent links of the same root may overwrite each other;
+        # sweep again until no edge joins two trees.
+        while workers > 1 and any(changed):
+            changed = _map_sources(func, N, workers, max_block=65536)
+
+        n_components = _relabel_forest(labels)
 
     if return_labels:
         return n_components, labels
@@ -120,6 +150,15 @@ def connected_components(csgraph, directed=True, connection='weak',
         return n_components
     
 
+def _transposed_structure(csgraph):
+    """CSR indices and indptr of the transposed graph, in the index dtype
+    of `csgraph`."""
+    csgraph_T = csgraph.T.tocsr()
+    idx_dtype = csgraph.indices.dtype
+    return (csgraph_T.indices.astype(idx_dtype, copy=False),
+            csgraph_T.indptr.astype(idx_dtype, copy=False))
+
+
 def breadth_first_tree(csgraph, i_start, directed=True):
     r"""
     breadth_first_tree(csgraph, i_start, directed=True)
@@ -328,11 +367,13 @@ cpdef breadth_first_order(csgraph, i_start,
     (array([0, 1, 2, 3], dtype=int32), array([-9999,     0,     0,     1], dtype=int32))
 
     """
-    csgraph = validate_graph(csgraph, directed, dense_output=False)
-    cdef int N = csgraph.shape[0]
+    csgraph = validate_graph(csgraph, directed, dtype=None,
+                             dense_output=False)
+    N = csgraph.shape[0]
+    idx_dtype = csgraph.indices.dtype
 
-    cdef np.ndarray node_list = np.empty(N, dtype=ITYPE)
-    cdef np.ndarray predecessors = np.empty(N, dtype=ITYPE)
+    node_list = np.empty(N, dtype=idx_dtype)
+    predecessors = np.empty(N, dtype=idx_dtype)
     node_list.fill(NULL_IDX)
     predecessors.fill(NULL_IDX)
 
@@ -341,10 +382,10 @@ cpdef breadth_first_order(csgraph, i_start,
                                 csgraph.indices, csgraph.indptr,
                                 node_list, predecessors)
     else:
-        csgraph_T = csgraph.T.tocsr()
+        indices_T, indptr_T = _transposed_structure(csgraph)
         length = _breadth_first_undirected(i_start,
                                            csgraph.indices, csgraph.indptr,
-                                           csgraph_T.indices, csgraph_T.indptr,
+                                           indices_T, indptr_T,
                                            node_list, predecessors)
 
     if return_predecessors:
@@ -353,12 +394,12 @@ cpdef breadth_first_order(csgraph, i_start,
         return node_list[:length]
     
 
-cdef unsigned int _breadth_first_directed(
-                           unsigned int head_node,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indices,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indptr,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] node_list,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] predecessors):
+def _breadth_first_directed(
+                           np.npy_intp head_node,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] indices,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] indptr,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] node_list,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] predecessors):
     # Inputs:
     #  head_node: (input) index of the node from which traversal starts
     #  indices: (input) CSR indices of graph
@@ -368,9 +409,8 @@ cdef unsigned int _breadth_first_directed(
     #                tree.  Should be initialized to NULL_IDX
     # Returns:
     #  n_nodes: the number of nodes in the breadth-first tree
-    cdef unsigned int i, pnode, cnode
-    cdef unsigned int i_nl, i_nl_end
-    cdef unsigned int N = node_list.shape[0]
+    cdef np.npy_intp i, pnode, cnode
+    cdef np.npy_intp i_nl, i_nl_end
 
     node_list[0] = head_node
     i_nl = 0
@@ -393,14 +433,14 @@ cdef unsigned int _breadth_first_directed(
     return i_nl
     
 
-cdef unsigned int _breadth_first_undirected(
-                           unsigned int head_node,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indices1,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indptr1,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indices2,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indptr2,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] node_list,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] predecessors):
+def _breadth_first_undirected(
+                           np.npy_intp head_node,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] indices1,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] indptr1,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] indices2,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] indptr2,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] node_list,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] predecessors):
     # Inputs:
     #  head_node: (input) index of the node from which traversal starts
     #  indices1: (input) CSR indices of graph
@@ -412,9 +452,8 @@ cdef unsigned int _breadth_first_undirected(
     #                tree.  Should be initialized to NULL_IDX
     # Returns:
     #  n_nodes: the number of nodes in the breadth-first tree
-    cdef unsigned int i, pnode, cnode
-    cdef unsigned int i_nl, i_nl_end
-    cdef unsigned int N = node_list.shape[0]
+    cdef np.npy_intp i, pnode, cnode
+    cdef np.npy_intp i_nl, i_nl_end
 
     node_list[0] = head_node
     i_nl = 0
@@ -511,13 +550,15 @@ cpdef depth_first_order(csgraph, i_start,
     (array([0, 1, 3, 2], dtype=int32), array([-9999,     0,     0,     1], dtype=int32))
 
     """
-    csgraph = validate_graph(csgraph, directed, dense_output=False)
-    cdef int N = csgraph.shape[0]
+    csgraph = validate_graph(csgraph, directed, dtype=None,
+                             dense_output=False)
+    N = csgraph.shape[0]
+    idx_dtype = csgraph.indices.dtype
 
-    node_list = np.empty(N, dtype=ITYPE)
-    predecessors = np.empty(N, dtype=ITYPE)
-    root_list = np.empty(N, dtype=ITYPE)
-    flag = np.zeros(N, dtype=ITYPE)
+    node_list = np.empty(N, dtype=idx_dtype)
+    predecessors = np.empty(N, dtype=idx_dtype)
+    root_list = np.empty(N, dtype=idx_dtype)
+    flag = np.zeros(N, dtype=idx_dtype)
     node_list.fill(NULL_IDX)
     predecessors.fill(NULL_IDX)
     root_list.fill(NULL_IDX)
@@ -528,10 +569,10 @@ cpdef depth_first_order(csgraph, i_start,
                               node_list, predecessors,
                               root_list, flag)
     else:
-        csgraph_T = csgraph.T.tocsr()
+        indices_T, indptr_T = _transposed_structure(csgraph)
         length = _depth_first_undirected(i_start,
                                          csgraph.indices, csgraph.indptr,
-                                         csgraph_T.indices, csgraph_T.indptr,
+                                         indices_T, indptr_T,
                                          node_list, predecessors,
                                          root_list, flag)
 
@@ -541,17 +582,17 @@ cpdef depth_first_order(csgraph, i_start,
         return node_list[:length]
     
 
-cdef unsigned int _depth_first_directed(
-                           unsigned int head_node,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indices,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indptr,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] node_list,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] predecessors,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] root_list,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] flag):
-    cdef unsigned int i, j, i_nl_end, cnode, pnode
-    cdef unsigned int N = node_list.shape[0]
-    cdef int no_children, i_root
+def _depth_first_directed(
+                           np.npy_intp head_node,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] indices,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] indptr,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] node_list,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] predecessors,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] root_list,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] flag):
+    cdef np.npy_intp i, i_nl_end, cnode, pnode, i_root
+    cdef np.npy_intp N = node_list.shape[0]
+    cdef bint no_children
 
     node_list[0] = head_node
     root_list[0] = head_node
@@ -585,19 +626,19 @@ cdef unsigned int _depth_first_directed(
     return i_nl_end
     
 
-cdef unsigned int _depth_first_undirected(
-                           unsigned int head_node,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indices1,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indptr1,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indices2,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indptr2,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] node_list,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] predecessors,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] root_list,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] flag):
-    cdef unsigned int i, j, i_nl_end, cnode, pnode
-    cdef unsigned int N = node_list.shape[0]
-    cdef int no_children, i_root
+def _depth_first_undirected(
+                           np.npy_intp head_node,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] indices1,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] indptr1,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] indices2,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] indptr2,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] node_list,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] predecessors,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] root_list,
+                           np.ndarray[int32_or_int64, ndim=1, mode='c'] flag):
+    cdef np.npy_intp i, i_nl_end, cnode, pnode, i_root
+    cdef np.npy_intp N = node_list.shape[0]
+    cdef bint no_children
 
     node_list[0] = head_node
     root_list[0] = head_node
@@ -647,10 +688,10 @@ cdef unsigned int _depth_first_undirected(
     return i_nl_end
 
 
-cdef int _connected_components_directed(
-                                 np.ndarray[ITYPE_t, ndim=1, mode='c'] indices,
-                                 np.ndarray[ITYPE_t, ndim=1, mode='c'] indptr,
-                                 np.ndarray[ITYPE_t, ndim=1, mode='c'] labels):
+def _connected_components_directed(
+                                 np.ndarray[int32_or_int64, ndim=1, mode='c'] indices,
+                                 np.ndarray[int32_or_int64, ndim=1, mode='c'] indptr,
+                                 np.ndarray[int32_or_int64, ndim=1, mode='c'] labels):
     """
     Uses an iterative version of Tarjan's algorithm to find the
     strongly connected components of a directed graph represented as a
@@ -666,16 +707,16 @@ cdef int _connected_components_directed(
     For more details of the memory optimisations used see here:
     http://www.timl.id.au/?p=327
     """
-    cdef int v, w, index, low_v, low_w, label, j
-    cdef int SS_head, root, stack_head, f, b
+    cdef np.npy_intp v, w, index, low_v, low_w, label, j
+    cdef np.npy_intp SS_head, root, stack_head, f, b
     DEF VOID = -1
     DEF END = -2
-    cdef int N = labels.shape[0]
-    cdef np.ndarray[ITYPE_t, ndim=1, mode="c"] SS, lowlinks, stack_f, stack_b
+    cdef np.npy_intp N = labels.shape[0]
+    cdef np.ndarray[int32_or_int64, ndim=1, mode="c"] SS, lowlinks, stack_f, stack_b
 
     lowlinks = labels
-    SS = np.ndarray((N,), dtype=ITYPE)
-    stack_b = np.ndarray((N,), dtype=ITYPE)
+    SS = np.ndarray((N,), dtype=labels.dtype)
+    stack_b = np.ndarray((N,), dtype=labels.dtype)
     stack_f = SS
 
     # The stack of nodes which have been backtracked and are in the current SCC
@@ -769,49 +810,66 @@ cdef int _connected_components_directed(
     labels += (N - 1)
     return (N - 1) - label
 
-cdef int _connected_components_undirected(
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indices1,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indptr1,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indices2,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] indptr2,
-                           np.ndarray[ITYPE_t, ndim=1, mode='c'] labels):
+cdef inline np.npy_intp _find_root(int32_or_int64* parent,
+                                   np.npy_intp v) nogil:
+    # Root of the tree of v, halving the path on the way.  Every node is
+    # linked to a node of lower index, so that the forest has no cycles
+    # even if the links are changed by several threads at once.
+    cdef np.npy_intp p
+    while parent[v] != v:
+        p = parent[parent[v]]
+        parent[v] = p
+        v = p
+    return v
+
+
+def _union_rows(np.ndarray[int32_or_int64, ndim=1, mode='c'] indices,
+                np.ndarray[int32_or_int64, ndim=1, mode='c'] indptr,
+                np.ndarray[int32_or_int64, ndim=1, mode='c'] parent,
+                np.npy_intp start, np.npy_intp stop):
+    """
+    Link the trees of the union-find forest `parent` along the edges of
+    the rows ``start:stop`` of the graph.
 
-    cdef int v, w, j, label, SS_head
-    cdef int N = labels.shape[0]
-    DEF VOID = -1
-    DEF END = -2
-    labels.fill(VOID)
-    label = 0
+    Returns True if any two trees were linked.
+    """
+    cdef int32_or_int64* ind = <int32_or_int64*> indices.data
+    cdef int32_or_int64* ptr = <int32_or_int64*> indptr.data
+    cdef int32_or_int64* par = <int32_or_int64*> parent.data
+    cdef np.npy_intp u, j, ru, rv
+    cdef bint changed = False
+
+    with nogil:
+        for u in range(start, stop):
+            for j in range(ptr[u], ptr[u + 1]):
+                ru = _find_root(par, u)
+                rv = _find_root(par, ind[j])
+                if ru < rv:
+                    par[rv] = ru
+                    changed = True
+                elif rv < ru:
+                    par[ru] = rv
+                    changed = True
+    return changed
+
+
+def _relabel_forest(np.ndarray[int32_or_int64, ndim=1, mode='c'] labels):
+    """
+    Replace the union-find forest `labels` in-place by component labels,
+    numbered in the order of the lowest node of each component.
 
-    # Share memory for the stack and labels, since labels are only
-    # applied once a node has been popped from the stack.
-    cdef np.ndarray[ITYPE_t, ndim=1, mode="c"] SS = labels
-    SS_head = END
+    Returns the number of components.
+    """
+    cdef np.npy_intp v, p
+    cdef np.npy_intp N = labels.shape[0]
+    cdef np.npy_intp label = 0
+
+    # The parent of v has a lower index, and has already been relabeled.
     for v in range(N):
-        if labels[v] == VOID:
-            # SS.push(v)
-            SS_head = v
-            SS[v] = END
-
-            while SS_head != END:
-                # v = SS.pop()
-                v = SS_head
-                SS_head = SS[v]
-
-                labels[v] = label
-
-                # Push children onto the stack if they haven't been
-                # seen at all yet.
-                for j in range(indptr1[v], indptr1[v+1]):
-                    w = indices1[j]
-                    if SS[w] == VOID:
-                        SS[w] = SS_head
-                        SS_head = w
-                for j in range(indptr2[v], indptr2[v+1]):
-                    w = indices2[j]
-                    if SS[w] == VOID:
-                        SS[w] = SS_head
-                        SS_head = w
+        p = labels[v]
+        if p == v:
+            labels[v] = label
             label += 1
-
+        else:
+            labels[v] = labels[p]
     return label
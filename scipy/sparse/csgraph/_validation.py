@@ -1,5 +1,9 @@
 from __future__ import division, print_function, absolute_import
 
+import itertools
+import threading
+from multiprocessing import cpu_count
+
 import numpy as np
 from scipy.sparse import csr_matrix, isspmatrix, isspmatrix_csc
 from ._tools import csgraph_to_dense, csgraph_from_dense,\
@@ -24,13 +28,13 @@ def validate_graph(csgraph, directed, dtype=DTYPE,
 
     if isspmatrix(csgraph):
         if csr_output:
-            csgraph = csr_matrix(csgraph, dtype=DTYPE, copy=copy_if_sparse)
+            csgraph = csr_matrix(csgraph, dtype=dtype, copy=copy_if_sparse)
         else:
             csgraph = csgraph_to_dense(csgraph, null_value=null_value_out)
     elif np.ma.isMaskedArray(csgraph):
         if dense_output:
             mask = csgraph.mask
-            csgraph = np.array(csgraph.data, dtype=DTYPE, copy=copy_if_dense)
+            csgraph = np.array(csgraph.data, dtype=dtype, copy=copy_if_dense)
             csgraph[mask] = null_value_out
         else:
             csgraph = csgraph_from_masked(csgraph)
@@ -42,7 +46,7 @@ def validate_graph(csgraph, directed, dtype=DTYPE,
                                                 nan_null=nan_null,
                                                 infinity_null=infinity_null)
             mask = csgraph.mask
-            csgraph = np.asarray(csgraph.data, dtype=DTYPE)
+            csgraph = np.asarray(csgraph.data, dtype=dtype)
             csgraph[mask] = null_value_out
         else:
             csgraph = csgraph_from_dense(csgraph, null_value=null_value_in,
@@ -56,3 +60,55 @@ def validate_graph(csgraph, directed, dtype=DTYPE,
         raise ValueError("compressed-sparse graph must be shape (N, N)")
 
     return csgraph
+
+
+def _validate_workers(workers):
+    workers = int(workers)
+    if workers == -1:
+        workers = cpu_count()
+    elif workers < 1:
+        raise ValueError("workers must be a positive integer or -1")
+    return workers
+
+
+def _map_sources(func, n, workers, max_block=64):
+    """
+    Call ``func(start, stop)`` on consecutive blocks of ``range(n)``.
+
+    With ``workers > 1``, the blocks are processed by a pool of threads,
+    which take the next unprocessed block when done with the last one.
+    Blocks have at most `max_block` elements.  Returns the list of the
+    results, in the order of the blocks.
+    """
+    if workers == 1 or n <= 1:
+        return [func(0, n)]
+
+    # small blocks, for load balancing between the threads
+    block = max(1, min(max_block, n // (4 * workers)))
+    bounds = list(range(0, n, block)) + [n]
+    results = [None] * (len(bounds) - 1)
+    errors = []
+    counter = itertools.count()
+
+    def worker():
+        while not errors:
+            # itertools.count is thread-safe under the GIL
+            k = next(counter)
+            if k >= len(results):
+                return
+            try:
+                results[k] = func(bounds[k], bounds[k + 1])
+            except BaseException as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker)
+               for j in range(min(workers, len(results)))]
+    for t in threads:
+        t.daemon = True
+        t.start()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise errors[0]
+    return results
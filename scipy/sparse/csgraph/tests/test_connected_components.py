@@ -2,6 +2,8 @@ from __future__ import division, print_function, absolute_import
 
 import numpy as np
 from numpy.testing import assert_equal, assert_array_almost_equal
+from pytest import raises as assert_raises
+from scipy.sparse import csr_matrix
 from scipy.sparse import csgraph
 
 
@@ -99,3 +101,37 @@ def test_fully_connected_graph():
     g = np.ones((4, 4))
     n_components, labels = csgraph.connected_components(g)
     assert_equal(n_components, 1)
+
+
+def test_int64_indices():
+    g = csgraph.csgraph_from_dense(np.array([[0, 1, 0, 0],
+                                             [0, 0, 0, 0],
+                                             [0, 0, 0, 1],
+                                             [0, 0, 1, 0]]), null_value=0)
+    g.indices = g.indices.astype(np.int64)
+    g.indptr = g.indptr.astype(np.int64)
+
+    for connection, expected in [('weak', [0, 0, 1, 1]),
+                                 ('strong', [0, 1, 2, 2])]:
+        n_components, labels = csgraph.connected_components(
+            g, connection=connection)
+        assert_equal(labels.dtype, np.int64)
+        assert_equal(n_components, len(set(expected)))
+        assert_equal(len(set(zip(labels, expected))), n_components)
+
+
+def test_weak_connections_workers():
+    np.random.seed(1234)
+    n = 1000
+    rows = np.random.randint(n, size=n // 2)
+    cols = np.random.randint(n, size=n // 2)
+    g = csr_matrix((np.ones(n // 2), (rows, cols)), shape=(n, n))
+
+    expected = csgraph.connected_components(g, connection='weak')
+    for workers in [2, 4, -1]:
+        n_components, labels = csgraph.connected_components(
+            g, connection='weak', workers=workers)
+        assert_equal(n_components, expected[0])
+        assert_equal(labels, expected[1])
+
+    assert_raises(ValueError, csgraph.connected_components, g, workers=0)
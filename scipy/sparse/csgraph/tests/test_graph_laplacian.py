@@ -134,3 +134,86 @@ def test_sparse_formats():
         for normed in True, False:
             _check_symmetric_graph_laplacian(mat, normed)
 
+
+def test_laplacian_copy_dtype():
+    A = sparse.random(30, 30, density=0.2, format='csr', random_state=1234)
+    # with stored diagonal entries, the Laplacian keeps the structure of A
+    A = (A + A.T + sparse.identity(30)).tocsr()
+    for normed in True, False:
+        desired = _explicit_laplacian(A, normed=normed)
+
+        L = csgraph.laplacian(A, normed=normed, dtype=np.float32)
+        assert L.dtype == np.float32
+        assert_allclose(L.toarray(), desired, rtol=1e-5, atol=1e-6)
+
+        B = A.copy()
+        B.indices = B.indices.astype(np.int64)
+        B.indptr = B.indptr.astype(np.int64)
+        L = csgraph.laplacian(B, normed=normed, copy=False)
+        assert L.data is B.data
+        assert L.indices is B.indices
+        assert L.indices.dtype == np.int64
+        assert_allclose(L.toarray(), desired, atol=1e-12)
+
+        B = A.toarray()
+        L = csgraph.laplacian(B, normed=normed, copy=False)
+        assert L is B
+        assert_allclose(L, desired, atol=1e-12)
+
+    # the index type is kept by copies, and when diagonal entries have to
+    # be inserted
+    A = sparse.diags([1., 2.], [-1, 1], shape=(5, 5))
+    for A in (A, A + sparse.identity(5)):
+        for fmt in ('csr', 'csc'):
+            B = A.asformat(fmt)
+            B.indices = B.indices.astype(np.int64)
+            B.indptr = B.indptr.astype(np.int64)
+            for normed in True, False:
+                L = csgraph.laplacian(B, normed=normed)
+                assert L.format == fmt
+                assert L.indices.dtype == np.int64
+                assert L.indptr.dtype == np.int64
+                desired = csgraph.laplacian(A.toarray(), normed=normed)
+                assert_allclose(L.toarray(), desired, atol=1e-12)
+
+
+def test_laplacian_linear_operator():
+    A = [[0, 1, 0],
+         [4, 2, 0],
+         [0, 0, 0]]
+    x = np.arange(1., 7.).reshape(3, 2)
+    for arr_type in np.array, sparse.csr_matrix, sparse.coo_matrix:
+        adj = arr_type(A)
+        for normed in True, False:
+            for use_out_degree in True, False:
+                L, d = csgraph.laplacian(adj, normed=normed, return_diag=True,
+                                         use_out_degree=use_out_degree)
+                if sparse.issparse(L):
+                    L = L.toarray()
+                lo, d_lo = csgraph.laplacian(adj, normed=normed,
+                                             return_diag=True,
+                                             use_out_degree=use_out_degree,
+                                             form='lo')
+                assert_allclose(d_lo, d)
+                assert_allclose(lo.matvec(x[:, 0]), L.dot(x[:, 0]))
+                assert_allclose(lo.matmat(x), L.dot(x))
+                assert_allclose(lo.rmatvec(x[:, 0]), L.T.dot(x[:, 0]))
+
+                f = csgraph.laplacian(adj, normed=normed, form='function',
+                                      use_out_degree=use_out_degree)
+                assert_allclose(f(x), L.dot(x))
+
+    # complex weights, the adjoint conjugates the degrees as well
+    A = np.array(A) * (1 + 2j)
+    A[0, 2] = 3 - 1j
+    y = x[:, 0] + 1j * x[:, 1]
+    for arr_type in np.array, sparse.csr_matrix:
+        for normed in True, False:
+            L = csgraph.laplacian(arr_type(A), normed=normed)
+            if sparse.issparse(L):
+                L = L.toarray()
+            lo = csgraph.laplacian(arr_type(A), normed=normed, form='lo')
+            assert_allclose(lo.matvec(y), L.dot(y))
+            assert_allclose(lo.rmatvec(y), L.conj().T.dot(y))
+
+    assert_raises(ValueError, csgraph.laplacian, np.eye(3), form='matrix')
@@ -1,10 +1,13 @@
 from __future__ import division, print_function, absolute_import
 
 import numpy as np
-from numpy.testing import assert_array_almost_equal, assert_array_equal
+import scipy.sparse
+from numpy.testing import (assert_array_almost_equal, assert_array_equal,
+                           assert_equal, assert_)
 from pytest import raises as assert_raises
 from scipy.sparse.csgraph import (shortest_path, dijkstra, johnson,
-    bellman_ford, construct_dist_matrix, NegativeCycleError)
+    bellman_ford, shortest_path_pairs, construct_dist_matrix,
+    NegativeCycleError)
 
 
 directed_G = np.array([[0, 3, 3, 0, 0],
@@ -200,3 +203,188 @@ def test_overwrite():
     shortest_path(foo, overwrite=False)
     assert_array_equal(foo, G)
 
+
+def test_workers():
+    np.random.seed(1234)
+    G = scipy.sparse.random(200, 200, density=0.02, format='csr')
+    # no negative cycles in a directed acyclic graph
+    G_neg = scipy.sparse.triu(G, 1, format='csr')
+    G_neg.data -= 0.1
+
+    def check(method, directed, graph):
+        SP1, pred1 = shortest_path(graph, method=method, directed=directed,
+                                   return_predecessors=True)
+        SP2, pred2 = shortest_path(graph, method=method, directed=directed,
+                                   return_predecessors=True, workers=4)
+        assert_array_almost_equal(SP1, SP2)
+        assert_array_equal(pred1, pred2)
+
+    for directed in (True, False):
+        for method in ['D', 'BF', 'J']:
+            check(method, directed, G)
+        check('J', True, G_neg)
+
+    assert_raises(NegativeCycleError, shortest_path, G_neg, 'BF', False,
+                  workers=4)
+    assert_raises(NegativeCycleError, shortest_path, G_neg, 'J', False,
+                  workers=4)
+    for workers in [0, -2]:
+        assert_raises(ValueError, dijkstra, G, workers=workers)
+
+
+def test_dijkstra_sparse_output():
+    np.random.seed(1234)
+    G = scipy.sparse.random(100, 100, density=0.05, format='csr')
+    indices = [3, 0, 42, 99]
+
+    for directed in (True, False):
+        for limit in [0, 0.5, np.inf]:
+            SP, pred = dijkstra(G, directed=directed, indices=indices,
+                                limit=limit, return_predecessors=True)
+            for workers in [1, 2]:
+                SP_s, pred_s = dijkstra(G, directed=directed, indices=indices,
+                                        limit=limit, return_predecessors=True,
+                                        workers=workers, output='sparse')
+                assert_(scipy.sparse.isspmatrix_csr(SP_s))
+                assert_equal(SP_s.shape, (len(indices), 100))
+                # only the reachable nodes are stored, sources included
+                assert_equal(SP_s.nnz, np.isfinite(SP).sum())
+                coo = SP_s.tocoo()
+                dense = np.full(SP.shape, np.inf)
+                dense[coo.row, coo.col] = coo.data
+                assert_array_almost_equal(dense, SP)
+                assert_array_equal(pred_s.indices, SP_s.indices)
+                assert_array_equal(pred_s.toarray()[np.isfinite(SP)],
+                                   pred[np.isfinite(SP)])
+
+    assert_raises(ValueError, dijkstra, G, output='coo')
+
+
+def test_dijkstra_sparse_predecessors():
+    # 0 -> 1 -> 2, node 3 is not reached
+    G = scipy.sparse.csr_matrix(([1., 1.], ([0, 1], [1, 2])), shape=(4, 4))
+    SP, pred = dijkstra(G, indices=[0, 1], return_predecessors=True)
+    SP_s, pred_s = dijkstra(G, indices=[0, 1], return_predecessors=True,
+                            output='sparse')
+    # the sources are stored as -9999, a predecessor 0 as an explicit zero
+    assert_array_equal(pred_s.indices, [0, 1, 2, 1, 2])
+    assert_array_equal(pred_s.data, [-9999, 0, 1, -9999, 1])
+
+    P = np.full(pred_s.shape, -9999, dtype=pred_s.dtype)
+    coo = pred_s.tocoo()
+    P[coo.row, coo.col] = coo.data
+    assert_array_equal(P, pred)
+
+
+def test_negative_cycle_workers():
+    # every source reaches the negative edge of the undirected path graph,
+    # the error reports the first one whatever the number of threads
+    n = 300
+    G = scipy.sparse.diags(np.ones(n - 1), 1, format='csr')
+    G.data[n // 2] = -1
+    indices = np.arange(n)
+    for method in ['BF', 'J']:
+        for workers in [1, 4]:
+            try:
+                shortest_path(G, method=method, directed=False,
+                              indices=indices, workers=workers)
+            except NegativeCycleError as e:
+                if method == 'BF':
+                    assert_equal(str(e), 'Negative cycle detected on node %i'
+                                 % indices[0])
+            else:
+                raise AssertionError('NegativeCycleError not raised')
+
+def test_dijkstra_min_only():
+    np.random.seed(1234)
+    G = scipy.sparse.random(100, 100, density=0.05, format='csr')
+    indices = [3, 42, 99, 42]
+
+    for directed in (True, False):
+        for limit in [0.5, np.inf]:
+            SP = dijkstra(G, directed=directed, indices=indices, limit=limit)
+            dist, pred, sources = dijkstra(G, directed=directed,
+                                           indices=indices, limit=limit,
+                                           return_predecessors=True,
+                                           min_only=True)
+            assert_equal(dist.shape, (100,))
+            assert_array_almost_equal(dist, SP.min(axis=0))
+            reached = np.isfinite(dist)
+            assert_array_equal(sources[~reached], -9999)
+            assert_array_equal(pred[~reached], -9999)
+
+            # the paths start from the reported source, and follow the
+            # predecessors back to it
+            rows = np.searchsorted([3, 42, 99], sources[reached])
+            assert_array_almost_equal(SP[rows, np.flatnonzero(reached)],
+                                      dist[reached])
+            for j in np.flatnonzero(reached):
+                source = sources[j]
+                while pred[j] != -9999:
+                    j = pred[j]
+                assert_equal(j, source)
+
+            dist2 = dijkstra(G, directed=directed, indices=indices,
+                             limit=limit, min_only=True)
+            assert_array_almost_equal(dist2, dist)
+
+    assert_raises(ValueError, dijkstra, G, indices=indices, min_only=True,
+                  output='sparse')
+
+
+def test_shortest_path_pairs():
+    sources = [0, 1, 2, 3, 4, 2]
+    targets = [2, 4, 0, 3, 1, 2]
+
+    def check(directed, SP, G):
+        lengths, paths = shortest_path_pairs(G, sources, targets,
+                                             directed=directed,
+                                             return_paths=True)
+        SP = np.asarray(SP)
+        assert_array_almost_equal(lengths, SP[sources, targets])
+        for s, t, length, path in zip(sources, targets, lengths, paths):
+            if np.isinf(length):
+                assert_equal(len(path), 0)
+                continue
+            assert_equal(path[0], s)
+            assert_equal(path[-1], t)
+            weights = [G[i, j] if G[i, j] else G[j, i]
+                       for i, j in zip(path[:-1], path[1:])]
+            assert_array_almost_equal(np.sum(weights), length)
+
+    check(True, directed_SP, directed_G)
+    check(False, undirected_SP, undirected_G)
+
+    # broadcasting
+    lengths = shortest_path_pairs(directed_G, [[0], [1]], [2, 3, 4])
+    assert_array_almost_equal(lengths,
+                              np.asarray(directed_SP)[[[0], [1]], [2, 3, 4]])
+
+    assert_raises(ValueError, shortest_path_pairs, directed_G, 0, 5)
+    assert_raises(ValueError, shortest_path_pairs, directed_G, 0, 1,
+                  method='astar')
+    assert_raises(ValueError, shortest_path_pairs, -directed_G, 0, 1)
+
+
+def test_shortest_path_pairs_astar():
+    # random geometric graph, whose weights are at least the Euclidean
+    # distances between the nodes
+    np.random.seed(1234)
+    n = 300
+    X = np.random.rand(n, 2)
+    dist = np.sqrt(((X[:, None, :] - X[None, :, :])**2).sum(axis=-1))
+    G = np.where(dist < 0.15, dist * (1 + np.random.rand(n, n)), 0)
+    G = scipy.sparse.csr_matrix(np.triu(G, 1))
+    sources = np.random.randint(0, n, 50)
+    targets = np.random.randint(0, n, 50)
+
+    for directed in (True, False):
+        SP = dijkstra(G, directed=directed, indices=sources)
+        expected = SP[np.arange(50), targets]
+        for method in ['bidirectional', 'astar']:
+            for workers in [1, 2]:
+                lengths = shortest_path_pairs(G, sources, targets,
+                                              directed=directed,
+                                              method=method, coordinates=X,
+                                              workers=workers)
+                assert_array_almost_equal(lengths, expected)
@@ -2,7 +2,8 @@
 from __future__ import division, print_function, absolute_import
 
 import numpy as np
-from numpy.testing import assert_
+from numpy.testing import assert_, assert_equal, assert_allclose
+from pytest import raises as assert_raises
 import numpy.testing as npt
 from scipy.sparse import csr_matrix
 from scipy.sparse.csgraph import minimum_spanning_tree
@@ -65,3 +66,53 @@ def test_minimum_spanning_tree():
 
         npt.assert_array_equal(mintree.todense(), expected,
             'Incorrect spanning tree found.')
+
+
+def test_minimum_spanning_tree_boruvka():
+    np.random.seed(1234)
+    for N in (1, 5, 20, 100):
+        graph = np.random.random((N, N))
+        # two components, and ties between the weights
+        graph[graph < 0.7] = 0
+        graph[:N//2, N//2:] = 0
+        graph[N//2:, :N//2] = 0
+        graph = np.round(graph, 1)
+        csgraph = csr_matrix(graph)
+
+        kruskal = minimum_spanning_tree(csgraph)
+        for workers in (1, 3):
+            boruvka = minimum_spanning_tree(csgraph, method='boruvka',
+                                            workers=workers)
+            assert_equal(boruvka.nnz, kruskal.nnz)
+            assert_allclose(boruvka.sum(), kruskal.sum())
+            # the tree consists of edges of the graph
+            assert_equal(boruvka.toarray()[boruvka.toarray() != 0],
+                         graph[boruvka.toarray() != 0])
+
+    # the input graph is not modified
+    npt.assert_array_equal(csgraph.toarray(), graph)
+
+    assert_raises(ValueError, minimum_spanning_tree, csgraph, method='prim')
+    assert_raises(ValueError, minimum_spanning_tree, csgraph, workers=0)
+
+
+def test_minimum_spanning_tree_int64_indices():
+    graph = np.array([[0, 1, 0, 0, 0],
+                      [1, 0, 0, 0, 0],
+                      [0, 0, 0, 8, 5],
+                      [0, 0, 8, 0, 1],
+                      [0, 0, 5, 1, 0]])
+    expected = np.array([[0, 1, 0, 0, 0],
+                         [0, 0, 0, 0, 0],
+                         [0, 0, 0, 0, 5],
+                         [0, 0, 0, 0, 1],
+                         [0, 0, 0, 0, 0]])
+    csgraph = csr_matrix(graph)
+    csgraph.indices = csgraph.indices.astype(np.int64)
+    csgraph.indptr = csgraph.indptr.astype(np.int64)
+
+    for method in ('kruskal', 'boruvka'):
+        # the tree may hold either of two symmetric edges of equal weight
+        mintree = minimum_spanning_tree(csgraph, method=method)
+        npt.assert_array_equal((mintree + mintree.T).toarray(),
+                               expected + expected.T)
@@ -1,9 +1,10 @@
 from __future__ import division, print_function, absolute_import
 
 import numpy as np
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_almost_equal, assert_equal
 from scipy.sparse.csgraph import (breadth_first_tree, depth_first_tree,
-    csgraph_to_dense, csgraph_from_dense)
+    breadth_first_order, depth_first_order, csgraph_to_dense,
+    csgraph_from_dense)
 
 
 def test_graph_breadth_first():
@@ -68,3 +69,24 @@ def test_graph_depth_first_trivial_graph():
         bfirst_test = depth_first_tree(csgraph, 0, directed)
         assert_array_almost_equal(csgraph_to_dense(bfirst_test),
                                   bfirst)
+
+
+def test_graph_traversal_int64_indices():
+    csgraph = np.array([[0, 1, 2, 0, 0],
+                        [1, 0, 0, 0, 3],
+                        [2, 0, 0, 7, 0],
+                        [0, 0, 7, 0, 1],
+                        [0, 3, 0, 1, 0]])
+    csgraph = csgraph_from_dense(csgraph, null_value=0)
+    csgraph64 = csgraph.copy()
+    csgraph64.indices = csgraph64.indices.astype(np.int64)
+    csgraph64.indptr = csgraph64.indptr.astype(np.int64)
+
+    for order in [breadth_first_order, depth_first_order]:
+        for directed in [True, False]:
+            nodes, predecessors = order(csgraph, 0, directed)
+            nodes64, predecessors64 = order(csgraph64, 0, directed)
+            assert_equal(nodes64.dtype, np.int64)
+            assert_equal(predecessors64.dtype, np.int64)
+            assert_equal(nodes64, nodes)
+            assert_equal(predecessors64, predecessors)
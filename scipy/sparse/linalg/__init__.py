@@ -23,6 +23,7 @@ Matrix Operations
    inv -- compute the sparse matrix inverse
    expm -- compute the sparse matrix exponential
    expm_multiply -- compute the product of a matrix exponential and a matrix
+   ExpmAction -- repeated products of the exponential of the same matrix
 
 Matrix norms
 ------------
@@ -61,6 +62,9 @@ Iterative methods for linear equation systems:
    minres -- Use MINimum RESidual iteration to solve Ax = b
    qmr -- Use Quasi-Minimal Residual iteration to solve A x = b
    gcrotmk -- Solve a matrix equation using the GCROT(m,k) algorithm
+   rcg -- Solve a matrix equation using CG with Krylov subspace recycling
+   block_cg -- Use block Conjugate Gradient iteration to solve A X = B
+   block_gmres -- Use block GMRES iteration to solve A X = B
 
 Iterative methods for least-squares problems:
 
@@ -98,6 +102,13 @@ Complete or incomplete LU factorizations
    spilu -- Compute an incomplete LU decomposition for a sparse matrix
    SuperLU -- Object representing an LU factorization
 
+Multigrid preconditioners
+
+.. autosummary::
+   :toctree: generated/
+
+   amg_preconditioner -- Smoothed aggregation algebraic multigrid preconditioner
+
 Exceptions
 ----------
 
@@ -119,6 +130,7 @@ from .matfuncs import *
 from ._onenormest import *
 from ._norm import *
 from ._expm_multiply import *
+from ._amg import *
 
 __all__ = [s for s in dir() if not s.startswith('_')]
 
@@ -0,0 +1,228 @@
+"""Smoothed aggregation algebraic multigrid preconditioner.
+"""
+
+from __future__ import division, print_function, absolute_import
+
+import numpy as np
+
+from scipy._lib.six import xrange
+from scipy._lib._util import check_random_state
+from scipy.sparse import csr_matrix, diags
+from scipy.sparse.linalg.interface import LinearOperator
+from scipy.sparse.linalg.dsolve import splu
+
+__all__ = ['amg_preconditioner']
+
+
+def _row_max(indptr, values, empty):
+    """Maximum of `values` over each row of a CSR structure."""
+    out = np.full(len(indptr) - 1, empty, dtype=values.dtype)
+    nonempty = np.flatnonzero(np.diff(indptr))
+    if len(nonempty):
+        out[nonempty] = np.maximum.reduceat(values, indptr[nonempty])
+    return out
+
+
+def _strength(A, theta):
+    """
+    Symmetric strength of connection: ``i`` and ``j != i`` are strongly
+    connected if ``|a_ij| >= theta * sqrt(|a_ii a_jj|)``.
+    """
+    A = A.tocoo()
+    d = abs(A.diagonal())
+    mask = (A.row != A.col) & (A.data != 0)
+    if theta > 0:
+        mask &= abs(A.data) >= theta * np.sqrt(d[A.row] * d[A.col])
+    S = csr_matrix((np.ones(mask.sum()), (A.row[mask], A.col[mask])),
+                   shape=A.shape)
+    # symmetrize, so that aggregates are independent of the orientation
+    S = S + S.T
+    S.sort_indices()
+    return S
+
+
+def _aggregate(S, random_state):
+    """
+    Aggregate the nodes of the strength graph `S` around a maximal
+    independent set.
+
+    Returns an array mapping each node to its aggregate.
+    """
+    n = S.shape[0]
+    indptr, indices = S.indptr, S.indices
+
+    # Luby's algorithm: in each round, select the undecided nodes whose
+    # random weight is larger than that of all their undecided neighbours,
+    # and remove the neighbours of the selected nodes.
+    weight = random_state.permutation(n) + 1.0
+    state = np.zeros(n, dtype=np.int8)  # 0: undecided, 1: root, -1: removed
+    while True:
+        undecided = state == 0
+        if not undecided.any():
+            break
+        nbr_weight = np.where(undecided[indices], weight[indices], 0.0)
+        nbr_max = _row_max(indptr, nbr_weight, 0.0)
+        selected = undecided & (weight > nbr_max)
+        state[selected] = 1
+        covered = S.dot(selected.astype(float)) > 0
+        state[covered & (state == 0)] = -1
+
+    roots = np.flatnonzero(state == 1)
+    agg = np.empty(n, dtype=np.intp)
+    agg[roots] = np.arange(len(roots))
+
+    # Every other node is adjacent to a root; join one of them
+    root_id = np.where(state[indices] == 1, agg[indices] + 1.0, 0.0)
+    others = np.flatnonzero(state != 1)
+    agg[others] = _row_max(indptr, root_id, 0.0)[others].astype(np.intp) - 1
+    return agg, len(roots)
+
+
+def _spectral_radius_bound(DinvA):
+    """Upper bound for the spectral radius, from the maximum row sum."""
+    return abs(DinvA).sum(axis=1).max()
+
+
+class _Level(object):
+    def __init__(self, A):
+        self.A = A
+        self.Dinv = 1 / A.diagonal()
+        # smoother weight and transfer operators to the next coarser level
+        self.omega = None
+        self.P = None
+        self.R = None
+
+
+def amg_preconditioner(A, theta=0.0, max_levels=10, max_coarse=500,
+                       sweeps=1, random_state=None):
+    """
+    Build a smoothed aggregation algebraic multigrid preconditioner.
+
+    The result applies one V-cycle and is intended as preconditioner `M`
+    for the iterative solvers, in particular `cg`.
+
+    Parameters
+    ----------
+    A : (N, N) sparse matrix
+        Symmetric positive definite matrix, typically an M-matrix arising
+        from the discretization of an elliptic partial differential
+        equation.
+    theta : float, optional
+        Strength of connection threshold.  Off-diagonal entries ``a_ij``
+        are used to build the aggregates if
+        ``|a_ij| >= theta * sqrt(|a_ii a_jj|)``.  Default: 0.
+    max_levels : int, optional
+        Maximum number of levels of the hierarchy.  Default: 10.
+    max_coarse : int, optional
+        Stop coarsening once a level has at most this many unknowns; the
+        coarsest level is solved with a sparse LU factorization.
+        Default: 500.
+    sweeps : int, optional
+        Number of damped Jacobi sweeps before and after the coarse grid
+        correction on each level.  Default: 1.
+    random_state : {None, int, `numpy.random.RandomState`}, optional
+        Source of randomness for the selection of the aggregates.
+
+    Returns
+    -------
+    M : LinearOperator
+        Preconditioner approximating the inverse of `A`.
+
+    See Also
+    --------
+    spilu, cg
+
+    Notes
+    -----
+    The aggregates are the neighbourhoods of a maximal independent set of
+    the strength graph, which is found with Luby's algorithm in a few
+    vectorized passes over the matrix.  The tentative prolongator
+    interpolates the constant vector and is smoothed with one step of
+    damped Jacobi, as in [1]_.  Building the hierarchy and applying the
+    V-cycle consist of sparse matrix products only, so that their cost is
+    linear in the number of nonzeros of `A`, and the preconditioned
+    iteration count is essentially independent of the problem size.
+
+    The V-cycle is symmetric, so that `M` is symmetric positive definite
+    when `A` is.
+
+    .. versionadded:: 1.2.0
+
+    References
+    ----------
+    .. [1] P. Vanek, J. Mandel and M. Brezina, "Algebraic multigrid by
+           smoothed aggregation for second and fourth order elliptic
+           problems", Computing 56, 179 (1996).
+
+    Examples
+    --------
+    >>> from scipy.sparse import diags, identity, kron
+    >>> from scipy.sparse.linalg import amg_preconditioner, cg
+    >>> T = diags([-1, 2, -1], [-1, 0, 1], shape=(50, 50))
+    >>> A = (kron(T, identity(50)) + kron(identity(50), T)).tocsr()
+    >>> M = amg_preconditioner(A)
+    >>> b = np.ones(A.shape[0])
+    >>> x, info = cg(A, b, M=M, atol=1e-8)
+    >>> info
+    0
+    """
+    # sum_duplicates works in place, so never on the caller's matrix
+    A = csr_matrix(A, copy=True).asfptype()
+    A.sum_duplicates()
+
+    if A.shape[0] != A.shape[1]:
+        raise ValueError('expected square matrix, but got shape=%s' % (A.shape,))
+    if np.any(A.diagonal() == 0):
+        raise ValueError('matrix has zeros on the diagonal')
+
+    random_state = check_random_state(random_state)
+
+    levels = [_Level(A)]
+    while len(levels) < max_levels and levels[-1].A.shape[0] > max_coarse:
+        level = levels[-1]
+        A = level.A
+
+        agg, n_agg = _aggregate(_strength(A, theta), random_state)
+        if n_agg == A.shape[0]:
+            # no coarsening possible
+            break
+
+        # Tentative prolongator, interpolating the constant vector with
+        # orthonormal columns
+        counts = np.bincount(agg, minlength=n_agg)
+        T = csr_matrix((1 / np.sqrt(counts[agg]),
+                        (np.arange(A.shape[0]), agg)),
+                       shape=(A.shape[0], n_agg))
+
+        # Prolongation smoother  P = (I - omega D^{-1} A) T
+        DinvA = diags(level.Dinv).dot(A)
+        level.omega = 4 / (3 * _spectral_radius_bound(DinvA))
+        P = T - level.omega * DinvA.dot(T)
+
+        level.P = P.tocsr()
+        level.R = P.T.conj().tocsr()
+        levels.append(_Level((level.R.dot(A).dot(level.P)).tocsr()))
+
+    coarse_solve = splu(levels[-1].A.tocsc()).solve
+
+    def smooth(level, x, b):
+        for i in xrange(sweeps):
+            x = x + level.omega * level.Dinv * (b - level.A.dot(x))
+        return x
+
+    def vcycle(i, b):
+        if i == len(levels) - 1:
+            return coarse_solve(b)
+        level = levels[i]
+        x = smooth(level, np.zeros_like(b), b)
+        x = x + level.P.dot(vcycle(i + 1, level.R.dot(b - level.A.dot(x))))
+        return smooth(level, x, b)
+
+    def matvec(b):
+        b = np.asarray(b).ravel()
+        if np.iscomplexobj(b) and not np.iscomplexobj(levels[0].A.data):
+            return matvec(b.real) + 1j * matvec(b.imag)
+        return vcycle(0, b)
+
+    return LinearOperator(levels[0].A.shape, matvec=matvec,
+                          dtype=levels[0].A.dtype)
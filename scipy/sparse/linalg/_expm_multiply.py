@@ -7,9 +7,9 @@ import numpy as np
 
 import scipy.linalg
 import scipy.sparse.linalg
-from scipy.sparse.linalg import aslinearoperator
+from scipy.sparse.linalg import aslinearoperator, LinearOperator
 
-__all__ = ['expm_multiply']
+__all__ = ['expm_multiply', 'ExpmAction']
 
 
 def _exact_inf_norm(A):
@@ -45,14 +45,16 @@ def _ident_like(A):
         return np.eye(A.shape[0], A.shape[1], dtype=A.dtype)
 
 
-def expm_multiply(A, B, start=None, stop=None, num=None, endpoint=None):
+def expm_multiply(A, B, start=None, stop=None, num=None, endpoint=None,
+                  method=None):
     """
     Compute the action of the matrix exponential of A on B.
 
     Parameters
     ----------
     A : transposable linear operator
-        The operator whose exponential is of interest.
+        The operator whose exponential is of interest.  With
+        ``method='krylov'``, any `LinearOperator`.
     B : ndarray
         The matrix or vector to be multiplied by the matrix exponential of A.
     start : scalar, optional
@@ -66,12 +68,24 @@ def expm_multiply(A, B, start=None, stop=None, num=None, endpoint=None):
         Number of time points to use.
     endpoint : bool, optional
         If True, `stop` is the last time point.  Otherwise, it is not included.
+    method : {None, 'taylor', 'krylov'}, optional
+        The truncated Taylor series of [1]_ ('taylor') needs the exact
+        1-norm and trace of `A`, and is the default for arrays and sparse
+        matrices.  The Krylov subspace method ('krylov') only applies `A` to
+        vectors, and is the default for a `LinearOperator`.  See
+        `ExpmAction` for details.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
     expm_A_B : ndarray
          The result of the action :math:`e^{t_k A} B`.
 
+    See Also
+    --------
+    ExpmAction : repeated actions of the exponential of the same operator
+
     Notes
     -----
     The optional arguments defining the sequence of evenly spaced time points
@@ -127,6 +141,20 @@ def expm_multiply(A, B, start=None, stop=None, num=None, endpoint=None):
     >>> expm(2*A).dot(B)                # Verify 3rd timestep
     array([ 2.71828183,  1.        ])
     """
+    if method is None:
+        if isinstance(A, LinearOperator):
+            method = 'krylov'
+        else:
+            method = 'taylor'
+    if method not in ('taylor', 'krylov'):
+        raise ValueError("method must be 'taylor' or 'krylov'")
+
+    if method == 'krylov':
+        action = ExpmAction(A, method='krylov')
+        if all(arg is None for arg in (start, stop, num, endpoint)):
+            return action.dot(B)
+        return action._dot_linspace(B, start, stop, num, endpoint)
+
     if all(arg is None for arg in (start, stop, num, endpoint)):
         X = _expm_multiply_simple(A, B)
     else:
@@ -134,6 +162,325 @@ def expm_multiply(A, B, start=None, stop=None, num=None, endpoint=None):
     return X
 
 
+class ExpmAction(object):
+    """
+    Action of the matrix exponential of a fixed operator.
+
+    ``ExpmAction(A).dot(B, t)`` computes :math:`e^{t A} B` like
+    ``expm_multiply(t*A, B)``, but keeps the work that only depends on `A`
+    between the calls, for time stepping or other repeated propagations.
+
+    Parameters
+    ----------
+    A : {sparse matrix, dense matrix, LinearOperator}
+        The square operator whose exponential is of interest.  With
+        ``method='taylor'``, `A` must be an array or sparse matrix.
+    method : {'krylov', 'taylor'}, optional
+        Use Krylov subspace projections (default) or the truncated Taylor
+        series of `expm_multiply`.
+    m : int, optional
+        Dimension of the Krylov subspaces.  Default: 30.
+    tol : float, optional
+        Relative accuracy of the Krylov method.  Default: the double
+        precision unit roundoff, ``2**-53``.
+    hermitian : bool, optional
+        If True, `A` is hermitian, and the Krylov bases are built with the
+        Lanczos recurrence instead of Arnoldi's method.  Default: False.
+
+    See Also
+    --------
+    expm_multiply
+
+    Notes
+    -----
+    With ``method='krylov'``, the vector :math:`b` is propagated in substeps
+    :math:`\\tau`, each approximating :math:`e^{\\tau A} w` by
+    :math:`\\beta V_m e^{\\tau H_m} e_1` in an Arnoldi basis :math:`V_m` of
+    the Krylov subspace of :math:`w`, with :math:`\\beta = \\|w\\|_2` [1]_.
+    The error is estimated from the :math:`\\varphi_1` function of
+    :math:`\\tau H_m` [2]_, which only needs the exponential of a small
+    matrix, so that rejected substeps and several output times reuse the
+    same basis.  The number of products with `A` thus grows with the
+    spread of its spectrum rather than with its norm, which is favourable
+    for stiff problems.  The last accepted substep is kept as the first
+    guess for the next call.
+
+    With ``method='taylor'``, the shifted operator, its 1-norm, the
+    estimated norms of its powers and the selected Taylor degrees and
+    numbers of substeps are cached between calls.
+
+    The last Krylov basis and the vector it was built from are kept as
+    well, so that calls at several times ``t`` for the same `B` only build
+    the bases once.
+
+    .. versionadded:: 1.2.0
+
+    References
+    ----------
+    .. [1] Y. Saad, "Analysis of some Krylov subspace approximations to the
+           matrix exponential operator", SIAM J. Numer. Anal. 29, 209
+           (1992).
+    .. [2] R. B. Sidje, "Expokit: A Software Package for Computing Matrix
+           Exponentials", ACM Trans. Math. Softw. 24, 130 (1998).
+
+    Examples
+    --------
+    >>> from scipy.sparse import diags
+    >>> from scipy.sparse.linalg import ExpmAction, expm_multiply
+    >>> A = diags([1, -2, 1], [-1, 0, 1], shape=(100, 100))
+    >>> x = np.zeros(100)
+    >>> x[50] = 1
+    >>> propagate = ExpmAction(A, hermitian=True)
+    >>> y = x
+    >>> for k in range(10):
+    ...     y = propagate.dot(y, t=0.1)
+    >>> np.allclose(y, expm_multiply(A, x))
+    True
+    """
+
+    def __init__(self, A, method='krylov', m=30, tol=None, hermitian=False):
+        if method not in ('taylor', 'krylov'):
+            raise ValueError("method must be 'taylor' or 'krylov'")
+        if len(A.shape) != 2 or A.shape[0] != A.shape[1]:
+            raise ValueError('expected A to be like a square matrix')
+        if m < 1:
+            raise ValueError('m must be a positive integer')
+        if tol is None:
+            tol = 2**-53
+        elif not tol > 0:
+            raise ValueError('tol must be positive')
+        self.A = A
+        self.shape = A.shape
+        self.dtype = A.dtype
+        self.method = method
+        self.m = m
+        self.tol = tol
+        self.hermitian = hermitian
+
+        if method == 'taylor':
+            n = A.shape[0]
+            self._mu = _trace(A) / float(n)
+            self._A_shifted = A - self._mu * _ident_like(A)
+            self._norm_info = LazyOperatorNormInfo(
+                self._A_shifted, A_1_norm=_exact_1_norm(self._A_shifted),
+                ell=2)
+            self._taylor_params = {}
+        else:
+            self._op = aslinearoperator(A)
+            self._basis = None
+            self._tau = None
+
+    def dot(self, B, t=1.0):
+        """
+        Compute :math:`e^{t A} B`.
+
+        Parameters
+        ----------
+        B : ndarray
+            Vector or matrix of shape ``(N,)`` or ``(N, K)``.
+        t : float, optional
+            Time point.  Default: 1.
+
+        Returns
+        -------
+        X : ndarray
+            The result, of the same shape as `B`.
+        """
+        B = np.asarray(B)
+        if B.ndim not in (1, 2):
+            raise ValueError('expected B to be like a matrix or a vector')
+        if self.shape[1] != B.shape[0]:
+            raise ValueError('the matrices A and B have incompatible shapes')
+
+        if self.method == 'taylor':
+            return self._taylor_dot(B, t)
+        return self._krylov_dot(B, [t])[0]
+
+    def _taylor_dot(self, B, t):
+        n0 = 1 if B.ndim == 1 else B.shape[1]
+        key = (abs(t), n0)
+        if key not in self._taylor_params:
+            norm_info = self._norm_info
+            if t*norm_info.onenorm() == 0:
+                self._taylor_params[key] = 0, 1
+            else:
+                # the norms of powers of t*A
+                norm_info.set_scale(abs(t))
+                self._taylor_params[key] = _fragment_3_1(norm_info, n0,
+                                                         self.tol, ell=2)
+                norm_info.set_scale(1)
+        m_star, s = self._taylor_params[key]
+        return _expm_multiply_simple_core(self._A_shifted, B, t, self._mu,
+                                          m_star, s, self.tol)
+
+    def _dot_linspace(self, B, start, stop, num, endpoint):
+        B = np.asarray(B)
+        if B.ndim not in (1, 2):
+            raise ValueError('expected B to be like a matrix or a vector')
+        if self.shape[1] != B.shape[0]:
+            raise ValueError('the matrices A and B have incompatible shapes')
+        linspace_kwargs = {}
+        if num is not None:
+            linspace_kwargs['num'] = num
+        if endpoint is not None:
+            linspace_kwargs['endpoint'] = endpoint
+        samples = np.linspace(start, stop, **linspace_kwargs)
+        if len(samples) < 2:
+            raise ValueError('at least two time points are required')
+        return self._krylov_dot(B, samples)
+
+    def _krylov_dot(self, B, times):
+        times = np.asarray(times, dtype=float)
+        dtype = np.result_type(self.dtype, B.dtype, float)
+        X = np.empty((len(times),) + B.shape, dtype=dtype)
+        if B.ndim == 1:
+            X[:] = self._krylov_propagate(B.astype(dtype), times)
+        else:
+            for j in range(B.shape[1]):
+                X[:, :, j] = self._krylov_propagate(B[:, j].astype(dtype),
+                                                    times)
+        return X
+
+    def _krylov_propagate(self, b, times):
+        """
+        e^{t A} b for the times t, which must have the same sign and be
+        sorted by increasing magnitude, or be a linspace from an
+        arbitrary start.
+        """
+        X = np.empty((len(times), len(b)), dtype=b.dtype)
+
+        # go to the first time point, then successively to the next ones
+        t_now = 0.0
+        w = b
+        k = 0
+        while k < len(times):
+            t_left = times[k] - t_now
+            if t_left == 0:
+                X[k] = w
+                k += 1
+                continue
+
+            V, H, beta = self._krylov_basis(w)
+            if beta == 0:
+                X[k:] = 0
+                break
+            tau = t_left
+            if self._tau is not None and abs(self._tau) < abs(tau):
+                tau = np.copysign(self._tau, tau)
+
+            # Accept all the times that are reached accurately from this
+            # basis, and otherwise the longest substep found.
+            for i in range(_KRYLOV_MAX_SHRINK):
+                y, err = _krylov_expm(H, tau, beta)
+                tol = self.tol * beta * max(abs(tau / t_left), 2**-53)
+                if err <= tol:
+                    break
+                # the error behaves like tau**k
+                if np.isfinite(err):
+                    tau *= max(0.1, 0.9 * (tol / err) ** (1. / H.shape[1]))
+                else:
+                    tau *= 0.1
+                # substeps this small would not make progress
+                if (abs(tau) <= 2**-53 * abs(t_left) or
+                        t_now + tau == t_now):
+                    break
+            if err > tol:
+                raise RuntimeError('no accurate Krylov substep was found at '
+                                   't=%g, increase m or tol' % t_now)
+
+            if tau == t_left:
+                X[k] = V.dot(y)
+                k += 1
+                # later time points, as long as the error is small enough
+                while k < len(times):
+                    tau_k = times[k] - t_now
+                    y_k, err = _krylov_expm(H, tau_k, beta)
+                    if err > self.tol * beta:
+                        break
+                    X[k] = V.dot(y_k)
+                    k += 1
+                w = X[k-1]
+                t_now = times[k-1]
+            else:
+                # next substep, allowing for growth
+                if err > 0:
+                    grow = min(2., 0.9 * (tol / err) ** (1. / H.shape[1]))
+                else:
+                    grow = 2.
+                self._tau = abs(tau) * max(1., grow)
+                w = V.dot(y)
+                t_now += tau
+        return X
+
+    def _krylov_basis(self, w):
+        basis = self._basis
+        if (basis is not None and basis[0].shape == w.shape and
+                basis[0].dtype == w.dtype and np.array_equal(basis[0], w)):
+            return basis[1:]
+        V, H, beta = _arnoldi(self._op, w, min(self.m, len(w)),
+                              self.hermitian)
+        self._basis = (w.copy(), V, H, beta)
+        return V, H, beta
+
+
+# Maximum number of times a rejected Krylov substep is shortened
+_KRYLOV_MAX_SHRINK = 100
+
+
+def _arnoldi(A, w, m, hermitian):
+    """
+    Arnoldi basis ``V`` of the Krylov subspace of `A` and `w` of dimension
+    at most `m`, and the ``(k+1, k)`` upper Hessenberg matrix ``H`` with
+    ``A V[:, :k] = V H``.  With `hermitian`, only the last two vectors are
+    orthogonalized against, which is the Lanczos recurrence.
+    """
+    beta = np.linalg.norm(w)
+    n = len(w)
+    V = np.zeros((n, m + 1), dtype=w.dtype, order='F')
+    H = np.zeros((m + 1, m), dtype=w.dtype)
+    if beta == 0:
+        return V[:, :1], H[:1, :0], beta
+    V[:, 0] = w / beta
+    for j in range(m):
+        z = A.matvec(V[:, j])
+        z = np.asarray(z, dtype=w.dtype).ravel()
+        if hermitian:
+            for i in range(max(0, j - 1), j + 1):
+                H[i, j] = np.vdot(V[:, i], z)
+                z -= H[i, j] * V[:, i]
+        else:
+            # classical Gram-Schmidt, twice for stability
+            for k in range(2):
+                h = V[:, :j+1].T.conj().dot(z)
+                z -= V[:, :j+1].dot(h)
+                H[:j+1, j] += h
+        h = np.linalg.norm(z)
+        H[j + 1, j] = h
+        if h <= 4 * np.finfo(h.dtype).eps * abs(H[:j+2, j]).max():
+            # "happy breakdown": the subspace is invariant, and the
+            # projection exact
+            H[j + 1, j] = 0
+            return V[:, :j+2], H[:j+2, :j+1], beta
+        V[:, j + 1] = z / h
+    return V, H, beta
+
+
+def _krylov_expm(H, tau, beta):
+    """
+    Coefficients ``y`` of ``beta e^{tau A} v_1`` in the Arnoldi basis with
+    Hessenberg matrix `H`, and the error estimate
+    ``beta tau |h_{k+1,k} e_k^T phi_1(tau H_k) e_1|``, the last entry of the
+    exponential of the augmented matrix.
+    """
+    k = H.shape[1]
+    Ha = np.zeros((k + 1, k + 1), dtype=H.dtype)
+    Ha[:, :k] = H
+    F = scipy.linalg.expm(tau * Ha)
+    y = beta * F[:, 0]
+    y[k] = 0
+    return y, abs(beta * F[k, 0])
+
+
 def _expm_multiply_simple(A, B, t=1.0, balance=False):
     """
     Compute the action of the matrix exponential at a single time point.
@@ -23,6 +23,7 @@ add_newdoc('scipy.sparse.linalg.dsolve._superlu', 'SuperLU',
     Methods
     -------
     solve
+    refactor
 
     Notes
     -----
@@ -85,7 +86,7 @@ add_newdoc('scipy.sparse.linalg.dsolve._superlu', 'SuperLU',
 
 add_newdoc('scipy.sparse.linalg.dsolve._superlu', 'SuperLU', ('solve',
     """
-    solve(rhs[, trans])
+    solve(rhs[, trans, workers])
 
     Solves linear system of equations with one or several right-hand sides.
 
@@ -101,6 +102,13 @@ add_newdoc('scipy.sparse.linalg.dsolve._superlu', 'SuperLU', ('solve',
             'H':   A^H * x == rhs
 
         i.e., normal, transposed, and hermitian conjugate.
+    workers : int, optional
+        Number of threads among which the columns of `rhs` are divided.
+        The triangular solves release the GIL, so that the threads run
+        concurrently.  If -1, use as many threads as there are CPUs.
+        Default: 1.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -108,6 +116,51 @@ add_newdoc('scipy.sparse.linalg.dsolve._superlu', 'SuperLU', ('solve',
         Solution vector(s)
     """))
 
+add_newdoc('scipy.sparse.linalg.dsolve._superlu', 'SuperLU', ('refactor',
+    """
+    refactor(data)
+
+    Factorize a matrix with the same sparsity structure as the original one.
+
+    The column permutation and the elimination tree of the previous
+    factorization are reused, and only the numerical factorization is
+    redone.  This is considerably cheaper than a new call to `splu` or
+    `spilu` when many matrices with identical structure are factorized, as
+    e.g. in Newton iterations or implicit time stepping.
+
+    Parameters
+    ----------
+    data : ndarray, shape (nnz,)
+        Nonzero values of the new matrix, in the order of the ``data``
+        attribute of the CSC matrix originally factorized, i.e., after
+        conversion to CSC format and summing of duplicates.
+
+    Notes
+    -----
+    The row permutation is chosen anew by partial pivoting.  The column
+    permutation is however kept, so that the factors may have more fill-in
+    than those of a fresh factorization if the values change
+    substantially.
+
+    The factors are replaced in place, so `refactor` must not be called
+    while another thread is solving with the same object.
+
+    .. versionadded:: 1.2.0
+
+    Examples
+    --------
+    >>> from scipy.sparse import csc_matrix
+    >>> from scipy.sparse.linalg import splu
+    >>> A = csc_matrix([[4., 1., 0.], [1., 4., 1.], [0., 1., 4.]])
+    >>> lu = splu(A)
+    >>> A2 = A.copy()
+    >>> A2.data *= 2
+    >>> lu.refactor(A2.data)
+    >>> b = np.array([1., 2., 3.])
+    >>> np.allclose(A2.dot(lu.solve(b)), b)
+    True
+    """))
+
 add_newdoc('scipy.sparse.linalg.dsolve._superlu', 'SuperLU', ('L',
     """
     Lower triangular factor with unit diagonal as a
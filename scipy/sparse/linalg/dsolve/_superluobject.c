@@ -19,6 +19,10 @@
  * SuperLUObject methods
  */
 
+static int SuperLU_factor(SuperLUObject *, SuperMatrix *, int,
+                          int *, SuperMatrix *, SuperMatrix *);
+static PyObject *SuperLU_solve_threaded(SuperLUObject *, PyObject *, int, int);
+
 static PyObject *SuperLU_solve(SuperLUObject * self, PyObject * args,
 			       PyObject * kwds)
 {
@@ -32,7 +36,8 @@ static PyObject *SuperLU_solve(SuperLUObject * self, PyObject * args,
     volatile int info;
     volatile trans_t trans;
     volatile SuperLUStat_t stat = { 0 };
-    static char *kwlist[] = { "rhs", "trans", NULL };
+    static char *kwlist[] = { "rhs", "trans", "workers", NULL };
+    volatile int workers = 1;
     volatile jmp_buf *jmpbuf_ptr;
     SLU_BEGIN_THREADS_DEF;
 
@@ -42,11 +47,11 @@ static PyObject *SuperLU_solve(SuperLUObject * self, PyObject * args,
     }
 
 #ifndef NPY_PY3K
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!|c", kwlist,
-                                     &PyArray_Type, &b, &itrans))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!|ci", kwlist,
+                                     &PyArray_Type, &b, &itrans, &workers))
 #else
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!|C", kwlist,
-                                     &PyArray_Type, &b, &itrans))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O!|Ci", kwlist,
+                                     &PyArray_Type, &b, &itrans, &workers))
 #endif
         return NULL;
 
@@ -63,6 +68,17 @@ static PyObject *SuperLU_solve(SuperLUObject * self, PyObject * args,
         return NULL;
     }
 
+    if (workers == 0 || workers < -1) {
+        PyErr_SetString(PyExc_ValueError,
+                        "workers must be a positive integer or -1");
+        return NULL;
+    }
+
+    if (workers != 1 && PyArray_NDIM((PyArrayObject*)b) == 2 &&
+            PyArray_DIM((PyArrayObject*)b, 1) > 1) {
+        return SuperLU_solve_threaded(self, (PyObject*)b, itrans, workers);
+    }
+
     x = (PyArrayObject*)PyArray_FROMANY(
         (PyObject*)b, self->type, 1, 2,
         NPY_ARRAY_F_CONTIGUOUS | NPY_ARRAY_ENSURECOPY);
@@ -115,10 +131,109 @@ static PyObject *SuperLU_solve(SuperLUObject * self, PyObject * args,
     return NULL;
 }
 
+/*
+ * Solve for blocks of columns of b in several threads. Each thread calls
+ * the solve method above, which releases the GIL during the triangular
+ * solves; the threads are managed from Python.
+ */
+static PyObject *SuperLU_solve_threaded(SuperLUObject * self, PyObject * b,
+                                        int itrans, int workers)
+{
+    PyObject *linsolve, *x;
+
+    linsolve = PyImport_ImportModule("scipy.sparse.linalg.dsolve.linsolve");
+    if (linsolve == NULL) {
+        return NULL;
+    }
+#ifndef NPY_PY3K
+    x = PyObject_CallMethod(linsolve, "_superlu_solve_threaded", "OOci",
+                            (PyObject *)self, b, itrans, workers);
+#else
+    x = PyObject_CallMethod(linsolve, "_superlu_solve_threaded", "OOCi",
+                            (PyObject *)self, b, itrans, workers);
+#endif
+    Py_DECREF(linsolve);
+    return x;
+}
+
+static PyObject *SuperLU_refactor(SuperLUObject * self, PyObject * args,
+                                  PyObject * kwds)
+{
+    PyObject *py_data;
+    volatile PyArrayObject *data = NULL;
+    volatile SuperMatrix A = { 0 };
+    volatile SuperMatrix L = { 0 }, U = { 0 };
+    volatile int *perm_r = NULL;
+    volatile jmp_buf *jmpbuf_ptr;
+    static char *kwlist[] = { "data", NULL };
+
+    if (!CHECK_SLU_TYPE(self->type)) {
+        PyErr_SetString(PyExc_ValueError, "unsupported data type");
+        return NULL;
+    }
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &py_data))
+        return NULL;
+
+    data = (PyArrayObject*)PyArray_FROMANY(py_data, self->type, 1, 1,
+                                           NPY_ARRAY_IN_ARRAY);
+    if (data == NULL) {
+        return NULL;
+    }
+
+    if (PyArray_DIM((PyArrayObject*)data, 0) != self->nnz) {
+        PyErr_SetString(PyExc_ValueError, "data is of incompatible size");
+        goto fail;
+    }
+
+    jmpbuf_ptr = (volatile jmp_buf *)superlu_python_jmpbuf();
+    if (setjmp(*(jmp_buf*)jmpbuf_ptr)) {
+	goto fail;
+    }
+
+    /* The new matrix shares the structure of the factored one */
+    Create_CompCol_Matrix(self->type, (SuperMatrix*)&A, self->m, self->n,
+                          self->nnz, PyArray_DATA((PyArrayObject*)data),
+                          self->rowind, self->colptr, SLU_NC,
+                          NPY_TYPECODE_TO_SLU(self->type), SLU_GE);
+    perm_r = intMalloc(self->n);
+
+    if (SuperLU_factor(self, (SuperMatrix*)&A, 1, (int*)perm_r,
+                       (SuperMatrix*)&L, (SuperMatrix*)&U)) {
+        goto fail;
+    }
+
+    /* Replace the factors. Arrays obtained from the perm_r attribute
+     * refer to its memory, so it is updated in place. */
+    memcpy(self->perm_r, (int*)perm_r, self->n * sizeof(int));
+    SUPERLU_FREE((void*)perm_r);
+    XDestroy_SuperNode_Matrix(&self->L);
+    XDestroy_CompCol_Matrix(&self->U);
+    self->L = *(SuperMatrix*)&L;
+    self->U = *(SuperMatrix*)&U;
+    Py_CLEAR(self->cached_U);
+    Py_CLEAR(self->cached_L);
+
+    /* arrays of the input data will not be freed */
+    Destroy_SuperMatrix_Store((SuperMatrix*)&A);
+    Py_DECREF(data);
+    Py_RETURN_NONE;
+
+  fail:
+    SUPERLU_FREE((void*)perm_r);
+    XDestroy_SuperNode_Matrix((SuperMatrix*)&L);
+    XDestroy_CompCol_Matrix((SuperMatrix*)&U);
+    XDestroy_SuperMatrix_Store((SuperMatrix*)&A);
+    Py_XDECREF(data);
+    return NULL;
+}
+
 /** table of object methods
  */
 PyMethodDef SuperLU_methods[] = {
     {"solve", (PyCFunction) SuperLU_solve, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"refactor", (PyCFunction) SuperLU_refactor, METH_VARARGS | METH_KEYWORDS,
+     NULL},
     {NULL, NULL}		/* sentinel */
 };
 
@@ -135,8 +250,14 @@ static void SuperLU_dealloc(SuperLUObject * self)
     self->cached_L = NULL;
     SUPERLU_FREE(self->perm_r);
     SUPERLU_FREE(self->perm_c);
+    SUPERLU_FREE(self->rowind);
+    SUPERLU_FREE(self->colptr);
+    SUPERLU_FREE(self->etree);
     self->perm_r = NULL;
     self->perm_c = NULL;
+    self->rowind = NULL;
+    self->colptr = NULL;
+    self->etree = NULL;
     XDestroy_SuperNode_Matrix(&self->L);
     XDestroy_CompCol_Matrix(&self->U);
     PyObject_Del(self);
@@ -688,72 +809,58 @@ size_error:
 }
 
 
-PyObject *newSuperLUObject(SuperMatrix * A, PyObject * option_dict,
-                           int intype, int ilu)
+/*
+ * Factorize A, which has the sparsity structure stored in self, into L, U
+ * and the row permutation perm_r.
+ *
+ * If refactor is nonzero, the column permutation and the (postordered)
+ * elimination tree of the previous factorization are reused. Otherwise,
+ * they are computed and stored in self.
+ */
+static int SuperLU_factor(SuperLUObject * self, SuperMatrix * A, int refactor,
+                          int *perm_r, SuperMatrix * L, SuperMatrix * U)
 {
-
-    /* A must be in SLU_NC format used by the factorization routine. */
-    volatile SuperLUObject *self;
     volatile SuperMatrix AC = { 0 };	/* Matrix postmultiplied by Pc */
     volatile int lwork = 0;
-    volatile int *etree = NULL;
     volatile int info;
-    volatile int n;
     volatile superlu_options_t options;
     volatile SuperLUStat_t stat = { 0 };
-    volatile int panel_size, relax;
     volatile GlobalLU_t Glu;
     static volatile GlobalLU_t static_Glu;
     volatile GlobalLU_t *Glu_ptr;
     volatile jmp_buf *jmpbuf_ptr;
     SLU_BEGIN_THREADS_DEF;
 
-    n = A->ncol;
-
-    if (!set_superlu_options_from_dict((superlu_options_t*)&options, ilu, option_dict,
-				       (int*)&panel_size, (int*)&relax)) {
-	return NULL;
+    options = self->options;
+    if (refactor) {
+        /* sp_preorder skips the elimination tree and postordering */
+        options.Fact = SamePattern;
     }
 
-    /* Create SLUObject */
-    self = PyObject_New(SuperLUObject, &SuperLUType);
-    if (self == NULL)
-	return PyErr_NoMemory();
-    self->m = A->nrow;
-    self->n = n;
-    self->perm_r = NULL;
-    self->perm_c = NULL;
-    self->L.Store = NULL;
-    self->U.Store = NULL;
-    self->cached_U = NULL;
-    self->cached_L = NULL;
-    self->type = intype;
+    if (!CHECK_SLU_TYPE(SLU_TYPECODE_TO_NPY(A->Dtype))) {
+	PyErr_SetString(PyExc_ValueError, "Invalid type in SuperMatrix.");
+	return -1;
+    }
 
     jmpbuf_ptr = (volatile jmp_buf *)superlu_python_jmpbuf();
     if (setjmp(*(jmp_buf*)jmpbuf_ptr)) {
 	goto fail;
     }
 
-    /* Calculate and apply minimum degree ordering */
-    etree = intMalloc(n);
-    self->perm_r = intMalloc(n);
-    self->perm_c = intMalloc(n);
     StatInit((SuperLUStat_t *)&stat);
 
-    /* calc column permutation */
-    get_perm_c(options.ColPerm, A, self->perm_c);	
+    if (!refactor) {
+        /* calc column permutation */
+        get_perm_c(options.ColPerm, A, self->perm_c);
+    }
 
     /* apply column permutation */
-    sp_preorder((superlu_options_t*)&options, A, self->perm_c, (int*)etree,
+    sp_preorder((superlu_options_t*)&options, A, self->perm_c, self->etree,
                 (SuperMatrix*)&AC);
 
     /* Perform factorization */
-    if (!CHECK_SLU_TYPE(SLU_TYPECODE_TO_NPY(A->Dtype))) {
-	PyErr_SetString(PyExc_ValueError, "Invalid type in SuperMatrix.");
-	goto fail;
-    }
-
-    if (options.Fact == SamePattern || options.Fact == SamePattern_SameRowPerm) {
+    if (!refactor && (options.Fact == SamePattern ||
+                      options.Fact == SamePattern_SameRowPerm)) {
         /* XXX: not nice, a better new API should be introduced for this */
         Glu_ptr = &static_Glu;
     }
@@ -767,18 +874,18 @@ PyObject *newSuperLUObject(SuperMatrix * A, PyObject * option_dict,
         }
     }
 
-    if (ilu) {
+    if (self->ilu) {
         gsitrf(SLU_TYPECODE_TO_NPY(A->Dtype),
-               (superlu_options_t*)&options, (SuperMatrix*)&AC, relax, panel_size,
-               (int*)etree, NULL, lwork, self->perm_c, self->perm_r,
-               (SuperMatrix*)&self->L, (SuperMatrix*)&self->U, (GlobalLU_t*)Glu_ptr,
+               (superlu_options_t*)&options, (SuperMatrix*)&AC, self->relax,
+               self->panel_size, self->etree, NULL, lwork, self->perm_c,
+               perm_r, L, U, (GlobalLU_t*)Glu_ptr,
                (SuperLUStat_t*)&stat, (int*)&info);
     }
     else {
 	gstrf(SLU_TYPECODE_TO_NPY(A->Dtype),
-	      (superlu_options_t*)&options, (SuperMatrix*)&AC, relax, panel_size,
-	      (int*)etree, NULL, lwork, self->perm_c, self->perm_r,
-	      (SuperMatrix*)&self->L, (SuperMatrix*)&self->U, (GlobalLU_t*)Glu_ptr,
+	      (superlu_options_t*)&options, (SuperMatrix*)&AC, self->relax,
+              self->panel_size, self->etree, NULL, lwork, self->perm_c,
+              perm_r, L, U, (GlobalLU_t*)Glu_ptr,
               (SuperLUStat_t*)&stat, (int*)&info);
     }
 
@@ -789,7 +896,7 @@ PyObject *newSuperLUObject(SuperMatrix * A, PyObject * option_dict,
 	    PyErr_SetString(PyExc_SystemError,
 			    "gstrf was called with invalid arguments");
 	else {
-	    if (info <= n)
+	    if (info <= self->n)
 		PyErr_SetString(PyExc_RuntimeError,
 				"Factor is exactly singular");
 	    else
@@ -799,16 +906,79 @@ PyObject *newSuperLUObject(SuperMatrix * A, PyObject * option_dict,
     }
 
     /* free memory */
-    SUPERLU_FREE((void*)etree);
     Destroy_CompCol_Permuted((SuperMatrix*)&AC);
     StatFree((SuperLUStat_t*)&stat);
 
-    return (PyObject *) self;
+    return 0;
 
   fail:
-    SUPERLU_FREE((void*)etree);
     XDestroy_CompCol_Permuted((SuperMatrix*)&AC);
     XStatFree((SuperLUStat_t*)&stat);
+    return -1;
+}
+
+
+PyObject *newSuperLUObject(SuperMatrix * A, PyObject * option_dict,
+                           int intype, int ilu)
+{
+
+    /* A must be in SLU_NC format used by the factorization routine. */
+    volatile SuperLUObject *self;
+    volatile NCformat *Astore;
+    volatile int n;
+    volatile jmp_buf *jmpbuf_ptr;
+
+    n = A->ncol;
+    Astore = (NCformat *) A->Store;
+
+    /* Create SLUObject */
+    self = PyObject_New(SuperLUObject, &SuperLUType);
+    if (self == NULL)
+	return PyErr_NoMemory();
+    self->m = A->nrow;
+    self->n = n;
+    self->perm_r = NULL;
+    self->perm_c = NULL;
+    self->L.Store = NULL;
+    self->U.Store = NULL;
+    self->cached_U = NULL;
+    self->cached_L = NULL;
+    self->type = intype;
+    self->nnz = Astore->nnz;
+    self->rowind = NULL;
+    self->colptr = NULL;
+    self->etree = NULL;
+    self->ilu = ilu;
+
+    if (!set_superlu_options_from_dict((superlu_options_t*)&self->options, ilu,
+                                       option_dict, (int*)&self->panel_size,
+                                       (int*)&self->relax)) {
+	goto fail;
+    }
+
+    jmpbuf_ptr = (volatile jmp_buf *)superlu_python_jmpbuf();
+    if (setjmp(*(jmp_buf*)jmpbuf_ptr)) {
+	goto fail;
+    }
+
+    self->etree = intMalloc(n);
+    self->perm_r = intMalloc(n);
+    self->perm_c = intMalloc(n);
+
+    /* Keep the structure of A for refactorizations */
+    self->rowind = intMalloc(SUPERLU_MAX(self->nnz, 1));
+    self->colptr = intMalloc(n + 1);
+    memcpy(self->rowind, Astore->rowind, self->nnz * sizeof(int));
+    memcpy(self->colptr, Astore->colptr, (n + 1) * sizeof(int));
+
+    if (SuperLU_factor((SuperLUObject*)self, A, 0, self->perm_r,
+                       (SuperMatrix*)&self->L, (SuperMatrix*)&self->U)) {
+	goto fail;
+    }
+
+    return (PyObject *) self;
+
+  fail:
     Py_DECREF(self);
     return NULL;
 }
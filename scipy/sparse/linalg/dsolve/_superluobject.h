@@ -38,6 +38,14 @@ typedef struct {
     PyObject *cached_U;
     PyObject *cached_L;
     int type;
+    /* structure of the factored matrix, for refactorization */
+    int nnz;
+    int *rowind;
+    int *colptr;
+    int *etree;
+    superlu_options_t options;
+    int panel_size, relax;
+    int ilu;
 } SuperLUObject;
 
 typedef struct {
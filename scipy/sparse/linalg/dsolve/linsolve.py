@@ -1,6 +1,8 @@
 from __future__ import division, print_function, absolute_import
 
 from warnings import warn
+import multiprocessing
+import threading
 
 import numpy as np
 from numpy import asarray
@@ -389,6 +391,41 @@ def spilu(A, drop_tol=None, fill_factor=None, drop_rule=None, permc_spec=None,
                           ilu=True, options=_options)
 
 
+def _superlu_solve_threaded(lu, b, trans, workers):
+    """
+    Compute ``lu.solve(b, trans)`` for blocks of the columns of `b` in
+    separate threads.
+
+    Called by ``SuperLU.solve`` for ``workers != 1``.  The triangular solves
+    only read the factors and release the GIL, so that the blocks are
+    processed concurrently.
+    """
+    if workers == -1:
+        workers = multiprocessing.cpu_count()
+
+    bounds = np.linspace(0, b.shape[1], min(workers, b.shape[1]) + 1)
+    bounds = bounds.astype(np.intp)
+    results = [None] * (len(bounds) - 1)
+    errors = []
+
+    def worker(i):
+        try:
+            results[i] = lu.solve(b[:, bounds[i]:bounds[i+1]], trans)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,))
+               for i in range(len(results))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if errors:
+        raise errors[0]
+    return np.hstack(results)
+
+
 def factorized(A):
     """
     Return a function for solving a sparse linear system, with A pre-factorized.
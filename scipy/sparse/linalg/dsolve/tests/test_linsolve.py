@@ -636,6 +636,68 @@ class TestSplu(object):
         check(np.complex64, True)
         check(np.complex128, True)
 
+    def test_refactor(self):
+        for dtype in [np.float32, np.float64, np.complex64, np.complex128]:
+            A = self.A.tocsc().astype(dtype)
+            eps = np.finfo(dtype).eps
+            for spxlu, atol in [(splu, 1e3*eps), (spilu, 1e-2)]:
+                lu = spxlu(A)
+                perm_c = lu.perm_c.copy()
+                perm_r = lu.perm_r
+
+                rng = random.RandomState(1234)
+                A2 = A.copy()
+                A2.data = (A.data * (1 + rng.rand(A.nnz))).astype(dtype)
+                lu.refactor(A2.data)
+
+                # the column ordering is kept, and arrays obtained before
+                # see the new row permutation
+                assert_array_equal(lu.perm_c, perm_c)
+                assert_array_equal(perm_r, lu.perm_r)
+
+                b = rng.rand(self.n).astype(dtype)
+                for trans, B in [('N', A2), ('T', A2.T)]:
+                    x = lu.solve(b, trans)
+                    assert_(abs(B.dot(x) - b).max() < atol)
+
+                if spxlu is splu:
+                    Pc = np.zeros((self.n, self.n))
+                    Pc[np.arange(self.n), lu.perm_c] = 1
+                    Pr = np.zeros((self.n, self.n))
+                    Pr[lu.perm_r, np.arange(self.n)] = 1
+                    assert_allclose(Pr.dot(A2.toarray()).dot(Pc),
+                                    (lu.L * lu.U).toarray(),
+                                    atol=100*eps*abs(A2).max())
+
+    def test_refactor_bad_inputs(self):
+        A = self.A.tocsc()
+        lu = splu(A)
+        assert_raises(ValueError, lu.refactor, A.data[:-1])
+        assert_raises(ValueError, lu.refactor, np.ones((A.nnz, 2)))
+        assert_raises(TypeError, lu.refactor, A.data.astype(np.complex128))
+
+        # singular values, the previous factors stay usable
+        b = random.rand(self.n)
+        x = lu.solve(b)
+        assert_raises(RuntimeError, lu.refactor, np.zeros(A.nnz))
+        assert_allclose(lu.solve(b), x)
+
+    def test_solve_workers(self):
+        A = (self.A + 1j*self.A.T).tocsc()
+        lu = splu(A)
+        rng = random.RandomState(1234)
+        B = rng.rand(self.n, 7) + 1j*rng.rand(self.n, 7)
+        for trans in ['N', 'T', 'H']:
+            X = lu.solve(B, trans)
+            for workers in [2, 3, 7, 16, -1]:
+                assert_allclose(lu.solve(B, trans, workers=workers), X,
+                                rtol=1e-12, atol=0)
+
+        b = B[:, 0]
+        assert_allclose(lu.solve(b, workers=2), lu.solve(b))
+        assert_raises(ValueError, lu.solve, B, workers=0)
+        assert_raises(ValueError, lu.solve, B[:-1], workers=2)
+
     @pytest.mark.slow
     @sup_sparse_efficiency
     def test_threads_parallel(self):
@@ -0,0 +1,137 @@
+"""
+Randomized range finder backend for `svds` and `eigsh`.
+
+The operator is only accessed through ``matmat`` on blocks of vectors,
+following the algorithms of
+
+    N. Halko, P. G. Martinsson and J. A. Tropp, "Finding structure with
+    randomness: Probabilistic algorithms for constructing approximate
+    matrix decompositions", SIAM Review 53, 217 (2011).
+"""
+
+from __future__ import division, print_function, absolute_import
+
+import numpy as np
+
+from scipy._lib.six import xrange
+from scipy._lib._util import check_random_state
+from scipy.linalg import qr, svd, eigh
+from scipy.sparse.linalg.interface import aslinearoperator
+
+
+def _default_ncv(k, n):
+    # oversample by k, but at least by 10 vectors
+    return min(n, max(2*k, k + 10))
+
+
+def _random_block(shape, dtype, random_state):
+    X = random_state.standard_normal(shape)
+    if np.issubdtype(dtype, np.complexfloating):
+        X = X + 1j*random_state.standard_normal(shape)
+    return X.astype(dtype)
+
+
+def _orth(Y):
+    return qr(Y, mode='economic', check_finite=False)[0]
+
+
+def _range_finder(A, AH, l, n_iter, random_state):
+    """
+    Orthonormal basis of `l` vectors approximating the range of `A`.
+
+    `A` is applied ``n_iter + 1`` times and its adjoint `AH` ``n_iter``
+    times.  If `AH` is None, `A` is hermitian and is applied ``n_iter + 1``
+    times in total.  The block is reorthonormalized after each product, so
+    that the small singular values are not lost to rounding.  The starting
+    block is drawn from `random_state`.
+    """
+    dtype = np.result_type(A.dtype, np.float32)
+    Q = _orth(A.matmat(_random_block((A.shape[1], l), dtype, random_state)))
+    for i in xrange(n_iter):
+        if AH is not None:
+            Q = _orth(AH.matmat(Q))
+        Q = _orth(A.matmat(Q))
+    return Q
+
+
+def _check_params(k, ncv, maxiter, n):
+    if ncv is None:
+        ncv = _default_ncv(k, n)
+    if not k <= ncv <= n:
+        raise ValueError("ncv must be k<=ncv<=n, ncv=%s" % ncv)
+    if maxiter is None:
+        maxiter = 4
+    if maxiter < 0:
+        raise ValueError("maxiter must be non-negative, maxiter=%s" % maxiter)
+    return ncv, maxiter
+
+
+def randomized_svds(A, k, ncv=None, which='LM', maxiter=None,
+                    return_singular_vectors=True, random_state=None):
+    """
+    Randomized partial SVD, see `svds` with ``solver='randomized'``.
+
+    `ncv` is the size of the random block, and `maxiter` the number of
+    power iterations.
+    """
+    if which != 'LM':
+        raise ValueError("solver='randomized' only supports which='LM'")
+
+    A = aslinearoperator(A)
+    ncv, maxiter = _check_params(k, ncv, maxiter, min(A.shape))
+
+    AH = A.H
+    Q = _range_finder(A, AH, ncv, maxiter, check_random_state(random_state))
+
+    # A ~= Q Q^H A = Q B
+    BH = AH.matmat(Q)
+    if not return_singular_vectors:
+        s = svd(BH, compute_uv=False, check_finite=False)
+        return s[:k][::-1]
+
+    V, s, UbH = svd(BH, full_matrices=False, check_finite=False)
+
+    # singular values in ascending order, as returned by ARPACK
+    s = s[:k][::-1]
+    u = Q.dot(UbH[:k][::-1].T.conj())
+    vh = V[:, :k][:, ::-1].T.conj()
+
+    if return_singular_vectors == 'u':
+        vh = None
+    elif return_singular_vectors == 'vh':
+        u = None
+    return u, s, vh
+
+
+def randomized_eigsh(A, k, ncv=None, which='LM', maxiter=None,
+                     return_eigenvectors=True, random_state=None):
+    """
+    Randomized partial eigendecomposition of a hermitian operator, see
+    `eigsh` with ``solver='randomized'``.
+
+    `ncv` is the size of the random block, and `maxiter` the number of
+    subspace iterations.
+    """
+    if which != 'LM':
+        raise ValueError("solver='randomized' only supports which='LM'")
+
+    A = aslinearoperator(A)
+    ncv, maxiter = _check_params(k, ncv, maxiter, A.shape[0])
+
+    Q = _range_finder(A, None, ncv, maxiter,
+                      check_random_state(random_state))
+
+    # Rayleigh-Ritz on the range of Q
+    AQ = A.matmat(Q)
+    T = Q.T.conj().dot(AQ)
+    T = (T + T.T.conj()) / 2
+    w, V = eigh(T, check_finite=False)
+
+    idx = np.argsort(abs(w))[-k:]
+    if not return_eigenvectors:
+        return w[idx]
+
+    # eigenvalues in ascending algebraic order, as returned by ARPACK
+    idx = idx[np.argsort(w[idx])]
+    return w[idx], Q.dot(V[:, idx])
+
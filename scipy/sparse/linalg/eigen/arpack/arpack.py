@@ -53,6 +53,8 @@ from scipy.sparse.linalg import gmres, splu
 from scipy._lib._util import _aligned_zeros
 from scipy._lib._threadsafety import ReentrancyLock
 
+from ._randomized import randomized_svds, randomized_eigsh
+
 
 _type_conv = {'f': 's', 'd': 'd', 'F': 'c', 'D': 'z'}
 _ndigits = {'f': 5, 'd': 12, 'F': 5, 'D': 12}
@@ -1336,7 +1338,8 @@ def eigs(A, k=6, M=None, sigma=None, which='LM', v0=None,
 
 def eigsh(A, k=6, M=None, sigma=None, which='LM', v0=None,
           ncv=None, maxiter=None, tol=0, return_eigenvectors=True,
-          Minv=None, OPinv=None, mode='normal'):
+          Minv=None, OPinv=None, mode='normal', solver='arpack',
+          random_state=None):
     """
     Find k eigenvalues and eigenvectors of the real symmetric square matrix
     or complex hermitian matrix A.
@@ -1491,6 +1494,31 @@ def eigsh(A, k=6, M=None, sigma=None, which='LM', v0=None,
         The choice of mode will affect which eigenvalues are selected by
         the keyword 'which', and can also impact the stability of
         convergence (see [2] for a discussion).
+    solver : {'arpack', 'randomized'}, optional
+        Eigenvalue solver to use:
+
+            'arpack' :
+                Implicitly restarted Lanczos method (default).
+
+            'randomized' :
+                Randomized subspace iteration [3]_, which applies `A` to a
+                block of `ncv` random vectors and orthonormalizes after
+                each of the `maxiter` subsequent multiplications.  The
+                operator is only accessed through ``matmat``, so that each
+                iteration is a single pass over the data.  Only
+                ``which='LM'`` is supported, and `M`, `sigma`, `v0` and
+                `tol` must not be given.  The default values are
+                ``ncv = min(n, max(2*k, k + 10))`` and ``maxiter = 4``.
+                The accuracy depends on the decay of the eigenvalues,
+                and improves with larger `ncv` and `maxiter`.
+
+        .. versionadded:: 1.2.0
+    random_state : {None, int, `numpy.random.RandomState`}, optional
+        Source of the random starting block of ``solver='randomized'``.
+        If None, the global numpy random state is used.  Not used by the
+        ARPACK solver, which takes a starting vector `v0` instead.
+
+        .. versionadded:: 1.2.0
 
     Raises
     ------
@@ -1518,6 +1546,9 @@ def eigsh(A, k=6, M=None, sigma=None, which='LM', v0=None,
     .. [2] R. B. Lehoucq, D. C. Sorensen, and C. Yang,  ARPACK USERS GUIDE:
        Solution of Large Scale Eigenvalue Problems by Implicitly Restarted
        Arnoldi Methods. SIAM, Philadelphia, PA, 1998.
+    .. [3] N. Halko, P. G. Martinsson and J. A. Tropp, "Finding structure
+       with randomness: Probabilistic algorithms for constructing
+       approximate matrix decompositions", SIAM Review 53, 217 (2011).
 
     Examples
     --------
@@ -1530,6 +1561,22 @@ def eigsh(A, k=6, M=None, sigma=None, which='LM', v0=None,
     (13, 6)
 
     """
+    if solver == 'randomized':
+        if (M is not None or sigma is not None or Minv is not None or
+                OPinv is not None or v0 is not None or tol != 0 or
+                mode != 'normal'):
+            raise ValueError("M, sigma, Minv, OPinv, v0, tol and mode "
+                             "cannot be used with solver='randomized'")
+        if A.shape[0] != A.shape[1]:
+            raise ValueError('expected square matrix (shape=%s)' % (A.shape,))
+        if k <= 0 or k > A.shape[0]:
+            raise ValueError("k must be between 1 and N, k=%d" % k)
+        return randomized_eigsh(A, k, ncv=ncv, which=which, maxiter=maxiter,
+                                return_eigenvectors=return_eigenvectors,
+                                random_state=random_state)
+    elif solver != 'arpack':
+        raise ValueError("solver must be 'arpack' or 'randomized'")
+
     # complex hermitian matrices should be solved with eigs
     if np.issubdtype(A.dtype, np.complexfloating):
         if mode != 'normal':
@@ -1702,7 +1749,8 @@ def _herm(x):
 
 
 def svds(A, k=6, ncv=None, tol=0, which='LM', v0=None,
-         maxiter=None, return_singular_vectors=True):
+         maxiter=None, return_singular_vectors=True, solver='arpack',
+         random_state=None):
     """Compute the largest k singular values/vectors for a sparse matrix.
 
     Parameters
@@ -1746,6 +1794,21 @@ def svds(A, k=6, ncv=None, tol=0, which='LM', v0=None,
         - "vh": only return the vh matrix, without computing u (if N <= M).
 
         .. versionadded:: 0.16.0
+    solver : {'arpack', 'randomized'}, optional
+        Solver to use:
+
+            - 'arpack': ARPACK applied to ``A.H * A`` or ``A * A.H``
+              (default).
+            - 'randomized': randomized range finder with power
+              iterations [1]_, see Notes.
+
+        .. versionadded:: 1.2.0
+    random_state : {None, int, `numpy.random.RandomState`}, optional
+        Source of the random starting block of ``solver='randomized'``.
+        If None, the global numpy random state is used.  Not used by the
+        ARPACK solver, which takes a starting vector `v0` instead.
+
+        .. versionadded:: 1.2.0
 
     Returns
     -------
@@ -1766,6 +1829,24 @@ def svds(A, k=6, ncv=None, tol=0, which='LM', v0=None,
     This is a naive implementation using ARPACK as an eigensolver
     on A.H * A or A * A.H, depending on which one is more efficient.
 
+    With ``solver='randomized'``, `A` is applied to a block of `ncv` random
+    vectors, and the range of the result is refined by `maxiter` power
+    iterations with ``A * A.H``, orthonormalizing the block after each
+    multiplication.  The operator is only accessed through ``matmat`` (of
+    `A` and of its adjoint), so that each multiplication is a single pass
+    over the data, and the number of passes, ``2*maxiter + 2``, does not
+    depend on the size of the matrix.  Only ``which='LM'`` is supported,
+    and `tol` and `v0` are not used.  The default values are
+    ``ncv = min(min(A.shape), max(2*k, k + 10))`` and ``maxiter = 4``.
+    The accuracy depends on the decay of the singular values, and improves
+    with larger `ncv` and `maxiter`.
+
+    References
+    ----------
+    .. [1] N. Halko, P. G. Martinsson and J. A. Tropp, "Finding structure
+       with randomness: Probabilistic algorithms for constructing
+       approximate matrix decompositions", SIAM Review 53, 217 (2011).
+
     Examples
     --------
     >>> from scipy.sparse import csc_matrix
@@ -1785,6 +1866,13 @@ def svds(A, k=6, ncv=None, tol=0, which='LM', v0=None,
     if k <= 0 or k >= min(n, m):
         raise ValueError("k must be between 1 and min(A.shape), k=%d" % k)
 
+    if solver == 'randomized':
+        return randomized_svds(A, k, ncv=ncv, which=which, maxiter=maxiter,
+                               return_singular_vectors=return_singular_vectors,
+                               random_state=random_state)
+    elif solver != 'arpack':
+        raise ValueError("solver must be 'arpack' or 'randomized'")
+
     if isinstance(A, LinearOperator):
         if n > m:
             X_dot = A.matvec
@@ -11,7 +11,7 @@ import threading
 import numpy as np
 
 from numpy.testing import (assert_allclose, assert_array_almost_equal_nulp,
-                           assert_equal, assert_array_equal)
+                           assert_equal, assert_array_equal, assert_)
 from pytest import raises as assert_raises
 import pytest
 
@@ -859,6 +859,120 @@ def test_svds_wrong_eigen_type():
     assert_raises(ValueError, svds, x, 1, which='LA')
 
 
+def _matrix_with_spectrum(n, m, s, dtype):
+    rng = np.random.RandomState(1234)
+
+    def rand_orth(n, k):
+        X = rng.randn(n, k)
+        if np.issubdtype(dtype, np.complexfloating):
+            X = X + 1j*rng.randn(n, k)
+        return np.linalg.qr(X)[0]
+
+    U = rand_orth(n, len(s))
+    V = rand_orth(m, len(s))
+    return (U*s).dot(V.T.conj()).astype(dtype)
+
+
+def test_svds_randomized():
+    np.random.seed(1234)
+    k = 5
+    s_exact = 2.0**-np.arange(60)
+    for n, m in [(200, 60), (60, 200)]:
+        for dtype in [np.float64, np.complex128]:
+            A = _matrix_with_spectrum(n, m, s_exact, dtype)
+            for X in [A, csr_matrix(A), aslinearoperator(A)]:
+                U, s, VH = svds(X, k, solver='randomized')
+                assert_equal(U.shape, (n, k))
+                assert_equal(VH.shape, (k, m))
+                assert_allclose(s, s_exact[:k][::-1], rtol=1e-10)
+                assert_allclose(U.T.conj().dot(U), np.identity(k),
+                                atol=1e-12)
+                assert_allclose(VH.dot(VH.T.conj()), np.identity(k),
+                                atol=1e-12)
+                assert_allclose(A.dot(VH.T.conj()), U*s, atol=1e-10)
+
+            s = svds(A, k, solver='randomized',
+                     return_singular_vectors=False)
+            assert_allclose(s, s_exact[:k][::-1], rtol=1e-10)
+
+            U, s, VH = svds(A, k, solver='randomized',
+                            return_singular_vectors='u')
+            assert_equal(VH, None)
+            assert_allclose(np.linalg.norm(A.T.conj().dot(U), axis=0), s,
+                            rtol=1e-10)
+
+
+def test_svds_randomized_params():
+    np.random.seed(1234)
+    s_exact = 0.9**np.arange(40)
+    A = _matrix_with_spectrum(100, 40, s_exact, np.float64)
+
+    # more power iterations improve a slowly decaying spectrum
+    errors = [abs(svds(A, 3, solver='randomized', ncv=6, maxiter=maxiter,
+                       return_singular_vectors=False) -
+                  s_exact[:3][::-1]).max()
+              for maxiter in [0, 20]]
+    assert_(errors[1] < errors[0])
+    assert_(errors[1] < 1e-6)
+
+    # with a full block, the result is exact
+    s = svds(A, 3, solver='randomized', ncv=40, maxiter=0,
+             return_singular_vectors=False)
+    assert_allclose(s, s_exact[:3][::-1], rtol=1e-12)
+
+    assert_raises(ValueError, svds, A, 3, solver='randomized', which='SM')
+    assert_raises(ValueError, svds, A, 3, solver='randomized', ncv=2)
+    assert_raises(ValueError, svds, A, 3, solver='randomized', ncv=41)
+    assert_raises(ValueError, svds, A, 3, solver='randomized', maxiter=-1)
+    assert_raises(ValueError, svds, A, 3, solver='lanczos')
+
+
+def test_eigsh_randomized():
+    np.random.seed(1234)
+    n = 100
+    w_exact = 2.0**-np.arange(n) * (-1)**np.arange(n)
+    for dtype in [np.float64, np.complex128]:
+        A = _matrix_with_spectrum(n, n, w_exact, dtype)
+        A = (A + A.T.conj()) / 2
+        w_ref = np.sort(eigh(A, eigvals_only=True))
+        w_ref = w_ref[np.argsort(abs(w_ref))[-4:]]
+
+        for X in [A, csr_matrix(A), aslinearoperator(A)]:
+            w, v = eigsh(X, 4, solver='randomized')
+            assert_allclose(w, np.sort(w_ref), rtol=1e-10)
+            assert_allclose(A.dot(v), v*w, atol=1e-10)
+            assert_allclose(v.T.conj().dot(v), np.identity(4), atol=1e-12)
+
+        w = eigsh(A, 4, solver='randomized', return_eigenvectors=False)
+        assert_allclose(w, w_ref[np.argsort(abs(w_ref))], rtol=1e-10)
+
+    assert_raises(ValueError, eigsh, A, 4, solver='randomized', which='LA')
+    assert_raises(ValueError, eigsh, A, 4, solver='randomized', sigma=1)
+    assert_raises(ValueError, eigsh, A, 4, solver='randomized', v0=A[0])
+    assert_raises(ValueError, eigsh, A, 4, solver='lanczos')
+
+
+def test_randomized_random_state():
+    np.random.seed(1234)
+    A = _matrix_with_spectrum(60, 40, 0.9**np.arange(40), np.float64)
+    B = (A.T.dot(A) + A.T.dot(A).T) / 2
+
+    s = svds(A, 3, solver='randomized', maxiter=0, random_state=0,
+             return_singular_vectors=False)
+    w = eigsh(B, 3, solver='randomized', maxiter=0, random_state=0,
+              return_eigenvectors=False)
+    for random_state in (0, np.int64(0), np.random.RandomState(0)):
+        # the global random state is not used
+        np.random.seed(4321)
+        assert_equal(svds(A, 3, solver='randomized', maxiter=0,
+                          random_state=random_state,
+                          return_singular_vectors=False), s)
+        np.random.seed(5678)
+        assert_equal(eigsh(B, 3, solver='randomized', maxiter=0,
+                           random_state=random_state,
+                           return_eigenvectors=False), w)
+
+
 def test_parallel_threads():
     results = []
     v0 = np.random.rand(50)
@@ -11,11 +11,13 @@ Examples in tests directory contributed by Nils Wagner.
 """
 
 from __future__ import division, print_function, absolute_import
+import time
 import numpy as np
 from numpy.testing import assert_allclose
 from scipy._lib.six import xrange
-from scipy.linalg import inv, eigh, cho_factor, cho_solve, cholesky
-from scipy.sparse.linalg import aslinearoperator, LinearOperator
+from scipy.linalg import (inv, eigh, cho_factor, cho_solve, cholesky,
+                          LinAlgError)
+from scipy.sparse.linalg import aslinearoperator
 
 __all__ = ['lobpcg']
 
@@ -55,7 +57,8 @@ def as2d(ar):
 def _makeOperator(operatorInput, expectedShape):
     """Takes a dense numpy array or a sparse matrix or
     a function and makes an operator performing matrix * blockvector
-    products.
+    products.  None, standing for the identity, is passed through, so
+    that the products with it can be skipped.
 
     Examples
     --------
@@ -64,9 +67,7 @@ def _makeOperator(operatorInput, expectedShape):
 
     """
     if operatorInput is None:
-        def ident(x):
-            return x
-        operator = LinearOperator(expectedShape, ident, matmat=ident)
+        return None
     else:
         operator = aslinearoperator(operatorInput)
 
@@ -96,6 +97,8 @@ def _b_orthonormalize(B, blockVectorV, blockVectorBV=None, retInvR=False):
     blockVectorV = np.dot(blockVectorV, gramVBV)
     if B is not None:
         blockVectorBV = np.dot(blockVectorBV, gramVBV)
+    else:
+        blockVectorBV = blockVectorV
 
     if retInvR:
         return blockVectorV, blockVectorBV, gramVBV
@@ -107,7 +110,8 @@ def lobpcg(A, X,
             B=None, M=None, Y=None,
             tol=None, maxiter=20,
             largest=True, verbosityLevel=0,
-            retLambdaHistory=False, retResidualNormsHistory=False):
+            retLambdaHistory=False, retResidualNormsHistory=False,
+            retTimingHistory=False):
     """Locally Optimal Block Preconditioned Conjugate Gradient Method (LOBPCG)
 
     LOBPCG is a preconditioned eigensolver for large symmetric positive
@@ -152,10 +156,17 @@ def lobpcg(A, X,
         when True, solve for the largest eigenvalues, otherwise the smallest
     verbosityLevel : integer, optional
         controls solver output.  default: verbosityLevel = 0.
+        If positive, the eigenvalues, residual norms, active block size
+        and time of each iteration are printed.
     retLambdaHistory : boolean, optional
         whether to return eigenvalue history
     retResidualNormsHistory : boolean, optional
         whether to return history of residual norms
+    retTimingHistory : boolean, optional
+        whether to return the wall clock time, in seconds, of each
+        iteration
+
+        .. versionadded:: 1.2.0
 
     Examples
     --------
@@ -206,7 +217,9 @@ def lobpcg(A, X,
     -----
     If both retLambdaHistory and retResidualNormsHistory are True,
     the return tuple has the following format
-    (lambda, V, lambda history, residual norms history).
+    (lambda, V, lambda history, residual norms history).  With
+    retTimingHistory, the list of iteration times is appended to the
+    tuple.
 
     In the following ``n`` denotes the matrix size and ``m`` the number
     of required eigenvalues (smallest or largest).
@@ -220,6 +233,18 @@ def lobpcg(A, X,
     it will most likely break internally, so the code tries to call the standard
     function instead.
 
+    Converged eigenvectors are soft-locked: they remain in the Rayleigh-Ritz
+    procedure, so that the other approximations stay orthogonal to them, but
+    their residuals are removed from the search space, reducing the block
+    size of the remaining iterations.  The products of `A` and `B` with the
+    current approximations are updated along with them, so that `A`, `B`
+    and `M` are applied only once per iteration, to the residuals of the
+    active vectors; without `B` and `M`, no identity products are formed.
+    If the search directions of the previous iteration become numerically
+    linearly dependent, the iteration is restarted without them.  Close to
+    convergence, the Gram matrices are formed explicitly rather than from
+    the orthonormality relations, which no longer hold to full accuracy.
+
     It is not that n should be large for the LOBPCG to work, but rather the
     ratio ``n``/``m`` should be large. It you call the LOBPCG code with ``m``=1
     and ``n``=10, it should work, though ``n`` is small. The method is intended
@@ -304,6 +329,10 @@ def lobpcg(A, X,
     if residualTolerance is None:
         residualTolerance = np.sqrt(1e-15) * n
 
+    eps = np.finfo(np.result_type(A.dtype, blockVectorX.dtype, np.float32)).eps
+    explicitGramTolerance = eps**0.6
+    restartTolerance = np.sqrt(eps)
+
     maxIterations = min(n, maxIterations)
 
     if verbosityLevel:
@@ -366,6 +395,8 @@ def lobpcg(A, X,
     blockVectorAX = np.dot(blockVectorAX, eigBlockVector)
     if B is not None:
         blockVectorBX = np.dot(blockVectorBX, eigBlockVector)
+    else:
+        blockVectorBX = blockVectorX
 
     ##
     # Active index set.
@@ -373,6 +404,7 @@ def lobpcg(A, X,
 
     lambdaHistory = [_lambda]
     residualNormsHistory = []
+    timingHistory = []
 
     previousBlockSize = sizeX
     ident = np.eye(sizeX, dtype=A.dtype)
@@ -386,6 +418,7 @@ def lobpcg(A, X,
     blockVectorBP = None
 
     for iterationNumber in xrange(maxIterations):
+        startTime = time.time()
         if verbosityLevel > 0:
             print('iteration %d' % iterationNumber)
 
@@ -397,6 +430,9 @@ def lobpcg(A, X,
 
         residualNormsHistory.append(residualNorms)
 
+        # Converged vectors are soft-locked: they are kept in the
+        # Rayleigh-Ritz procedure, but their residuals are no longer
+        # added to the search space.
         ii = np.where(residualNorms > residualTolerance, True, False)
         activeMask = activeMask & ii
         if verbosityLevel > 2:
@@ -419,11 +455,6 @@ def lobpcg(A, X,
 
         activeBlockVectorR = as2d(blockVectorR[:,activeMask])
 
-        if iterationNumber > 0:
-            activeBlockVectorP = as2d(blockVectorP[:,activeMask])
-            activeBlockVectorAP = as2d(blockVectorAP[:,activeMask])
-            activeBlockVectorBP = as2d(blockVectorBP[:,activeMask])
-
         if M is not None:
             # Apply preconditioner T to the active residuals.
             activeBlockVectorR = M(activeBlockVectorR)
@@ -442,49 +473,109 @@ def lobpcg(A, X,
 
         activeBlockVectorAR = A(activeBlockVectorR)
 
-        if iterationNumber > 0:
-            aux = _b_orthonormalize(B, activeBlockVectorP,
-                                    activeBlockVectorBP, retInvR=True)
-            activeBlockVectorP, activeBlockVectorBP, invR = aux
-            activeBlockVectorAP = np.dot(activeBlockVectorAP, invR)
+        # The directions P are only used if they can be B-orthonormalized,
+        # otherwise the iteration is restarted without them.
+        restart = iterationNumber == 0
+        if not restart:
+            activeBlockVectorP = as2d(blockVectorP[:,activeMask])
+            activeBlockVectorAP = as2d(blockVectorAP[:,activeMask])
+            activeBlockVectorBP = as2d(blockVectorBP[:,activeMask])
+            try:
+                aux = _b_orthonormalize(B, activeBlockVectorP,
+                                        activeBlockVectorBP, retInvR=True)
+            except LinAlgError:
+                restart = True
+            else:
+                activeBlockVectorP, activeBlockVectorBP, invR = aux
+                activeBlockVectorAP = np.dot(activeBlockVectorAP, invR)
 
         ##
         # Perform the Rayleigh Ritz Procedure:
-        # Compute symmetric Gram matrices:
+        # Compute symmetric Gram matrices.  As X, R and P are
+        # B-orthonormal and X holds the Ritz vectors of the previous step,
+        # the diagonal blocks of gramB are identities and X^H A X is
+        # diagonal.  Close to convergence, rounding errors make these
+        # relations inaccurate, and the diagonal blocks are computed
+        # explicitly.
+        explicitGram = residualNorms.max() <= explicitGramTolerance
 
         xaw = np.dot(blockVectorX.T.conj(), activeBlockVectorAR)
         waw = np.dot(activeBlockVectorR.T.conj(), activeBlockVectorAR)
         xbw = np.dot(blockVectorX.T.conj(), activeBlockVectorBR)
 
-        if iterationNumber > 0:
-            xap = np.dot(blockVectorX.T.conj(), activeBlockVectorAP)
-            wap = np.dot(activeBlockVectorR.T.conj(), activeBlockVectorAP)
-            pap = np.dot(activeBlockVectorP.T.conj(), activeBlockVectorAP)
-            xbp = np.dot(blockVectorX.T.conj(), activeBlockVectorBP)
-            wbp = np.dot(activeBlockVectorR.T.conj(), activeBlockVectorBP)
-
-            gramA = np.bmat([[np.diag(_lambda), xaw, xap],
-                              [xaw.T.conj(), waw, wap],
-                              [xap.T.conj(), wap.T.conj(), pap]])
-
-            gramB = np.bmat([[ident0, xbw, xbp],
-                              [xbw.T.conj(), ident, wbp],
-                              [xbp.T.conj(), wbp.T.conj(), ident]])
+        if explicitGram:
+            xax = np.dot(blockVectorX.T.conj(), blockVectorAX)
+            xax = (xax + xax.T.conj()) / 2
+            xbx = np.dot(blockVectorX.T.conj(), blockVectorBX)
+            xbx = (xbx + xbx.T.conj()) / 2
+            wbw = np.dot(activeBlockVectorR.T.conj(), activeBlockVectorBR)
+            wbw = (wbw + wbw.T.conj()) / 2
         else:
-            gramA = np.bmat([[np.diag(_lambda), xaw],
-                              [xaw.T.conj(), waw]])
-            gramB = np.bmat([[ident0, xbw],
-                              [xbw.T.conj(), ident]])
-
-        _assert_symmetric(gramA)
-        _assert_symmetric(gramB)
-
-        if verbosityLevel > 10:
-            save(gramA, 'gramA')
-            save(gramB, 'gramB')
+            xax = np.diag(_lambda)
+            xbx = ident0
+            wbw = ident
+        waw = (waw + waw.T.conj()) / 2
+
+        while True:
+            if not restart:
+                xap = np.dot(blockVectorX.T.conj(), activeBlockVectorAP)
+                wap = np.dot(activeBlockVectorR.T.conj(), activeBlockVectorAP)
+                pap = np.dot(activeBlockVectorP.T.conj(), activeBlockVectorAP)
+                pap = (pap + pap.T.conj()) / 2
+                xbp = np.dot(blockVectorX.T.conj(), activeBlockVectorBP)
+                wbp = np.dot(activeBlockVectorR.T.conj(), activeBlockVectorBP)
+                if explicitGram:
+                    pbp = np.dot(activeBlockVectorP.T.conj(),
+                                 activeBlockVectorBP)
+                    pbp = (pbp + pbp.T.conj()) / 2
+                else:
+                    pbp = ident
+
+                gramA = np.bmat([[xax, xaw, xap],
+                                  [xaw.T.conj(), waw, wap],
+                                  [xap.T.conj(), wap.T.conj(), pap]])
+
+                gramB = np.bmat([[xbx, xbw, xbp],
+                                  [xbw.T.conj(), wbw, wbp],
+                                  [xbp.T.conj(), wbp.T.conj(), pbp]])
+            else:
+                gramA = np.bmat([[xax, xaw],
+                                  [xaw.T.conj(), waw]])
+                gramB = np.bmat([[xbx, xbw],
+                                  [xbw.T.conj(), wbw]])
+
+            _assert_symmetric(gramA)
+            _assert_symmetric(gramB)
+
+            if verbosityLevel > 10:
+                save(gramA, 'gramA')
+                save(gramB, 'gramB')
+
+            # Solve the generalized eigenvalue problem.  If X, R and P are
+            # close to linearly dependent, gramB is ill-conditioned and
+            # the Ritz vectors lose their B-orthonormality, or spurious
+            # Ritz values appear: restart without P in that case.
+            if not restart:
+                gramBEigs = eigh(gramB, eigvals_only=True,
+                                 check_finite=False)
+                if gramBEigs[0] <= restartTolerance * gramBEigs[-1]:
+                    if verbosityLevel > 0:
+                        print('restarting without the P directions')
+                    restart = True
+                    continue
+            try:
+                _lambda, eigBlockVector = eigh(gramA, gramB,
+                                               check_finite=False)
+            except LinAlgError:
+                if restart:
+                    raise
+                # gramB is numerically singular: restart without P
+                if verbosityLevel > 0:
+                    print('restarting without the P directions')
+                restart = True
+            else:
+                break
 
-        # Solve the generalized eigenvalue problem.
-        _lambda, eigBlockVector = eigh(gramA, gramB, check_finite=False)
         ii = np.argsort(_lambda)[:sizeX]
         if largest:
             ii = ii[::-1]
@@ -509,27 +600,28 @@ def lobpcg(A, X,
             pause()
 
         ##
-        # Compute Ritz vectors.
-        if iterationNumber > 0:
-            eigBlockVectorX = eigBlockVector[:sizeX]
-            eigBlockVectorR = eigBlockVector[sizeX:sizeX+currentBlockSize]
+        # Compute Ritz vectors.  The products with A and B are updated
+        # along with the vectors, so that A and B are applied only once
+        # per iteration, to the new residuals.  Without B, the B-products
+        # are the vectors themselves and are not formed.
+        eigBlockVectorX = eigBlockVector[:sizeX]
+        eigBlockVectorR = eigBlockVector[sizeX:sizeX+currentBlockSize]
+
+        pp = np.dot(activeBlockVectorR, eigBlockVectorR)
+        app = np.dot(activeBlockVectorAR, eigBlockVectorR)
+        if B is not None:
+            bpp = np.dot(activeBlockVectorBR, eigBlockVectorR)
+
+        if not restart:
             eigBlockVectorP = eigBlockVector[sizeX+currentBlockSize:]
 
-            pp = np.dot(activeBlockVectorR, eigBlockVectorR)
             pp += np.dot(activeBlockVectorP, eigBlockVectorP)
-
-            app = np.dot(activeBlockVectorAR, eigBlockVectorR)
             app += np.dot(activeBlockVectorAP, eigBlockVectorP)
+            if B is not None:
+                bpp += np.dot(activeBlockVectorBP, eigBlockVectorP)
 
-            bpp = np.dot(activeBlockVectorBR, eigBlockVectorR)
-            bpp += np.dot(activeBlockVectorBP, eigBlockVectorP)
-        else:
-            eigBlockVectorX = eigBlockVector[:sizeX]
-            eigBlockVectorR = eigBlockVector[sizeX:]
-
-            pp = np.dot(activeBlockVectorR, eigBlockVectorR)
-            app = np.dot(activeBlockVectorAR, eigBlockVectorR)
-            bpp = np.dot(activeBlockVectorBR, eigBlockVectorR)
+        if B is None:
+            bpp = pp
 
         if verbosityLevel > 10:
             print(pp)
@@ -539,10 +631,17 @@ def lobpcg(A, X,
 
         blockVectorX = np.dot(blockVectorX, eigBlockVectorX) + pp
         blockVectorAX = np.dot(blockVectorAX, eigBlockVectorX) + app
-        blockVectorBX = np.dot(blockVectorBX, eigBlockVectorX) + bpp
+        if B is not None:
+            blockVectorBX = np.dot(blockVectorBX, eigBlockVectorX) + bpp
+        else:
+            blockVectorBX = blockVectorX
 
         blockVectorP, blockVectorAP, blockVectorBP = pp, app, bpp
 
+        timingHistory.append(time.time() - startTime)
+        if verbosityLevel > 0:
+            print('iteration time: %.3g s' % timingHistory[-1])
+
     aux = blockVectorBX * _lambda[np.newaxis,:]
     blockVectorR = blockVectorAX - aux
 
@@ -553,13 +652,11 @@ def lobpcg(A, X,
         print('final eigenvalue:', _lambda)
         print('final residual norms:', residualNorms)
 
+    ret = (_lambda, blockVectorX)
     if retLambdaHistory:
-        if retResidualNormsHistory:
-            return _lambda, blockVectorX, lambdaHistory, residualNormsHistory
-        else:
-            return _lambda, blockVectorX, lambdaHistory
-    else:
-        if retResidualNormsHistory:
-            return _lambda, blockVectorX, residualNormsHistory
-        else:
-            return _lambda, blockVectorX
+        ret += (lambdaHistory,)
+    if retResidualNormsHistory:
+        ret += (residualNormsHistory,)
+    if retTimingHistory:
+        ret += (timingHistory,)
+    return ret
@@ -227,3 +227,51 @@ def test_hermitian():
             # Compare eigenvalues
             j = np.argmin(abs(w0 - wx))
             assert_allclose(wx, w0[j], rtol=1e-4)
+
+
+def test_tight_tolerance():
+    # Near convergence X, R and P become nearly linearly dependent; the
+    # iteration has to restart instead of breaking down.
+    n = 200
+    A = scipy.sparse.diags(np.arange(1, n + 1, dtype=float))
+    for seed in range(5):
+        X = np.random.RandomState(seed).rand(n, 5)
+        w, v = lobpcg(A, X, tol=1e-14, maxiter=200, largest=False)
+        assert_allclose(w, np.arange(1, 6), atol=1e-8)
+
+        # an explicit identity B gives the same result as B=None
+        w2, v2 = lobpcg(A, X, B=scipy.sparse.identity(n), tol=1e-14,
+                        maxiter=200, largest=False)
+        assert_allclose(w2, w, atol=1e-8)
+
+
+def test_verbosity_timing(capsys):
+    n = 50
+    A = scipy.sparse.diags(np.arange(1, n + 1, dtype=float))
+    X = np.random.RandomState(0).rand(n, 3)
+    w, v, resHistory = lobpcg(A, X, tol=1e-6, maxiter=20, largest=False,
+                              verbosityLevel=1,
+                              retResidualNormsHistory=True)
+    out = capsys.readouterr()[0]
+    # one timing line per iteration that updated the eigenvectors
+    n_timed = out.count('iteration time')
+    assert_(n_timed > 0)
+    assert_(n_timed <= len(resHistory))
+
+
+def test_timing_history():
+    n = 50
+    A = scipy.sparse.diags(np.arange(1, n + 1, dtype=float))
+    X = np.random.RandomState(0).rand(n, 3)
+    w, v, lambdaHistory, resHistory, timingHistory = lobpcg(
+        A, X, tol=1e-6, maxiter=20, largest=False, retLambdaHistory=True,
+        retResidualNormsHistory=True, retTimingHistory=True)
+    assert_allclose(w, [1, 2, 3], atol=1e-3)
+    # one time per iteration that updated the eigenvectors
+    assert_(0 < len(timingHistory) <= len(resHistory))
+    assert_(all(t >= 0 for t in timingHistory))
+
+    w2, v2, timingHistory = lobpcg(A, X, tol=1e-6, maxiter=20,
+                                   largest=False, retTimingHistory=True)
+    assert_equal(w2, w)
+    assert_equal(len(timingHistory), len(lambdaHistory) - 1)
@@ -9,6 +9,8 @@ from .lgmres import lgmres
 from .lsqr import lsqr
 from .lsmr import lsmr
 from ._gcrotmk import gcrotmk
+from ._block_krylov import block_cg, block_gmres
+from ._rcg import rcg
 
 __all__ = [s for s in dir() if not s.startswith('_')]
 
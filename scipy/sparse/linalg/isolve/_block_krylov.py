@@ -0,0 +1,351 @@
+"""Block Krylov methods for linear systems with multiple right-hand sides"""
+
+from __future__ import division, print_function, absolute_import
+
+import numpy as np
+from scipy._lib.six import xrange
+from scipy.linalg import qr, svd, solve, lstsq, LinAlgError
+from scipy.sparse.linalg.interface import aslinearoperator, IdentityOperator
+from scipy.sparse.linalg.isolve.utils import coerce
+
+
+__all__ = ['block_cg', 'block_gmres']
+
+
+def _make_block_system(A, M, X0, B):
+    """Make a linear system A X = B with a block of right-hand sides
+
+    Returns
+    -------
+    (A, M, X, B, postprocess)
+        A, M : LinearOperator
+        X, B : rank 2 ndarray of shape (N, s)
+        postprocess : function
+            converts the solution block to the shape of the input `B`
+    """
+    A = aslinearoperator(A)
+
+    if A.shape[0] != A.shape[1]:
+        raise ValueError('expected square matrix, but got shape=%s' % (A.shape,))
+
+    N = A.shape[0]
+
+    B = np.asarray(B)
+    B_shape = B.shape
+
+    if B.ndim == 1:
+        B = B.reshape(-1, 1)
+    if B.ndim != 2 or B.shape[0] != N:
+        raise ValueError('A and B have incompatible dimensions')
+
+    if B.dtype.char not in 'fdFD':
+        B = B.astype('d')  # upcast non-FP types to double
+
+    if hasattr(A, 'dtype'):
+        xtype = A.dtype.char
+    else:
+        xtype = A.matvec(B[:, 0]).dtype.char
+    xtype = coerce(xtype, B.dtype.char)
+
+    B = np.asarray(B, dtype=xtype)
+
+    if X0 is None:
+        X = np.zeros(B.shape, dtype=xtype)
+    else:
+        X = np.array(X0, dtype=xtype)
+        if X.size != B.size:
+            raise ValueError('A and X0 have incompatible dimensions')
+        X = X.reshape(B.shape)
+
+    if M is None:
+        M = IdentityOperator(shape=A.shape, dtype=A.dtype)
+    else:
+        M = aslinearoperator(M)
+        if A.shape != M.shape:
+            raise ValueError('matrix and preconditioner have different shapes')
+
+    def postprocess(X):
+        return X.reshape(B_shape)
+
+    return A, M, X, B, postprocess
+
+
+def _orth(W):
+    """
+    Orthonormal basis for the range of W, dropping numerically dependent
+    directions.
+    """
+    if W.shape[1] == 0:
+        return W
+    u, s, _ = svd(W, full_matrices=False, check_finite=False)
+    rank = np.sum(s > s[0] * max(W.shape) * np.finfo(s.dtype).eps)
+    return u[:, :rank]
+
+
+def _column_norms(X):
+    return np.sqrt(np.sum(abs(X)**2, axis=0))
+
+
+def block_cg(A, B, X0=None, tol=1e-5, maxiter=None, M=None, callback=None,
+             atol=0.):
+    """
+    Use block Conjugate Gradient iteration to solve ``A X = B``.
+
+    All right-hand sides share one block Krylov space, so that each iteration
+    applies `A` (and `M`) once to a block of vectors via ``matmat``.
+
+    Parameters
+    ----------
+    A : {sparse matrix, dense matrix, LinearOperator}
+        The real symmetric or complex hermitian positive definite N-by-N
+        matrix of the linear system.
+    B : {array, matrix}
+        Right-hand sides of the linear system. Has shape (N, s) or (N,).
+    X0 : {array, matrix}, optional
+        Starting guess for the solution, of the same shape as `B`.
+    tol, atol : float, optional
+        Tolerances for convergence of each column ``j``,
+        ``norm(B[:,j] - A X[:,j]) <= max(tol*norm(B[:,j]), atol)``.
+    maxiter : int, optional
+        Maximum number of iterations.  Default: ``10*N``.
+    M : {sparse matrix, dense matrix, LinearOperator}, optional
+        Symmetric positive definite preconditioner for A, approximating
+        the inverse of A.
+    callback : function, optional
+        User-supplied function to call after each iteration.  It is called
+        as ``callback(Xk)``, where `Xk` is the current solution block.
+
+    Returns
+    -------
+    X : ndarray
+        The solution, of the same shape as `B`.
+    info : ndarray of int
+        Convergence information for each column of `B`:
+
+        * 0  : successful exit
+        * >0 : convergence to tolerance not achieved, number of iterations
+        * <0 : breakdown, `A` or `M` is not positive definite
+
+    See Also
+    --------
+    cg, block_gmres
+
+    Notes
+    -----
+    This is the breakdown-free variant of [1]_: the search directions are
+    orthonormalized, discarding those that become linearly dependent, and
+    the columns are removed from the block as they converge.
+
+    .. versionadded:: 1.2.0
+
+    References
+    ----------
+    .. [1] H. Ji and Y. Li, "A breakdown-free block conjugate gradient
+           method", BIT Numer. Math. 57, 379 (2017).
+
+    Examples
+    --------
+    >>> from scipy.sparse import diags
+    >>> from scipy.sparse.linalg import block_cg
+    >>> A = diags([-1, 4, -1], [-1, 0, 1], shape=(50, 50))
+    >>> B = np.random.rand(50, 3)
+    >>> X, info = block_cg(A, B, tol=1e-10)
+    >>> info
+    array([0, 0, 0])
+    >>> np.allclose(A.dot(X), B)
+    True
+    """
+    A, M, X, B, postprocess = _make_block_system(A, M, X0, B)
+
+    if not np.isfinite(B).all():
+        raise ValueError("RHS must contain only finite numbers")
+
+    n, s = B.shape
+    if maxiter is None:
+        maxiter = n * 10
+
+    col_atol = np.maximum(atol, tol * _column_norms(B))
+    info = np.zeros(s, dtype=int)
+
+    R = B - A.matmat(X)
+    active = np.flatnonzero(_column_norms(R) > col_atol)
+    P = _orth(M.matmat(R[:, active]))
+
+    it = 0
+    while len(active) > 0 and P.shape[1] > 0 and it < maxiter:
+        it += 1
+
+        Q = A.matmat(P)
+        PQ = P.T.conj().dot(Q)
+        try:
+            alpha = solve(PQ, P.T.conj().dot(R[:, active]), assume_a='pos',
+                          check_finite=False)
+        except LinAlgError:
+            # A is not positive definite on the search space
+            info[active] = -1
+            return postprocess(X), info
+
+        X[:, active] += P.dot(alpha)
+        R[:, active] -= Q.dot(alpha)
+
+        if callback is not None:
+            callback(postprocess(X))
+
+        # Lock the converged columns
+        active = active[_column_norms(R[:, active]) > col_atol[active]]
+        if len(active) == 0:
+            break
+
+        Z = M.matmat(R[:, active])
+        beta = -solve(PQ, Q.T.conj().dot(Z), assume_a='pos',
+                      check_finite=False)
+        P = _orth(Z + P.dot(beta))
+
+    info[active] = it
+    return postprocess(X), info
+
+
+def block_gmres(A, B, X0=None, tol=1e-5, restart=None, maxiter=None, M=None,
+                callback=None, atol=0.):
+    """
+    Use restarted block GMRES iteration to solve ``A X = B``.
+
+    All right-hand sides share one block Krylov space, so that each inner
+    iteration applies `A` (and `M`) once to a block of vectors via
+    ``matmat``.
+
+    Parameters
+    ----------
+    A : {sparse matrix, dense matrix, LinearOperator}
+        The real or complex N-by-N matrix of the linear system.
+    B : {array, matrix}
+        Right-hand sides of the linear system. Has shape (N, s) or (N,).
+    X0 : {array, matrix}, optional
+        Starting guess for the solution, of the same shape as `B`.
+    tol, atol : float, optional
+        Tolerances for convergence of each column ``j``,
+        ``norm(B[:,j] - A X[:,j]) <= max(tol*norm(B[:,j]), atol)``.
+    restart : int, optional
+        Number of block iterations between restarts.  Larger values increase
+        iteration cost, but may be necessary for convergence.
+        Default: ``max(1, 20 // s)``, i.e. a Krylov basis of about 20
+        vectors.
+    maxiter : int, optional
+        Maximum number of restart cycles.  Default: ``10*N``.
+    M : {sparse matrix, dense matrix, LinearOperator}, optional
+        Preconditioner for A, approximating the inverse of A.  It is applied
+        from the right, so that the residuals being minimized are those of
+        the original system.
+    callback : function, optional
+        User-supplied function to call after each restart cycle.  It is
+        called as ``callback(Xk)``, where `Xk` is the current solution block.
+
+    Returns
+    -------
+    X : ndarray
+        The solution, of the same shape as `B`.
+    info : ndarray of int
+        Convergence information for each column of `B`:
+
+        * 0  : successful exit
+        * >0 : convergence to tolerance not achieved, number of restart
+          cycles
+
+    See Also
+    --------
+    gmres, block_cg
+
+    Notes
+    -----
+    Columns that have converged at a restart are removed from the block,
+    so that later cycles only work on the remaining right-hand sides.
+
+    .. versionadded:: 1.2.0
+
+    References
+    ----------
+    .. [1] Y. Saad, "Iterative Methods for Sparse Linear Systems",
+           2nd ed., SIAM (2003), Section 6.12.
+
+    Examples
+    --------
+    >>> from scipy.sparse import diags
+    >>> from scipy.sparse.linalg import block_gmres
+    >>> A = diags([-1, 4, -2], [-1, 0, 1], shape=(50, 50))
+    >>> B = np.random.rand(50, 3)
+    >>> X, info = block_gmres(A, B, tol=1e-10)
+    >>> info
+    array([0, 0, 0])
+    >>> np.allclose(A.dot(X), B)
+    True
+    """
+    A, M, X, B, postprocess = _make_block_system(A, M, X0, B)
+
+    if not np.isfinite(B).all():
+        raise ValueError("RHS must contain only finite numbers")
+
+    n, s = B.shape
+    if maxiter is None:
+        maxiter = n * 10
+    if restart is None:
+        restart = max(1, 20 // s)
+
+    col_atol = np.maximum(atol, tol * _column_norms(B))
+    info = np.zeros(s, dtype=int)
+
+    R = B - A.matmat(X)
+    active = np.flatnonzero(_column_norms(R) > col_atol)
+
+    it = 0
+    while len(active) > 0 and it < maxiter:
+        it += 1
+
+        k = len(active)
+        m_max = min(restart, max(1, n // k))
+        V, S = qr(R[:, active], mode='economic', check_finite=False)
+        vs = [V]
+        zs = []
+        H = np.zeros(((m_max + 1) * k, m_max * k), dtype=V.dtype)
+
+        for j in xrange(m_max):
+            Z = M.matmat(vs[-1])
+            W = A.matmat(Z)
+            zs.append(Z)
+
+            # Block Gram-Schmidt, twice for stability
+            for _ in xrange(2):
+                for i, Vi in enumerate(vs):
+                    Hij = Vi.T.conj().dot(W)
+                    H[i*k:(i+1)*k, j*k:(j+1)*k] += Hij
+                    W -= Vi.dot(Hij)
+            V, Hjj = qr(W, mode='economic', check_finite=False)
+
+            # Directions of W that are numerically zero leave arbitrary
+            # columns in V; make them orthogonal to the basis as well.
+            for Vi in vs:
+                V -= Vi.dot(Vi.T.conj().dot(V))
+            V, T = qr(V, mode='economic', check_finite=False)
+            H[(j+1)*k:(j+2)*k, j*k:(j+1)*k] = T.dot(Hjj)
+            vs.append(V)
+
+            # Block least-squares problem
+            # || H Y - [S; 0] ||_F = min!
+            m = (j + 1) * k
+            E = np.zeros((m + k, k), dtype=H.dtype)
+            E[:k] = S
+            Y = lstsq(H[:m+k, :m], E, check_finite=False)[0]
+            res = _column_norms(E - H[:m+k, :m].dot(Y))
+            if np.all(res <= col_atol[active]):
+                break
+
+        X[:, active] += np.hstack(zs).dot(Y)
+        R[:, active] = B[:, active] - A.matmat(X[:, active])
+
+        if callback is not None:
+            callback(postprocess(X))
+
+        # Lock the converged columns
+        active = active[_column_norms(R[:, active]) > col_atol[active]]
+
+    info[active] = it
+    return postprocess(X), info
@@ -0,0 +1,209 @@
+from __future__ import division, print_function, absolute_import
+
+import numpy as np
+from scipy._lib.six import xrange
+from scipy.linalg import (get_blas_funcs, cho_factor, cho_solve, eigh, qr,
+                          LinAlgError)
+from scipy.sparse.linalg.isolve.utils import make_system
+
+
+__all__ = ['rcg']
+
+
+def rcg(A, b, x0=None, tol=1e-5, maxiter=None, M=None, callback=None,
+        k=10, m=None, W=None, atol=0.):
+    """
+    Solve a matrix equation using the deflated Conjugate Gradient algorithm
+    with Krylov subspace recycling.
+
+    Parameters
+    ----------
+    A : {sparse matrix, dense matrix, LinearOperator}
+        The real symmetric or complex hermitian positive definite N-by-N
+        matrix of the linear system.
+    b : {array, matrix}
+        Right hand side of the linear system. Has shape (N,) or (N,1).
+    x0  : {array, matrix}
+        Starting guess for the solution.
+    tol, atol : float, optional
+        Tolerances for convergence, ``norm(residual) <= max(tol*norm(b), atol)``.
+    maxiter : int, optional
+        Maximum number of iterations.  Iteration will stop after maxiter
+        steps even if the specified tolerance has not been achieved.
+        Default: ``10*N``.
+    M : {sparse matrix, dense matrix, LinearOperator}, optional
+        Symmetric positive definite preconditioner for A, approximating the
+        inverse of A.
+    callback : function, optional
+        User-supplied function to call after each iteration.  It is called
+        as callback(xk), where xk is the current solution vector.
+    k : int, optional
+        Number of vectors to recycle to the next call.
+        Default: 10
+    m : int, optional
+        Number of search directions of this solve, in addition to the
+        recycled vectors, from which the new recycled vectors are extracted.
+        Default: ``2*k``
+    W : list of ndarray, optional
+        List of vectors spanning the recycled subspace.  The iteration is
+        deflated with respect to these vectors, and on exit the list is
+        replaced in-place by the approximate eigenvectors of `A` belonging
+        to its `k` smallest eigenvalues.  Passing the same list to the
+        solves of a sequence of slowly varying systems thus removes the
+        slowest converging components from all but the first one.
+        If not given, start from an empty list.
+
+    Returns
+    -------
+    x : array or matrix
+        The solution found.
+    info : int
+        Provides convergence information:
+
+        * 0  : successful exit
+        * >0 : convergence to tolerance not achieved, number of iterations
+        * <0 : breakdown, `A` or `M` is not positive definite
+
+    See Also
+    --------
+    cg, gcrotmk
+
+    Notes
+    -----
+    The recycled vectors are computed by a Rayleigh-Ritz procedure on the
+    span of the previous recycled vectors and the first `m` search
+    directions, as proposed in [1]_ and [2]_.  Only the vectors themselves
+    are kept, since `A` is free to change between the calls.  For sequences
+    of nonsymmetric systems, see `gcrotmk`.
+
+    .. versionadded:: 1.2.0
+
+    References
+    ----------
+    .. [1] Y. Saad, M. Yeung, J. Erhel and F. Guyomarc'h, ''A deflated
+           version of the conjugate gradient algorithm'', SIAM J. Sci.
+           Comput. 21, 1909 (2000).
+    .. [2] M.L. Parks, E. de Sturler, G. Mackey, D.D. Johnson, S. Maiti,
+           ''Recycling Krylov subspaces for sequences of linear systems'',
+           SIAM J. Sci. Comput. 28, 1651 (2006).
+
+    Examples
+    --------
+    >>> from scipy.sparse import diags, identity
+    >>> from scipy.sparse.linalg import rcg
+    >>> L = diags([-1, 2, -1], [-1, 0, 1], shape=(200, 200))
+    >>> b = np.ones(200)
+    >>> W = []
+    >>> for t in np.linspace(0, 1e-3, 5):
+    ...     x, info = rcg(L + t*identity(200), b, tol=1e-8, W=W)
+    >>> len(W)
+    10
+    """
+    A,M,x,b,postprocess = make_system(A,M,x0,b)
+
+    if not np.isfinite(b).all():
+        raise ValueError("RHS must contain only finite numbers")
+
+    n = A.shape[0]
+    if maxiter is None:
+        maxiter = n * 10
+    if m is None:
+        m = 2 * k
+    if W is None:
+        W = []
+
+    matvec = A.matvec
+    psolve = M.matvec
+
+    r = b - matvec(x)
+
+    axpy, dot, nrm2 = get_blas_funcs(['axpy', 'dot', 'nrm2'], (x, r))
+
+    b_norm = nrm2(b)
+    r_tol = max(atol, tol * b_norm)
+
+    # Deflation space: Wm has orthonormal columns, AW = A Wm
+    Wm = AW = np.zeros((n, 0), dtype=x.dtype)
+    if W:
+        Wm, _ = qr(np.array(W, dtype=x.dtype).T, mode='economic')
+        AW = A.matmat(Wm)
+        try:
+            WAW = cho_factor(Wm.T.conj().dot(AW))
+        except LinAlgError:
+            # Not positive definite on the recycled space, cannot deflate
+            Wm = Wm[:, :0]
+        else:
+            # Galerkin projection of the initial guess:
+            # x := x + W (W^H A W)^{-1} W^H r
+            mu = cho_solve(WAW, Wm.T.conj().dot(r))
+            x += Wm.dot(mu)
+            r -= AW.dot(mu)
+
+    def deflate(z):
+        # z - W (W^H A W)^{-1} (A W)^H z, i.e. make z A-orthogonal to W
+        if Wm.shape[1] == 0:
+            return z
+        return z - Wm.dot(cho_solve(WAW, AW.T.conj().dot(z)))
+
+    # Search directions and their images, for the Rayleigh-Ritz step
+    ps = []
+    qs = []
+
+    info = 0
+    p = None
+    rz = None
+    for j in xrange(maxiter + 1):
+        if nrm2(r) <= r_tol:
+            break
+        if j == maxiter:
+            info = maxiter
+            break
+
+        z = psolve(r)
+        rz_new = dot(r, z).real
+        if p is None:
+            p = deflate(z)
+        else:
+            p = deflate(z + (rz_new / rz) * p)
+        rz = rz_new
+
+        q = matvec(p)
+        pq = dot(p, q).real
+        if not pq > 0:
+            info = -1
+            break
+
+        alpha = rz / pq
+        x = axpy(p, x, n, alpha)  # x += alpha*p
+        # not in-place, r may be aliased by z and p
+        r = r - alpha * q
+
+        if len(ps) < m:
+            ps.append(p)
+            qs.append(q)
+
+        if callback is not None:
+            callback(x)
+
+    # Rayleigh-Ritz on span(W, P): since the directions P are A-orthogonal
+    # to W and to each other, Z^H A Z is block diagonal.  The largest
+    # eigenvalues of (Z^H Z) y = theta^{-1} (Z^H A Z) y give the Ritz
+    # vectors of the smallest eigenvalues of A.
+    if ps and info >= 0:
+        Z = np.column_stack([Wm] + ps)
+        AZ = np.column_stack([AW[:, :Wm.shape[1]]] + qs)
+        G = Z.T.conj().dot(AZ)
+        G = (G + G.T.conj()) / 2
+        F = Z.T.conj().dot(Z)
+        try:
+            _, Y = eigh(F, G, eigvals=(max(0, Z.shape[1] - k),
+                                       Z.shape[1] - 1))
+        except LinAlgError:
+            Y = None
+        if Y is not None:
+            Wnew = Z.dot(Y[:, ::-1])
+            W[:] = [w / nrm2(w) for w in Wnew.T]
+    elif Wm.shape[1]:
+        W[:] = list(Wm.T)
+
+    return postprocess(x), info
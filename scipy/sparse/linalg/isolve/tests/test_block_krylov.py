@@ -0,0 +1,170 @@
+"""Tests for the linalg.isolve._block_krylov module
+"""
+
+from __future__ import division, print_function, absolute_import
+
+from numpy.testing import assert_, assert_allclose, assert_equal
+import pytest
+
+import numpy as np
+from scipy.sparse import diags, kron, eye
+
+from scipy.sparse.linalg.interface import LinearOperator, aslinearoperator
+from scipy.sparse.linalg.isolve import block_cg, block_gmres, cg
+
+
+def _poisson2d(m):
+    T = diags([-1, 2, -1], [-1, 0, 1], shape=(m, m))
+    return (kron(T, eye(m)) + kron(eye(m), T)).tocsr()
+
+
+def _counting_operator(A):
+    A = aslinearoperator(A)
+    count = {'matvec': 0, 'matmat': 0}
+
+    def matvec(x):
+        count['matvec'] += 1
+        return A.matvec(x)
+
+    def matmat(X):
+        count['matmat'] += 1
+        return A.matmat(X)
+
+    return LinearOperator(A.shape, matvec=matvec, matmat=matmat,
+                          dtype=A.dtype), count
+
+
+class TestBlockCG(object):
+    def test_convergence(self):
+        np.random.seed(1234)
+        A = _poisson2d(12)
+        B = np.random.rand(A.shape[0], 6)
+        X, info = block_cg(A, B, tol=1e-10)
+        assert_equal(info, np.zeros(6))
+        assert_allclose(A.dot(X), B, atol=1e-8)
+
+    def test_matmat_only(self):
+        # The operator is applied to the whole block at once, in fewer
+        # iterations than needed by cg for a single column
+        np.random.seed(1234)
+        A = _poisson2d(12)
+        B = np.random.rand(A.shape[0], 4)
+        op, count = _counting_operator(A)
+        X, info = block_cg(op, B, tol=1e-8)
+        assert_equal(info, np.zeros(4))
+        assert_equal(count['matvec'], 0)
+
+        cg_iters = [0]
+
+        def callback(x):
+            cg_iters[0] += 1
+        cg(A, B[:, 0], tol=1e-8, atol=0, callback=callback)
+        assert_(count['matmat'] < cg_iters[0])
+
+    def test_dependent_columns(self):
+        np.random.seed(1234)
+        A = _poisson2d(8)
+        B = np.random.rand(A.shape[0], 3)
+        B = np.hstack([B, 2 * B[:, :1], np.zeros((A.shape[0], 1))])
+        X, info = block_cg(A, B, tol=1e-10)
+        assert_equal(info, np.zeros(5))
+        assert_allclose(A.dot(X), B, atol=1e-8)
+        assert_equal(X[:, -1], 0)
+
+    def test_complex_hermitian(self):
+        np.random.seed(1234)
+        n = 40
+        A = (diags([-1., 4., -1.], [-1, 0, 1], shape=(n, n)).tocsr() +
+             1j * diags([0.5, -0.5], [-1, 1], shape=(n, n)))
+        B = np.random.rand(n, 3) + 1j * np.random.rand(n, 3)
+        X, info = block_cg(A, B, tol=1e-10)
+        assert_equal(info, np.zeros(3))
+        assert_allclose(A.dot(X), B, atol=1e-8)
+
+    def test_preconditioner_and_x0(self):
+        np.random.seed(1234)
+        A = _poisson2d(8)
+        B = np.random.rand(A.shape[0], 3)
+        M = diags(1 / A.diagonal())
+        X0 = np.random.rand(*B.shape)
+        X, info = block_cg(A, B, X0=X0, M=M, tol=1e-10)
+        assert_equal(info, np.zeros(3))
+        assert_allclose(A.dot(X), B, atol=1e-8)
+
+    def test_vector_rhs(self):
+        A = _poisson2d(5)
+        b = np.ones(A.shape[0])
+        x, info = block_cg(A, b, tol=1e-10)
+        assert_equal(x.shape, b.shape)
+        assert_equal(info, [0])
+        assert_allclose(A.dot(x), b, atol=1e-8)
+
+    def test_maxiter(self):
+        np.random.seed(1234)
+        A = _poisson2d(12)
+        B = np.random.rand(A.shape[0], 2)
+        X, info = block_cg(A, B, tol=1e-12, maxiter=3)
+        assert_equal(info, [3, 3])
+
+    def test_not_positive_definite(self):
+        A = diags([1, -1, 1, -1], 0)
+        X, info = block_cg(A, np.ones((4, 1)), tol=1e-10)
+        assert_(np.all(info < 0))
+
+
+class TestBlockGMRES(object):
+    def _nonsymmetric(self, n):
+        return diags([-1, 4, -2.5], [-1, 0, 1], shape=(n, n)).tocsr()
+
+    def test_convergence(self):
+        np.random.seed(1234)
+        A = self._nonsymmetric(100)
+        B = np.random.rand(100, 5)
+        X, info = block_gmres(A, B, tol=1e-10)
+        assert_equal(info, np.zeros(5))
+        assert_allclose(A.dot(X), B, atol=1e-8)
+
+    def test_matmat_only(self):
+        np.random.seed(1234)
+        A = self._nonsymmetric(100)
+        B = np.random.rand(100, 4)
+        op, count = _counting_operator(A)
+        X, info = block_gmres(op, B, tol=1e-8)
+        assert_equal(info, np.zeros(4))
+        assert_equal(count['matvec'], 0)
+
+    def test_complex(self):
+        np.random.seed(1234)
+        n = 60
+        A = (self._nonsymmetric(n) +
+             1j * diags([1, -1], [-1, 1], shape=(n, n)))
+        B = np.random.rand(n, 3) + 1j * np.random.rand(n, 3)
+        X, info = block_gmres(A, B, tol=1e-10)
+        assert_equal(info, np.zeros(3))
+        assert_allclose(A.dot(X), B, atol=1e-8)
+
+    @pytest.mark.parametrize('restart', [1, 3, 30])
+    def test_dependent_columns(self, restart):
+        np.random.seed(1234)
+        A = self._nonsymmetric(50)
+        B = np.random.rand(50, 3)
+        B = np.hstack([B, 2 * B[:, :1], np.zeros((50, 1))])
+        X, info = block_gmres(A, B, tol=1e-10, restart=restart)
+        assert_equal(info, np.zeros(5))
+        assert_allclose(A.dot(X), B, atol=1e-8)
+
+    def test_preconditioner(self):
+        np.random.seed(1234)
+        A = self._nonsymmetric(100)
+        B = np.random.rand(100, 3)
+        M = diags(1 / A.diagonal())
+        X, info = block_gmres(A, B, M=M, tol=1e-10)
+        assert_equal(info, np.zeros(3))
+        assert_allclose(A.dot(X), B, atol=1e-8)
+
+    def test_maxiter(self):
+        np.random.seed(1234)
+        A = self._nonsymmetric(100)
+        B = np.random.rand(100, 2)
+        X, info = block_gmres(A, B, tol=1e-12, restart=2, maxiter=2)
+        assert_equal(info, [2, 2])
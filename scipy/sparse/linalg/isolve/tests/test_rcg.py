@@ -0,0 +1,107 @@
+"""Tests for the linalg.isolve._rcg module
+"""
+
+from __future__ import division, print_function, absolute_import
+
+from numpy.testing import assert_, assert_allclose, assert_equal
+
+import numpy as np
+from scipy.sparse import diags, kron, eye, identity
+
+from scipy.sparse.linalg.isolve import rcg, cg
+
+
+def _poisson2d(m):
+    T = diags([-1, 2, -1], [-1, 0, 1], shape=(m, m))
+    return (kron(T, eye(m)) + kron(eye(m), T)).tocsr()
+
+
+def do_solve(A, b, **kw):
+    count = [0]
+
+    def callback(x):
+        count[0] += 1
+
+    x, info = rcg(A, b, tol=1e-8, callback=callback, **kw)
+    assert_equal(info, 0)
+    assert_allclose(A.dot(x), b, atol=1e-7 * np.linalg.norm(b))
+    return x, count[0]
+
+
+class TestRCG(object):
+    def test_no_recycling_matches_cg(self):
+        np.random.seed(1234)
+        A = _poisson2d(10)
+        b = np.random.rand(A.shape[0])
+
+        x0, count_0 = do_solve(A, b)
+
+        cg_count = [0]
+
+        def callback(x):
+            cg_count[0] += 1
+        x1, info = cg(A, b, tol=1e-8, atol=0, callback=callback)
+        assert_(abs(count_0 - cg_count[0]) <= 1)
+        assert_allclose(x0, x1, rtol=1e-6)
+
+    def test_recycling(self):
+        # Slowly varying sequence of systems converges faster with
+        # recycled vectors
+        np.random.seed(1234)
+        L = _poisson2d(30)
+        b = np.random.rand(L.shape[0])
+
+        W = []
+        counts = []
+        for t in np.linspace(0, 1e-2, 4):
+            A = L + t * identity(L.shape[0])
+            x, count = do_solve(A, b, W=W, k=8)
+            counts.append(count)
+            assert_equal(len(W), 8)
+
+        assert_(counts[-1] < 0.7 * counts[0], counts)
+
+    def test_ritz_vectors(self):
+        # The recycled vectors approximate the lowest eigenvectors
+        np.random.seed(1234)
+        A = diags(np.arange(1, 201, dtype=float))
+        W = []
+        for j in range(3):
+            do_solve(A, np.random.rand(200), W=W, k=2, m=30)
+        assert_allclose([w.dot(A.dot(w)) for w in W], [1, 2], rtol=0.05)
+
+    def test_preconditioner(self):
+        np.random.seed(1234)
+        A = _poisson2d(10) + diags(np.random.rand(100))
+        M = diags(1 / A.diagonal())
+        W = []
+        for j in range(3):
+            do_solve(A, np.random.rand(100), M=M, W=W)
+
+    def test_complex_hermitian(self):
+        np.random.seed(1234)
+        n = 50
+        A = (diags([-1., 4., -1.], [-1, 0, 1], shape=(n, n)).tocsr() +
+             1j * diags([0.5, -0.5], [-1, 1], shape=(n, n)))
+        W = []
+        for j in range(3):
+            b = np.random.rand(n) + 1j * np.random.rand(n)
+            do_solve(A, b, W=W, k=4)
+
+    def test_x0(self):
+        A = _poisson2d(5)
+        b = np.ones(A.shape[0])
+        x0 = np.arange(A.shape[0], dtype=float)
+        x, count = do_solve(A, b, x0=x0)
+        assert_equal(x0, np.arange(A.shape[0]))
+
+    def test_maxiter(self):
+        np.random.seed(1234)
+        A = _poisson2d(10)
+        b = np.random.rand(A.shape[0])
+        x, info = rcg(A, b, tol=1e-12, maxiter=5)
+        assert_equal(info, 5)
+
+    def test_indefinite(self):
+        x, info = rcg(diags([1., -1., 1., -1.]), np.ones(4))
+        assert_(info < 0)
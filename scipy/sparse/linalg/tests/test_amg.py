@@ -0,0 +1,133 @@
+"""Test functions for the sparse.linalg._amg module
+"""
+
+from __future__ import division, print_function, absolute_import
+
+import numpy as np
+from numpy.testing import assert_, assert_allclose, assert_equal
+from pytest import raises as assert_raises
+
+from scipy.sparse import csr_matrix, diags, identity, kron
+from scipy.sparse.linalg import amg_preconditioner, cg
+from scipy.sparse.linalg._amg import _aggregate, _strength
+
+
+def poisson(m, dim):
+    T = diags([-1, 2, -1], [-1, 0, 1], shape=(m, m))
+    A = T
+    for d in range(1, dim):
+        A = kron(A, identity(m)) + kron(identity(A.shape[0]), T)
+    return csr_matrix(A, dtype=float)
+
+
+def count_cg(A, b, M=None):
+    count = [0]
+
+    def callback(x):
+        count[0] += 1
+    x, info = cg(A, b, M=M, tol=1e-8, atol=0, callback=callback)
+    assert_equal(info, 0)
+    assert_allclose(A.dot(x), b, atol=1e-6 * np.linalg.norm(b))
+    return count[0]
+
+
+class TestAggregation(object):
+    def test_aggregates(self):
+        S = _strength(poisson(20, 2), 0.0)
+        agg, n_agg = _aggregate(S, np.random.RandomState(1234))
+        assert_equal(agg.shape, (400,))
+        assert_equal(np.unique(agg), np.arange(n_agg))
+        assert_(n_agg < 400 // 2)
+        # aggregates are a root and some of its neighbours
+        assert_(np.bincount(agg).max() <= 5)
+        for a in range(n_agg):
+            nodes = np.flatnonzero(agg == a)
+            adjacent = S[nodes][:, nodes].toarray() != 0
+            assert_(np.any(adjacent.sum(axis=1) == len(nodes) - 1))
+
+    def test_strength_threshold(self):
+        A = csr_matrix([[4., -1., -0.01],
+                        [-1., 4., 0.],
+                        [-0.01, 0., 4.]])
+        S = _strength(A, 0.0)
+        assert_equal(S.nnz, 4)
+        S = _strength(A, 0.1)
+        assert_equal(S.toarray() != 0, [[0, 1, 0], [1, 0, 0], [0, 0, 0]])
+
+
+class TestAMGPreconditioner(object):
+    def test_poisson_2d(self):
+        np.random.seed(1234)
+        A = poisson(40, 2)
+        b = np.random.rand(A.shape[0])
+        M = amg_preconditioner(A, random_state=1234)
+        assert_(count_cg(A, b, M) < count_cg(A, b) / 3)
+
+    def test_poisson_3d_scaling(self):
+        # iteration count grows only slowly with the problem size
+        counts = []
+        for m in (8, 16, 24):
+            A = poisson(m, 3)
+            M = amg_preconditioner(A, random_state=1234)
+            counts.append(count_cg(A, np.ones(A.shape[0]), M))
+        assert_(counts[-1] <= 2 * counts[0], counts)
+
+    def test_symmetric(self):
+        A = poisson(30, 2)
+        M = amg_preconditioner(A, max_coarse=10, random_state=1234)
+        np.random.seed(1234)
+        x = np.random.rand(A.shape[0])
+        y = np.random.rand(A.shape[0])
+        assert_allclose(x.dot(M.matvec(y)), y.dot(M.matvec(x)))
+        assert_(x.dot(M.matvec(x)) > 0)
+
+    def test_coarse_only(self):
+        # small problems are solved directly on the coarsest level
+        A = poisson(10, 2)
+        M = amg_preconditioner(A)
+        b = np.ones(A.shape[0])
+        assert_allclose(A.dot(M.matvec(b)), b)
+
+    def test_sweeps_and_theta(self):
+        A = poisson(30, 2) + diags(np.linspace(0, 1, 900))
+        b = np.ones(A.shape[0])
+        for sweeps in (1, 2):
+            for theta in (0.0, 0.25):
+                M = amg_preconditioner(A, theta=theta, sweeps=sweeps,
+                                       max_coarse=50, random_state=1234)
+                count_cg(A, b, M)
+
+    def test_complex_rhs(self):
+        A = poisson(30, 2)
+        M = amg_preconditioner(A, max_coarse=50, random_state=1234)
+        b = np.ones(A.shape[0]) + 2j * np.arange(A.shape[0])
+        assert_allclose(M.matvec(b), M.matvec(b.real) + 1j * M.matvec(b.imag))
+
+    def test_random_state(self):
+        A = poisson(30, 2)
+        b = np.ones(A.shape[0])
+        x = amg_preconditioner(A, max_coarse=50, random_state=1234).matvec(b)
+        for random_state in (np.int64(1234), np.random.RandomState(1234)):
+            M = amg_preconditioner(A, max_coarse=50,
+                                   random_state=random_state)
+            assert_allclose(M.matvec(b), x)
+
+    def test_input_not_modified(self):
+        # each row twice, with unsorted indices
+        P = poisson(20, 2)
+        rows = [slice(i, j) for i, j in zip(P.indptr[:-1], P.indptr[1:])]
+        indices = np.concatenate([np.r_[P.indices[r][::-1], P.indices[r]]
+                                  for r in rows])
+        data = np.concatenate([np.r_[P.data[r][::-1], P.data[r]] / 2
+                               for r in rows])
+        A = csr_matrix((data, indices, 2 * P.indptr), shape=P.shape)
+        assert_(not A.has_canonical_format)
+        indices, data = indices.copy(), data.copy()
+        amg_preconditioner(A, max_coarse=50, random_state=1234)
+        assert_equal(A.indices, indices)
+        assert_equal(A.data, data)
+        assert_(not A.has_canonical_format)
+
+    def test_invalid(self):
+        assert_raises(ValueError, amg_preconditioner, csr_matrix((3, 4)))
+        assert_raises(ValueError, amg_preconditioner, diags([1., 0., 1.]))
@@ -5,13 +5,15 @@ from __future__ import division, print_function, absolute_import
 
 import numpy as np
 from numpy.testing import assert_allclose, assert_, assert_equal
+from pytest import raises as assert_raises
 from scipy._lib._numpy_compat import suppress_warnings
 
-from scipy.sparse import SparseEfficiencyWarning
+from scipy.sparse import SparseEfficiencyWarning, diags
 import scipy.linalg
+from scipy.sparse.linalg import aslinearoperator
 from scipy.sparse.linalg._expm_multiply import (_theta, _compute_p_max,
         _onenormest_matrix_power, expm_multiply, _expm_multiply_simple,
-        _expm_multiply_interval)
+        _expm_multiply_interval, ExpmAction)
 
 
 def less_than_or_close(a, b):
@@ -252,3 +254,71 @@ class TestExpmActionInterval(object):
             msg = 'failed to find a status-' + str(target_status) + ' interval'
             raise Exception(msg)
 
+
+class TestExpmActionKrylov(object):
+
+    def test_linear_operator(self):
+        np.random.seed(1234)
+        for n in (1, 5, 40):
+            A = np.random.randn(n, n)
+            B = np.random.randn(n, 3)
+            for t in (0.5, -1.3):
+                expected = scipy.linalg.expm(t*A).dot(B)
+                observed = ExpmAction(aslinearoperator(A), m=10).dot(B, t)
+                assert_allclose(observed, expected, rtol=1e-10, atol=1e-10)
+                observed = ExpmAction(A, method='taylor').dot(B, t)
+                assert_allclose(observed, expected, rtol=1e-10, atol=1e-10)
+            # the default for a LinearOperator
+            assert_allclose(expm_multiply(aslinearoperator(A), B[:, 0]),
+                            scipy.linalg.expm(A).dot(B[:, 0]))
+
+    def test_complex_and_hermitian(self):
+        np.random.seed(1234)
+        n = 30
+        A = np.random.randn(n, n) + 1j*np.random.randn(n, n)
+        b = np.random.randn(n)
+        assert_allclose(expm_multiply(A, b, method='krylov'),
+                        scipy.linalg.expm(A).dot(b))
+        A = A + A.T.conj()
+        assert_allclose(ExpmAction(A, hermitian=True, m=8).dot(b),
+                        scipy.linalg.expm(A).dot(b))
+
+    def test_interval(self):
+        np.random.seed(1234)
+        n = 20
+        A = np.random.randn(n, n)
+        B = np.random.randn(n, 2)
+        X = expm_multiply(aslinearoperator(A), B, 0.1, 3.2, 13)
+        assert_equal(X.shape, (13, n, 2))
+        for solution, t in zip(X, np.linspace(0.1, 3.2, 13)):
+            assert_allclose(solution, scipy.linalg.expm(t*A).dot(B))
+
+    def test_time_stepping(self):
+        # a stiff problem, propagated in steps
+        n = 200
+        A = diags([1., -2., 1.], [-1, 0, 1], shape=(n, n)) * (n + 1)**2
+        b = np.sin(np.linspace(0, np.pi, n))
+        expected = expm_multiply(0.01*A, b)
+        for method in ('krylov', 'taylor'):
+            action = ExpmAction(A, method=method)
+            x = b
+            for k in range(10):
+                x = action.dot(x, t=1e-3)
+            assert_allclose(x, expected, rtol=1e-10, atol=1e-12)
+
+    def test_invalid(self):
+        A = np.eye(3)
+        assert_raises(ValueError, ExpmAction, A, method='pade')
+        assert_raises(ValueError, expm_multiply, A, np.ones(3),
+                      method='pade')
+        assert_raises(ValueError, ExpmAction(A).dot, np.ones(2))
+        assert_raises(ValueError, ExpmAction, A, m=0)
+        assert_raises(ValueError, ExpmAction, A, tol=0)
+        assert_raises(ValueError, ExpmAction, A, tol=-1e-8)
+
+    def test_no_accurate_substep(self):
+        # With m=1, the error estimate and the tolerance of a substep are
+        # both proportional to its length, so that no substep is accepted.
+        A = diags([1, -2, 1], [-1, 0, 1], shape=(20, 20))
+        b = np.arange(20.)
+        assert_raises(RuntimeError, ExpmAction(A, m=1).dot, b)
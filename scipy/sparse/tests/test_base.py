@@ -4052,6 +4052,24 @@ class TestCOO(sparse_test_class(getset=False,
         assert_array_equal(coo.col, [1])
         assert_array_equal(coo.data, [3])
 
+    def test_tocsr_canonical(self):
+        np.random.seed(1234)
+        row = np.random.randint(0, 7, size=200)
+        col = np.random.randint(0, 5, size=200)
+        data = np.random.random(200)
+        coo = coo_matrix((data, (row, col)), shape=(7, 5))
+        dense = np.zeros((7, 5))
+        np.add.at(dense, (row, col), data)
+
+        for fmt in ('csr', 'csc'):
+            m = coo.asformat(fmt)
+            assert_allclose(m.A, dense)
+            assert_(m.has_canonical_format)
+            # the flags must agree with the actual contents
+            assert_equal(m.nnz, np.count_nonzero(dense))
+            for start, stop in zip(m.indptr[:-1], m.indptr[1:]):
+                assert_(np.all(np.diff(m.indices[start:stop]) > 0))
+
     def test_todok_duplicates(self):
         coo = coo_matrix(([1,1,1,1], ([0,2,2,0], [0,1,1,0])))
         dok = coo.todok()
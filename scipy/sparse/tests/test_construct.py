@@ -420,6 +420,42 @@ class TestConstructUtils(object):
         assert_equal(construct.block_diag([1]).todense(),
                      matrix([[1]]))
 
+    def test_from_coo_chunks(self):
+        np.random.seed(1234)
+        row = np.random.randint(0, 9, size=500)
+        col = np.random.randint(0, 7, size=500)
+        data = np.random.randint(-2, 3, size=500)
+        expected = np.zeros((9, 7), dtype=data.dtype)
+        np.add.at(expected, (row, col), data)
+
+        for nchunks in (1, 2, 3, 7, 500):
+            bounds = np.linspace(0, 500, nchunks + 1).astype(int)
+            for fmt in ('csr', 'csc'):
+                # chunks may be a generator
+                chunks = ((data[i:j], (row[i:j], col[i:j]))
+                          for i, j in zip(bounds[:-1], bounds[1:]))
+                m = construct.from_coo_chunks(chunks, (9, 7), format=fmt)
+                assert_equal(m.format, fmt)
+                assert_equal(m.toarray(), expected)
+                assert_(m.has_canonical_format)
+                assert_equal(m.nnz, np.count_nonzero(expected))
+
+    def test_from_coo_chunks_format(self):
+        # entries that cancel are not stored
+        chunks = [([1., 2.], ([0, 1], [1, 0])), ([3., -2.], ([0, 1], [1, 0]))]
+        m = construct.from_coo_chunks(chunks, (2, 2), format='csc',
+                                      dtype=np.float32)
+        assert_equal(m.format, 'csc')
+        assert_equal(m.dtype, np.float32)
+        assert_equal(m.toarray(), [[0, 4], [0, 0]])
+        assert_equal(m.nnz, 1)
+
+        m = construct.from_coo_chunks([], (3, 4))
+        assert_equal(m.shape, (3, 4))
+        assert_equal(m.nnz, 0)
+        assert_raises(ValueError, construct.from_coo_chunks, chunks, (2, 2),
+                      format='coo')
+
     def test_random_sampling(self):
         # Simple sanity checks for sparse random sampling.
         for f in sprand, _sprandn:
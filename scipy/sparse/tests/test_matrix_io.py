@@ -91,3 +91,77 @@ def test_implemented_error():
     x[0,1] = 1
 
     assert_raises(NotImplementedError, save_npz, 'x.npz', x)
+
+
+def _check_mmap_load(matrix, tmpdir):
+    npz = str(tmpdir.join('matrix.npz'))
+    save_npz(npz, matrix, compressed=False)
+
+    # Same layout, one .npy file per array
+    directory = tmpdir.mkdir('matrix')
+    with np.load(npz) as loaded:
+        for key in loaded.files:
+            np.save(str(directory.join(key + '.npy')), loaded[key])
+
+    for source in (npz, str(directory)):
+        loaded_matrix = load_npz(source, mmap_mode='r')
+        assert_(type(loaded_matrix) is type(matrix))
+        assert_equal(loaded_matrix.shape, matrix.shape)
+        assert_equal(loaded_matrix.dtype, matrix.dtype)
+        assert_equal(loaded_matrix.toarray(), matrix.toarray())
+        if matrix.format in ('csr', 'csc', 'bsr') and matrix.nnz > 0:
+            assert_(isinstance(loaded_matrix.data.base, np.memmap))
+            assert_equal(loaded_matrix.indices.dtype, matrix.indices.dtype)
+        del loaded_matrix
+
+
+def test_mmap_load(tmpdir):
+    np.random.seed(1234)
+    dense_matrix = np.random.random((12, 8))
+    dense_matrix[dense_matrix > 0.7] = 0
+    for matrix_class in [csc_matrix, csr_matrix, dia_matrix, coo_matrix]:
+        _check_mmap_load(matrix_class(dense_matrix), tmpdir.mkdir(
+            matrix_class.__name__))
+    _check_mmap_load(bsr_matrix(dense_matrix, blocksize=(3, 2)),
+                     tmpdir.mkdir('bsr_matrix'))
+    _check_mmap_load(csr_matrix((4, 6)), tmpdir.mkdir('empty'))
+
+
+def test_mmap_operations(tmpdir):
+    np.random.seed(1234)
+    matrix = csr_matrix(np.random.random((50, 30)) > 0.8, dtype=float)
+    # Wide index arrays must be mapped as-is, not downcast into memory
+    matrix.indices = matrix.indices.astype(np.int64)
+    matrix.indptr = matrix.indptr.astype(np.int64)
+    tmpfile = str(tmpdir.join('matrix.npz'))
+    save_npz(tmpfile, matrix, compressed=False)
+
+    loaded = load_npz(tmpfile, mmap_mode='r')
+    assert_equal(loaded.indices.dtype, np.int64)
+    x = np.random.random(30)
+    X = np.random.random((30, 4))
+    assert_equal(loaded.dot(x), matrix.dot(x))
+    assert_equal(loaded.dot(X), matrix.dot(X))
+    assert_equal(loaded.sum(), matrix.sum())
+    assert_equal(loaded.sum(axis=0), matrix.sum(axis=0))
+    assert_equal(loaded.sum(axis=1), matrix.sum(axis=1))
+    assert_equal(loaded[10:20].toarray(), matrix[10:20].toarray())
+    del loaded
+
+
+def test_mmap_load_compressed(tmpdir):
+    tmpfile = str(tmpdir.join('matrix.npz'))
+    save_npz(tmpfile, csr_matrix([[0, 1], [2, 0]]), compressed=True)
+    assert_raises(ValueError, load_npz, tmpfile, mmap_mode='r')
+
+
+def test_mmap_load_missing_array(tmpdir):
+    # A missing array is a KeyError, as for np.load of an .npz file
+    npz = str(tmpdir.join('matrix.npz'))
+    save_npz(npz, csr_matrix([[0, 1], [2, 0]]), compressed=False)
+    directory = tmpdir.mkdir('matrix')
+    with np.load(npz) as loaded:
+        for key in loaded.files:
+            if key != 'indices':
+                np.save(str(directory.join(key + '.npy')), loaded[key])
+    assert_raises(KeyError, load_npz, str(directory), mmap_mode='r')